@@ -0,0 +1,152 @@
+"""
+MediaVault Scanner - Face Detection Benchmark
+Measures face counting time per megapixel and agreement with full-resolution Haar counts.
+
+Usage:
+    python benchmark_faces.py <image_directory> [--max-dimensions 640 1024 1280]
+                              [--dnn-model PATH --dnn-config PATH] [--batch-size 8]
+    python benchmark_faces.py --synthetic 20   # drawn faces of 30-300 px on 12 MP frames
+"""
+
+import argparse
+import os
+import time
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+from config import Config
+from face_detector import FaceDetector
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+
+
+def load_images(directory: str, limit: int) -> List[np.ndarray]:
+    """Decode up to `limit` images from a directory (decoding is not part of the timings)."""
+    images = []
+    for root, _, files in os.walk(directory):
+        for filename in sorted(files):
+            if os.path.splitext(filename)[1].lower() not in IMAGE_EXTENSIONS:
+                continue
+            img = cv2.imread(os.path.join(root, filename))
+            if img is not None:
+                images.append(img)
+            if len(images) >= limit:
+                return images
+    return images
+
+
+def draw_face(size: int) -> np.ndarray:
+    """Draw a grayscale frontal face pattern (brows, eyes, nose, mouth) the Haar cascade detects."""
+    img = np.full((size, size), 170, dtype=np.uint8)
+    cv2.ellipse(img, (size // 2, size // 2), (int(size * 0.40), int(size * 0.50)), 0, 0, 360, 200, -1)
+    for x in (0.32, 0.68):
+        cv2.ellipse(img, (int(size * x), int(size * 0.30)), (int(size * 0.12), int(size * 0.03)), 0, 0, 360, 60, -1)
+        cv2.ellipse(img, (int(size * x), int(size * 0.40)), (int(size * 0.09), int(size * 0.05)), 0, 0, 360, 40, -1)
+    cv2.ellipse(img, (size // 2, int(size * 0.58)), (int(size * 0.06), int(size * 0.10)), 0, 0, 360, 150, -1)
+    cv2.ellipse(img, (size // 2, int(size * 0.76)), (int(size * 0.16), int(size * 0.04)), 0, 0, 360, 70, -1)
+    return cv2.GaussianBlur(img, (0, 0), size / 60)
+
+
+def synthetic_photo(face_sizes: List[int], shape: Tuple[int, int] = (3000, 4000)) -> np.ndarray:
+    """Place drawn faces of the given sizes in a row on a plain BGR background."""
+    gray = np.full(shape, 120, dtype=np.uint8)
+    x = 100
+    for size in face_sizes:
+        top = (shape[0] - size) // 2
+        gray[top:top + size, x:x + size] = draw_face(size)
+        x += size + 150
+    return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+
+
+def synthetic_photos(count: int) -> List[np.ndarray]:
+    """Generate 12 MP photos with four to eight faces of random sizes each."""
+    rng = np.random.default_rng(11)
+    return [synthetic_photo(sorted(rng.integers(30, 300, rng.integers(4, 9)).tolist())) for _ in range(count)]
+
+
+def run_detector(detector: FaceDetector, images: List[np.ndarray], batch_size: int) -> Tuple[List[int], float]:
+    """Count faces in all images; returns (counts, elapsed seconds)."""
+    counts = []
+    start = time.perf_counter()
+    for index in range(0, len(images), batch_size):
+        counts.extend(detector.count_faces_batch(images[index:index + batch_size]))
+    return counts, time.perf_counter() - start
+
+
+def print_result(name: str, counts: List[int], elapsed: float, megapixels: float,
+                 baseline_counts: List[int], baseline_elapsed: float, min_face: str = '-'):
+    """Print one benchmark row."""
+    counts_array = np.array(counts)
+    baseline_array = np.array(baseline_counts)
+    exact = np.mean(counts_array == baseline_array) * 100
+    mean_abs_diff = np.mean(np.abs(counts_array - baseline_array))
+    speedup = baseline_elapsed / elapsed if elapsed > 0 else float('inf')
+
+    print(f"{name:<28} {elapsed / megapixels * 1000:>10.2f} {speedup:>8.1f}x "
+          f"{exact:>9.1f}% {mean_abs_diff:>9.2f} {sum(counts):>7} {min_face:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MediaVault face counting backends")
+    parser.add_argument('directory', nargs='?', help="Directory with test images (ideally containing people)")
+    parser.add_argument('--synthetic', type=int, metavar='COUNT',
+                        help="Use COUNT generated photos with drawn faces instead of a directory")
+    parser.add_argument('--max-dimensions', type=int, nargs='+', default=[640, 1024, 1280],
+                        help="Bounded sizes to test for the Haar backend")
+    parser.add_argument('--dnn-model', default=Config.FACE_DNN_MODEL_PATH, help="DNN weights (.caffemodel)")
+    parser.add_argument('--dnn-config', default=Config.FACE_DNN_CONFIG_PATH, help="DNN definition (.prototxt)")
+    parser.add_argument('--batch-size', type=int, default=8, help="Images per DNN forward pass")
+    parser.add_argument('--limit', type=int, default=200, help="Maximum number of images")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        images = synthetic_photos(args.synthetic)
+    elif args.directory:
+        images = load_images(args.directory, args.limit)
+    else:
+        parser.error("an image directory or --synthetic is required")
+    if not images:
+        print(f"No images found in {args.directory}")
+        return
+    # Smallest detectable face for the median image size
+    height, width = sorted(img.shape[:2] for img in images)[len(images) // 2]
+
+    megapixels = sum(img.shape[0] * img.shape[1] for img in images) / 1e6
+
+    print("=" * 78)
+    print("Face Detection Benchmark")
+    print("=" * 78)
+    print(f"Images: {len(images)}  |  Total: {megapixels:.1f} MP  |  OpenCV {cv2.__version__}")
+    print(f"\n{'Configuration':<28} {'ms/MP':>10} {'Speedup':>9} {'Agreement':>10} {'MeanDiff':>9} {'Faces':>7} "
+          f"{'MinFace':>8}")
+    print("-" * 78)
+
+    # Baseline: Haar cascade on the full-resolution image (previous behaviour)
+    baseline = FaceDetector('haar', max_dimension=None)
+    baseline_counts, baseline_elapsed = run_detector(baseline, images, 1)
+    print_result("haar (full resolution)", baseline_counts, baseline_elapsed, megapixels,
+                 baseline_counts, baseline_elapsed, f"{baseline.min_face_size(height, width)}px")
+
+    for max_dimension in args.max_dimensions:
+        detector = FaceDetector('haar', max_dimension=max_dimension)
+        counts, elapsed = run_detector(detector, images, 1)
+        print_result(f"haar (max {max_dimension}px)", counts, elapsed, megapixels,
+                     baseline_counts, baseline_elapsed, f"{detector.min_face_size(height, width)}px")
+
+    dnn_detector = FaceDetector('dnn', dnn_model_path=args.dnn_model, dnn_config_path=args.dnn_config)
+    if dnn_detector.backend == 'dnn':
+        counts, elapsed = run_detector(dnn_detector, images, args.batch_size)
+        print_result(f"dnn (batch {args.batch_size})", counts, elapsed, megapixels,
+                     baseline_counts, baseline_elapsed)
+    else:
+        print(f"{'dnn':<28} skipped (model not found: {args.dnn_model})")
+
+    print("-" * 78)
+    print("Agreement: share of images whose face count equals the full-resolution Haar count.")
+    print(f"MinFace: smallest detectable face (full-resolution pixels) in a {width}x{height} image.")
+
+
+if __name__ == "__main__":
+    main()
@@ -40,6 +40,49 @@ class Config:
 
     DEEPSEEK_ENABLED = True  # Try to use Deepseek GGUF (will fallback to Tesseract if unavailable)
 
+    # Video analysis settings
+    VIDEO_SAMPLE_MODE = "single"  # "single" (one frame at 5s), "uniform" (evenly spaced seeks) or "keyframes"
+    VIDEO_FRAME_BUDGET = 8  # Maximum frames analysed per video in "uniform"/"keyframes" modes
+
+    # Thumbnail settings
+    THUMBNAIL_MODE = "eager"  # "eager" (generated during the scan) or "lazy" (generated when first displayed)
+    THUMBNAIL_PREFILL_LIMIT = 500  # Filtered results whose thumbnails are prefilled in the background
+
+    # Object/scene heuristic stages (disable expensive stages for faster scans)
+    SCENE_DETECT_COLORS = True  # Dominant colour ranges (sky, grass, water, ...)
+    SCENE_DETECT_EDGES = True  # Edge density (buildings/structures)
+    SCENE_DETECT_CIRCLES = True  # HoughCircles on images (the slowest stage)
+
+    # Face detection settings
+    FACE_DETECTOR_BACKEND = "haar"  # "haar" or "dnn" (OpenCV SSD face model, falls back to Haar)
+    FACE_MAX_DIMENSION = 1280  # Longest image side for Haar face detection (smaller = faster, misses smaller faces)
+    FACE_DNN_MODEL_PATH = "models/res10_300x300_ssd_iter_140000.caffemodel"
+    FACE_DNN_CONFIG_PATH = "models/deploy.prototxt"
+
+    # Near-duplicate detection
+    NEAR_DUPLICATE_DISTANCE = 6  # Largest perceptual hash Hamming distance treated as a duplicate
+
+    # Exact-duplicate detection
+    SKIP_DUPLICATE_CONTENT = True  # Copy metadata of files whose content is already in the database
+    CONTENT_HASH_WORKERS = 4  # Threads hashing the chunks of large files
+
+    # Visual similarity search
+    SIMILAR_RESULTS_LIMIT = 50  # Results of a "more like this" query
+
+    # Offline reverse geocoding
+    GAZETTEER_PATH = None  # None = bundled gazetteer.csv; or a GeoNames cities*.txt file
+    GEOCODE_MAX_DISTANCE_KM = 250  # Positions further than this from every place stay unresolved
+
+    # Sentiment keywords and OCR stop words
+    KEYWORD_DICTIONARY_PATH = None  # None = built-in lists; or a JSON file (python keyword_rules.py --export)
+
+    # Location clustering
+    LOCATION_CLUSTER_PRECISION = 7  # Geohash length of the grid cells (7 = about 150 x 150 m)
+
+    # Event segmentation
+    EVENT_MAX_GAP_MINUTES = 120  # A longer gap between two files starts a new event
+    EVENT_MAX_JUMP_KM = 30  # A longer jump between two geotagged files starts a new event
+
     # Tesseract settings (Fallback OCR)
     TESSERACT_PATH = None  # Will be set by user or auto-detected
     TESSERACT_ENABLED = True  # Always keep Tesseract as fallback
@@ -64,6 +107,50 @@ class Config:
                     cls.N_THREADS = config_data.get('n_threads', cls.N_THREADS)
                     cls.DEEPSEEK_ENABLED = config_data.get('deepseek_enabled', cls.DEEPSEEK_ENABLED)
 
+                    # Video analysis settings
+                    cls.VIDEO_SAMPLE_MODE = config_data.get('video_sample_mode', cls.VIDEO_SAMPLE_MODE)
+                    cls.VIDEO_FRAME_BUDGET = config_data.get('video_frame_budget', cls.VIDEO_FRAME_BUDGET)
+
+                    # Thumbnail settings
+                    cls.THUMBNAIL_MODE = config_data.get('thumbnail_mode', cls.THUMBNAIL_MODE)
+                    cls.THUMBNAIL_PREFILL_LIMIT = config_data.get('thumbnail_prefill_limit', cls.THUMBNAIL_PREFILL_LIMIT)
+
+                    # Object/scene heuristic stages
+                    cls.SCENE_DETECT_COLORS = config_data.get('scene_detect_colors', cls.SCENE_DETECT_COLORS)
+                    cls.SCENE_DETECT_EDGES = config_data.get('scene_detect_edges', cls.SCENE_DETECT_EDGES)
+                    cls.SCENE_DETECT_CIRCLES = config_data.get('scene_detect_circles', cls.SCENE_DETECT_CIRCLES)
+
+                    # Face detection settings
+                    cls.FACE_DETECTOR_BACKEND = config_data.get('face_detector_backend', cls.FACE_DETECTOR_BACKEND)
+                    cls.FACE_MAX_DIMENSION = config_data.get('face_max_dimension', cls.FACE_MAX_DIMENSION)
+                    cls.FACE_DNN_MODEL_PATH = config_data.get('face_dnn_model_path', cls.FACE_DNN_MODEL_PATH)
+                    cls.FACE_DNN_CONFIG_PATH = config_data.get('face_dnn_config_path', cls.FACE_DNN_CONFIG_PATH)
+
+                    # Near-duplicate detection
+                    cls.NEAR_DUPLICATE_DISTANCE = config_data.get('near_duplicate_distance', cls.NEAR_DUPLICATE_DISTANCE)
+
+                    # Exact-duplicate detection
+                    cls.SKIP_DUPLICATE_CONTENT = config_data.get('skip_duplicate_content', cls.SKIP_DUPLICATE_CONTENT)
+                    cls.CONTENT_HASH_WORKERS = config_data.get('content_hash_workers', cls.CONTENT_HASH_WORKERS)
+
+                    # Visual similarity search
+                    cls.SIMILAR_RESULTS_LIMIT = config_data.get('similar_results_limit', cls.SIMILAR_RESULTS_LIMIT)
+
+                    # Offline reverse geocoding
+                    cls.GAZETTEER_PATH = config_data.get('gazetteer_path', cls.GAZETTEER_PATH)
+                    cls.GEOCODE_MAX_DISTANCE_KM = config_data.get('geocode_max_distance_km', cls.GEOCODE_MAX_DISTANCE_KM)
+
+                    # Sentiment keywords and OCR stop words
+                    cls.KEYWORD_DICTIONARY_PATH = config_data.get('keyword_dictionary_path', cls.KEYWORD_DICTIONARY_PATH)
+
+                    # Location clustering
+                    cls.LOCATION_CLUSTER_PRECISION = config_data.get('location_cluster_precision',
+                                                                     cls.LOCATION_CLUSTER_PRECISION)
+
+                    # Event segmentation
+                    cls.EVENT_MAX_GAP_MINUTES = config_data.get('event_max_gap_minutes', cls.EVENT_MAX_GAP_MINUTES)
+                    cls.EVENT_MAX_JUMP_KM = config_data.get('event_max_jump_km', cls.EVENT_MAX_JUMP_KM)
+
                     # Tesseract settings
                     cls.TESSERACT_PATH = config_data.get('tesseract_path')
                     cls.TESSERACT_ENABLED = config_data.get('tesseract_enabled', cls.TESSERACT_ENABLED)
@@ -88,6 +175,49 @@ class Config:
                 'n_threads': cls.N_THREADS,
                 'deepseek_enabled': cls.DEEPSEEK_ENABLED,
 
+                # Video analysis settings
+                'video_sample_mode': cls.VIDEO_SAMPLE_MODE,
+                'video_frame_budget': cls.VIDEO_FRAME_BUDGET,
+
+                # Thumbnail settings
+                'thumbnail_mode': cls.THUMBNAIL_MODE,
+                'thumbnail_prefill_limit': cls.THUMBNAIL_PREFILL_LIMIT,
+
+                # Object/scene heuristic stages
+                'scene_detect_colors': cls.SCENE_DETECT_COLORS,
+                'scene_detect_edges': cls.SCENE_DETECT_EDGES,
+                'scene_detect_circles': cls.SCENE_DETECT_CIRCLES,
+
+                # Face detection settings
+                'face_detector_backend': cls.FACE_DETECTOR_BACKEND,
+                'face_max_dimension': cls.FACE_MAX_DIMENSION,
+                'face_dnn_model_path': cls.FACE_DNN_MODEL_PATH,
+                'face_dnn_config_path': cls.FACE_DNN_CONFIG_PATH,
+
+                # Near-duplicate detection
+                'near_duplicate_distance': cls.NEAR_DUPLICATE_DISTANCE,
+
+                # Exact-duplicate detection
+                'skip_duplicate_content': cls.SKIP_DUPLICATE_CONTENT,
+                'content_hash_workers': cls.CONTENT_HASH_WORKERS,
+
+                # Visual similarity search
+                'similar_results_limit': cls.SIMILAR_RESULTS_LIMIT,
+
+                # Offline reverse geocoding
+                'gazetteer_path': cls.GAZETTEER_PATH,
+                'geocode_max_distance_km': cls.GEOCODE_MAX_DISTANCE_KM,
+
+                # Sentiment keywords and OCR stop words
+                'keyword_dictionary_path': cls.KEYWORD_DICTIONARY_PATH,
+
+                # Location clustering
+                'location_cluster_precision': cls.LOCATION_CLUSTER_PRECISION,
+
+                # Event segmentation
+                'event_max_gap_minutes': cls.EVENT_MAX_GAP_MINUTES,
+                'event_max_jump_km': cls.EVENT_MAX_JUMP_KM,
+
                 # Tesseract settings
                 'tesseract_path': cls.TESSERACT_PATH,
                 'tesseract_enabled': cls.TESSERACT_ENABLED,
@@ -164,3 +294,31 @@ class Config:
             'tesseract_enabled': cls.TESSERACT_ENABLED
         }
 
+    @classmethod
+    def get_extractor_config(cls) -> dict:
+        """
+        Get metadata extractor configuration dictionary.
+
+        Returns:
+            Dictionary with extraction settings
+        """
+        return {
+            'video_sample_mode': cls.VIDEO_SAMPLE_MODE,
+            'video_frame_budget': cls.VIDEO_FRAME_BUDGET,
+            'thumbnail_mode': cls.THUMBNAIL_MODE,
+            'scene_detect_colors': cls.SCENE_DETECT_COLORS,
+            'scene_detect_edges': cls.SCENE_DETECT_EDGES,
+            'scene_detect_circles': cls.SCENE_DETECT_CIRCLES,
+            'face_detector_backend': cls.FACE_DETECTOR_BACKEND,
+            'face_max_dimension': cls.FACE_MAX_DIMENSION,
+            'face_dnn_model_path': cls.FACE_DNN_MODEL_PATH,
+            'face_dnn_config_path': cls.FACE_DNN_CONFIG_PATH,
+            'skip_duplicate_content': cls.SKIP_DUPLICATE_CONTENT,
+            'content_hash_workers': cls.CONTENT_HASH_WORKERS,
+            'gazetteer_path': cls.GAZETTEER_PATH,
+            'geocode_max_distance_km': cls.GEOCODE_MAX_DISTANCE_KM,
+            'keyword_dictionary_path': cls.KEYWORD_DICTIONARY_PATH,
+            'location_cluster_precision': cls.LOCATION_CLUSTER_PRECISION,
+            'event_max_gap_minutes': cls.EVENT_MAX_GAP_MINUTES,
+            'event_max_jump_km': cls.EVENT_MAX_JUMP_KM
+        }
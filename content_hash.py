@@ -0,0 +1,101 @@
+"""
+MediaVault Scanner - Content Hash Module
+Fast exact-duplicate detection: files are hashed in fixed-size chunks that are
+read and hashed on a thread pool, so large videos use several cores and disks.
+"""
+
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+
+class ContentHasher:
+    """
+    Computes content hashes of media files.
+
+    The hash is a two-level BLAKE2b tree: every CHUNK_SIZE block of the file is
+    hashed independently (in parallel for multi-chunk files), and the root hash
+    covers the file size and the chunk digests in order. The result therefore
+    does not depend on the number of worker threads.
+    """
+
+    # Bytes per independently hashed chunk
+    CHUNK_SIZE = 8 * 1024 * 1024
+
+    # Bytes read per call while streaming a chunk
+    READ_SIZE = 1024 * 1024
+
+    # Digest size in bytes (hex digest is twice as long)
+    DIGEST_SIZE = 16
+
+    def __init__(self, workers: int = 4, chunk_size: int = CHUNK_SIZE):
+        """
+        Initialize the hasher.
+
+        Args:
+            workers: Threads used to hash the chunks of large files
+            chunk_size: Bytes per chunk (changing it changes all hashes)
+        """
+        self.workers = max(1, int(workers))
+        self.chunk_size = chunk_size
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def hash_file(self, filepath: str) -> Optional[str]:
+        """
+        Compute the content hash of a file.
+
+        Args:
+            filepath: Full path to the file
+
+        Returns:
+            Hex digest, or None if the file could not be read
+        """
+        try:
+            size = os.path.getsize(filepath)
+            chunk_count = max(1, -(-size // self.chunk_size))
+
+            if chunk_count == 1 or self.workers == 1:
+                digests = [self._hash_chunk(filepath, index) for index in range(chunk_count)]
+            else:
+                executor = self._get_executor()
+                digests = list(executor.map(lambda index: self._hash_chunk(filepath, index), range(chunk_count)))
+
+            root = hashlib.blake2b(digest_size=self.DIGEST_SIZE)
+            root.update(size.to_bytes(8, 'little'))
+            for digest in digests:
+                root.update(digest)
+            return root.hexdigest()
+        except OSError as e:
+            print(f"Error hashing {filepath}: {e}")
+            return None
+
+    def close(self):
+        """Shut down the worker threads."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the shared thread pool, creating it on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="content-hash")
+            return self._executor
+
+    def _hash_chunk(self, filepath: str, index: int) -> bytes:
+        """Hash one chunk, streaming it with its own file handle."""
+        digest = hashlib.blake2b(digest_size=self.DIGEST_SIZE)
+        with open(filepath, 'rb') as f:
+            f.seek(index * self.chunk_size)
+            remaining = self.chunk_size
+            while remaining > 0:
+                data = f.read(min(self.READ_SIZE, remaining))
+                if not data:
+                    break
+                digest.update(data)
+                remaining -= len(data)
+        return digest.digest()
@@ -5,13 +5,85 @@ Handles SQLite database operations for media metadata storage.
 
 import sqlite3
 import os
-from typing import Optional, List, Dict, Any
+import json
+import calendar
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Tuple, Iterator, Callable
 from contextlib import contextmanager
 
 
 class MediaDatabase:
     """Manages the SQLite database for media metadata."""
-    
+
+    # Columns written by insert_metadata (in insert order)
+    METADATA_COLUMNS = [
+        'filepath', 'filename', 'file_type', 'date_time_original',
+        'capture_timestamp', 'gps_latitude', 'gps_longitude', 'person_count',
+        'ocr_text_summary', 'object_keywords', 'emotion_sentiment',
+        'sentiment', 'sentiment_context', 'day_period', 'thumbnail_path',
+        'duration_seconds', 'width', 'height', 'codec', 'frame_rate', 'phash',
+        'content_hash', 'duplicate_of', 'embedding',
+        'place_name', 'place_region', 'place_country'
+    ]
+
+    # Columns written by the exporters (in column order; binary embeddings and the
+    # legacy per-file thumbnail path are left out, thumbnails live in the ThumbnailStore)
+    EXPORT_COLUMNS = (['id'] + [column for column in METADATA_COLUMNS if column not in ('embedding', 'thumbnail_path')]
+                      + ['duplicate_group', 'location_cluster', 'event_id'])
+
+    # Typed columns for columnar export (all other columns are exported as strings)
+    COLUMNAR_TYPES = {
+        'id': 'int64',
+        'capture_timestamp': 'timestamp',
+        'gps_latitude': 'float64',
+        'gps_longitude': 'float64',
+        'person_count': 'int32',
+        'duration_seconds': 'float64',
+        'width': 'int32',
+        'height': 'int32',
+        'frame_rate': 'float64',
+        'phash': 'int64',
+        'duplicate_group': 'int64',
+        'location_cluster': 'int64',
+        'event_id': 'int64'
+    }
+
+    # Supported partition keys for columnar export
+    PARTITION_KEYS = ('file_type', 'capture_year')
+
+    # Maximum number of values bound to one IN (...) list
+    ID_CHUNK_SIZE = 500
+
+    # Day periods appended to the combined emotion_sentiment label
+    DAY_PERIODS = ('Daytime', 'Nighttime')
+
+    # Person count facet buckets: (label, minimum, maximum or None for open-ended)
+    PERSON_COUNT_BUCKETS = [
+        ('0', 0, 0),
+        ('1', 1, 1),
+        ('2-5', 2, 5),
+        ('6+', 6, None)
+    ]
+
+    # SQL expression converting an EXIF "YYYY:MM:DD HH:MM:SS" string into epoch
+    # seconds (wall-clock time, interpreted as UTC). Yields NULL for bad values.
+    CAPTURE_TIMESTAMP_SQL = (
+        "CAST(strftime('%s', replace(substr({0}, 1, 10), ':', '-') || "
+        "substr({0}, 11, 9)) AS INTEGER)"
+    )
+
+    # strftime() formats for capture date histogram buckets
+    HISTOGRAM_FORMATS = {
+        'year': '%Y',
+        'month': '%Y-%m',
+        'day': '%Y-%m-%d'
+    }
+
+    SECONDS_PER_DAY = 24 * 60 * 60
+
+    # Capture timestamps count seconds from this (time.gmtime rejects negative values on Windows)
+    EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
     def __init__(self, db_path: str = "metadata.db"):
         """
         Initialize the database connection.
@@ -27,6 +99,8 @@ class MediaDatabase:
         """Context manager for database connections."""
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
+        # Fire delete triggers for rows removed by REPLACE conflict resolution (keeps bucket counts exact)
+        conn.execute("PRAGMA recursive_triggers = ON")
         try:
             yield conn
             conn.commit()
@@ -47,13 +121,32 @@ class MediaDatabase:
                     filename TEXT,
                     file_type TEXT,
                     date_time_original TEXT,
+                    capture_timestamp INTEGER,
                     gps_latitude REAL,
                     gps_longitude REAL,
                     person_count INTEGER,
                     ocr_text_summary TEXT,
                     object_keywords TEXT,
                     emotion_sentiment TEXT,
-                    thumbnail_path TEXT
+                    sentiment TEXT,
+                    sentiment_context TEXT,
+                    day_period TEXT,
+                    thumbnail_path TEXT,
+                    duration_seconds REAL,
+                    width INTEGER,
+                    height INTEGER,
+                    codec TEXT,
+                    frame_rate REAL,
+                    phash INTEGER,
+                    duplicate_group INTEGER,
+                    content_hash TEXT,
+                    duplicate_of TEXT,
+                    embedding BLOB,
+                    place_name TEXT,
+                    place_region TEXT,
+                    place_country TEXT,
+                    location_cluster INTEGER,
+                    event_id INTEGER
                 )
             """)
 
@@ -63,31 +156,455 @@ class MediaDatabase:
                 ON media_metadata(filepath)
             """)
 
-            # Add thumbnail_path column if it doesn't exist (for existing databases)
-            try:
-                cursor.execute("ALTER TABLE media_metadata ADD COLUMN thumbnail_path TEXT")
-            except sqlite3.OperationalError:
-                # Column already exists
-                pass
+            # Add columns introduced after the initial schema (for existing databases)
+            self._add_column(cursor, 'thumbnail_path', 'TEXT')
+
+            if self._add_column(cursor, 'capture_timestamp', 'INTEGER'):
+                # Backfill parsed capture timestamps for existing rows
+                cursor.execute(f"""
+                    UPDATE media_metadata
+                    SET capture_timestamp = {self.CAPTURE_TIMESTAMP_SQL.format('date_time_original')}
+                    WHERE date_time_original IS NOT NULL AND date_time_original != ''
+                """)
+
+            # Structured sentiment columns (split out of emotion_sentiment)
+            added_sentiment = self._add_column(cursor, 'sentiment', 'TEXT')
+            self._add_column(cursor, 'sentiment_context', 'TEXT')
+            self._add_column(cursor, 'day_period', 'TEXT')
+            if added_sentiment:
+                self._backfill_sentiment_columns(cursor)
+
+            # Video container properties
+            self._add_column(cursor, 'duration_seconds', 'REAL')
+            self._add_column(cursor, 'width', 'INTEGER')
+            self._add_column(cursor, 'height', 'INTEGER')
+            self._add_column(cursor, 'codec', 'TEXT')
+            self._add_column(cursor, 'frame_rate', 'REAL')
+
+            # Perceptual hash (signed 64-bit dHash) and near-duplicate cluster id
+            self._add_column(cursor, 'phash', 'INTEGER')
+            self._add_column(cursor, 'duplicate_group', 'INTEGER')
+
+            # Exact-duplicate detection: content hash, and the file path of the
+            # record whose metadata an alias was copied from
+            self._add_column(cursor, 'content_hash', 'TEXT')
+            self._add_column(cursor, 'duplicate_of', 'TEXT')
+
+            # Visual similarity embedding (float16 blob)
+            self._add_column(cursor, 'embedding', 'BLOB')
+
+            # Reverse-geocoded place of the GPS position
+            self._add_column(cursor, 'place_name', 'TEXT')
+            self._add_column(cursor, 'place_region', 'TEXT')
+            self._add_column(cursor, 'place_country', 'TEXT')
+
+            # Location cluster (see location_clusters.py)
+            self._add_column(cursor, 'location_cluster', 'INTEGER')
+
+            # Event (see events.py)
+            self._add_column(cursor, 'event_id', 'INTEGER')
+
+            # Create index on capture timestamp for date range scans
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_capture_timestamp
+                ON media_metadata(capture_timestamp)
+            """)
+
+            # Create indexes for equality/range filters and facet counts
+            for column in ('sentiment', 'sentiment_context', 'day_period', 'person_count', 'file_type',
+                           'duplicate_group', 'content_hash', 'duplicate_of',
+                           'place_name', 'place_region', 'place_country', 'location_cluster'):
+                cursor.execute(f"""
+                    CREATE INDEX IF NOT EXISTS idx_{column}
+                    ON media_metadata({column})
+                """)
+
+            # Location clusters: one row per place, and the geohash cells it covers
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS location_clusters (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    centroid_latitude REAL,
+                    centroid_longitude REAL,
+                    media_count INTEGER NOT NULL DEFAULT 0,
+                    representative_id INTEGER
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_location_clusters_centroid
+                ON location_clusters(centroid_latitude, centroid_longitude)
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS location_cells (
+                    cell TEXT PRIMARY KEY,
+                    cluster_id INTEGER NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_location_cells_cluster
+                ON location_cells(cluster_id)
+            """)
+
+            # Events: summary per event; media are found through the event index
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    start_timestamp INTEGER,
+                    end_timestamp INTEGER,
+                    media_count INTEGER NOT NULL DEFAULT 0,
+                    centroid_latitude REAL,
+                    centroid_longitude REAL,
+                    place_name TEXT,
+                    representative_id INTEGER
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_events_time
+                ON events(start_timestamp, end_timestamp)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_event_media
+                ON media_metadata(event_id, capture_timestamp, id)
+            """)
+
+            # Capture date buckets: media count per day, maintained by triggers
+            self._create_capture_buckets(cursor)
+
+            # Clusters and events left by moved, re-dated or deleted records
+            self._create_grouping_triggers(cursor)
+
+            # Keyword index: one row per (media, keyword) for facet counts
+            cursor.execute("""
+                SELECT COUNT(*) FROM sqlite_master
+                WHERE type = 'table' AND name = 'media_keywords'
+            """)
+            keywords_table_exists = cursor.fetchone()[0] > 0
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS media_keywords (
+                    media_id INTEGER NOT NULL,
+                    keyword TEXT NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_media_keywords_keyword
+                ON media_keywords(keyword, media_id)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_media_keywords_media
+                ON media_keywords(media_id)
+            """)
+
+            if not keywords_table_exists:
+                cursor.execute("""
+                    SELECT id, object_keywords FROM media_metadata
+                    WHERE object_keywords IS NOT NULL AND object_keywords != ''
+                """)
+                for row_id, object_keywords in cursor.fetchall():
+                    self._insert_keywords(cursor, row_id, object_keywords)
+
+            # Progress of re-derivation jobs (see derivation.py)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS derivation_checkpoints (
+                    step TEXT PRIMARY KEY,
+                    last_id INTEGER NOT NULL DEFAULT 0,
+                    changed INTEGER NOT NULL DEFAULT 0,
+                    completed INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+
+    def _create_capture_buckets(self, cursor: sqlite3.Cursor):
+        """Create the per-day capture count table and the triggers keeping it current."""
+        cursor.execute("""
+            SELECT COUNT(*) FROM sqlite_master
+            WHERE type = 'table' AND name = 'capture_day_counts'
+        """)
+        buckets_table_exists = cursor.fetchone()[0] > 0
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS capture_day_counts (
+                day TEXT PRIMARY KEY,
+                media_count INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+
+        day = f"strftime('{self.HISTOGRAM_FORMATS['day']}', {{0}}.capture_timestamp, 'unixepoch')"
+        increment = f"""
+            INSERT INTO capture_day_counts (day, media_count) VALUES ({day.format('NEW')}, 1)
+            ON CONFLICT(day) DO UPDATE SET media_count = media_count + 1;
+        """
+        decrement = f"""
+            UPDATE capture_day_counts SET media_count = media_count - 1 WHERE day = {day.format('OLD')};
+            DELETE FROM capture_day_counts WHERE day = {day.format('OLD')} AND media_count <= 0;
+        """
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_capture_buckets_insert
+            AFTER INSERT ON media_metadata
+            WHEN NEW.capture_timestamp IS NOT NULL
+            BEGIN {increment} END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_capture_buckets_delete
+            AFTER DELETE ON media_metadata
+            WHEN OLD.capture_timestamp IS NOT NULL
+            BEGIN {decrement} END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_capture_buckets_update_old
+            AFTER UPDATE OF capture_timestamp ON media_metadata
+            WHEN OLD.capture_timestamp IS NOT NEW.capture_timestamp AND OLD.capture_timestamp IS NOT NULL
+            BEGIN {decrement} END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_capture_buckets_update_new
+            AFTER UPDATE OF capture_timestamp ON media_metadata
+            WHEN OLD.capture_timestamp IS NOT NEW.capture_timestamp AND NEW.capture_timestamp IS NOT NULL
+            BEGIN {increment} END
+        """)
+
+        if not buckets_table_exists:
+            cursor.execute(f"""
+                INSERT INTO capture_day_counts (day, media_count)
+                SELECT {day.format('media_metadata')} AS bucket, COUNT(*)
+                FROM media_metadata
+                WHERE capture_timestamp IS NOT NULL
+                GROUP BY bucket
+            """)
+
+    def _create_grouping_triggers(self, cursor: sqlite3.Cursor):
+        """
+        Create the triggers dissolving location clusters and events whose members
+        move or disappear.
+
+        A cluster is a connected set of occupied cells and an event a run of
+        captures without long gaps or GPS jumps, so a record leaving one (its
+        GPS position or capture time changes, or the row is deleted)
+        can empty, shrink or split it. Its remaining records are unassigned and
+        the cluster or event removed; the next incremental update assigns them
+        again.
+        """
+        cursor.execute("""
+            SELECT name FROM sqlite_master
+            WHERE type = 'trigger' AND name IN ('trg_location_cluster_delete', 'trg_event_delete')
+        """)
+        existing_triggers = {row[0] for row in cursor.fetchall()}
+
+        dissolve_cluster = """
+            UPDATE media_metadata SET location_cluster = NULL WHERE location_cluster = OLD.location_cluster;
+            DELETE FROM location_cells WHERE cluster_id = OLD.location_cluster;
+            DELETE FROM location_clusters WHERE id = OLD.location_cluster;
+        """
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_location_cluster_delete
+            AFTER DELETE ON media_metadata
+            WHEN OLD.location_cluster IS NOT NULL
+            BEGIN {dissolve_cluster} END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_location_cluster_moved
+            AFTER UPDATE OF gps_latitude, gps_longitude ON media_metadata
+            WHEN OLD.location_cluster IS NOT NULL
+                AND (OLD.gps_latitude IS NOT NEW.gps_latitude OR OLD.gps_longitude IS NOT NEW.gps_longitude)
+            BEGIN {dissolve_cluster} END
+        """)
+
+        dissolve_event = """
+            UPDATE media_metadata SET event_id = NULL WHERE event_id = OLD.event_id;
+            DELETE FROM events WHERE id = OLD.event_id;
+        """
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_event_delete
+            AFTER DELETE ON media_metadata
+            WHEN OLD.event_id IS NOT NULL
+            BEGIN {dissolve_event} END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_event_moved
+            AFTER UPDATE OF capture_timestamp, gps_latitude, gps_longitude ON media_metadata
+            WHEN OLD.event_id IS NOT NULL
+                AND (OLD.capture_timestamp IS NOT NEW.capture_timestamp
+                     OR OLD.gps_latitude IS NOT NEW.gps_latitude OR OLD.gps_longitude IS NOT NEW.gps_longitude)
+            BEGIN {dissolve_event} END
+        """)
+
+        if 'trg_event_delete' not in existing_triggers:
+            # Events of databases written before the triggers may be stale: dissolve
+            # those whose stored span or count no longer matches their records
+            cursor.execute("""
+                UPDATE media_metadata SET event_id = NULL
+                WHERE event_id IS NOT NULL AND (capture_timestamp IS NULL OR event_id IN (
+                    SELECT e.id FROM events e
+                    WHERE (e.media_count, e.start_timestamp, e.end_timestamp) IS NOT (
+                        SELECT COUNT(*), MIN(capture_timestamp), MAX(capture_timestamp)
+                        FROM media_metadata WHERE event_id = e.id
+                    )
+                ) OR event_id NOT IN (SELECT id FROM events))
+            """)
+            cursor.execute("DELETE FROM events WHERE id NOT IN (SELECT event_id FROM media_metadata WHERE event_id IS NOT NULL)")
+
+        if 'trg_location_cluster_delete' not in existing_triggers:
+            # Clusters of databases written before the triggers may be stale
+            cursor.execute("""
+                UPDATE media_metadata SET location_cluster = NULL
+                WHERE location_cluster IS NOT NULL AND location_cluster NOT IN (SELECT id FROM location_clusters)
+            """)
+            cursor.execute("""
+                DELETE FROM location_clusters
+                WHERE id NOT IN (SELECT location_cluster FROM media_metadata WHERE location_cluster IS NOT NULL)
+            """)
+            cursor.execute("DELETE FROM location_cells WHERE cluster_id NOT IN (SELECT id FROM location_clusters)")
+            cursor.execute("""
+                UPDATE location_clusters
+                SET (media_count, centroid_latitude, centroid_longitude, representative_id) = (
+                    SELECT COUNT(*), AVG(gps_latitude), AVG(gps_longitude), MIN(id)
+                    FROM media_metadata WHERE location_cluster = location_clusters.id
+                )
+            """)
+
+    def _insert_keywords(self, cursor: sqlite3.Cursor, media_id: int, object_keywords: Optional[str]):
+        """Index the comma-separated keywords of a media record."""
+        cursor.executemany(
+            "INSERT INTO media_keywords (media_id, keyword) VALUES (?, ?)",
+            [(media_id, keyword) for keyword in self.split_keywords(object_keywords)]
+        )
+
+    @staticmethod
+    def split_keywords(object_keywords: Optional[str]) -> List[str]:
+        """
+        Split a comma-separated keyword string into unique, stripped keywords.
+
+        Args:
+            object_keywords: Comma-separated keywords
+
+        Returns:
+            List of keywords in their original order
+        """
+        if not object_keywords:
+            return []
+        keywords = (keyword.strip() for keyword in object_keywords.split(','))
+        return list(dict.fromkeys(keyword for keyword in keywords if keyword))
+
+    def _backfill_sentiment_columns(self, cursor: sqlite3.Cursor):
+        """Populate the structured sentiment columns from existing emotion_sentiment labels."""
+        cursor.execute("""
+            SELECT id, emotion_sentiment FROM media_metadata
+            WHERE emotion_sentiment IS NOT NULL
+        """)
+        updates = [
+            (*self.split_emotion_sentiment(label), row_id)
+            for row_id, label in cursor.fetchall()
+        ]
+        cursor.executemany("""
+            UPDATE media_metadata
+            SET sentiment = ?, sentiment_context = ?, day_period = ?
+            WHERE id = ?
+        """, updates)
+
+    @classmethod
+    def split_emotion_sentiment(cls, label: Optional[str]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Split a combined label like "Positive/Vacation/Daytime" into its parts.
+
+        Args:
+            label: Combined emotion_sentiment label
+
+        Returns:
+            Tuple of (sentiment, context_keyword, day_period); missing parts are None
+        """
+        if not label:
+            return None, None, None
+
+        parts = label.split('/')
+        sentiment = parts[0] or None
+        day_period = parts.pop() if len(parts) > 1 and parts[-1] in cls.DAY_PERIODS else None
+        context = '/'.join(parts[1:]) or None
+        return sentiment, context, day_period
+
+    def _add_column(self, cursor: sqlite3.Cursor, name: str, definition: str) -> bool:
+        """
+        Add a column to media_metadata if it doesn't exist yet.
+
+        Args:
+            cursor: Open database cursor
+            name: Column name
+            definition: Column type/constraint definition
+
+        Returns:
+            True if the column was added, False if it already existed
+        """
+        try:
+            cursor.execute(f"ALTER TABLE media_metadata ADD COLUMN {name} {definition}")
+            return True
+        except sqlite3.OperationalError:
+            # Column already exists
+            return False
     
-    def file_exists(self, filepath: str) -> bool:
+    def file_exists(self, filepath: str, analyzed_only: bool = False) -> bool:
         """
         Check if a file already exists in the database.
         
         Args:
             filepath: Full path to the file
+            analyzed_only: Only count records that went through full analysis
+                (rows written by the EXIF-only scan mode are ignored)
             
         Returns:
             True if file exists in database, False otherwise
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "SELECT COUNT(*) FROM media_metadata WHERE filepath = ?",
-                (filepath,)
-            )
+            query = "SELECT COUNT(*) FROM media_metadata WHERE filepath = ?"
+            if analyzed_only:
+                query += " AND emotion_sentiment IS NOT NULL"
+            cursor.execute(query, (filepath,))
             count = cursor.fetchone()[0]
             return count > 0
+
+    def get_existing_filepaths(self) -> set:
+        """
+        Get the file paths of all records.
+
+        Returns:
+            Set of file paths stored in the database
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT filepath FROM media_metadata")
+            return {row[0] for row in cursor.fetchall()}
+
+    def update_metadata_fields(self, records: List[Dict[str, Any]], fields: List[str]) -> bool:
+        """
+        Insert or update selected fields of many records in one transaction.
+
+        Existing rows keep all other columns (analysis results, keywords);
+        new rows are created with only the given fields set.
+
+        Args:
+            records: Metadata dictionaries, each containing 'filepath'
+            fields: Columns to write (must be in METADATA_COLUMNS)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        fields = [field for field in fields if field in self.METADATA_COLUMNS and field != 'filepath']
+        if not records or not fields:
+            return True
+
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(f"""
+                    INSERT INTO media_metadata (filepath, {', '.join(fields)})
+                    VALUES (:filepath, {', '.join(f':{field}' for field in fields)})
+                    ON CONFLICT(filepath) DO UPDATE SET
+                        {', '.join(f'{field} = excluded.{field}' for field in fields)}
+                """, [
+                    {'filepath': record['filepath'], **{field: record.get(field) for field in fields}}
+                    for record in records
+                ])
+                return True
+        except Exception as e:
+            print(f"Error updating metadata fields: {e}")
+            return False
     
     def insert_metadata(self, metadata: Dict[str, Any]) -> bool:
         """
@@ -100,28 +617,40 @@ class MediaDatabase:
             True if successful, False otherwise
         """
         try:
+            # Derive structured sentiment parts when only the combined label is given
+            if metadata.get('sentiment') is None and metadata.get('emotion_sentiment'):
+                metadata = dict(metadata)
+                (metadata['sentiment'],
+                 metadata['sentiment_context'],
+                 metadata['day_period']) = self.split_emotion_sentiment(metadata['emotion_sentiment'])
+
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO media_metadata (
-                        filepath, filename, file_type, date_time_original,
-                        gps_latitude, gps_longitude, person_count,
-                        ocr_text_summary, object_keywords, emotion_sentiment,
-                        thumbnail_path
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    metadata.get('filepath'),
-                    metadata.get('filename'),
-                    metadata.get('file_type'),
-                    metadata.get('date_time_original'),
-                    metadata.get('gps_latitude'),
-                    metadata.get('gps_longitude'),
-                    metadata.get('person_count'),
-                    metadata.get('ocr_text_summary'),
-                    metadata.get('object_keywords'),
-                    metadata.get('emotion_sentiment'),
-                    metadata.get('thumbnail_path')
-                ))
+                placeholders = [f":{column}" for column in self.METADATA_COLUMNS]
+
+                # Derive the capture timestamp from the EXIF string if the caller didn't
+                timestamp_index = self.METADATA_COLUMNS.index('capture_timestamp')
+                placeholders[timestamp_index] = (
+                    f"COALESCE(:capture_timestamp, "
+                    f"{self.CAPTURE_TIMESTAMP_SQL.format(':date_time_original')})"
+                )
+
+                # Update an existing row in place: its id and the groupings derived from
+                # it (duplicate group, location cluster, event) stay valid unless the
+                # grouping triggers see its GPS position or capture time change
+                cursor.execute(f"""
+                    INSERT INTO media_metadata (
+                        {', '.join(self.METADATA_COLUMNS)}
+                    ) VALUES ({', '.join(placeholders)})
+                    ON CONFLICT(filepath) DO UPDATE SET
+                        {', '.join(f'{column} = excluded.{column}' for column in self.METADATA_COLUMNS[1:])}
+                    RETURNING id
+                """, {column: metadata.get(column) for column in self.METADATA_COLUMNS})
+                row_id = cursor.fetchone()[0]
+
+                # Replace the keyword index entries of the row
+                cursor.execute("DELETE FROM media_keywords WHERE media_id = ?", (row_id,))
+                self._insert_keywords(cursor, row_id, metadata.get('object_keywords'))
                 return True
         except Exception as e:
             print(f"Database insert error: {e}")
@@ -159,165 +688,1356 @@ class MediaDatabase:
             row = cursor.fetchone()
             return dict(row) if row else None
     
-    def get_record_count(self) -> int:
-        """Get the total number of records in the database."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM media_metadata")
-            return cursor.fetchone()[0]
-
-    def get_analytics_summary(self) -> Dict[str, Any]:
+    def find_by_content_hash(self, content_hash: str, exclude_filepath: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
-        Get analytics summary for the dashboard.
+        Find a fully analyzed record with the given content hash.
+
+        Original records are preferred over aliases.
+
+        Args:
+            content_hash: Content hash to look up
+            exclude_filepath: File path to ignore (the file being scanned)
 
         Returns:
-            Dictionary containing analytics data
+            Dictionary containing metadata or None if not found
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-
-            # Total counts
-            cursor.execute("SELECT COUNT(*) FROM media_metadata WHERE file_type LIKE 'image%'")
-            image_count = cursor.fetchone()[0]
-
-            cursor.execute("SELECT COUNT(*) FROM media_metadata WHERE file_type LIKE 'video%'")
-            video_count = cursor.fetchone()[0]
-
-            # Geographic distribution
             cursor.execute("""
-                SELECT COUNT(DISTINCT gps_latitude || ',' || gps_longitude)
-                FROM media_metadata
-                WHERE gps_latitude IS NOT NULL AND gps_longitude IS NOT NULL
-            """)
-            unique_locations = cursor.fetchone()[0]
+                SELECT * FROM media_metadata
+                WHERE content_hash = ? AND filepath != ? AND emotion_sentiment IS NOT NULL
+                ORDER BY duplicate_of IS NOT NULL, id
+                LIMIT 1
+            """, (content_hash, exclude_filepath or ''))
+            row = cursor.fetchone()
+            return dict(row) if row else None
 
-            # Average people per photo
-            cursor.execute("""
-                SELECT AVG(person_count)
-                FROM media_metadata
-                WHERE person_count IS NOT NULL AND person_count > 0
-            """)
-            avg_people = cursor.fetchone()[0] or 0
+    def get_aliases(self, filepath: str) -> List[str]:
+        """
+        Get the paths of files recorded as exact duplicates of a file.
 
-            # Emotion sentiment distribution
-            cursor.execute("""
-                SELECT emotion_sentiment, COUNT(*) as count
-                FROM media_metadata
-                WHERE emotion_sentiment IS NOT NULL
-                GROUP BY emotion_sentiment
-                ORDER BY count DESC
-            """)
-            emotion_distribution = dict(cursor.fetchall())
+        Args:
+            filepath: Full path to the original file
 
-            # Top OCR keywords
-            cursor.execute("""
-                SELECT object_keywords
-                FROM media_metadata
-                WHERE object_keywords IS NOT NULL AND object_keywords != ''
-            """)
-            all_keywords = []
-            for row in cursor.fetchall():
-                keywords = row[0].split(',')
-                all_keywords.extend([k.strip() for k in keywords if k.strip()])
+        Returns:
+            Sorted list of alias file paths
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT filepath FROM media_metadata WHERE duplicate_of = ? ORDER BY filepath",
+                (filepath,)
+            )
+            return [row[0] for row in cursor.fetchall()]
 
-            # Count keyword frequency
-            keyword_counts = {}
-            for keyword in all_keywords:
-                keyword_counts[keyword] = keyword_counts.get(keyword, 0) + 1
+    def iter_embeddings(self, batch_size: int = 10000) -> Iterator[List[Tuple[int, bytes]]]:
+        """
+        Stream the similarity embeddings of all records that have one.
 
-            # Get top 3 keywords
-            top_keywords = sorted(keyword_counts.items(), key=lambda x: x[1], reverse=True)[:3]
+        Args:
+            batch_size: Number of rows fetched per batch
 
-            return {
-                'total_files': image_count + video_count,
-                'image_count': image_count,
-                'video_count': video_count,
-                'unique_locations': unique_locations,
-                'avg_people_per_photo': round(avg_people, 2),
-                'emotion_distribution': emotion_distribution,
-                'top_keywords': [k[0] for k in top_keywords]
-            }
+        Yields:
+            Lists of (id, embedding blob) tuples
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, embedding FROM media_metadata WHERE embedding IS NOT NULL")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [tuple(row) for row in rows]
 
-    def get_filtered_metadata(self,
-                             emotion_filter: Optional[str] = None,
-                             person_count_min: Optional[int] = None,
-                             person_count_max: Optional[int] = None,
-                             keyword_search: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_metadata_by_ids(self, ids: List[int]) -> List[Dict[str, Any]]:
         """
-        Get filtered metadata records.
+        Retrieve records by id.
 
         Args:
-            emotion_filter: Filter by emotion sentiment
-            person_count_min: Minimum person count
-            person_count_max: Maximum person count
-            keyword_search: Search in object keywords
+            ids: Record ids
 
         Returns:
-            List of filtered metadata records
+            List of metadata records in the order of ids (missing ids are skipped)
         """
+        if not ids:
+            return []
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT * FROM media_metadata WHERE id IN ({', '.join('?' for _ in ids)})",
+                list(ids)
+            )
+            records = {row['id']: dict(row) for row in cursor.fetchall()}
+            return [records[record_id] for record_id in ids if record_id in records]
 
-            query = "SELECT * FROM media_metadata WHERE 1=1"
-            params = []
-
-            if emotion_filter and emotion_filter != "All":
-                # Use LIKE to match emotion sentiment (handles complex formats like "Positive/Vacation/Daytime")
-                query += " AND emotion_sentiment LIKE ?"
-                params.append(f"{emotion_filter}%")
-
-            if person_count_min is not None:
-                query += " AND person_count >= ?"
-                params.append(person_count_min)
-
-            if person_count_max is not None:
-                query += " AND person_count <= ?"
-                params.append(person_count_max)
+    def get_geotagged_batch(self, after_id: int, limit: int, missing_place_only: bool = False,
+                            unclustered_only: bool = False) -> List[Tuple[int, float, float]]:
+        """
+        Get a page of geotagged records in id order (keyset pagination).
 
-            if keyword_search:
-                query += " AND object_keywords LIKE ?"
-                params.append(f"%{keyword_search}%")
+        Args:
+            after_id: Only return records with a larger id
+            limit: Maximum number of records
+            missing_place_only: Only return records without a resolved place
+            unclustered_only: Only return records without a location cluster
 
-            query += " ORDER BY id DESC"
+        Returns:
+            List of (id, gps_latitude, gps_longitude) tuples
+        """
+        query = """
+            SELECT id, gps_latitude, gps_longitude FROM media_metadata
+            WHERE id > ? AND gps_latitude IS NOT NULL AND gps_longitude IS NOT NULL
+        """
+        if missing_place_only:
+            query += " AND place_name IS NULL"
+        if unclustered_only:
+            query += " AND location_cluster IS NULL"
+        query += " ORDER BY id LIMIT ?"
 
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, (after_id, limit))
+            return [tuple(row) for row in cursor.fetchall()]
 
-    def export_to_csv(self, filepath: str, records: Optional[List[Dict[str, Any]]] = None) -> bool:
+    def update_places(self, places: List[Tuple[Optional[str], Optional[str], Optional[str], int]]) -> bool:
         """
-        Export metadata to CSV file.
+        Store reverse-geocoded places.
 
         Args:
-            filepath: Path to save the CSV file
-            records: Optional list of records to export (if None, exports all)
+            places: (place_name, place_region, place_country, id) tuples
 
         Returns:
             True if successful, False otherwise
         """
-        import csv
-
         try:
-            if records is None:
-                records = self.get_all_metadata()
-
-            if not records:
-                return False
-
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = [
-                    'id', 'filepath', 'filename', 'file_type', 'date_time_original',
-                    'gps_latitude', 'gps_longitude', 'person_count',
-                    'ocr_text_summary', 'object_keywords', 'emotion_sentiment'
-                ]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-                writer.writeheader()
-                for record in records:
-                    writer.writerow(record)
-
-            return True
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany("""
+                    UPDATE media_metadata
+                    SET place_name = ?, place_region = ?, place_country = ?
+                    WHERE id = ?
+                """, places)
+                return True
         except Exception as e:
-            print(f"CSV export error: {e}")
+            print(f"Error storing places: {e}")
             return False
 
+    def get_column_batch(self, columns: List[str], after_id: int, limit: int,
+                         condition: Optional[str] = None) -> List[tuple]:
+        """
+        Get a page of stored column values in id order (keyset pagination).
+
+        Args:
+            columns: media_metadata columns to read (may be empty)
+            after_id: Only return records with a larger id
+            limit: Maximum number of records
+            condition: Additional SQL condition (trusted, without parameters)
+
+        Returns:
+            List of (id, *columns) tuples
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT {', '.join(['id'] + columns)} FROM media_metadata
+                WHERE id > ?{f' AND ({condition})' if condition else ''}
+                ORDER BY id LIMIT ?
+            """, (after_id, limit))
+            return [tuple(row) for row in cursor.fetchall()]
+
+    def update_derived_columns(self, step: str, last_id: int, columns: List[str], rows: List[tuple]) -> bool:
+        """
+        Store re-derived column values and the step checkpoint in one transaction.
+
+        Keyword index entries are rebuilt for records whose object_keywords change.
+
+        Args:
+            step: Derivation step name
+            last_id: Largest record id covered by this batch
+            columns: media_metadata columns to set
+            rows: (*values, id) tuples in the order of columns
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(f"""
+                    UPDATE media_metadata SET {', '.join(f'{column} = ?' for column in columns)}
+                    WHERE id = ?
+                """, rows)
+
+                if 'object_keywords' in columns:
+                    keyword_index = columns.index('object_keywords')
+                    cursor.executemany("DELETE FROM media_keywords WHERE media_id = ?",
+                                       ((row[-1],) for row in rows))
+                    for row in rows:
+                        self._insert_keywords(cursor, row[-1], row[keyword_index])
+
+                self._save_checkpoint(cursor, step, last_id, len(rows))
+                return True
+        except Exception as e:
+            print(f"Error storing derived {', '.join(columns)}: {e}")
+            return False
+
+    def derive_capture_timestamps(self, step: str, after_id: int, last_id: int) -> int:
+        """
+        Re-parse the capture timestamps of an id range from date_time_original in SQL.
+
+        Records whose EXIF string cannot be parsed keep their timestamp.
+
+        Args:
+            step: Derivation step name (for the checkpoint)
+            after_id: Range start (exclusive)
+            last_id: Range end (inclusive)
+
+        Returns:
+            Number of records whose timestamp changed, or -1 on error
+        """
+        parsed = self.CAPTURE_TIMESTAMP_SQL.format('date_time_original')
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    UPDATE media_metadata SET capture_timestamp = {parsed}
+                    WHERE id > ? AND id <= ?
+                      AND date_time_original IS NOT NULL AND date_time_original != ''
+                      AND {parsed} IS NOT NULL AND capture_timestamp IS NOT {parsed}
+                """, (after_id, last_id))
+                changed = cursor.rowcount
+                self._save_checkpoint(cursor, step, last_id, changed)
+                return changed
+        except Exception as e:
+            print(f"Error deriving capture timestamps: {e}")
+            return -1
+
+    @staticmethod
+    def _save_checkpoint(cursor: sqlite3.Cursor, step: str, last_id: int, changed: int):
+        """Advance the checkpoint of a derivation step."""
+        cursor.execute("""
+            INSERT INTO derivation_checkpoints (step, last_id, changed) VALUES (?, ?, ?)
+            ON CONFLICT(step) DO UPDATE SET last_id = excluded.last_id, changed = changed + excluded.changed
+        """, (step, last_id, changed))
+
+    def get_derivation_checkpoints(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the checkpoints of the current derivation run.
+
+        Returns:
+            Dictionary of step -> {'last_id', 'changed', 'completed'}
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT step, last_id, changed, completed FROM derivation_checkpoints")
+            return {row['step']: {'last_id': row['last_id'], 'changed': row['changed'],
+                                  'completed': row['completed']} for row in cursor.fetchall()}
+
+    def complete_derivation_step(self, step: str) -> bool:
+        """
+        Mark a derivation step as finished for the current run.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO derivation_checkpoints (step, completed) VALUES (?, 1)
+                    ON CONFLICT(step) DO UPDATE SET completed = 1
+                """, (step,))
+                return True
+        except Exception as e:
+            print(f"Error completing derivation step {step}: {e}")
+            return False
+
+    def clear_derivation_checkpoints(self) -> bool:
+        """
+        Forget the current derivation run (the next run starts from the beginning).
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM derivation_checkpoints")
+                return True
+        except Exception as e:
+            print(f"Error clearing derivation checkpoints: {e}")
+            return False
+
+    def get_location_cell_precision(self) -> Optional[int]:
+        """Get the geohash length of the stored location cells (None if there are none)."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT length(cell) FROM location_cells LIMIT 1")
+            row = cursor.fetchone()
+            return row[0] if row else None
+
+    def get_cell_clusters(self, cells: List[str]) -> Dict[str, int]:
+        """
+        Look up the location clusters of geohash cells.
+
+        Args:
+            cells: Geohash cells
+
+        Returns:
+            Dictionary mapping each stored cell to its cluster id
+        """
+        clusters = {}
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(cells), self.ID_CHUNK_SIZE):
+                chunk = cells[start:start + self.ID_CHUNK_SIZE]
+                cursor.execute(
+                    f"SELECT cell, cluster_id FROM location_cells WHERE cell IN ({', '.join('?' for _ in chunk)})",
+                    chunk
+                )
+                clusters.update(cursor.fetchall())
+        return clusters
+
+    def assign_location_clusters(self, groups: List[Dict[str, list]]) -> bool:
+        """
+        Store a batch of location clustering results in one transaction.
+
+        Each group's records and new cells join its smallest existing cluster
+        (or a new cluster); the other clusters it touches are merged into it.
+        Count, centroid and representative record of every affected cluster
+        are then recomputed.
+
+        Args:
+            groups: Groups as returned by location_clusters.cluster_cells
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                touched = []
+                for group in groups:
+                    if group['clusters']:
+                        target = group['clusters'][0]
+                    else:
+                        cursor.execute("INSERT INTO location_clusters (media_count) VALUES (0)")
+                        target = cursor.lastrowid
+
+                    for merged in group['clusters'][1:]:
+                        cursor.execute("UPDATE location_cells SET cluster_id = ? WHERE cluster_id = ?", (target, merged))
+                        cursor.execute("UPDATE media_metadata SET location_cluster = ? WHERE location_cluster = ?",
+                                       (target, merged))
+                        cursor.execute("DELETE FROM location_clusters WHERE id = ?", (merged,))
+
+                    cursor.executemany("INSERT INTO location_cells (cell, cluster_id) VALUES (?, ?)",
+                                       ((cell, target) for cell in group['cells']))
+                    cursor.executemany("UPDATE media_metadata SET location_cluster = ? WHERE id = ?",
+                                       ((target, record_id) for record_id in group['record_ids']))
+                    touched.append(target)
+
+                for start in range(0, len(touched), self.ID_CHUNK_SIZE):
+                    chunk = touched[start:start + self.ID_CHUNK_SIZE]
+                    cursor.execute(f"""
+                        UPDATE location_clusters
+                        SET (media_count, centroid_latitude, centroid_longitude, representative_id) = (
+                            SELECT COUNT(*), AVG(gps_latitude), AVG(gps_longitude), MIN(id)
+                            FROM media_metadata WHERE location_cluster = location_clusters.id
+                        )
+                        WHERE id IN ({', '.join('?' for _ in chunk)})
+                    """, chunk)
+                return True
+        except Exception as e:
+            print(f"Error storing location clusters: {e}")
+            return False
+
+    def reset_location_clusters(self) -> bool:
+        """
+        Remove all location clusters and cluster assignments.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM location_cells")
+                cursor.execute("DELETE FROM location_clusters")
+                cursor.execute("UPDATE media_metadata SET location_cluster = NULL WHERE location_cluster IS NOT NULL")
+                return True
+        except Exception as e:
+            print(f"Error resetting location clusters: {e}")
+            return False
+
+    def get_location_cluster_count(self) -> int:
+        """Get the number of location clusters."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM location_clusters")
+            return cursor.fetchone()[0]
+
+    def _area_condition(self, min_latitude: float, max_latitude: float,
+                        min_longitude: float, max_longitude: float) -> Tuple[str, List[Any]]:
+        """Build a WHERE condition on cluster centroids (longitudes may wrap the antimeridian)."""
+        condition = "centroid_latitude BETWEEN ? AND ? AND "
+        if min_longitude <= max_longitude:
+            condition += "centroid_longitude BETWEEN ? AND ?"
+        else:
+            condition += "(centroid_longitude >= ? OR centroid_longitude <= ?)"
+        return condition, [min_latitude, max_latitude, min_longitude, max_longitude]
+
+    def get_map_clusters(self, min_latitude: float, max_latitude: float,
+                         min_longitude: float, max_longitude: float,
+                         cell_degrees: float) -> List[Dict[str, Any]]:
+        """
+        Aggregate the location clusters of a map viewport into grid cells.
+
+        Only the cluster table is read (range scan on the centroid index), so
+        the cost depends on the number of places, not the number of files.
+
+        Args:
+            min_latitude: Southern edge of the viewport
+            max_latitude: Northern edge of the viewport
+            min_longitude: Western edge (greater than max_longitude across the antimeridian)
+            max_longitude: Eastern edge
+            cell_degrees: Grid cell size in degrees
+
+        Returns:
+            One dictionary per occupied cell with 'latitude' / 'longitude'
+            (count-weighted centroid), 'media_count', 'cluster_count',
+            'bounds' (min_lat, max_lat, min_lon, max_lon of the cell) and the
+            'representative_id' / 'filepath' of its largest cluster's
+            representative record, largest cells first
+        """
+        condition, params = self._area_condition(min_latitude, max_latitude, min_longitude, max_longitude)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # With MAX(), SQLite takes the bare representative_id from the largest cluster
+            cursor.execute(f"""
+                SELECT cells.*, m.filepath FROM (
+                    SELECT CAST((centroid_latitude + 90) / ? AS INTEGER) AS cell_row,
+                           CAST((centroid_longitude + 180) / ? AS INTEGER) AS cell_column,
+                           SUM(media_count) AS media_count,
+                           COUNT(*) AS cluster_count,
+                           SUM(centroid_latitude * media_count) / SUM(media_count) AS latitude,
+                           SUM(centroid_longitude * media_count) / SUM(media_count) AS longitude,
+                           representative_id,
+                           MAX(media_count) AS largest_cluster
+                    FROM location_clusters
+                    WHERE media_count > 0 AND {condition}
+                    GROUP BY cell_row, cell_column
+                ) AS cells
+                LEFT JOIN media_metadata m ON m.id = cells.representative_id
+                ORDER BY cells.media_count DESC
+            """, [cell_degrees, cell_degrees] + params)
+
+            cells = []
+            for row in cursor.fetchall():
+                cell = dict(row)
+                cell['bounds'] = (cell['cell_row'] * cell_degrees - 90,
+                                  (cell['cell_row'] + 1) * cell_degrees - 90,
+                                  cell['cell_column'] * cell_degrees - 180,
+                                  (cell['cell_column'] + 1) * cell_degrees - 180)
+                cells.append(cell)
+            return cells
+
+    def get_area_records(self, min_latitude: float, max_latitude: float,
+                         min_longitude: float, max_longitude: float,
+                         limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        Get the records of the location clusters whose centroid lies in an area.
+
+        Args:
+            min_latitude: Southern edge
+            max_latitude: Northern edge
+            min_longitude: Western edge (greater than max_longitude across the antimeridian)
+            max_longitude: Eastern edge
+            limit: Maximum number of records
+
+        Returns:
+            List of metadata records, newest capture first
+        """
+        condition, params = self._area_condition(min_latitude, max_latitude, min_longitude, max_longitude)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT * FROM media_metadata
+                WHERE location_cluster IN (SELECT id FROM location_clusters WHERE {condition})
+                ORDER BY capture_timestamp DESC, id DESC
+                LIMIT ?
+            """, params + [limit])
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_unassigned_event_media(self, limit: int) -> List[Tuple[int, int, Optional[float], Optional[float]]]:
+        """
+        Get the earliest dated records without an event.
+
+        Args:
+            limit: Maximum number of records
+
+        Returns:
+            List of (id, capture_timestamp, gps_latitude, gps_longitude) in capture time order
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, capture_timestamp, gps_latitude, gps_longitude FROM media_metadata
+                WHERE event_id IS NULL AND capture_timestamp IS NOT NULL
+                ORDER BY capture_timestamp, id
+                LIMIT ?
+            """, (limit,))
+            return [tuple(row) for row in cursor.fetchall()]
+
+    def get_events_in_range(self, date_from: int, date_to: int) -> List[Tuple[int, int, int]]:
+        """
+        Get the events overlapping a capture time range.
+
+        Args:
+            date_from: Range start (epoch seconds, inclusive)
+            date_to: Range end (epoch seconds, inclusive)
+
+        Returns:
+            List of (id, start_timestamp, end_timestamp) ordered by start
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, start_timestamp, end_timestamp FROM events
+                WHERE start_timestamp <= ? AND end_timestamp >= ?
+                ORDER BY start_timestamp
+            """, (date_to, date_from))
+            return [tuple(row) for row in cursor.fetchall()]
+
+    def get_event_media_rows(self, event_ids: List[int]) -> List[Tuple[int, int, Optional[float], Optional[float], int]]:
+        """
+        Get the segmentation inputs of the media of some events.
+
+        Args:
+            event_ids: Event ids
+
+        Returns:
+            List of (id, capture_timestamp, gps_latitude, gps_longitude, event_id)
+        """
+        rows = []
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(event_ids), self.ID_CHUNK_SIZE):
+                chunk = event_ids[start:start + self.ID_CHUNK_SIZE]
+                cursor.execute(f"""
+                    SELECT id, capture_timestamp, gps_latitude, gps_longitude, event_id FROM media_metadata
+                    WHERE event_id IN ({', '.join('?' for _ in chunk)}) AND capture_timestamp IS NOT NULL
+                """, chunk)
+                rows.extend(tuple(row) for row in cursor.fetchall())
+        return rows
+
+    def store_events(self, segments: List[Tuple[Optional[int], List[int]]], removed: List[int]) -> bool:
+        """
+        Store re-segmented events in one transaction and refresh their summaries.
+
+        Args:
+            segments: (event id or None for a new event, record ids) tuples
+            removed: Ids of events that no longer exist
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany("DELETE FROM events WHERE id = ?", ((event_id,) for event_id in removed))
+
+                touched = []
+                for event_id, record_ids in segments:
+                    if event_id is None:
+                        cursor.execute("INSERT INTO events (media_count) VALUES (0)")
+                        event_id = cursor.lastrowid
+                    cursor.executemany("UPDATE media_metadata SET event_id = ? WHERE id = ?",
+                                       ((event_id, record_id) for record_id in record_ids))
+                    touched.append(event_id)
+
+                for start in range(0, len(touched), self.ID_CHUNK_SIZE):
+                    chunk = touched[start:start + self.ID_CHUNK_SIZE]
+                    cursor.execute(f"""
+                        UPDATE events
+                        SET (start_timestamp, end_timestamp, media_count,
+                             centroid_latitude, centroid_longitude, representative_id) = (
+                                SELECT MIN(capture_timestamp), MAX(capture_timestamp), COUNT(*),
+                                       AVG(gps_latitude), AVG(gps_longitude), MIN(id)
+                                FROM media_metadata WHERE event_id = events.id
+                            ),
+                            place_name = (
+                                SELECT place_name FROM media_metadata
+                                WHERE event_id = events.id AND place_name IS NOT NULL
+                                GROUP BY place_name ORDER BY COUNT(*) DESC, place_name LIMIT 1
+                            )
+                        WHERE id IN ({', '.join('?' for _ in chunk)})
+                    """, chunk)
+                return True
+        except Exception as e:
+            print(f"Error storing events: {e}")
+            return False
+
+    def refresh_event_places(self) -> bool:
+        """
+        Recompute the place names of all events from the places of their media.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.get_connection() as conn:
+                conn.execute("""
+                    UPDATE events SET place_name = (
+                        SELECT place_name FROM media_metadata
+                        WHERE event_id = events.id AND place_name IS NOT NULL
+                        GROUP BY place_name ORDER BY COUNT(*) DESC, place_name LIMIT 1
+                    )
+                """)
+                return True
+        except Exception as e:
+            print(f"Error refreshing event places: {e}")
+            return False
+
+    def reset_events(self) -> bool:
+        """
+        Remove all events and event assignments.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM events")
+                cursor.execute("UPDATE media_metadata SET event_id = NULL WHERE event_id IS NOT NULL")
+                return True
+        except Exception as e:
+            print(f"Error resetting events: {e}")
+            return False
+
+    def get_events(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Get events for browsing, newest first.
+
+        Args:
+            limit: Maximum number of events
+            offset: Number of events to skip
+
+        Returns:
+            List of event summaries with the 'filepath' and 'thumbnail_path'
+            of their representative record
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT e.*, m.filepath, m.filename, m.thumbnail_path FROM events e
+                LEFT JOIN media_metadata m ON m.id = e.representative_id
+                WHERE e.media_count > 0
+                ORDER BY e.start_timestamp DESC
+                LIMIT ? OFFSET ?
+            """, (limit, offset))
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_event_records(self, event_id: int) -> List[Dict[str, Any]]:
+        """
+        Get the records of an event in capture time order.
+
+        Args:
+            event_id: Event id
+
+        Returns:
+            List of metadata records
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM media_metadata WHERE event_id = ?
+                ORDER BY capture_timestamp, id
+            """, (event_id,))
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_event_count(self) -> int:
+        """Get the number of events."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM events WHERE media_count > 0")
+            return cursor.fetchone()[0]
+
+    def get_perceptual_hashes(self) -> List[Tuple[int, int]]:
+        """
+        Get the perceptual hashes of all hashed records.
+
+        Returns:
+            List of (id, phash) tuples (phash in its stored, signed form)
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, phash FROM media_metadata WHERE phash IS NOT NULL")
+            return [tuple(row) for row in cursor.fetchall()]
+
+    def set_duplicate_groups(self, clusters: List[List[int]]) -> bool:
+        """
+        Replace all near-duplicate group assignments.
+
+        Args:
+            clusters: Lists of record ids; each record gets the smallest id of
+                its cluster as duplicate_group, all other records are reset to NULL
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("UPDATE media_metadata SET duplicate_group = NULL WHERE duplicate_group IS NOT NULL")
+                cursor.executemany(
+                    "UPDATE media_metadata SET duplicate_group = ? WHERE id = ?",
+                    ((min(cluster), record_id) for cluster in clusters for record_id in cluster)
+                )
+                return True
+        except Exception as e:
+            print(f"Error storing duplicate groups: {e}")
+            return False
+
+    def get_duplicate_group(self, group_id: int) -> List[Dict[str, Any]]:
+        """
+        Get the records of a near-duplicate group.
+
+        Args:
+            group_id: duplicate_group value (the smallest record id of the group)
+
+        Returns:
+            List of metadata records ordered by id
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM media_metadata WHERE duplicate_group = ? ORDER BY id",
+                (group_id,)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_record_count(self, condition: Optional[str] = None, last_id: Optional[int] = None) -> int:
+        """
+        Get the number of records in the database.
+
+        Args:
+            condition: SQL condition the records must match (trusted, without parameters)
+            last_id: Only count records up to this id
+
+        Returns:
+            Number of matching records
+        """
+        conditions = [f'({condition})'] if condition else []
+        if last_id is not None:
+            conditions.append('id <= ?')
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT COUNT(*) FROM media_metadata" +
+                (f" WHERE {' AND '.join(conditions)}" if conditions else ''),
+                () if last_id is None else (last_id,)
+            )
+            return cursor.fetchone()[0]
+
+    def get_analytics_summary(self) -> Dict[str, Any]:
+        """
+        Get analytics summary for the dashboard.
+
+        Returns:
+            Dictionary containing analytics data
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            # Total counts
+            cursor.execute("SELECT COUNT(*) FROM media_metadata WHERE file_type LIKE 'image%'")
+            image_count = cursor.fetchone()[0]
+
+            cursor.execute("SELECT COUNT(*) FROM media_metadata WHERE file_type LIKE 'video%'")
+            video_count = cursor.fetchone()[0]
+
+            # Geographic distribution (from the location clusters)
+            cursor.execute("SELECT COUNT(*), COALESCE(SUM(media_count), 0) FROM location_clusters")
+            unique_locations, geotagged_count = cursor.fetchone()
+
+            # Most photographed places (reverse-geocoded)
+            cursor.execute("""
+                SELECT place_name, place_country, COUNT(*) as count
+                FROM media_metadata
+                WHERE place_name IS NOT NULL
+                GROUP BY place_name, place_region, place_country
+                ORDER BY count DESC, place_name
+                LIMIT 3
+            """)
+            top_places = [(f"{name}, {country}", count) for name, country, count in cursor.fetchall()]
+
+            cursor.execute("SELECT COUNT(DISTINCT place_country) FROM media_metadata WHERE place_country IS NOT NULL")
+            country_count = cursor.fetchone()[0]
+
+            # Average people per photo
+            cursor.execute("""
+                SELECT AVG(person_count)
+                FROM media_metadata
+                WHERE person_count IS NOT NULL AND person_count > 0
+            """)
+            avg_people = cursor.fetchone()[0] or 0
+
+            # Emotion sentiment distribution
+            cursor.execute("""
+                SELECT sentiment, COUNT(*) as count
+                FROM media_metadata
+                WHERE sentiment IS NOT NULL
+                GROUP BY sentiment
+                ORDER BY count DESC
+            """)
+            emotion_distribution = dict(cursor.fetchall())
+
+            # Top 3 OCR keywords (from the keyword index)
+            cursor.execute("""
+                SELECT keyword, COUNT(*) as count
+                FROM media_keywords
+                GROUP BY keyword
+                ORDER BY count DESC, keyword
+                LIMIT 3
+            """)
+            top_keywords = cursor.fetchall()
+
+            return {
+                'total_files': image_count + video_count,
+                'image_count': image_count,
+                'video_count': video_count,
+                'unique_locations': unique_locations,
+                'geotagged_count': geotagged_count,
+                'top_places': top_places,
+                'country_count': country_count,
+                'avg_people_per_photo': round(avg_people, 2),
+                'emotion_distribution': emotion_distribution,
+                'top_keywords': [k[0] for k in top_keywords]
+            }
+
+    def get_filtered_metadata(self,
+                             emotion_filter: Optional[str] = None,
+                             person_count_min: Optional[int] = None,
+                             person_count_max: Optional[int] = None,
+                             keyword_search: Optional[str] = None,
+                             date_from: Optional[int] = None,
+                             date_to: Optional[int] = None,
+                             context_filter: Optional[str] = None,
+                             day_period_filter: Optional[str] = None,
+                             record_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Get filtered metadata records.
+
+        Args:
+            emotion_filter: Filter by sentiment (Positive, Neutral, Negative)
+            person_count_min: Minimum person count
+            person_count_max: Maximum person count
+            keyword_search: Keyword the records are tagged with (exact match, via the keyword index)
+            date_from: Earliest capture timestamp (epoch seconds, inclusive)
+            date_to: Latest capture timestamp (epoch seconds, exclusive)
+            context_filter: Filter by sentiment context keyword (e.g. "Vacation")
+            day_period_filter: Filter by day period ("Daytime" or "Nighttime")
+            record_ids: Only these records (e.g. the results of a similarity search)
+
+        Returns:
+            List of filtered metadata records
+        """
+        conditions = self._build_filter_conditions(
+            emotion_filter=emotion_filter,
+            person_count_min=person_count_min,
+            person_count_max=person_count_max,
+            keyword_search=keyword_search,
+            date_from=date_from,
+            date_to=date_to,
+            context_filter=context_filter,
+            day_period_filter=day_period_filter,
+            record_ids=record_ids
+        )
+        where_sql, params = self._join_conditions(conditions)
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT * FROM media_metadata WHERE {where_sql} ORDER BY id DESC", params)
+            rows = cursor.fetchall()
+            return [dict(row) for row in rows]
+
+    def _build_filter_conditions(self,
+                                 emotion_filter: Optional[str] = None,
+                                 person_count_min: Optional[int] = None,
+                                 person_count_max: Optional[int] = None,
+                                 keyword_search: Optional[str] = None,
+                                 date_from: Optional[int] = None,
+                                 date_to: Optional[int] = None,
+                                 context_filter: Optional[str] = None,
+                                 day_period_filter: Optional[str] = None,
+                                 record_ids: Optional[List[int]] = None) -> List[Tuple[str, str, List[Any]]]:
+        """
+        Build SQL conditions for the filter arguments of get_filtered_metadata.
+
+        Returns:
+            List of (dimension, sql_condition, params) tuples
+        """
+        conditions = []
+
+        if emotion_filter and emotion_filter != "All":
+            conditions.append(('sentiment', "sentiment = ?", [emotion_filter]))
+
+        if context_filter:
+            conditions.append(('context', "sentiment_context = ?", [context_filter]))
+
+        if day_period_filter:
+            conditions.append(('day_period', "day_period = ?", [day_period_filter]))
+
+        if person_count_min is not None:
+            conditions.append(('person_count', "person_count >= ?", [person_count_min]))
+
+        if person_count_max is not None:
+            conditions.append(('person_count', "person_count <= ?", [person_count_max]))
+
+        if keyword_search:
+            conditions.append(('keyword', "id IN (SELECT media_id FROM media_keywords WHERE keyword = ?)",
+                               [keyword_search]))
+
+        if date_from is not None:
+            conditions.append(('date', "capture_timestamp >= ?", [date_from]))
+
+        if date_to is not None:
+            conditions.append(('date', "capture_timestamp < ?", [date_to]))
+
+        if record_ids is not None:
+            # One JSON parameter, so any number of ids fits in the statement
+            conditions.append(('id', "id IN (SELECT value FROM json_each(?))", [json.dumps(record_ids)]))
+
+        return conditions
+
+    def _join_conditions(self, conditions: List[Tuple[str, str, List[Any]]]) -> Tuple[str, List[Any]]:
+        """Combine filter conditions into a single SQL expression and parameter list."""
+        if not conditions:
+            return "1=1", []
+        sql = " AND ".join(f"({condition})" for _, condition, _ in conditions)
+        params = [param for _, _, condition_params in conditions for param in condition_params]
+        return sql, params
+
+    def get_facet_counts(self, top_keyword_limit: int = 10, **filters) -> Dict[str, Any]:
+        """
+        Count how many records each filter choice would produce.
+
+        Sentiment and person-count facets ignore their own filter (so every choice
+        shows a count); all other filters apply. The sentiment, person-count and
+        file-type facets are computed in a single grouped scan.
+
+        Args:
+            top_keyword_limit: Number of top keywords to return
+            **filters: Same keyword arguments as get_filtered_metadata
+
+        Returns:
+            Dictionary with 'sentiment', 'person_count', 'file_type' and
+            'keywords' mappings of choice -> count, plus 'total'
+        """
+        conditions = self._build_filter_conditions(**filters)
+
+        # Facet dimensions are evaluated per group so each facet can ignore its own filter
+        shared = [c for c in conditions if c[0] not in ('sentiment', 'person_count')]
+        sentiment_sql, sentiment_params = self._join_conditions(
+            [c for c in conditions if c[0] == 'sentiment'])
+        person_sql, person_params = self._join_conditions(
+            [c for c in conditions if c[0] == 'person_count'])
+        where_sql, where_params = self._join_conditions(shared)
+
+        bucket_cases = []
+        for label, _, maximum in self.PERSON_COUNT_BUCKETS:
+            if maximum is None:
+                continue
+            bucket_cases.append(f"WHEN COALESCE(person_count, 0) <= {maximum} THEN '{label}'")
+        bucket_sql = f"CASE {' '.join(bucket_cases)} ELSE '{self.PERSON_COUNT_BUCKETS[-1][0]}' END"
+
+        facets = {
+            'sentiment': {},
+            'person_count': {label: 0 for label, _, _ in self.PERSON_COUNT_BUCKETS},
+            'file_type': {},
+            'keywords': {},
+            'total': 0
+        }
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(f"""
+                SELECT sentiment, {bucket_sql} AS person_bucket, file_type,
+                       ({sentiment_sql}) AS sentiment_ok, ({person_sql}) AS person_ok,
+                       COUNT(*)
+                FROM media_metadata
+                WHERE {where_sql}
+                GROUP BY 1, 2, 3, 4, 5
+            """, sentiment_params + person_params + where_params)
+
+            for sentiment, person_bucket, file_type, sentiment_ok, person_ok, count in cursor.fetchall():
+                if person_ok and sentiment:
+                    facets['sentiment'][sentiment] = facets['sentiment'].get(sentiment, 0) + count
+                if sentiment_ok:
+                    facets['person_count'][person_bucket] += count
+                if sentiment_ok and person_ok:
+                    facets['file_type'][file_type] = facets['file_type'].get(file_type, 0) + count
+                    facets['total'] += count
+
+            # Top keywords within the full filter set (via the keyword index)
+            if conditions:
+                all_sql, all_params = self._join_conditions(conditions)
+                cursor.execute(f"""
+                    SELECT keyword, COUNT(*) AS count
+                    FROM media_keywords
+                    WHERE media_id IN (SELECT id FROM media_metadata WHERE {all_sql})
+                    GROUP BY keyword
+                    ORDER BY count DESC, keyword
+                    LIMIT ?
+                """, all_params + [top_keyword_limit])
+            else:
+                cursor.execute("""
+                    SELECT keyword, COUNT(*) AS count
+                    FROM media_keywords
+                    GROUP BY keyword
+                    ORDER BY count DESC, keyword
+                    LIMIT ?
+                """, (top_keyword_limit,))
+            facets['keywords'] = dict(cursor.fetchall())
+
+        return facets
+
+    def get_capture_date_range(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Get the earliest and latest capture timestamps in the library.
+
+        Returns:
+            Tuple of (min_timestamp, max_timestamp) in epoch seconds, or (None, None)
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT MIN(capture_timestamp), MAX(capture_timestamp)
+                FROM media_metadata
+            """)
+            row = cursor.fetchone()
+            return row[0], row[1]
+
+    def get_capture_histogram(self,
+                              granularity: str = 'month',
+                              date_from: Optional[int] = None,
+                              date_to: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Count media per capture year, month or day.
+
+        Whole-day ranges are answered from the per-day bucket table (one row per
+        day with photos, however many files there are); other ranges scan the
+        capture timestamp index.
+
+        Args:
+            granularity: Bucket size ('year', 'month' or 'day')
+            date_from: Earliest capture timestamp (epoch seconds, inclusive)
+            date_to: Latest capture timestamp (epoch seconds, exclusive)
+
+        Returns:
+            List of (bucket_label, count) tuples ordered by bucket
+        """
+        if granularity not in self.HISTOGRAM_FORMATS:
+            raise ValueError(f"Unsupported histogram granularity: {granularity}")
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            if all(value is None or value % self.SECONDS_PER_DAY == 0 for value in (date_from, date_to)):
+                # Day labels are prefixes of their month and year labels
+                query = f"""
+                    SELECT substr(day, 1, {len(self.bucket_label(0, granularity))}) AS bucket,
+                           SUM(media_count)
+                    FROM capture_day_counts
+                    WHERE 1 = 1
+                """
+                params = []
+                if date_from is not None:
+                    query += " AND day >= ?"
+                    params.append(self.bucket_label(date_from, 'day'))
+                if date_to is not None:
+                    query += " AND day < ?"
+                    params.append(self.bucket_label(date_to, 'day'))
+                query += " GROUP BY bucket ORDER BY bucket"
+
+                cursor.execute(query, params)
+                return [(row[0], row[1]) for row in cursor.fetchall()]
+
+            query = f"""
+                SELECT strftime('{self.HISTOGRAM_FORMATS[granularity]}', capture_timestamp, 'unixepoch') AS bucket,
+                       COUNT(*)
+                FROM media_metadata
+                WHERE capture_timestamp IS NOT NULL
+            """
+            params = []
+
+            if date_from is not None:
+                query += " AND capture_timestamp >= ?"
+                params.append(date_from)
+
+            if date_to is not None:
+                query += " AND capture_timestamp < ?"
+                params.append(date_to)
+
+            query += " GROUP BY bucket ORDER BY bucket"
+
+            cursor.execute(query, params)
+            return [(row[0], row[1]) for row in cursor.fetchall()]
+
+    @classmethod
+    def bucket_label(cls, timestamp: int, granularity: str) -> str:
+        """
+        Get the histogram bucket label of a capture timestamp.
+
+        Args:
+            timestamp: Capture timestamp (epoch seconds)
+            granularity: Bucket size ('year', 'month' or 'day')
+
+        Returns:
+            Label as returned by get_capture_histogram (e.g. '2023-06')
+        """
+        return (cls.EPOCH + timedelta(seconds=timestamp)).strftime(cls.HISTOGRAM_FORMATS[granularity])
+
+    @staticmethod
+    def bucket_range(label: str) -> Tuple[int, int]:
+        """
+        Get the capture timestamp range of a histogram bucket.
+
+        Args:
+            label: Bucket label ('YYYY', 'YYYY-MM' or 'YYYY-MM-DD')
+
+        Returns:
+            Tuple of (start, end) epoch seconds, end exclusive
+        """
+        parts = [int(part) for part in label.split('-')]
+        year, month, day = (parts + [1, 1])[:3]
+        start = calendar.timegm((year, month, day, 0, 0, 0))
+        if len(parts) == 1:
+            end = calendar.timegm((year + 1, 1, 1, 0, 0, 0))
+        elif len(parts) == 2:
+            end = calendar.timegm((year + month // 12, month % 12 + 1, 1, 0, 0, 0))
+        else:
+            end = start + MediaDatabase.SECONDS_PER_DAY
+        return start, end
+
+    def count_filtered_metadata(self, **filters) -> int:
+        """
+        Count records matching the filters.
+
+        Args:
+            **filters: Same keyword arguments as get_filtered_metadata
+
+        Returns:
+            Number of matching records
+        """
+        where_sql, params = self._join_conditions(self._build_filter_conditions(**filters))
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM media_metadata WHERE {where_sql}", params)
+            return cursor.fetchone()[0]
+
+    def iter_metadata(self,
+                      columns: Optional[List[str]] = None,
+                      batch_size: int = 1000,
+                      **filters) -> Iterator[List[tuple]]:
+        """
+        Stream matching records in batches without loading the whole result set.
+
+        Args:
+            columns: Columns to select (defaults to EXPORT_COLUMNS)
+            batch_size: Number of rows fetched per batch
+            **filters: Same keyword arguments as get_filtered_metadata
+
+        Yields:
+            Lists of row tuples (column order as requested)
+        """
+        columns = columns or self.EXPORT_COLUMNS
+        where_sql, params = self._join_conditions(self._build_filter_conditions(**filters))
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT {', '.join(columns)}
+                FROM media_metadata
+                WHERE {where_sql}
+                ORDER BY id DESC
+            """, params)
+
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [tuple(row) for row in rows]
+
+    def export_to_csv(self,
+                      filepath: str,
+                      records: Optional[List[Dict[str, Any]]] = None,
+                      progress_callback: Optional[Callable[[int, int], None]] = None,
+                      batch_size: int = 1000,
+                      **filters) -> bool:
+        """
+        Export metadata to CSV file.
+
+        Rows are streamed from the database in batches, so memory use stays
+        constant regardless of library size.
+
+        Args:
+            filepath: Path to save the CSV file
+            records: Optional list of records to export (if None, streams from the database)
+            progress_callback: Optional callback function(written, total)
+            batch_size: Number of rows fetched and written per batch
+            **filters: Same keyword arguments as get_filtered_metadata
+
+        Returns:
+            True if successful, False otherwise
+        """
+        import csv
+
+        try:
+            if records is not None:
+                if not records:
+                    return False
+
+                with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
+                    writer = csv.DictWriter(csvfile, fieldnames=self.EXPORT_COLUMNS, extrasaction='ignore')
+                    writer.writeheader()
+                    writer.writerows(records)
+
+                if progress_callback:
+                    progress_callback(len(records), len(records))
+                return True
+
+            total = self.count_filtered_metadata(**filters)
+            if total == 0:
+                return False
+
+            written = 0
+            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(self.EXPORT_COLUMNS)
+
+                for batch in self.iter_metadata(batch_size=batch_size, **filters):
+                    writer.writerows(batch)
+                    written += len(batch)
+                    if progress_callback:
+                        progress_callback(written, total)
+
+            return True
+        except Exception as e:
+            print(f"CSV export error: {e}")
+            return False
+
+    def export_to_columnar(self,
+                           filepath: str,
+                           file_format: str = 'parquet',
+                           partition_by: Optional[str] = None,
+                           row_group_size: int = 65536,
+                           progress_callback: Optional[Callable[[int, int], None]] = None,
+                           **filters) -> bool:
+        """
+        Export metadata to typed Parquet or Arrow IPC files.
+
+        Rows are streamed from the database and written one row group per batch,
+        keeping numbers and timestamps typed for downstream analytics.
+        Requires the optional pyarrow package.
+
+        Args:
+            filepath: Output file, or output directory when partitioning
+            file_format: 'parquet' or 'arrow' (Arrow IPC file format)
+            partition_by: Optional partition key ('file_type' or 'capture_year');
+                writes hive-style subdirectories such as file_type=Image/part-0.parquet
+            row_group_size: Number of rows per row group / record batch
+            progress_callback: Optional callback function(written, total)
+            **filters: Same keyword arguments as get_filtered_metadata
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("Columnar export requires pyarrow (pip install pyarrow)")
+            return False
+
+        if file_format not in ('parquet', 'arrow'):
+            raise ValueError(f"Unsupported columnar format: {file_format}")
+        if partition_by is not None and partition_by not in self.PARTITION_KEYS:
+            raise ValueError(f"Unsupported partition key: {partition_by}")
+
+        arrow_types = {
+            'int64': pa.int64(),
+            'int32': pa.int32(),
+            'float64': pa.float64(),
+            'timestamp': pa.timestamp('s')
+        }
+        schema = pa.schema([
+            (column, arrow_types.get(self.COLUMNAR_TYPES.get(column), pa.string()))
+            for column in self.EXPORT_COLUMNS
+        ])
+
+        writers = {}
+
+        def get_writer(partition_value: Optional[str]):
+            if partition_value not in writers:
+                if partition_by is None:
+                    path = filepath
+                else:
+                    directory = os.path.join(filepath, f"{partition_by}={partition_value}")
+                    os.makedirs(directory, exist_ok=True)
+                    path = os.path.join(directory, f"part-0.{file_format}")
+
+                if file_format == 'parquet':
+                    writers[partition_value] = pq.ParquetWriter(path, schema, compression='zstd')
+                else:
+                    writers[partition_value] = pa.ipc.new_file(path, schema)
+            return writers[partition_value]
+
+        timestamp_index = self.EXPORT_COLUMNS.index('capture_timestamp')
+        file_type_index = self.EXPORT_COLUMNS.index('file_type')
+
+        def partition_value_of(row: tuple) -> Optional[str]:
+            if partition_by == 'file_type':
+                return row[file_type_index] or 'unknown'
+            if partition_by == 'capture_year':
+                timestamp = row[timestamp_index]
+                return self.bucket_label(timestamp, 'year') if timestamp is not None else 'unknown'
+            return None
+
+        try:
+            total = self.count_filtered_metadata(**filters)
+            if total == 0:
+                return False
+
+            written = 0
+            for batch in self.iter_metadata(batch_size=row_group_size, **filters):
+                # Split the batch by partition, keeping row order within each partition
+                partitions = {}
+                for row in batch:
+                    partitions.setdefault(partition_value_of(row), []).append(row)
+
+                for partition_value, rows in partitions.items():
+                    columns = list(zip(*rows))
+                    record_batch = pa.RecordBatch.from_arrays(
+                        [pa.array(columns[i], type=field.type) for i, field in enumerate(schema)],
+                        schema=schema
+                    )
+                    writer = get_writer(partition_value)
+                    if file_format == 'parquet':
+                        writer.write_batch(record_batch, row_group_size=row_group_size)
+                    else:
+                        writer.write_batch(record_batch)
+
+                written += len(batch)
+                if progress_callback:
+                    progress_callback(written, total)
+
+            return True
+        except Exception as e:
+            print(f"Columnar export error: {e}")
+            return False
+        finally:
+            for writer in writers.values():
+                writer.close()
@@ -0,0 +1,243 @@
+"""
+MediaVault Scanner - Derivation Module
+Recomputes derived columns from stored raw fields after the rules change, without
+re-extracting files (no OCR, face or scene detection):
+
+    dates      capture_timestamp from date_time_original (bulk SQL)
+    places     place columns from the GPS position (offline reverse geocoding)
+    sentiment  sentiment columns from the file path and capture time (keyword dictionary)
+    keywords   object_keywords without the current stop words (the full OCR text is
+               not stored, so new OCR keywords still need a rescan)
+
+Records are processed in id order in batches; each batch is written together
+with a checkpoint, so an interrupted run continues where it stopped. Only
+records whose values change are written. Files whose capture time changed
+leave their events (database triggers) and are grouped again incrementally.
+
+Usage:
+    python derivation.py [database] [--steps dates,sentiment,...] [--restart]
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from database import MediaDatabase
+from events import update_events
+from keyword_rules import KeywordDictionary, day_period
+from reverse_geocoder import ReverseGeocoder
+
+
+class DerivationEngine:
+    """Runs the derivation steps over the whole library with checkpoints."""
+
+    STEPS = ('dates', 'places', 'sentiment', 'keywords')
+
+    # Steps whose condition selects the records they read (None: all records)
+    STEP_CONDITIONS = {
+        'dates': None,
+        'places': "gps_latitude IS NOT NULL AND gps_longitude IS NOT NULL",
+        'sentiment': "emotion_sentiment IS NOT NULL",
+        'keywords': "object_keywords IS NOT NULL AND object_keywords != ''",
+    }
+
+    SENTIMENT_COLUMNS = ['emotion_sentiment', 'sentiment', 'sentiment_context', 'day_period']
+    PLACE_COLUMNS = ['place_name', 'place_region', 'place_country']
+
+    def __init__(self, db: MediaDatabase, extractor_config: dict = None, batch_size: int = 20000):
+        """
+        Initialize the engine.
+
+        Args:
+            db: MediaDatabase instance
+            extractor_config: Extraction options (keyword dictionary, gazetteer and
+                event settings, as from Config.get_extractor_config())
+            batch_size: Records read and written per transaction
+        """
+        self.db = db
+        self.config = extractor_config or {}
+        self.batch_size = batch_size
+        self.keyword_dictionary = KeywordDictionary(self.config.get('keyword_dictionary_path'))
+        self.geocoder = ReverseGeocoder(
+            self.config.get('gazetteer_path'),
+            max_distance_km=self.config.get('geocode_max_distance_km', 250)
+        )
+
+    def run(self, steps: Sequence[str] = STEPS, restart: bool = False,
+            progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Dict[str, int]:
+        """
+        Run derivation steps, resuming an interrupted run unless restart is set.
+
+        Afterwards, files whose capture time changed are grouped into events
+        again, and the event place names are refreshed if places changed.
+
+        Args:
+            steps: Step names (run in STEPS order)
+            restart: Discard the checkpoints of a previous run
+            progress_callback: Called with (processed, total, step) after each batch;
+                both count the records the step reads, including those before the checkpoint
+
+        Returns:
+            Dictionary of step -> number of records changed (in this run, including
+            the interrupted part), or an empty dictionary if a step failed
+        """
+        unknown = set(steps) - set(self.STEPS)
+        if unknown:
+            print(f"Unknown derivation steps: {', '.join(sorted(unknown))}")
+            return {}
+        if restart and not self.db.clear_derivation_checkpoints():
+            return {}
+
+        runners = {'dates': self._derive_dates, 'places': self._derive_places,
+                   'sentiment': self._derive_sentiment, 'keywords': self._derive_keywords}
+        for step in (step for step in self.STEPS if step in steps):
+            checkpoint = self.db.get_derivation_checkpoints().get(step, {})
+            if checkpoint.get('completed'):
+                continue
+            if not runners[step](step, checkpoint.get('last_id', 0), progress_callback):
+                return {}
+            self.db.complete_derivation_step(step)
+
+        checkpoints = self.db.get_derivation_checkpoints()
+        changed = {step: checkpoints.get(step, {}).get('changed', 0) for step in self.STEPS if step in steps}
+        if changed.get('dates') and update_events(self.db, self.config.get('event_max_gap_minutes', 120),
+                                                  self.config.get('event_max_jump_km', 30)) < 0:
+            return {}
+        if changed.get('places') and not self.db.refresh_event_places():
+            return {}
+
+        self.db.clear_derivation_checkpoints()
+        return changed
+
+    def _progress_counts(self, step: str, after_id: int) -> Tuple[int, int]:
+        """Get the (processed, total) record counts of a step resumed after after_id."""
+        condition = self.STEP_CONDITIONS[step]
+        processed = self.db.get_record_count(condition, after_id) if after_id else 0
+        return processed, self.db.get_record_count(condition)
+
+    def _derive_dates(self, step: str, after_id: int, progress_callback) -> bool:
+        """Re-parse capture timestamps in SQL, one id range per batch."""
+        processed, total = self._progress_counts(step, after_id) if progress_callback else (0, 0)
+        while True:
+            ids = self.db.get_column_batch([], after_id, self.batch_size)
+            if not ids:
+                return True
+            if self.db.derive_capture_timestamps(step, after_id, ids[-1][0]) < 0:
+                return False
+            after_id = ids[-1][0]
+            processed += len(ids)
+            if progress_callback:
+                progress_callback(processed, total, step)
+
+    def _derive_places(self, step: str, after_id: int, progress_callback) -> bool:
+        """Re-resolve the places of geotagged records."""
+        if not self.geocoder.load():
+            return False
+
+        def derive(rows):
+            places = self.geocoder.resolve([row[1] for row in rows], [row[2] for row in rows])
+            return [
+                (*place, row[0]) for row, place in
+                zip(rows, (tuple(place or (None, None, None)) for place in places))
+                if place != tuple(row[3:6])
+            ]
+
+        return self._run_batches(step, after_id, progress_callback,
+                                 ['gps_latitude', 'gps_longitude'] + self.PLACE_COLUMNS, self.PLACE_COLUMNS, derive)
+
+    def _derive_sentiment(self, step: str, after_id: int, progress_callback) -> bool:
+        """
+        Re-classify sentiment from file paths (one matcher pass per batch) and capture times.
+
+        Records of the EXIF-only scan mode are skipped: a sentiment label marks a
+        record as analyzed, and they still need the full analysis.
+        """
+        def derive(rows):
+            classified = self.keyword_dictionary.classify_sentiment_batch([row[1] for row in rows])
+            updates = []
+            for row, (sentiment, context) in zip(rows, classified):
+                period = day_period(row[2])
+                label = '/'.join(part for part in (sentiment, context, period) if part)
+                values = (label, sentiment, context, period)
+                if values != tuple(row[3:7]):
+                    updates.append((*values, row[0]))
+            return updates
+
+        return self._run_batches(step, after_id, progress_callback,
+                                 ['filepath', 'capture_timestamp'] + self.SENTIMENT_COLUMNS,
+                                 self.SENTIMENT_COLUMNS, derive)
+
+    def _derive_keywords(self, step: str, after_id: int, progress_callback) -> bool:
+        """Remove the current stop words from the stored keywords."""
+        stopwords = self.keyword_dictionary.stopwords
+
+        def derive(rows):
+            updates = []
+            for record_id, object_keywords in rows:
+                stored = MediaDatabase.split_keywords(object_keywords)
+                keywords = [keyword for keyword in stored if keyword.lower() not in stopwords]
+                if len(keywords) != len(stored):
+                    updates.append((', '.join(keywords), record_id))
+            return updates
+
+        return self._run_batches(step, after_id, progress_callback,
+                                 ['object_keywords'], ['object_keywords'], derive)
+
+    def _run_batches(self, step: str, after_id: int, progress_callback,
+                     read_columns: List[str], write_columns: List[str],
+                     derive: Callable[[List[tuple]], List[tuple]]) -> bool:
+        """
+        Read, derive and write one step in id-ordered batches.
+
+        Args:
+            step: Step name (for the checkpoint and its STEP_CONDITIONS entry)
+            after_id: Checkpoint to resume from
+            progress_callback: Progress callback (optional)
+            read_columns: Columns passed to derive (after the id)
+            write_columns: Columns set from the derived rows
+            derive: Maps read rows to (*write_columns values, id) tuples of changed records
+
+        Returns:
+            True if successful, False otherwise
+        """
+        condition = self.STEP_CONDITIONS[step]
+        processed, total = self._progress_counts(step, after_id) if progress_callback else (0, 0)
+        while True:
+            rows = self.db.get_column_batch(read_columns, after_id, self.batch_size, condition)
+            if not rows:
+                return True
+            after_id = rows[-1][0]
+            if not self.db.update_derived_columns(step, after_id, write_columns, derive(rows)):
+                return False
+            processed += len(rows)
+            if progress_callback:
+                progress_callback(processed, total, step)
+
+
+def main():
+    from config import Config
+
+    Config.load_config()
+    parser = argparse.ArgumentParser(description="Recompute derived columns from stored fields (no rescan)")
+    parser.add_argument('database', nargs='?', default=Config.DEFAULT_DB_PATH, help="Path to metadata.db")
+    parser.add_argument('--steps', default=','.join(DerivationEngine.STEPS),
+                        help=f"Comma-separated steps ({', '.join(DerivationEngine.STEPS)})")
+    parser.add_argument('--batch-size', type=int, default=20000, help="Records per transaction")
+    parser.add_argument('--restart', action='store_true', help="Ignore the checkpoints of an interrupted run")
+    args = parser.parse_args()
+
+    engine = DerivationEngine(MediaDatabase(args.database), Config.get_extractor_config(), args.batch_size)
+    start = time.time()
+
+    def report(processed, total, step):
+        print(f"\r{step}: {processed}/{total} records ({time.time() - start:.0f} s)", end='', flush=True)
+
+    changed = engine.run([step.strip() for step in args.steps.split(',') if step.strip()],
+                         restart=args.restart, progress_callback=report)
+    print()
+    for step, count in changed.items():
+        print(f"{step}: {count} records changed")
+
+
+if __name__ == "__main__":
+    main()
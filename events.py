@@ -0,0 +1,147 @@
+"""
+MediaVault Scanner - Events Module
+Groups media into events (trips, parties, bursts) with one linear pass over
+capture times: a new event starts after a long time gap or a GPS jump.
+
+Segmentation is incremental. New media are merged only with the existing
+events within one time gap of them; those events are re-segmented together
+with the new media, and the rest of the library is left untouched. When a
+file leaves an event (new capture time or GPS position, deleted row),
+database triggers dissolve that event and its remaining media are
+segmented again like new ones.
+
+Usage:
+    python events.py [database] [--gap MINUTES] [--jump KM] [--rebuild]
+"""
+
+import argparse
+import bisect
+import math
+from typing import List, Optional, Sequence, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_km(latitude1: float, longitude1: float, latitude2: float, longitude2: float) -> float:
+    """Great-circle distance between two coordinates in kilometres."""
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(longitude2 - longitude1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def segment_events(rows: Sequence[Tuple[int, int, Optional[float], Optional[float]]],
+                   max_gap_seconds: int, max_jump_km: float) -> List[List[int]]:
+    """
+    Split time-ordered media into events.
+
+    A new event starts when the time since the previous file exceeds
+    max_gap_seconds, or when a geotagged file is more than max_jump_km from
+    the previous geotagged file of the event.
+
+    Args:
+        rows: (id, capture_timestamp, latitude, longitude) sorted by timestamp
+        max_gap_seconds: Largest time gap inside an event
+        max_jump_km: Largest distance between consecutive geotagged files of an event
+
+    Returns:
+        Lists of record ids, one per event, in time order
+    """
+    events = []
+    current = []
+    last_timestamp = None
+    last_position = None
+    for record_id, timestamp, latitude, longitude in rows:
+        position = (latitude, longitude) if latitude is not None and longitude is not None else None
+        if current and (timestamp - last_timestamp > max_gap_seconds or
+                        (position and last_position and haversine_km(*last_position, *position) > max_jump_km)):
+            events.append(current)
+            current = []
+            last_position = None
+        current.append(record_id)
+        last_timestamp = timestamp
+        if position:
+            last_position = position
+    if current:
+        events.append(current)
+    return events
+
+
+def update_events(db, max_gap_minutes: int = 120, max_jump_km: float = 30.0,
+                  rebuild: bool = False, batch_size: int = 50000) -> int:
+    """
+    Assign dated media without an event to events.
+
+    Args:
+        db: MediaDatabase instance
+        max_gap_minutes: Largest time gap inside an event
+        max_jump_km: Largest GPS jump inside an event
+        rebuild: Discard all events and segment the whole library again
+        batch_size: New records processed per pass (in capture time order)
+
+    Returns:
+        Number of records assigned, or -1 if the events could not be stored
+    """
+    if rebuild and not db.reset_events():
+        return -1
+
+    max_gap_seconds = max_gap_minutes * 60
+    assigned = 0
+    while True:
+        new_rows = db.get_unassigned_event_media(batch_size)
+        if not new_rows:
+            return assigned
+
+        # Existing events within one gap of a new file are re-segmented with it
+        timestamps = [row[1] for row in new_rows]
+        affected = [
+            event_id for event_id, start, end in
+            db.get_events_in_range(timestamps[0] - max_gap_seconds, timestamps[-1] + max_gap_seconds)
+            if bisect.bisect_left(timestamps, start - max_gap_seconds) <
+            bisect.bisect_right(timestamps, end + max_gap_seconds)
+        ]
+        existing_rows = db.get_event_media_rows(affected)
+        event_of = {row[0]: row[4] for row in existing_rows}
+
+        rows = sorted([row[:4] for row in existing_rows] + list(new_rows), key=lambda row: (row[1], row[0]))
+        segments = segment_events(rows, max_gap_seconds, max_jump_km)
+
+        # Each segment keeps the smallest id of the existing events it contains
+        kept = set()
+        event_ids = []
+        for segment in segments:
+            candidates = sorted({event_of[record_id] for record_id in segment if record_id in event_of} - kept)
+            event_id = candidates[0] if candidates else None
+            if event_id is not None:
+                kept.add(event_id)
+            event_ids.append(event_id)
+
+        removed = [event_id for event_id in affected if event_id not in kept]
+        if not db.store_events(list(zip(event_ids, segments)), removed):
+            return -1
+        assigned += len(new_rows)
+
+
+def main():
+    from config import Config
+    from database import MediaDatabase
+
+    Config.load_config()
+    parser = argparse.ArgumentParser(description="Group media into events by capture time and location")
+    parser.add_argument('database', nargs='?', default=Config.DEFAULT_DB_PATH, help="Path to metadata.db")
+    parser.add_argument('--gap', type=int, default=Config.EVENT_MAX_GAP_MINUTES,
+                        help="Largest time gap inside an event (minutes)")
+    parser.add_argument('--jump', type=float, default=Config.EVENT_MAX_JUMP_KM,
+                        help="Largest GPS jump inside an event (km)")
+    parser.add_argument('--rebuild', action='store_true', help="Re-segment the whole library")
+    args = parser.parse_args()
+
+    db = MediaDatabase(args.database)
+    assigned = update_events(db, args.gap, args.jump, rebuild=args.rebuild)
+    if assigned >= 0:
+        print(f"Assigned {assigned} records; the library has {db.get_event_count()} events")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+MediaVault Scanner - Events Panel
+Event browsing mode for the analysis screen: one row per event (newest first)
+with the thumbnail of its first file, its date range, size and place.
+"""
+
+from typing import Callable, Dict, Optional
+
+import customtkinter as ctk
+from PIL import Image
+
+from database import MediaDatabase
+
+
+class EventsPanel(ctk.CTkFrame):
+    """Scrollable list of events, loaded one page at a time."""
+
+    PAGE_SIZE = 50
+    THUMBNAIL_SIZE = 48
+
+    def __init__(self, parent, get_database: Callable, thumbnail_store=None,
+                 on_select: Optional[Callable[[Dict], None]] = None, **kwargs):
+        """
+        Initialize the events panel.
+
+        Args:
+            parent: Parent widget
+            get_database: Callable returning the MediaDatabase to query
+            thumbnail_store: ThumbnailStore for event thumbnails (optional)
+            on_select: Called with the event summary when an event is clicked
+        """
+        super().__init__(parent, **kwargs)
+        self.get_database = get_database
+        self.thumbnail_store = thumbnail_store
+        self.on_select = on_select
+        self.loaded = 0
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        self.title_label = ctk.CTkLabel(self, text="🗓 Events", font=ctk.CTkFont(size=16, weight="bold"))
+        self.title_label.grid(row=0, column=0, padx=20, pady=(20, 10), sticky="w")
+
+        self.list_frame = ctk.CTkScrollableFrame(self, corner_radius=5)
+        self.list_frame.grid(row=1, column=0, padx=15, pady=(0, 5), sticky="nsew")
+        self.list_frame.grid_columnconfigure(1, weight=1)
+
+        self.more_btn = ctk.CTkButton(self, text="Load more", width=120, command=self._load_page)
+        self.more_btn.grid(row=2, column=0, padx=15, pady=(0, 15))
+
+    def refresh(self):
+        """Reload the event list from the first page (e.g. after a scan)."""
+        for widget in self.list_frame.winfo_children():
+            widget.destroy()
+        self.loaded = 0
+        self._load_page()
+
+    def _load_page(self):
+        """Append the next page of events."""
+        db = self.get_database()
+        try:
+            events = db.get_events(self.PAGE_SIZE, self.loaded)
+            total = db.get_event_count()
+        except Exception as e:
+            print(f"Error loading events: {e}")
+            events, total = [], 0
+
+        for event in events:
+            self._create_event_row(self.loaded, event)
+            self.loaded += 1
+
+        self.title_label.configure(text=f"🗓 Events ({total})")
+        self.more_btn.configure(state="normal" if self.loaded < total else "disabled")
+
+    def _create_event_row(self, row_num: int, event: Dict):
+        """Add one event to the list."""
+        image = self._get_thumbnail(event.get('filepath'))
+        select = (lambda e=event: self.on_select(e)) if self.on_select else None
+        thumb_btn = ctk.CTkButton(
+            self.list_frame, text="" if image else "📷", image=image,
+            width=self.THUMBNAIL_SIZE + 4, height=self.THUMBNAIL_SIZE + 4,
+            fg_color="transparent", command=select
+        )
+        thumb_btn.grid(row=row_num, column=0, padx=5, pady=3)
+
+        start = MediaDatabase.bucket_label(event['start_timestamp'], 'day')
+        end = MediaDatabase.bucket_label(event['end_timestamp'], 'day')
+        dates = start if start == end else f"{start} – {end}"
+        details = f"{event['media_count']} files"
+        if event.get('place_name'):
+            details += f"  ·  {event['place_name']}"
+
+        label = ctk.CTkLabel(self.list_frame, text=f"{dates}\n{details}", justify="left", anchor="w",
+                             font=ctk.CTkFont(size=12), cursor="hand2")
+        label.grid(row=row_num, column=1, padx=10, pady=3, sticky="w")
+        if select:
+            label.bind("<Button-1>", lambda e, callback=select: callback())
+
+    def _get_thumbnail(self, filepath: Optional[str]) -> Optional[ctk.CTkImage]:
+        """Get the thumbnail of an event's representative file."""
+        if not filepath or self.thumbnail_store is None:
+            return None
+        image = self.thumbnail_store.get_image(filepath, 64)
+        if image is None:
+            return None
+        image = image.convert('RGB').resize((self.THUMBNAIL_SIZE, self.THUMBNAIL_SIZE), Image.LANCZOS)
+        return ctk.CTkImage(light_image=image, dark_image=image, size=(self.THUMBNAIL_SIZE, self.THUMBNAIL_SIZE))
@@ -0,0 +1,368 @@
+"""
+MediaVault Scanner - EXIF Reader Module
+Header-only EXIF reader for JPEG (APP1), PNG (eXIf) and HEIC (Exif item).
+Reads just the EXIF block with a bounded read and decodes only the tags we persist.
+"""
+
+import os
+import struct
+from typing import Dict, Any, Optional, Tuple
+
+
+class ExifReader:
+    """Bounded, tag-selective EXIF reader."""
+
+    # Upper bound on the bytes scanned to locate the EXIF block
+    MAX_SCAN_BYTES = 512 * 1024
+
+    # Upper bound on the HEIC meta box size
+    MAX_META_SIZE = 1024 * 1024
+
+    # TIFF tags of interest
+    TAG_ORIENTATION = 0x0112
+    TAG_EXIF_IFD = 0x8769
+    TAG_GPS_IFD = 0x8825
+    TAG_DATETIME_ORIGINAL = 0x9003
+    TAG_PIXEL_X_DIMENSION = 0xA002
+    TAG_PIXEL_Y_DIMENSION = 0xA003
+    TAG_THUMBNAIL_OFFSET = 0x0201
+    TAG_THUMBNAIL_LENGTH = 0x0202
+
+    # GPS IFD tags
+    GPS_LATITUDE_REF = 1
+    GPS_LATITUDE = 2
+    GPS_LONGITUDE_REF = 3
+    GPS_LONGITUDE = 4
+
+    # TIFF field type -> (struct format character, byte size)
+    FIELD_TYPES = {
+        1: ('B', 1),   # BYTE
+        2: ('s', 1),   # ASCII
+        3: ('H', 2),   # SHORT
+        4: ('I', 4),   # LONG
+        5: ('I', 8),   # RATIONAL (two LONGs)
+        7: ('B', 1),   # UNDEFINED
+        9: ('i', 4),   # SLONG
+        10: ('i', 8),  # SRATIONAL (two SLONGs)
+    }
+
+    PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+    def read(self, filepath: str, include_thumbnail: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Read the persisted EXIF fields from a JPEG, PNG or HEIC file.
+
+        Args:
+            filepath: Full path to the image file
+            include_thumbnail: Also return the embedded IFD1 JPEG preview bytes
+
+        Returns:
+            Dictionary with any of: date_time_original, gps_latitude, gps_longitude,
+            orientation, width, height, thumbnail. An empty dictionary means the
+            file has no EXIF block; None means the format is not supported or the
+            block could not be parsed.
+        """
+        try:
+            with open(filepath, 'rb') as f:
+                header = f.read(12)
+                f.seek(0)
+                if header[:2] == b'\xff\xd8':
+                    tiff = self._find_jpeg_exif(f)
+                elif header[:8] == self.PNG_SIGNATURE:
+                    tiff = self._find_png_exif(f)
+                elif header[4:8] == b'ftyp':
+                    tiff = self._find_heic_exif(f)
+                else:
+                    return None
+
+            if tiff is None:
+                return {}
+            return self._parse_tiff(tiff, include_thumbnail)
+        except (OSError, struct.error, ValueError, IndexError) as e:
+            print(f"Error reading EXIF header of {os.path.basename(filepath)}: {e}")
+            return None
+
+    # ------------------------------------------------------------------
+    # Container formats
+    # ------------------------------------------------------------------
+
+    def _find_jpeg_exif(self, f) -> Optional[bytes]:
+        """Walk JPEG marker segments up to the image data and return the APP1 TIFF block."""
+        f.seek(2)
+        while f.tell() < self.MAX_SCAN_BYTES:
+            marker = f.read(4)
+            if len(marker) < 4 or marker[0] != 0xFF:
+                return None
+
+            marker_type = marker[1]
+            length = struct.unpack('>H', marker[2:4])[0]
+
+            # Start of scan / end of image: no more metadata segments
+            if marker_type in (0xDA, 0xD9):
+                return None
+
+            if marker_type == 0xE1:
+                segment = f.read(length - 2)
+                if segment[:6] == b'Exif\x00\x00':
+                    return segment[6:]
+            else:
+                f.seek(length - 2, os.SEEK_CUR)
+        return None
+
+    def _find_png_exif(self, f) -> Optional[bytes]:
+        """Walk PNG chunks up to the image data and return the eXIf chunk."""
+        f.seek(len(self.PNG_SIGNATURE))
+        while f.tell() < self.MAX_SCAN_BYTES:
+            chunk_header = f.read(8)
+            if len(chunk_header) < 8:
+                return None
+
+            length, chunk_type = struct.unpack('>I4s', chunk_header)
+            if chunk_type == b'eXIf':
+                return f.read(length)
+            if chunk_type in (b'IDAT', b'IEND'):
+                return None
+
+            # Skip the chunk data and its CRC
+            f.seek(length + 4, os.SEEK_CUR)
+        return None
+
+    def _find_heic_exif(self, f) -> Optional[bytes]:
+        """Locate the Exif item of a HEIC/HEIF file through the meta box (iinf/iloc)."""
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+        offset = 0
+
+        meta = None
+        while offset + 8 <= min(file_size, self.MAX_SCAN_BYTES):
+            f.seek(offset)
+            size, box_type = struct.unpack('>I4s', f.read(8))
+            header_size = 8
+            if size == 1:
+                size = struct.unpack('>Q', f.read(8))[0]
+                header_size = 16
+            elif size == 0:
+                size = file_size - offset
+            if size < header_size:
+                return None
+
+            if box_type == b'meta':
+                if size > self.MAX_META_SIZE:
+                    return None
+                meta = f.read(size - header_size)
+                break
+            offset += size
+
+        if meta is None:
+            return None
+
+        # meta is a full box: skip version/flags
+        exif_item_id = None
+        iloc = None
+        for box_type, start, end in self._iter_boxes(meta, 4, len(meta)):
+            if box_type == b'iinf':
+                exif_item_id = self._find_exif_item_id(meta, start, end)
+            elif box_type == b'iloc':
+                iloc = (start, end)
+
+        if exif_item_id is None or iloc is None:
+            return None
+        extent = self._find_item_extent(meta, iloc[0], iloc[1], exif_item_id)
+        if extent is None:
+            return None
+
+        extent_offset, extent_length = extent
+        f.seek(extent_offset)
+        item = f.read(min(extent_length, self.MAX_SCAN_BYTES))
+
+        # The Exif item starts with the offset to the TIFF header
+        tiff_offset = struct.unpack('>I', item[:4])[0]
+        return item[4 + tiff_offset:]
+
+    def _iter_boxes(self, data: bytes, start: int, end: int):
+        """Yield (type, payload_start, payload_end) for ISO BMFF boxes in a byte range."""
+        offset = start
+        while offset + 8 <= end:
+            size, box_type = struct.unpack_from('>I4s', data, offset)
+            header_size = 8
+            if size == 1:
+                size = struct.unpack_from('>Q', data, offset + 8)[0]
+                header_size = 16
+            elif size == 0:
+                size = end - offset
+            if size < header_size or offset + size > end:
+                break
+            yield box_type, offset + header_size, offset + size
+            offset += size
+
+    def _find_exif_item_id(self, data: bytes, start: int, end: int) -> Optional[int]:
+        """Find the item ID whose type is 'Exif' in an iinf box."""
+        version = data[start]
+        entries_start = start + (6 if version == 0 else 8)
+
+        for box_type, infe_start, _ in self._iter_boxes(data, entries_start, end):
+            if box_type != b'infe':
+                continue
+            infe_version = data[infe_start]
+            if infe_version == 2:
+                item_id = struct.unpack_from('>H', data, infe_start + 4)[0]
+                item_type = data[infe_start + 8:infe_start + 12]
+            elif infe_version >= 3:
+                item_id = struct.unpack_from('>I', data, infe_start + 4)[0]
+                item_type = data[infe_start + 10:infe_start + 14]
+            else:
+                continue
+            if item_type == b'Exif':
+                return item_id
+        return None
+
+    def _find_item_extent(self, data: bytes, start: int, end: int, item_id: int) -> Optional[Tuple[int, int]]:
+        """Return the (file offset, length) of the first extent of an item from an iloc box."""
+        version = data[start]
+        offset_size = data[start + 4] >> 4
+        length_size = data[start + 4] & 0x0F
+        base_offset_size = data[start + 5] >> 4
+        index_size = data[start + 5] & 0x0F if version in (1, 2) else 0
+        position = start + 6
+
+        if version < 2:
+            item_count = struct.unpack_from('>H', data, position)[0]
+            position += 2
+        else:
+            item_count = struct.unpack_from('>I', data, position)[0]
+            position += 4
+
+        def read_uint(size):
+            nonlocal position
+            value = int.from_bytes(data[position:position + size], 'big') if size else 0
+            position += size
+            return value
+
+        for _ in range(item_count):
+            current_id = read_uint(2 if version < 2 else 4)
+            construction_method = read_uint(2) & 0x0F if version in (1, 2) else 0
+            read_uint(2)  # data_reference_index
+            base_offset = read_uint(base_offset_size)
+            extent_count = read_uint(2)
+
+            extents = []
+            for _ in range(extent_count):
+                read_uint(index_size)
+                extents.append((base_offset + read_uint(offset_size), read_uint(length_size)))
+
+            if current_id == item_id:
+                # Only file-offset construction is supported
+                if construction_method != 0 or not extents:
+                    return None
+                return extents[0]
+        return None
+
+    # ------------------------------------------------------------------
+    # TIFF structure
+    # ------------------------------------------------------------------
+
+    def _parse_tiff(self, tiff: bytes, include_thumbnail: bool) -> Dict[str, Any]:
+        """Decode the persisted tags from a TIFF-structured EXIF block."""
+        if tiff[:2] == b'II':
+            endian = '<'
+        elif tiff[:2] == b'MM':
+            endian = '>'
+        else:
+            return {}
+
+        result = {}
+        ifd0_offset = struct.unpack_from(endian + 'I', tiff, 4)[0]
+        ifd0, ifd1_offset = self._read_ifd(tiff, endian, ifd0_offset, {
+            self.TAG_ORIENTATION, self.TAG_EXIF_IFD, self.TAG_GPS_IFD
+        })
+
+        if self.TAG_ORIENTATION in ifd0:
+            result['orientation'] = ifd0[self.TAG_ORIENTATION]
+
+        if self.TAG_EXIF_IFD in ifd0:
+            exif_ifd, _ = self._read_ifd(tiff, endian, ifd0[self.TAG_EXIF_IFD], {
+                self.TAG_DATETIME_ORIGINAL, self.TAG_PIXEL_X_DIMENSION, self.TAG_PIXEL_Y_DIMENSION
+            })
+            if self.TAG_DATETIME_ORIGINAL in exif_ifd:
+                result['date_time_original'] = exif_ifd[self.TAG_DATETIME_ORIGINAL]
+            if self.TAG_PIXEL_X_DIMENSION in exif_ifd and self.TAG_PIXEL_Y_DIMENSION in exif_ifd:
+                result['width'] = exif_ifd[self.TAG_PIXEL_X_DIMENSION]
+                result['height'] = exif_ifd[self.TAG_PIXEL_Y_DIMENSION]
+
+        if self.TAG_GPS_IFD in ifd0:
+            gps_ifd, _ = self._read_ifd(tiff, endian, ifd0[self.TAG_GPS_IFD], {
+                self.GPS_LATITUDE_REF, self.GPS_LATITUDE, self.GPS_LONGITUDE_REF, self.GPS_LONGITUDE
+            })
+            if self.GPS_LATITUDE in gps_ifd and self.GPS_LONGITUDE in gps_ifd:
+                result['gps_latitude'] = self._to_decimal_degrees(
+                    gps_ifd[self.GPS_LATITUDE], gps_ifd.get(self.GPS_LATITUDE_REF, 'N'))
+                result['gps_longitude'] = self._to_decimal_degrees(
+                    gps_ifd[self.GPS_LONGITUDE], gps_ifd.get(self.GPS_LONGITUDE_REF, 'E'))
+
+        if include_thumbnail and ifd1_offset:
+            ifd1, _ = self._read_ifd(tiff, endian, ifd1_offset, {
+                self.TAG_THUMBNAIL_OFFSET, self.TAG_THUMBNAIL_LENGTH
+            })
+            thumbnail_offset = ifd1.get(self.TAG_THUMBNAIL_OFFSET)
+            thumbnail_length = ifd1.get(self.TAG_THUMBNAIL_LENGTH)
+            if thumbnail_offset and thumbnail_length:
+                thumbnail = tiff[thumbnail_offset:thumbnail_offset + thumbnail_length]
+                if thumbnail[:2] == b'\xff\xd8':
+                    result['thumbnail'] = thumbnail
+
+        return result
+
+    def _read_ifd(self, tiff: bytes, endian: str, offset: int, wanted: set) -> Tuple[Dict[int, Any], int]:
+        """
+        Read the wanted tags of one IFD.
+
+        Returns:
+            Tuple of (tag -> value, offset of the next IFD or 0)
+        """
+        values = {}
+        if offset <= 0 or offset + 2 > len(tiff):
+            return values, 0
+
+        entry_count = struct.unpack_from(endian + 'H', tiff, offset)[0]
+        for index in range(entry_count):
+            entry = offset + 2 + index * 12
+            tag, field_type, count = struct.unpack_from(endian + 'HHI', tiff, entry)
+            if tag not in wanted or field_type not in self.FIELD_TYPES:
+                continue
+            values[tag] = self._read_value(tiff, endian, entry + 8, field_type, count)
+            if len(values) == len(wanted):
+                break
+
+        next_entry = offset + 2 + entry_count * 12
+        next_offset = 0
+        if next_entry + 4 <= len(tiff):
+            next_offset = struct.unpack_from(endian + 'I', tiff, next_entry)[0]
+        return values, next_offset
+
+    def _read_value(self, tiff: bytes, endian: str, value_offset: int, field_type: int, count: int):
+        """Decode an IFD entry value (inline if it fits in 4 bytes, otherwise at its offset)."""
+        fmt, size = self.FIELD_TYPES[field_type]
+        total = size * count
+        if total > 4:
+            value_offset = struct.unpack_from(endian + 'I', tiff, value_offset)[0]
+        raw = tiff[value_offset:value_offset + total]
+
+        if field_type == 2:
+            return raw.split(b'\x00', 1)[0].decode('ascii', errors='ignore').strip()
+        if field_type in (5, 10):
+            numbers = struct.unpack(endian + fmt * (2 * count), raw)
+            values = [numbers[i] / numbers[i + 1] if numbers[i + 1] else 0.0
+                      for i in range(0, len(numbers), 2)]
+            return values if count > 1 else values[0]
+
+        values = struct.unpack(endian + fmt * count, raw)
+        return values[0] if count == 1 else list(values)
+
+    def _to_decimal_degrees(self, coords, ref) -> Optional[float]:
+        """Convert (degrees, minutes, seconds) and a hemisphere reference to decimal degrees."""
+        if not isinstance(coords, list) or len(coords) < 3:
+            return None
+        decimal = coords[0] + coords[1] / 60 + coords[2] / 3600
+        if ref in ('S', 'W'):
+            decimal = -decimal
+        return decimal
@@ -0,0 +1,147 @@
+"""
+MediaVault Scanner - Face Detector Module
+Face counting on bounded-size images with a Haar cascade or an optional OpenCV DNN model.
+"""
+
+import math
+import os
+from typing import List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+
+class FaceDetector:
+    """
+    Counts faces in decoded BGR images.
+
+    Backends:
+        'haar': OpenCV Haar cascade, run on an image downscaled to max_dimension
+            with the minimum face size scaled accordingly; faces smaller than the
+            cascade window after scaling are missed (see min_face_size)
+        'dnn': OpenCV DNN SSD face detector (ResNet-10 Caffe model), batched on CPU;
+            falls back to 'haar' if the model files are missing
+    """
+
+    BACKENDS = ('haar', 'dnn')
+
+    # Haar parameters (minimum face size in full-resolution pixels)
+    HAAR_SCALE_FACTOR = 1.1
+    HAAR_MIN_NEIGHBORS = 5
+    HAAR_MIN_SIZE = 30
+
+    # Detection window the cascade was trained on; smaller faces are never found
+    HAAR_WINDOW_SIZE = 24
+
+    # DNN input size and mean (BGR) of the SSD face model
+    DNN_INPUT_SIZE = (300, 300)
+    DNN_MEAN = (104.0, 177.0, 123.0)
+
+    def __init__(self, backend: str = 'haar', max_dimension: Optional[int] = 1280,
+                 dnn_model_path: str = None, dnn_config_path: str = None,
+                 dnn_confidence: float = 0.5):
+        """
+        Initialize the face detector.
+
+        Args:
+            backend: 'haar' or 'dnn'
+            max_dimension: Longest image side used for Haar detection (None = full
+                resolution); trades the smallest detectable face for speed
+            dnn_model_path: Path to the DNN weights (res10_300x300_ssd_iter_140000.caffemodel)
+            dnn_config_path: Path to the DNN network definition (deploy.prototxt)
+            dnn_confidence: Minimum detection confidence for the DNN backend
+        """
+        self.max_dimension = max_dimension
+        self.dnn_confidence = dnn_confidence
+
+        cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+        self.face_cascade = cv2.CascadeClassifier(cascade_path)
+
+        self.backend = 'haar'
+        self.net = None
+        if backend == 'dnn':
+            if dnn_model_path and dnn_config_path and \
+                    os.path.exists(dnn_model_path) and os.path.exists(dnn_config_path):
+                try:
+                    self.net = cv2.dnn.readNetFromCaffe(dnn_config_path, dnn_model_path)
+                    self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+                    self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+                    self.backend = 'dnn'
+                except cv2.error as e:
+                    print(f"Failed to load DNN face model, using Haar cascade: {e}")
+            else:
+                print("DNN face model not found, using Haar cascade")
+
+    def count_faces(self, frame: np.ndarray) -> int:
+        """Count faces in one BGR image."""
+        return self.count_faces_batch([frame])[0]
+
+    def count_faces_batch(self, frames: Sequence[np.ndarray]) -> List[int]:
+        """
+        Count faces in a batch of BGR images.
+
+        Args:
+            frames: Decoded BGR images or video frames
+
+        Returns:
+            Face count per frame
+        """
+        if not frames:
+            return []
+        if self.backend == 'dnn':
+            return self._count_dnn(frames)
+        return [self._count_haar(frame) for frame in frames]
+
+    def min_face_size(self, height: int, width: int) -> int:
+        """
+        Get the smallest face the Haar backend can find in an image of the given size.
+
+        Args:
+            height: Image height in pixels
+            width: Image width in pixels
+
+        Returns:
+            Face size in full-resolution pixels (HAAR_MIN_SIZE, or larger when
+            downscaling shrinks such faces below the cascade window)
+        """
+        return max(self.HAAR_MIN_SIZE, math.ceil(self.HAAR_WINDOW_SIZE / self._haar_scale(height, width)))
+
+    def _haar_scale(self, height: int, width: int) -> float:
+        """Get the factor an image is downscaled by before Haar detection."""
+        if self.max_dimension and max(height, width) > self.max_dimension:
+            return self.max_dimension / max(height, width)
+        return 1.0
+
+    def _count_haar(self, frame: np.ndarray) -> int:
+        """Run the Haar cascade on a bounded-size grayscale image."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        height, width = gray.shape[:2]
+        scale = self._haar_scale(height, width)
+        if scale < 1.0:
+            gray = cv2.resize(gray, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+
+        # Keep the same minimum face size relative to the original image (the
+        # cascade cannot find anything smaller than its window)
+        min_size = max(self.HAAR_WINDOW_SIZE, int(round(self.HAAR_MIN_SIZE * scale)))
+        faces = self.face_cascade.detectMultiScale(
+            gray,
+            scaleFactor=self.HAAR_SCALE_FACTOR,
+            minNeighbors=self.HAAR_MIN_NEIGHBORS,
+            minSize=(min_size, min_size)
+        )
+        return len(faces)
+
+    def _count_dnn(self, frames: Sequence[np.ndarray]) -> List[int]:
+        """Run the SSD face detector on all frames in one forward pass."""
+        blob = cv2.dnn.blobFromImages(list(frames), 1.0, self.DNN_INPUT_SIZE, self.DNN_MEAN,
+                                      swapRB=False, crop=False)
+        self.net.setInput(blob)
+        # Output shape (1, 1, detections, 7): [image_id, label, confidence, x1, y1, x2, y2]
+        detections = self.net.forward().reshape(-1, 7)
+
+        counts = [0] * len(frames)
+        for image_id in detections[detections[:, 2] > self.dnn_confidence, 0].astype(int):
+            if 0 <= image_id < len(frames):
+                counts[image_id] += 1
+        return counts
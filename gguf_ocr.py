@@ -11,7 +11,8 @@ from typing import Tuple, Optional, Union
 from pathlib import Path
 import numpy as np
 from PIL import Image
-import re
+
+from keyword_rules import KeywordDictionary
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -32,14 +33,16 @@ class GGUF_OCR:
     - CPU fallback
     """
     
-    def __init__(self, config: dict = None):
+    def __init__(self, config: dict = None, keyword_dictionary: Optional[KeywordDictionary] = None):
         """
         Initialize GGUF OCR engine.
         
         Args:
             config: Configuration dictionary with model paths and settings
+            keyword_dictionary: Stop words for keyword extraction (default: built-in list)
         """
         self.config = config or {}
+        self.keyword_dictionary = keyword_dictionary or KeywordDictionary()
         self.deepseek_available = False
         self.tesseract_available = False
         self.current_engine = None
@@ -318,26 +321,8 @@ class GGUF_OCR:
         Returns:
             Comma-separated keywords
         """
-        if not text:
-            return ""
-
-        # Remove special characters and split into words
-        words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-
-        # Common stop words to filter out
-        stop_words = {'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'man', 'new', 'now', 'old', 'see', 'two', 'way', 'who', 'boy', 'did', 'its', 'let', 'put', 'say', 'she', 'too', 'use'}
-
-        # Filter and count words
-        word_freq = {}
-        for word in words:
-            if word not in stop_words and len(word) > 2:
-                word_freq[word] = word_freq.get(word, 0) + 1
-
-        # Sort by frequency and get top keywords
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        keywords = [word for word, freq in sorted_words[:max_keywords]]
-
-        return ', '.join(keywords)
+        # Stop words are shared with the sentiment rules (see keyword_rules.py)
+        return self.keyword_dictionary.extract_keywords(text, max_keywords)
 
     def get_engine_status(self) -> dict:
         """
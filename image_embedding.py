@@ -0,0 +1,103 @@
+"""
+MediaVault Scanner - Image Embedding Module
+Compact CPU-only colour/texture descriptors for visual similarity search.
+"""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class ImageEmbedder:
+    """
+    Computes a fixed-length, L2-normalized feature vector for a BGR image.
+
+    The vector concatenates a colour block (HSV histogram, 8x4x2 bins) and a
+    texture block (gradient orientation histograms, 8 orientations in a 2x2
+    grid). Both blocks use the Hellinger (square root) mapping, so the dot
+    product of two embeddings is their cosine similarity. Embeddings are stored
+    as float16 blobs.
+    """
+
+    HSV_BINS = (8, 4, 2)
+    ORIENTATION_BINS = 8
+    GRID_SIZE = 2
+
+    EMBEDDING_DIM = HSV_BINS[0] * HSV_BINS[1] * HSV_BINS[2] + ORIENTATION_BINS * GRID_SIZE * GRID_SIZE
+
+    # Relative weight of the colour and texture blocks
+    COLOR_WEIGHT = 1.0
+    TEXTURE_WEIGHT = 0.7
+
+    # Longest side images are reduced to before computing the descriptor
+    MAX_DIMENSION = 256
+
+    def embed(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Compute the embedding of a decoded image.
+
+        Args:
+            frame: BGR image (any size)
+
+        Returns:
+            float32 vector of length EMBEDDING_DIM with unit norm (all zeros
+            only for an empty image)
+        """
+        height, width = frame.shape[:2]
+        if max(height, width) > self.MAX_DIMENSION:
+            scale = self.MAX_DIMENSION / max(height, width)
+            frame = cv2.resize(frame, (max(1, int(width * scale)), max(1, int(height * scale))),
+                               interpolation=cv2.INTER_AREA)
+
+        color = self._color_block(frame) * self.COLOR_WEIGHT
+        texture = self._texture_block(frame) * self.TEXTURE_WEIGHT
+        vector = np.concatenate([color, texture]).astype(np.float32)
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _color_block(self, frame: np.ndarray) -> np.ndarray:
+        """HSV colour histogram with Hellinger mapping."""
+        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        histogram = cv2.calcHist([hsv], [0, 1, 2], None, list(self.HSV_BINS), [0, 180, 0, 256, 0, 256]).ravel()
+        return self._hellinger(histogram)
+
+    def _texture_block(self, frame: np.ndarray) -> np.ndarray:
+        """Magnitude-weighted gradient orientation histograms of a coarse grid."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY).astype(np.float32)
+        magnitude, angle = cv2.cartToPolar(cv2.Sobel(gray, cv2.CV_32F, 1, 0), cv2.Sobel(gray, cv2.CV_32F, 0, 1))
+
+        # Unsigned orientation (0..pi) quantized into ORIENTATION_BINS bins
+        bins = (np.mod(angle, np.pi) / np.pi * self.ORIENTATION_BINS).astype(np.int64)
+        np.clip(bins, 0, self.ORIENTATION_BINS - 1, out=bins)
+
+        height, width = gray.shape
+        histograms = []
+        for row in range(self.GRID_SIZE):
+            for column in range(self.GRID_SIZE):
+                cell = (slice(row * height // self.GRID_SIZE, (row + 1) * height // self.GRID_SIZE),
+                        slice(column * width // self.GRID_SIZE, (column + 1) * width // self.GRID_SIZE))
+                histograms.append(np.bincount(bins[cell].ravel(), weights=magnitude[cell].ravel(),
+                                              minlength=self.ORIENTATION_BINS))
+        return self._hellinger(np.concatenate(histograms))
+
+    @staticmethod
+    def _hellinger(histogram: np.ndarray) -> np.ndarray:
+        """Normalize a histogram to sum 1 and take the square root (unit L2 norm)."""
+        total = histogram.sum()
+        if total <= 0:
+            return np.zeros(len(histogram))
+        return np.sqrt(histogram / total)
+
+    @staticmethod
+    def to_blob(vector: np.ndarray) -> bytes:
+        """Encode an embedding as a float16 blob."""
+        return np.asarray(vector, dtype=np.float16).tobytes()
+
+    @classmethod
+    def from_blob(cls, blob: Optional[bytes]) -> Optional[np.ndarray]:
+        """Decode a float16 blob (None if missing or of the wrong size)."""
+        if not blob or len(blob) != cls.EMBEDDING_DIM * 2:
+            return None
+        return np.frombuffer(blob, dtype=np.float16).astype(np.float32)
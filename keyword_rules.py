@@ -0,0 +1,287 @@
+"""
+MediaVault Scanner - Keyword Rules Module
+Configurable keyword dictionary for the sentiment heuristics and OCR keyword
+extraction: sentiment keywords per label and a shared stop-word list. The
+day period of a capture time completes the sentiment label.
+
+Keywords are compiled into one trie-shaped regular expression, so a path is
+classified in a single pass however large the vocabulary is, and a batch of
+paths is classified with one scan over their concatenation.
+
+Dictionary file (JSON; labels are listed in priority order):
+    {
+        "sentiment": {"Positive": ["vacation", ...], "Negative": ["funeral", ...]},
+        "stopwords": ["the", "and", ...]
+    }
+
+Usage:
+    python keyword_rules.py --export keywords.json
+"""
+
+import argparse
+import bisect
+import json
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_SENTIMENT_KEYWORDS = {
+    'Positive': ['vacation', 'birthday', 'party', 'wedding', 'celebration', 'trip', 'holiday'],
+    'Negative': ['funeral', 'work', 'meeting', 'office'],
+}
+
+DEFAULT_STOPWORDS = [
+    'a', 'all', 'an', 'and', 'are', 'at', 'boy', 'but', 'can', 'day', 'did', 'for', 'get', 'has', 'her',
+    'him', 'his', 'how', 'in', 'is', 'its', 'let', 'man', 'new', 'not', 'now', 'of', 'old', 'on', 'one',
+    'or', 'our', 'out', 'put', 'say', 'see', 'she', 'the', 'to', 'too', 'two', 'use', 'was', 'way', 'were',
+    'who', 'with', 'you',
+]
+
+# Separates the paths of a batch; keywords may not contain it
+BATCH_SEPARATOR = '\n'
+
+
+class KeywordMatcher:
+    """
+    Finds labelled keywords as substrings of text in a single regex pass.
+
+    The keywords are merged into a trie and emitted as nested alternations
+    (a shared prefix is tested once), wrapped in a lookahead so matches
+    starting at every position are reported, including overlapping ones.
+    """
+
+    def __init__(self, labelled_keywords: Sequence[Tuple[str, Iterable[str]]]):
+        """
+        Compile the matcher.
+
+        Args:
+            labelled_keywords: (label, keywords) pairs; earlier labels win when
+                a text contains keywords of several labels
+        """
+        self.labels = [label for label, _ in labelled_keywords]
+        self.rank = {}  # keyword -> index of its label
+        for rank, (_, keywords) in enumerate(labelled_keywords):
+            for keyword in keywords:
+                keyword = keyword.strip().lower()
+                if keyword and BATCH_SEPARATOR not in keyword:
+                    self.rank.setdefault(keyword, rank)
+
+        trie = {}
+        for keyword in self.rank:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = keyword
+
+        # The regex reports the longest keyword at a position; resolve it to the
+        # best ranked keyword among its prefixes (e.g. "party" in "partyline")
+        self.best_prefix = {}
+        for keyword in self.rank:
+            node, best = trie, None
+            for char in keyword:
+                node = node[char]
+                if '' in node and (best is None or self.rank[node['']] <= self.rank[best]):
+                    best = node['']
+            self.best_prefix[keyword] = best
+
+        self.pattern = re.compile(f"(?=({self._trie_pattern(trie)}))") if self.rank else None
+
+    @classmethod
+    def _trie_pattern(cls, node: dict) -> str:
+        """Regular expression matching the keywords below a trie node."""
+        leaves = []
+        branches = []
+        for char in sorted(key for key in node if key):
+            child = node[char]
+            if list(child) == ['']:
+                leaves.append(re.escape(char))
+            else:
+                branches.append(re.escape(char) + cls._trie_pattern(child))
+
+        if len(leaves) > 1:
+            branches.append(f"[{''.join(leaves)}]")
+        else:
+            branches.extend(leaves)
+
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # A keyword ending here: longer keywords are tried first
+        return f"(?:{pattern})?" if '' in node else pattern
+
+    def match(self, text: str) -> Optional[Tuple[str, str]]:
+        """
+        Find the best keyword in a text.
+
+        Args:
+            text: Text to search (case-insensitive)
+
+        Returns:
+            (label, keyword) of the earliest keyword of the highest priority
+            label, or None if no keyword occurs
+        """
+        return self.match_batch([text])[0]
+
+    def match_batch(self, texts: Sequence[str]) -> List[Optional[Tuple[str, str]]]:
+        """
+        Find the best keyword in each of many texts with one regex scan.
+
+        Args:
+            texts: Texts to search (case-insensitive)
+
+        Returns:
+            (label, keyword) or None per text, as for match()
+        """
+        results: List[Optional[Tuple[str, str]]] = [None] * len(texts)
+        if self.pattern is None or not texts:
+            return results
+
+        # Lowercase before measuring: lowercasing can change the length (e.g. 'İ')
+        texts = [text.lower() for text in texts]
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + len(BATCH_SEPARATOR)
+
+        best: Dict[int, Tuple[int, str]] = {}  # text index -> (rank, keyword)
+        for hit in self.pattern.finditer(BATCH_SEPARATOR.join(texts)):
+            keyword = self.best_prefix[hit.group(1)]
+            rank = self.rank[keyword]
+            index = bisect.bisect_right(starts, hit.start()) - 1
+            # Hits arrive in text order, so only a better label replaces the first hit
+            if index not in best or rank < best[index][0]:
+                best[index] = (rank, keyword)
+
+        for index, (rank, keyword) in best.items():
+            results[index] = (self.labels[rank], keyword)
+        return results
+
+
+class KeywordDictionary:
+    """Sentiment keywords and stop words, from the built-in lists or a JSON file."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the dictionary.
+
+        Args:
+            path: JSON dictionary file (None = built-in lists; the built-in lists
+                are also kept if the file cannot be read)
+        """
+        self.sentiment_keywords = {label: list(keywords) for label, keywords in DEFAULT_SENTIMENT_KEYWORDS.items()}
+        self.stopwords = frozenset(DEFAULT_STOPWORDS)
+        if path:
+            self.load(path)
+        self.matcher = KeywordMatcher(list(self.sentiment_keywords.items()))
+
+    def load(self, path: str) -> bool:
+        """
+        Load the sentiment keywords and stop words of a dictionary file.
+
+        Sections missing from the file keep their current lists.
+
+        Args:
+            path: JSON dictionary file
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            sentiment = data.get('sentiment', self.sentiment_keywords)
+            stopwords = data.get('stopwords', self.stopwords)
+            if not isinstance(sentiment, dict) or not all(isinstance(words, list) for words in sentiment.values()):
+                raise ValueError("'sentiment' must map labels to keyword lists")
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"Error loading keyword dictionary {path}: {e}")
+            return False
+
+        self.sentiment_keywords = {str(label): [str(word) for word in words] for label, words in sentiment.items()}
+        self.stopwords = frozenset(str(word).lower() for word in stopwords)
+        self.matcher = KeywordMatcher(list(self.sentiment_keywords.items()))
+        return True
+
+    def save(self, path: str) -> bool:
+        """
+        Write the dictionary to a JSON file (e.g. as a starting point for edits).
+
+        Args:
+            path: Output file
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'sentiment': self.sentiment_keywords, 'stopwords': sorted(self.stopwords)}, f, indent=4)
+            return True
+        except OSError as e:
+            print(f"Error saving keyword dictionary {path}: {e}")
+            return False
+
+    def classify_sentiment(self, path: str) -> Tuple[str, Optional[str]]:
+        """
+        Classify a file path by its sentiment keywords.
+
+        Args:
+            path: File path (filename and parent directories are searched)
+
+        Returns:
+            Tuple of (sentiment label or 'Neutral', capitalized keyword or None)
+        """
+        return self.classify_sentiment_batch([path])[0]
+
+    def classify_sentiment_batch(self, paths: Sequence[str]) -> List[Tuple[str, Optional[str]]]:
+        """
+        Classify many file paths in one pass.
+
+        Args:
+            paths: File paths
+
+        Returns:
+            (sentiment, context keyword) per path, as for classify_sentiment()
+        """
+        return [
+            (match[0], match[1].capitalize()) if match else ('Neutral', None)
+            for match in self.matcher.match_batch(paths)
+        ]
+
+    def extract_keywords(self, text: str, max_keywords: int = 10) -> str:
+        """
+        Extract the most frequent words of a text that are not stop words.
+
+        Args:
+            text: Input text
+            max_keywords: Maximum number of keywords to extract
+
+        Returns:
+            Comma-separated keywords
+        """
+        if not text:
+            return ""
+
+        words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
+        word_freq = Counter(word for word in words if word not in self.stopwords)
+        return ', '.join(word for word, _ in word_freq.most_common(max_keywords))
+
+
+def day_period(capture_timestamp: Optional[int]) -> Optional[str]:
+    """Get 'Daytime' (06:00-17:59) or 'Nighttime' for a capture timestamp (None if unknown)."""
+    if capture_timestamp is None:
+        return None
+    hour = (capture_timestamp // 3600) % 24
+    return 'Daytime' if 6 <= hour < 18 else 'Nighttime'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the keyword dictionary to a JSON file for editing")
+    parser.add_argument('--export', required=True, metavar='PATH', help="Output JSON file")
+    parser.add_argument('--dictionary', help="Dictionary to start from (default: built-in lists)")
+    args = parser.parse_args()
+
+    if KeywordDictionary(args.dictionary).save(args.export):
+        print(f"Keyword dictionary written to {args.export}")
+
+
+if __name__ == "__main__":
+    main()
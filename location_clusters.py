@@ -0,0 +1,224 @@
+"""
+MediaVault Scanner - Location Clusters Module
+Groups geotagged media into places on a geohash grid. Records in the same or
+in adjacent occupied cells belong to the same cluster (DBSCAN with the cell
+size as radius and a single point as minimum), so photos taken a few metres
+apart always share a place even across a cell border.
+
+Clustering is incremental: each run only assigns records that have no cluster
+yet, growing or merging the existing clusters they touch. When a record leaves
+a cluster (new GPS position or deleted row), database triggers
+dissolve that cluster and the next run clusters its remaining records again.
+
+Usage:
+    python location_clusters.py [database] [--precision N] [--rebuild]
+"""
+
+import argparse
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+MAX_PRECISION = 12  # 60 bits, fits in int64
+
+
+def _quantize(latitudes: np.ndarray, longitudes: np.ndarray, precision: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the integer row (latitude) and column (longitude) of each coordinate's geohash cell."""
+    bits = 5 * precision
+    lat_bits, lon_bits = bits // 2, (bits + 1) // 2
+    rows = np.floor((latitudes + 90.0) / 180.0 * (1 << lat_bits)).astype(np.int64)
+    columns = np.floor((longitudes + 180.0) / 360.0 * (1 << lon_bits)).astype(np.int64)
+    return np.clip(rows, 0, (1 << lat_bits) - 1), columns % (1 << lon_bits)
+
+
+def _encode_cells(rows: np.ndarray, columns: np.ndarray, precision: int) -> List[str]:
+    """Encode cell rows/columns as geohash strings."""
+    bits = 5 * precision
+    lat_bits, lon_bits = bits // 2, (bits + 1) // 2
+
+    # Interleave the bits, starting with the most significant longitude bit
+    codes = np.zeros(len(rows), dtype=np.int64)
+    for i in range(bits):
+        if i % 2 == 0:
+            bit = (columns >> (lon_bits - 1 - i // 2)) & 1
+        else:
+            bit = (rows >> (lat_bits - 1 - i // 2)) & 1
+        codes = (codes << 1) | bit
+
+    alphabet = np.frombuffer(GEOHASH_ALPHABET.encode('ascii'), dtype=np.uint8)
+    characters = np.empty((len(rows), precision), dtype=np.uint8)
+    for i in range(precision):
+        characters[:, i] = alphabet[(codes >> (5 * (precision - 1 - i))) & 31]
+    return [code.decode('ascii') for code in characters.view(f'S{precision}').ravel()]
+
+
+def encode_geohashes(latitudes: Sequence[float], longitudes: Sequence[float], precision: int = 7) -> List[str]:
+    """
+    Encode many coordinates as geohashes.
+
+    Args:
+        latitudes: Latitudes in decimal degrees
+        longitudes: Longitudes in decimal degrees
+        precision: Geohash length (7 = cells of about 150 x 150 m)
+
+    Returns:
+        Geohash string per coordinate
+    """
+    if len(latitudes) == 0:
+        return []
+    rows, columns = _quantize(np.asarray(latitudes, dtype=np.float64),
+                              np.asarray(longitudes, dtype=np.float64), precision)
+    return _encode_cells(rows, columns, precision)
+
+
+def _neighbourhoods(cell_keys: np.ndarray, precision: int) -> List[List[str]]:
+    """
+    Encode the 3 x 3 neighbourhood of each cell.
+
+    Longitudes wrap around the antimeridian; latitudes clamp at the poles.
+
+    Returns:
+        Nine lists (one per offset, including the cell itself) aligned with cell_keys
+    """
+    bits = 5 * precision
+    lat_bits, lon_bits = bits // 2, (bits + 1) // 2
+    neighbourhoods = []
+    for row_offset in (-1, 0, 1):
+        for column_offset in (-1, 0, 1):
+            rows = np.clip(cell_keys[:, 0] + row_offset, 0, (1 << lat_bits) - 1)
+            columns = (cell_keys[:, 1] + column_offset) % (1 << lon_bits)
+            neighbourhoods.append(_encode_cells(rows, columns, precision))
+    return neighbourhoods
+
+
+def _cell_keys(rows: List[Tuple[int, float, float]], precision: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the distinct (row, column) cells of records and each record's index into them."""
+    latitudes = np.array([row[1] for row in rows], dtype=np.float64)
+    longitudes = np.array([row[2] for row in rows], dtype=np.float64)
+    keys = np.stack(_quantize(latitudes, longitudes, precision), axis=1)
+    cell_keys, record_cells = np.unique(keys, axis=0, return_inverse=True)
+    return cell_keys, record_cells.ravel()
+
+
+def cluster_cells(rows: List[Tuple[int, float, float]], known_cells: Dict[str, int],
+                  precision: int) -> List[Dict[str, list]]:
+    """
+    Group new geotagged records with each other and with existing clusters.
+
+    Args:
+        rows: (id, latitude, longitude) of records without a cluster
+        known_cells: Existing cell -> cluster id mapping (only cells around the
+            new records are needed)
+        precision: Geohash length of the cells
+
+    Returns:
+        One entry per connected group: 'clusters' (existing cluster ids it
+        touches, smallest first), 'cells' (cells not yet stored) and
+        'record_ids' (new records in the group)
+    """
+    cell_keys, record_cells = _cell_keys(rows, precision)
+    cells = _encode_cells(cell_keys[:, 0], cell_keys[:, 1], precision)
+
+    # Union-find over the occupied cells of this batch and the existing clusters
+    parent = {}
+
+    def find(node):
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(a, b):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+
+    batch_cells = set(cells)
+    for neighbours in _neighbourhoods(cell_keys, precision):
+        for cell, neighbour in zip(cells, neighbours):
+            if neighbour in known_cells:
+                union(cell, ('cluster', known_cells[neighbour]))
+            elif neighbour in batch_cells:
+                union(cell, neighbour)
+
+    groups = {}
+    for cell in cells:
+        group = groups.setdefault(find(cell), {'clusters': set(), 'cells': [], 'record_ids': []})
+        if cell not in known_cells:
+            group['cells'].append(cell)
+    for node in list(parent):
+        if isinstance(node, tuple):
+            root = find(node)
+            if root in groups:
+                groups[root]['clusters'].add(node[1])
+    for (record_id, _, _), cell_index in zip(rows, record_cells.tolist()):
+        groups[find(cells[cell_index])]['record_ids'].append(record_id)
+
+    for group in groups.values():
+        group['clusters'] = sorted(group['clusters'])
+    return list(groups.values())
+
+
+def update_location_clusters(db, precision: int = 7, rebuild: bool = False, batch_size: int = 10000) -> int:
+    """
+    Assign geotagged records without a location cluster to clusters.
+
+    Clusters stored with a different precision are rebuilt from scratch.
+
+    Args:
+        db: MediaDatabase instance
+        precision: Geohash length of the grid cells (1-12)
+        rebuild: Discard all clusters and cluster every geotagged record again
+        batch_size: Records clustered per transaction
+
+    Returns:
+        Number of records assigned, or -1 if the clusters could not be stored
+    """
+    precision = max(1, min(precision, MAX_PRECISION))
+    stored_precision = db.get_location_cell_precision()
+    if rebuild or (stored_precision is not None and stored_precision != precision):
+        if not db.reset_location_clusters():
+            return -1
+
+    assigned = 0
+    after_id = 0
+    while True:
+        rows = db.get_geotagged_batch(after_id, batch_size, unclustered_only=True)
+        if not rows:
+            return assigned
+
+        # Look up the stored clusters of the cells around the new records
+        cell_keys, _ = _cell_keys(rows, precision)
+        nearby = set()
+        for neighbours in _neighbourhoods(cell_keys, precision):
+            nearby.update(neighbours)
+
+        groups = cluster_cells(rows, db.get_cell_clusters(list(nearby)), precision)
+        if not db.assign_location_clusters(groups):
+            return -1
+        assigned += len(rows)
+        after_id = rows[-1][0]
+
+
+def main():
+    from config import Config
+    from database import MediaDatabase
+
+    Config.load_config()
+    parser = argparse.ArgumentParser(description="Group geotagged media into location clusters")
+    parser.add_argument('database', nargs='?', default=Config.DEFAULT_DB_PATH, help="Path to metadata.db")
+    parser.add_argument('--precision', type=int, default=Config.LOCATION_CLUSTER_PRECISION,
+                        help="Geohash length of the grid cells (7 = about 150 m)")
+    parser.add_argument('--rebuild', action='store_true', help="Recompute all clusters from scratch")
+    args = parser.parse_args()
+
+    db = MediaDatabase(args.database)
+    assigned = update_location_clusters(db, args.precision, rebuild=args.rebuild)
+    if assigned >= 0:
+        print(f"Clustered {assigned} records into {db.get_location_cluster_count()} locations")
+
+
+if __name__ == "__main__":
+    main()
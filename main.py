@@ -5,16 +5,25 @@ A professional-grade desktop application for scanning and cataloging media metad
 
 import os
 import sys
+import calendar
 import threading
+from datetime import datetime
 from pathlib import Path
+from typing import Optional
 from tkinter import filedialog, messagebox
 import customtkinter as ctk
 from PIL import Image
 
 from config import Config
 from scanner import MediaScanner
+from thumbnail_queue import ThumbnailQueue
+from image_embedding import ImageEmbedder
+from vector_index import IVFIndex
 from database import MediaDatabase
 from model_setup_dialog import ModelSetupDialog
+from map_panel import MapPanel
+from timeline_panel import TimelinePanel
+from events_panel import EventsPanel
 
 
 class MediaVaultApp(ctk.CTk):
@@ -35,19 +44,38 @@ class MediaVaultApp(ctk.CTk):
         ctk.set_appearance_mode(Config.APPEARANCE_MODE)
         ctk.set_default_color_theme(Config.COLOR_THEME)
 
-        # Initialize scanner with GGUF OCR configuration
+        # Initialize scanner with GGUF OCR and extraction configuration
         gguf_ocr_config = Config.get_gguf_ocr_config()
-        self.scanner = MediaScanner(gguf_ocr_config=gguf_ocr_config)
+        self.scanner = MediaScanner(
+            gguf_ocr_config=gguf_ocr_config,
+            extractor_config=Config.get_extractor_config()
+        )
+        self.thumbnail_store = self.scanner.extractor.thumbnail_store
+
+        # Background thumbnail generation for rows without thumbnails (lazy mode)
+        self.thumbnail_labels = {}  # filepath -> label waiting for its thumbnail
+        self.thumbnail_queue = ThumbnailQueue(
+            generate=self.scanner.extractor.generate_thumbnail,
+            has_thumbnail=self.thumbnail_store.has,
+            on_ready=lambda filepath: self.after(0, lambda: self._refresh_thumbnail(filepath))
+        )
         self.scanning = False
         self.selected_directory = None
 
+        # Visual similarity index, built in the background on the first "more like
+        # this" query after each scan (the version discards indexes built during a scan)
+        self.vector_index = None
+        self.vector_index_version = 0
+        self.similar_pending = None  # Record to query once the index being built is ready
+
         # Screen management
         self.current_screen = "scan"  # "scan" or "analysis"
         self.scan_frame = None
         self.analysis_frame = None
 
-        # Filtered data cache
+        # Filtered data cache and the filters that select the same records (for the export)
         self.current_filtered_data = []
+        self.current_filters = {}
 
         # Show model setup dialog on first run or if needed
         self._show_model_setup()
@@ -181,6 +209,16 @@ class MediaVaultApp(ctk.CTk):
             font=ctk.CTkFont(size=12)
         )
         self.update_checkbox.grid(row=1, column=1, padx=10, pady=(0, 15), sticky="w")
+
+        # EXIF-only mode: read capture time / GPS / dimensions from file headers only
+        self.exif_only_var = ctk.BooleanVar(value=False)
+        self.exif_only_checkbox = ctk.CTkCheckBox(
+            controls_frame,
+            text="EXIF only (fast)",
+            variable=self.exif_only_var,
+            font=ctk.CTkFont(size=12)
+        )
+        self.exif_only_checkbox.grid(row=1, column=2, columnspan=2, padx=10, pady=(0, 15), sticky="w")
     
     def _build_data_view_panel(self):
         """Build the center data view panel."""
@@ -277,8 +315,9 @@ class MediaVaultApp(ctk.CTk):
             self.after(500, lambda: self._show_screen("analysis"))
             return
 
-        # Start scan in separate thread
+        # Start scan in separate thread (background thumbnail generation waits for it)
         self.scanning = True
+        self.thumbnail_queue.pause()
         self.scan_btn.configure(text="Stop Scan", fg_color="#8B0000", hover_color="#660000")
         self.browse_btn.configure(state="disabled")
 
@@ -291,12 +330,14 @@ class MediaVaultApp(ctk.CTk):
         self._log_status("=" * 60)
 
         update_existing = self.update_existing_var.get()
+        exif_only = self.exif_only_var.get()
 
         try:
             stats = self.scanner.scan_directory(
                 self.selected_directory,
                 progress_callback=self._update_progress,
-                update_existing=update_existing
+                update_existing=update_existing,
+                exif_only=exif_only
             )
 
             # Log results
@@ -307,6 +348,7 @@ class MediaVaultApp(ctk.CTk):
             self._log_status(f"New records: {stats['new_records']}")
             self._log_status(f"Updated records: {stats['updated_records']}")
             self._log_status(f"Skipped: {stats['skipped']}")
+            self._log_status(f"Duplicates (metadata copied): {stats['duplicates']}")
             self._log_status(f"Errors: {stats['errors']}")
 
             # Reload data
@@ -327,6 +369,9 @@ class MediaVaultApp(ctk.CTk):
             ))
             self.after(0, lambda: self.browse_btn.configure(state="normal"))
             self.after(0, lambda: self.progress_bar.set(0))
+            self.thumbnail_queue.resume()
+            self.vector_index = None
+            self.vector_index_version += 1
 
     def _update_progress(self, current: int, total: int, filename: str):
         """Update progress bar and status."""
@@ -433,7 +478,7 @@ class MediaVaultApp(ctk.CTk):
         )
         title_label.grid(row=0, column=1, padx=20, pady=15)
 
-        export_btn = ctk.CTkButton(
+        self.export_btn = ctk.CTkButton(
             top_bar,
             text="📊 Export Data",
             command=self._export_data,
@@ -443,7 +488,7 @@ class MediaVaultApp(ctk.CTk):
             fg_color="#2B7A0B",
             hover_color="#1F5A08"
         )
-        export_btn.grid(row=0, column=2, padx=20, pady=15)
+        self.export_btn.grid(row=0, column=2, padx=20, pady=15)
 
         # Main content area
         content_frame = ctk.CTkFrame(self.analysis_frame, corner_radius=10)
@@ -477,11 +522,12 @@ class MediaVaultApp(ctk.CTk):
         insights_frame.grid_rowconfigure(1, weight=1)
 
     def _build_filtered_data_panel(self, parent):
-        """Build the filtered data view panel."""
-        data_panel = ctk.CTkFrame(parent, corner_radius=10)
-        data_panel.grid(row=0, column=1, rowspan=2, padx=(10, 15), pady=15, sticky="nsew")
+        """Build the filtered data view panel (and the map and events, in more tabs)."""
+        self.analysis_tabs = ctk.CTkTabview(parent, corner_radius=10)
+        self.analysis_tabs.grid(row=0, column=1, rowspan=2, padx=(10, 15), pady=15, sticky="nsew")
+        data_panel = self.analysis_tabs.add("Data")
         data_panel.grid_columnconfigure(0, weight=1)
-        data_panel.grid_rowconfigure(2, weight=1)
+        data_panel.grid_rowconfigure(3, weight=1)
 
         # Header
         header = ctk.CTkLabel(
@@ -494,19 +540,52 @@ class MediaVaultApp(ctk.CTk):
         # Filters
         self._build_filter_controls(data_panel)
 
+        # Capture date timeline (brushing sets the date range filter)
+        self.timeline_panel = TimelinePanel(
+            data_panel,
+            get_database=self.scanner.get_database,
+            on_brush=self._filter_date_range
+        )
+        self.timeline_panel.grid(row=2, column=0, padx=15, pady=(5, 0), sticky="ew")
+
         # Data table
         self.filtered_data_scroll = ctk.CTkScrollableFrame(data_panel, corner_radius=5)
-        self.filtered_data_scroll.grid(row=2, column=0, padx=15, pady=(10, 15), sticky="nsew")
+        self.filtered_data_scroll.grid(row=3, column=0, padx=15, pady=(10, 15), sticky="nsew")
         self.filtered_data_scroll.grid_columnconfigure(0, weight=1)
 
         # Create table header
         self._create_filtered_table_header()
 
+        # Map of geotagged media
+        map_tab = self.analysis_tabs.add("Map")
+        map_tab.grid_columnconfigure(0, weight=1)
+        map_tab.grid_rowconfigure(0, weight=1)
+        self.map_panel = MapPanel(
+            map_tab,
+            get_database=self.scanner.get_database,
+            thumbnail_store=self.thumbnail_store,
+            geocoder=self.scanner.extractor.geocoder,
+            on_select=self._show_map_area
+        )
+        self.map_panel.grid(row=0, column=0, sticky="nsew")
+
+        # Events (bursts of files close in time and place)
+        events_tab = self.analysis_tabs.add("Events")
+        events_tab.grid_columnconfigure(0, weight=1)
+        events_tab.grid_rowconfigure(0, weight=1)
+        self.events_panel = EventsPanel(
+            events_tab,
+            get_database=self.scanner.get_database,
+            thumbnail_store=self.thumbnail_store,
+            on_select=self._show_event
+        )
+        self.events_panel.grid(row=0, column=0, sticky="nsew")
+
     def _build_filter_controls(self, parent):
         """Build the filter controls."""
         filter_frame = ctk.CTkFrame(parent, fg_color="transparent")
         filter_frame.grid(row=1, column=0, padx=20, pady=10, sticky="ew")
-        filter_frame.grid_columnconfigure((0, 1, 2), weight=1)
+        filter_frame.grid_columnconfigure((0, 1, 2, 3), weight=1)
 
         # Emotion filter
         emotion_label = ctk.CTkLabel(
@@ -555,11 +634,31 @@ class MediaVaultApp(ctk.CTk):
 
         self.keyword_search = ctk.CTkEntry(
             filter_frame,
-            placeholder_text="Search keywords...",
+            placeholder_text="Keyword, e.g. beach",
             width=150
         )
         self.keyword_search.grid(row=1, column=2, padx=5, pady=5, sticky="ew")
 
+        # Capture date range filter
+        date_label = ctk.CTkLabel(
+            filter_frame,
+            text="Capture Date:",
+            font=ctk.CTkFont(size=12, weight="bold")
+        )
+        date_label.grid(row=0, column=3, padx=5, pady=5, sticky="w")
+
+        date_range_frame = ctk.CTkFrame(filter_frame, fg_color="transparent")
+        date_range_frame.grid(row=1, column=3, padx=5, pady=5, sticky="ew")
+        date_range_frame.grid_columnconfigure((0, 1, 2), weight=1)
+
+        self.date_from = ctk.CTkEntry(date_range_frame, placeholder_text="YYYY-MM-DD", width=95)
+        self.date_from.grid(row=0, column=0, padx=2)
+
+        ctk.CTkLabel(date_range_frame, text="-").grid(row=0, column=1, padx=2)
+
+        self.date_to = ctk.CTkEntry(date_range_frame, placeholder_text="YYYY-MM-DD", width=95)
+        self.date_to.grid(row=0, column=2, padx=2)
+
         # Apply button
         apply_btn = ctk.CTkButton(
             filter_frame,
@@ -569,7 +668,18 @@ class MediaVaultApp(ctk.CTk):
             height=32,
             font=ctk.CTkFont(size=12, weight="bold")
         )
-        apply_btn.grid(row=2, column=0, columnspan=3, pady=10)
+        apply_btn.grid(row=2, column=0, columnspan=4, pady=10)
+
+        # Facet counts for the current filter set
+        self.facet_label = ctk.CTkLabel(
+            filter_frame,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color="#AAAAAA",
+            anchor="w",
+            justify="left"
+        )
+        self.facet_label.grid(row=3, column=0, columnspan=4, padx=5, pady=(0, 5), sticky="w")
 
     def _create_filtered_table_header(self):
         """Create the filtered data table header."""
@@ -605,7 +715,14 @@ class MediaVaultApp(ctk.CTk):
 
         self._create_insight_card("Geographic Distribution",
                                  f"{analytics['unique_locations']} unique locations",
-                                 "Files with GPS coordinates")
+                                 f"{analytics['geotagged_count']} files with GPS coordinates")
+
+        top_places = analytics['top_places']
+        if top_places:
+            self._create_insight_card("Top Places",
+                                     ", ".join(place.split(", ")[0] for place, _ in top_places),
+                                     f"{analytics['country_count']} countries | "
+                                     + " | ".join(f"{place}: {count}" for place, count in top_places))
 
         self._create_insight_card("Average People Per Photo",
                                  f"{analytics['avg_people_per_photo']:.1f} people",
@@ -638,6 +755,11 @@ class MediaVaultApp(ctk.CTk):
                                      "No keywords",
                                      "No OCR data available")
 
+        # Reload the map markers, the timeline and the events
+        self.map_panel.refresh()
+        self.timeline_panel.refresh()
+        self.events_panel.refresh()
+
         # Load all data initially
         self._apply_filters()
 
@@ -673,7 +795,7 @@ class MediaVaultApp(ctk.CTk):
     def _apply_filters(self, *args):
         """Apply filters and refresh the data table."""
         # Get filter values
-        emotion = self.emotion_filter.get()
+        emotion = self._selected_emotion()
 
         person_min = None
         person_max = None
@@ -687,15 +809,44 @@ class MediaVaultApp(ctk.CTk):
 
         keyword = self.keyword_search.get().strip()
 
+        # Date range (the "to" day is inclusive)
+        date_from = self._parse_date_entry(self.date_from.get())
+        date_to = self._parse_date_entry(self.date_to.get())
+        if date_to is not None:
+            date_to += 24 * 60 * 60
+
+        filters = {
+            'emotion_filter': emotion if emotion != "All" else None,
+            'person_count_min': person_min,
+            'person_count_max': person_max,
+            'keyword_search': keyword if keyword else None,
+            'date_from': date_from,
+            'date_to': date_to
+        }
+
         # Get filtered data
         db = self.scanner.get_database()
-        self.current_filtered_data = db.get_filtered_metadata(
-            emotion_filter=emotion if emotion != "All" else None,
-            person_count_min=person_min,
-            person_count_max=person_max,
-            keyword_search=keyword if keyword else None
-        )
+        self.current_filters = filters
+        self.current_filtered_data = db.get_filtered_metadata(**filters)
+
+        # Show how many results each filter choice would produce
+        self._update_facet_counts(db.get_facet_counts(top_keyword_limit=5, **filters))
+
+        self._show_filtered_records()
+
+    def _filter_date_range(self, date_from, date_to):
+        """Set the date range filter from a timeline selection and refresh the table."""
+        self.date_from.delete(0, "end")
+        self.date_to.delete(0, "end")
+        if date_from is not None:
+            self.date_from.insert(0, MediaDatabase.bucket_label(date_from, 'day'))
+        if date_to is not None:
+            # The "to" entry is inclusive
+            self.date_to.insert(0, MediaDatabase.bucket_label(date_to - 1, 'day'))
+        self._apply_filters()
 
+    def _show_filtered_records(self):
+        """Redraw the data table from current_filtered_data."""
         # Clear existing data rows (keep header)
         for widget in self.filtered_data_scroll.winfo_children()[1:]:
             widget.destroy()
@@ -704,6 +855,136 @@ class MediaVaultApp(ctk.CTk):
         for i, record in enumerate(self.current_filtered_data[:100], start=1):
             self._create_filtered_data_row(i, record)
 
+        # Prefill thumbnails of the results beyond the displayed rows
+        self.thumbnail_queue.prefill(
+            record['filepath']
+            for record in self.current_filtered_data[100:100 + Config.THUMBNAIL_PREFILL_LIMIT]
+        )
+
+    def _show_similar(self, record: dict, index: Optional[IVFIndex] = None):
+        """
+        Replace the table with the images most similar to a record ("more like this").
+
+        Args:
+            record: Record to find similar images for
+            index: Index to query (default: the cached index, built in the background if missing)
+        """
+        vector = ImageEmbedder.from_blob(record.get('embedding'))
+        if vector is None:
+            self.facet_label.configure(text=f"No visual fingerprint for {record.get('filename')} (rescan to add one)")
+            return
+
+        index = index or self.vector_index
+        if index is None:
+            # Build the index off the UI thread; the latest request is shown when it is ready
+            building = self.similar_pending is not None
+            self.similar_pending = record
+            self.facet_label.configure(text=f"Building similarity index… ({record.get('filename')} queued)")
+            if not building:
+                index_thread = threading.Thread(
+                    target=self._build_vector_index,
+                    args=(self.vector_index_version,),
+                    daemon=True
+                )
+                index_thread.start()
+            return
+
+        db = self.scanner.get_database()
+        matches = index.query(vector, k=Config.SIMILAR_RESULTS_LIMIT, exclude_id=record.get('id'))
+        self.current_filtered_data = [record] + db.get_metadata_by_ids([record_id for record_id, _ in matches])
+        self._set_displayed_records()
+        self.facet_label.configure(
+            text=f"{len(matches)} images similar to {record.get('filename')}  |  Apply Filters to return"
+        )
+        self._show_filtered_records()
+
+    def _build_vector_index(self, version: int):
+        """Build the similarity index in a background thread."""
+        try:
+            index = IVFIndex.from_database(self.scanner.get_database())
+        except Exception as e:
+            print(f"Error building similarity index: {e}")
+            self.after(0, lambda: self._fail_vector_index(str(e)))
+            return
+        self.after(0, lambda: self._finish_vector_index(index, version))
+
+    def _finish_vector_index(self, index: IVFIndex, version: int):
+        """Store the built index and run the queued query on the UI thread."""
+        record, self.similar_pending = self.similar_pending, None
+        # An index started before a scan finished is outdated: it answers the
+        # queued query but is not cached, so the next query builds a new one
+        if version == self.vector_index_version:
+            self.vector_index = index
+        if record is not None:
+            self._show_similar(record, index)
+
+    def _fail_vector_index(self, error: str):
+        """Report a failed index build on the UI thread (the next query tries again)."""
+        self.similar_pending = None
+        self.facet_label.configure(text=f"Could not build the similarity index: {error}")
+
+    def _show_map_area(self, bounds: tuple, media_count: int):
+        """Replace the table with the files of a map marker."""
+        records = self.scanner.get_database().get_area_records(*bounds)
+        self.current_filtered_data = records
+        self._set_displayed_records()
+        self.facet_label.configure(
+            text=f"{media_count} geotagged files in the selected map area  |  Apply Filters to return"
+        )
+        self._show_filtered_records()
+        self.analysis_tabs.set("Data")
+
+    def _show_event(self, event: dict):
+        """Replace the table with the files of an event."""
+        self.current_filtered_data = self.scanner.get_database().get_event_records(event['id'])
+        self._set_displayed_records()
+        place = f" at {event['place_name']}" if event.get('place_name') else ""
+        self.facet_label.configure(
+            text=f"{event['media_count']} files of the event from "
+                 f"{MediaDatabase.bucket_label(event['start_timestamp'], 'day')}{place}  |  Apply Filters to return"
+        )
+        self._show_filtered_records()
+        self.analysis_tabs.set("Data")
+
+    def _set_displayed_records(self):
+        """Make the filtered export cover the records of a view that filters cannot express."""
+        self.current_filters = {'record_ids': [record['id'] for record in self.current_filtered_data]}
+
+    def _selected_emotion(self) -> str:
+        """Get the selected sentiment without its facet count suffix (e.g. "Positive (12)")."""
+        return self.emotion_filter.get().split(" (")[0].strip()
+
+    def _update_facet_counts(self, facets: dict):
+        """Update filter choices and the facet summary with result counts."""
+        sentiment_counts = facets['sentiment']
+        self.emotion_filter.configure(values=["All"] + [
+            f"{sentiment} ({sentiment_counts.get(sentiment, 0)})"
+            for sentiment in ("Positive", "Neutral", "Negative")
+        ])
+        # Show the current count of the selected choice instead of the stale one
+        emotion = self._selected_emotion()
+        if emotion != "All":
+            self.emotion_filter.set(f"{emotion} ({sentiment_counts.get(emotion, 0)})")
+
+        people = " · ".join(f"{label}: {count}" for label, count in facets['person_count'].items())
+        file_types = " · ".join(f"{file_type}: {count}" for file_type, count in facets['file_type'].items())
+        keywords = ", ".join(f"{keyword} ({count})" for keyword, count in facets['keywords'].items())
+
+        self.facet_label.configure(
+            text=f"{facets['total']} matches  |  People {people}  |  {file_types or 'No files'}"
+                 f"  |  Top keywords: {keywords or 'none'}"
+        )
+
+    def _parse_date_entry(self, value: str):
+        """Convert a YYYY-MM-DD entry into epoch seconds (None if empty or invalid)."""
+        value = value.strip()
+        if not value:
+            return None
+        try:
+            return calendar.timegm(datetime.strptime(value, '%Y-%m-%d').timetuple())
+        except ValueError:
+            return None
+
     def _create_filtered_data_row(self, row_num: int, record: dict):
         """Create a filtered data row with thumbnail and click functionality."""
         filepath = record.get('filepath', '')
@@ -717,13 +998,15 @@ class MediaVaultApp(ctk.CTk):
         row_frame.grid_columnconfigure((1, 2, 3, 4, 5), weight=1)
         row_frame.grid_columnconfigure(0, weight=0, minsize=80)
 
-        # Make the entire row clickable
+        # Make the entire row clickable (right-click shows visually similar images)
         row_frame.bind("<Button-1>", lambda e: self._open_file(filepath))
+        row_frame.bind("<Button-3>", lambda e: self._show_similar(record))
 
         # Thumbnail
         thumbnail_label = self._create_thumbnail_widget(row_frame, record)
         thumbnail_label.grid(row=0, column=0, padx=8, pady=6, sticky="w")
         thumbnail_label.bind("<Button-1>", lambda e: self._open_file(filepath))
+        thumbnail_label.bind("<Button-3>", lambda e: self._show_similar(record))
 
         # Filename
         filename_label = ctk.CTkLabel(
@@ -789,10 +1072,11 @@ class MediaVaultApp(ctk.CTk):
         placeholder_img = Image.new('RGB', (64, 64), color='#3B3B3B')
 
         try:
-            if thumbnail_path and os.path.exists(thumbnail_path):
-                # Load the actual thumbnail
+            # Thumbnail store first, then legacy per-file thumbnails
+            pil_image = self.thumbnail_store.get_image(record.get('filepath'), 64)
+            if pil_image is None and thumbnail_path and os.path.isfile(thumbnail_path):
                 pil_image = Image.open(thumbnail_path)
-            else:
+            if pil_image is None:
                 # Use placeholder
                 pil_image = placeholder_img
         except Exception as e:
@@ -815,8 +1099,27 @@ class MediaVaultApp(ctk.CTk):
         )
         thumbnail_label.image = ctk_image  # Keep a reference
 
+        # Generate missing thumbnails in the background and swap them in when ready
+        if pil_image is placeholder_img and record.get('filepath'):
+            self.thumbnail_labels[record['filepath']] = thumbnail_label
+            self.thumbnail_queue.request([record['filepath']])
+
         return thumbnail_label
 
+    def _refresh_thumbnail(self, filepath: str):
+        """Replace a placeholder with the thumbnail generated in the background."""
+        thumbnail_label = self.thumbnail_labels.pop(filepath, None)
+        if thumbnail_label is None or not thumbnail_label.winfo_exists():
+            return
+
+        pil_image = self.thumbnail_store.get_image(filepath, 64)
+        if pil_image is None:
+            return
+
+        ctk_image = ctk.CTkImage(light_image=pil_image, dark_image=pil_image, size=(64, 64))
+        thumbnail_label.configure(image=ctk_image)
+        thumbnail_label.image = ctk_image
+
     def _open_file(self, filepath: str):
         """Open the media file with the default system viewer."""
         if not filepath or not os.path.exists(filepath):
@@ -836,33 +1139,67 @@ class MediaVaultApp(ctk.CTk):
             )
 
     def _export_data(self):
-        """Export data to CSV file."""
+        """Export data to a CSV, Parquet or Arrow file."""
         # Ask user what to export
         dialog = ExportDialog(self)
         self.wait_window(dialog)
 
-        if not hasattr(dialog, 'export_choice'):
+        if not dialog.export_choice:
             return
 
         # Get file path
         filepath = filedialog.asksaveasfilename(
-            title="Save CSV File",
+            title="Export Data",
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            filetypes=[
+                ("CSV files", "*.csv"),
+                ("Parquet files", "*.parquet"),
+                ("Arrow IPC files", "*.arrow"),
+                ("All files", "*.*")
+            ]
         )
 
         if not filepath:
             return
 
-        # Export data
+        # Export in the background (rows are streamed from the database)
+        filters = {} if dialog.export_choice == "all" else dict(self.current_filters)
+        self.export_btn.configure(state="disabled", text="Exporting...")
+
+        export_thread = threading.Thread(
+            target=self._run_export,
+            args=(filepath, filters),
+            daemon=True
+        )
+        export_thread.start()
+
+    def _run_export(self, filepath: str, filters: dict):
+        """Run the export in a background thread."""
+        exported = [0]
+
+        def on_progress(written: int, total: int):
+            exported[0] = written
+            percent = int(written / total * 100) if total > 0 else 100
+            self.after(0, lambda: self.export_btn.configure(text=f"Exporting {percent}%"))
+
         db = self.scanner.get_database()
+        file_ext = Path(filepath).suffix.lower()
+
+        if file_ext in ('.parquet', '.arrow'):
+            success = db.export_to_columnar(
+                filepath,
+                file_format=file_ext[1:],
+                progress_callback=on_progress,
+                **filters
+            )
+        else:
+            success = db.export_to_csv(filepath, progress_callback=on_progress, **filters)
+
+        self.after(0, lambda: self._finish_export(success, exported[0], filepath))
 
-        if dialog.export_choice == "all":
-            success = db.export_to_csv(filepath)
-            count = db.get_record_count()
-        else:  # filtered
-            success = db.export_to_csv(filepath, self.current_filtered_data)
-            count = len(self.current_filtered_data)
+    def _finish_export(self, success: bool, count: int, filepath: str):
+        """Report the export result on the UI thread."""
+        self.export_btn.configure(state="normal", text="📊 Export Data")
 
         if success:
             messagebox.showinfo(
@@ -918,7 +1255,7 @@ class ExportDialog(ctk.CTkToplevel):
 
         filtered_btn = ctk.CTkButton(
             main_frame,
-            text="Export Filtered Records Only",
+            text="Export Displayed Records Only",
             command=lambda: self._set_choice("filtered"),
             width=200,
             height=40,
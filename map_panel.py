@@ -0,0 +1,215 @@
+"""
+MediaVault Scanner - Map Panel
+Pan/zoom map of geotagged media for the analysis screen. Markers are grid
+cells aggregated from the location clusters of the visible viewport, so the
+number of canvas items stays small regardless of the library size.
+"""
+
+import tkinter as tk
+from typing import Callable, Dict, Optional, Tuple
+
+import customtkinter as ctk
+from PIL import Image, ImageTk
+
+from map_tiles import MapViewport, TileRenderer
+
+
+class MapPanel(ctk.CTkFrame):
+    """Canvas map with offline base tiles and aggregated media markers."""
+
+    # Markers closer than this many pixels are merged into one
+    MARKER_CELL_PIXELS = 64
+
+    # Markers drawn with the thumbnail of their representative record (largest first)
+    THUMBNAIL_MARKERS = 30
+    THUMBNAIL_SIZE = 40
+
+    # Delay before querying markers after the view changes (ms)
+    MARKER_QUERY_DELAY = 120
+
+    # Mouse movement below which a press/release is treated as a click
+    CLICK_TOLERANCE = 4
+
+    MARKER_COLOR = "#1F8FFF"
+    MARKER_OUTLINE = "#FFFFFF"
+
+    def __init__(self, parent, get_database: Callable, thumbnail_store=None, geocoder=None,
+                 on_select: Optional[Callable[[Tuple[float, float, float, float], int], None]] = None,
+                 **kwargs):
+        """
+        Initialize the map panel.
+
+        Args:
+            parent: Parent widget
+            get_database: Callable returning the MediaDatabase to query
+            thumbnail_store: ThumbnailStore for marker thumbnails (optional)
+            geocoder: ReverseGeocoder whose places are drawn on the base map (optional)
+            on_select: Called with (cell bounds, media count) when a marker is clicked
+        """
+        super().__init__(parent, **kwargs)
+        self.get_database = get_database
+        self.thumbnail_store = thumbnail_store
+        self.on_select = on_select
+
+        self.viewport = MapViewport()
+        self.renderer = TileRenderer(geocoder)
+        self.tile_images: Dict[Tuple[int, int, int], ImageTk.PhotoImage] = {}
+        self.thumbnail_images: Dict[str, Optional[ImageTk.PhotoImage]] = {}
+        self.markers = []  # cells of the last marker query
+        self._marker_job = None
+        self._drag_start = None
+        self._drag_last = None
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.canvas = tk.Canvas(self, bg="#1D2733", highlightthickness=0, cursor="fleur")
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+
+        controls = ctk.CTkFrame(self, fg_color="transparent")
+        controls.grid(row=1, column=0, padx=5, pady=5, sticky="ew")
+        controls.grid_columnconfigure(2, weight=1)
+        ctk.CTkButton(controls, text="+", width=32, command=lambda: self._zoom_center(1)).grid(row=0, column=0, padx=2)
+        ctk.CTkButton(controls, text="−", width=32, command=lambda: self._zoom_center(-1)).grid(row=0, column=1, padx=2)
+        self.status_label = ctk.CTkLabel(controls, text="", font=ctk.CTkFont(size=11), text_color="#AAAAAA")
+        self.status_label.grid(row=0, column=2, padx=10, sticky="w")
+
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<ButtonPress-1>", self._on_press)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<ButtonRelease-1>", self._on_release)
+        self.canvas.bind("<MouseWheel>", lambda e: self._on_wheel(e, 1 if e.delta > 0 else -1))
+        self.canvas.bind("<Button-4>", lambda e: self._on_wheel(e, 1))
+        self.canvas.bind("<Button-5>", lambda e: self._on_wheel(e, -1))
+
+    def refresh(self):
+        """Reload the markers (e.g. after a scan)."""
+        self.thumbnail_images.clear()
+        self._redraw()
+
+    def _redraw(self):
+        """Redraw the base tiles now and the markers once the view settles."""
+        self._draw_tiles()
+        self._draw_markers()
+        if self._marker_job is not None:
+            self.after_cancel(self._marker_job)
+        self._marker_job = self.after(self.MARKER_QUERY_DELAY, self._load_markers)
+
+    def _draw_tiles(self):
+        """Place the visible base-map tiles on the canvas."""
+        self.canvas.delete("tile")
+        zoom = self.viewport.zoom
+        visible = set()
+        for tile_x, tile_y, x, y in self.viewport.visible_tiles():
+            key = (zoom, tile_x, tile_y)
+            visible.add(key)
+            if key not in self.tile_images:
+                self.tile_images[key] = ImageTk.PhotoImage(self.renderer.render(zoom, tile_x, tile_y))
+            self.canvas.create_image(x, y, image=self.tile_images[key], anchor="nw", tags="tile")
+        self.canvas.tag_lower("tile")
+
+        # Keep Tk images of visible tiles only (the renderer caches the pixels)
+        for key in [key for key in self.tile_images if key not in visible]:
+            del self.tile_images[key]
+
+    def _load_markers(self):
+        """Query the aggregated markers of the visible area."""
+        self._marker_job = None
+        cell_degrees = self.viewport.degrees_per_pixel() * self.MARKER_CELL_PIXELS
+        try:
+            self.markers = self.get_database().get_map_clusters(*self.viewport.bounds(), cell_degrees)
+        except Exception as e:
+            print(f"Error loading map markers: {e}")
+            self.markers = []
+        self._draw_markers()
+
+        total = sum(marker['media_count'] for marker in self.markers)
+        self.status_label.configure(text=f"{total} geotagged files in view | zoom {self.viewport.zoom}"
+                                         f" | drag to pan, scroll to zoom, click a marker to list its files")
+
+    def _draw_markers(self):
+        """Draw the current markers at their screen positions."""
+        self.canvas.delete("marker")
+        width, height = self.viewport.width, self.viewport.height
+        for index, marker in enumerate(self.markers):
+            x, y = self.viewport.to_screen(marker['latitude'], marker['longitude'])
+            if not (-self.MARKER_CELL_PIXELS <= x <= width + self.MARKER_CELL_PIXELS and
+                    -self.MARKER_CELL_PIXELS <= y <= height + self.MARKER_CELL_PIXELS):
+                continue
+            tags = ("marker", f"marker_{index}")
+
+            thumbnail = self._get_thumbnail(marker['filepath']) if index < self.THUMBNAIL_MARKERS else None
+            if thumbnail is not None:
+                half = self.THUMBNAIL_SIZE // 2
+                self.canvas.create_rectangle(x - half - 2, y - half - 2, x + half + 2, y + half + 2,
+                                             fill=self.MARKER_OUTLINE, outline="", tags=tags)
+                self.canvas.create_image(x, y, image=thumbnail, tags=tags)
+                badge_x, badge_y = x + half, y - half
+            else:
+                radius = min(22, 8 + len(str(marker['media_count'])) * 3)
+                self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius,
+                                        fill=self.MARKER_COLOR, outline=self.MARKER_OUTLINE, width=2, tags=tags)
+                badge_x, badge_y = x, y
+
+            self.canvas.create_text(badge_x, badge_y, text=str(marker['media_count']), fill="white",
+                                    font=("Segoe UI", 9, "bold"), tags=tags)
+
+    def _get_thumbnail(self, filepath: Optional[str]) -> Optional[ImageTk.PhotoImage]:
+        """Get (and cache) the square marker thumbnail of a record."""
+        if not filepath or self.thumbnail_store is None:
+            return None
+        if filepath not in self.thumbnail_images:
+            image = self.thumbnail_store.get_image(filepath, 64)
+            if image is not None:
+                image = image.convert('RGB').resize((self.THUMBNAIL_SIZE, self.THUMBNAIL_SIZE), Image.LANCZOS)
+                self.thumbnail_images[filepath] = ImageTk.PhotoImage(image)
+            else:
+                self.thumbnail_images[filepath] = None
+        return self.thumbnail_images[filepath]
+
+    def _marker_at(self, x: float, y: float) -> Optional[dict]:
+        """Get the marker under a canvas position."""
+        for item in reversed(self.canvas.find_overlapping(x, y, x, y)):
+            for tag in self.canvas.gettags(item):
+                if tag.startswith("marker_"):
+                    return self.markers[int(tag[len("marker_"):])]
+        return None
+
+    def _on_resize(self, event):
+        self.viewport.resize(event.width, event.height)
+        self._redraw()
+
+    def _on_press(self, event):
+        self._drag_start = self._drag_last = (event.x, event.y)
+
+    def _on_drag(self, event):
+        if self._drag_last is None:
+            return
+        dx, dy = event.x - self._drag_last[0], event.y - self._drag_last[1]
+        self._drag_last = (event.x, event.y)
+        # Move the existing items immediately; tiles are re-laid out as the view moves
+        self.viewport.pan(dx, dy)
+        self._draw_tiles()
+        self.canvas.move("marker", dx, dy)
+
+    def _on_release(self, event):
+        if self._drag_start is None:
+            return
+        moved = abs(event.x - self._drag_start[0]) + abs(event.y - self._drag_start[1])
+        self._drag_start = self._drag_last = None
+        if moved <= self.CLICK_TOLERANCE:
+            marker = self._marker_at(event.x, event.y)
+            if marker is not None and self.on_select:
+                self.on_select(marker['bounds'], marker['media_count'])
+            return
+        self._redraw()
+
+    def _on_wheel(self, event, delta: int):
+        self.viewport.zoom_at(event.x, event.y, delta)
+        self.markers = []
+        self._redraw()
+
+    def _zoom_center(self, delta: int):
+        self.viewport.zoom_at(self.viewport.width / 2, self.viewport.height / 2, delta)
+        self.markers = []
+        self._redraw()
@@ -0,0 +1,280 @@
+"""
+MediaVault Scanner - Map Tiles Module
+Web Mercator viewport math and an offline base-map tile renderer (graticule and
+gazetteer places) for the map panel. No network access is needed.
+"""
+
+import math
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+TILE_SIZE = 256
+MAX_LATITUDE = 85.05112878  # Web Mercator limit
+
+
+def project(latitude: float, longitude: float, zoom: int) -> Tuple[float, float]:
+    """
+    Project a coordinate to world pixels at a zoom level.
+
+    Args:
+        latitude: Latitude in decimal degrees (clamped to the Mercator limit)
+        longitude: Longitude in decimal degrees
+
+    Returns:
+        (x, y) in pixels from the top-left corner of the world map
+    """
+    world_size = TILE_SIZE * (1 << zoom)
+    latitude = math.radians(max(-MAX_LATITUDE, min(MAX_LATITUDE, latitude)))
+    x = (longitude + 180.0) / 360.0 * world_size
+    y = (1.0 - math.log(math.tan(latitude) + 1.0 / math.cos(latitude)) / math.pi) / 2.0 * world_size
+    return x, y
+
+
+def unproject(x: float, y: float, zoom: int) -> Tuple[float, float]:
+    """
+    Convert world pixels at a zoom level back to a coordinate.
+
+    Returns:
+        (latitude, longitude) in decimal degrees
+    """
+    world_size = TILE_SIZE * (1 << zoom)
+    longitude = x / world_size * 360.0 - 180.0
+    latitude = math.degrees(math.atan(math.sinh(math.pi * (1.0 - 2.0 * y / world_size))))
+    return latitude, longitude
+
+
+class MapViewport:
+    """Visible part of the map: centre, integer zoom level and size in pixels."""
+
+    MIN_ZOOM = 1
+    MAX_ZOOM = 17
+
+    def __init__(self, width: int = 600, height: int = 400,
+                 latitude: float = 20.0, longitude: float = 0.0, zoom: int = 2):
+        """
+        Initialize the viewport.
+
+        Args:
+            width: Width in pixels
+            height: Height in pixels
+            latitude: Latitude of the centre
+            longitude: Longitude of the centre
+            zoom: Zoom level (the world is 256 * 2^zoom pixels wide)
+        """
+        self.width = width
+        self.height = height
+        self.zoom = max(self.MIN_ZOOM, min(self.MAX_ZOOM, zoom))
+        self.center_x, self.center_y = project(latitude, longitude, self.zoom)
+        self._clamp()
+
+    @property
+    def world_size(self) -> int:
+        return TILE_SIZE * (1 << self.zoom)
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        """(latitude, longitude) of the viewport centre."""
+        return unproject(self.center_x, self.center_y, self.zoom)
+
+    def resize(self, width: int, height: int):
+        """Change the size in pixels, keeping the centre."""
+        self.width = max(1, width)
+        self.height = max(1, height)
+        self._clamp()
+
+    def pan(self, dx: float, dy: float):
+        """Move the map content by (dx, dy) screen pixels."""
+        self.center_x -= dx
+        self.center_y -= dy
+        self._clamp()
+
+    def zoom_at(self, x: float, y: float, delta: int):
+        """
+        Zoom in (delta > 0) or out, keeping the point under (x, y) in place.
+
+        Args:
+            x: Screen x of the zoom anchor
+            y: Screen y of the zoom anchor
+            delta: Zoom levels to add
+        """
+        zoom = max(self.MIN_ZOOM, min(self.MAX_ZOOM, self.zoom + delta))
+        if zoom == self.zoom:
+            return
+        latitude, longitude = self.to_latlon(x, y)
+        self.zoom = zoom
+        anchor_x, anchor_y = project(latitude, longitude, zoom)
+        self.center_x = anchor_x - (x - self.width / 2)
+        self.center_y = anchor_y - (y - self.height / 2)
+        self._clamp()
+
+    def to_screen(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        """Screen position of a coordinate (the world copy closest to the centre)."""
+        x, y = project(latitude, longitude, self.zoom)
+        world_size = self.world_size
+        dx = (x - self.center_x + world_size / 2) % world_size - world_size / 2
+        return self.width / 2 + dx, self.height / 2 + y - self.center_y
+
+    def to_latlon(self, x: float, y: float) -> Tuple[float, float]:
+        """Coordinate under a screen position."""
+        world_size = self.world_size
+        world_x = (self.center_x + x - self.width / 2) % world_size
+        world_y = max(0.0, min(world_size, self.center_y + y - self.height / 2))
+        return unproject(world_x, world_y, self.zoom)
+
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """
+        Get the visible area.
+
+        Returns:
+            (min_latitude, max_latitude, min_longitude, max_longitude); when the
+            view crosses the antimeridian, min_longitude > max_longitude
+        """
+        max_latitude, _ = self.to_latlon(0, 0)
+        min_latitude, _ = self.to_latlon(0, self.height)
+        if self.width >= self.world_size:
+            return min_latitude, max_latitude, -180.0, 180.0
+        _, min_longitude = self.to_latlon(0, 0)
+        _, max_longitude = self.to_latlon(self.width, 0)
+        return min_latitude, max_latitude, min_longitude, max_longitude
+
+    def degrees_per_pixel(self) -> float:
+        """Longitude degrees covered by one screen pixel."""
+        return 360.0 / self.world_size
+
+    def visible_tiles(self) -> List[Tuple[int, int, float, float]]:
+        """
+        Get the tiles covering the viewport.
+
+        Returns:
+            List of (tile_x, tile_y, screen_x, screen_y) with the screen position
+            of each tile's top-left corner (tile_x wraps around the world)
+        """
+        tile_count = 1 << self.zoom
+        left = self.center_x - self.width / 2
+        top = self.center_y - self.height / 2
+        tiles = []
+        for tile_y in range(math.floor(top / TILE_SIZE), math.ceil((top + self.height) / TILE_SIZE)):
+            if not 0 <= tile_y < tile_count:
+                continue
+            for tile_x in range(math.floor(left / TILE_SIZE), math.ceil((left + self.width) / TILE_SIZE)):
+                tiles.append((tile_x % tile_count, tile_y, tile_x * TILE_SIZE - left, tile_y * TILE_SIZE - top))
+        return tiles
+
+    def _clamp(self):
+        """Wrap the centre horizontally and keep the map filling the view vertically."""
+        world_size = self.world_size
+        self.center_x %= world_size
+        if self.height >= world_size:
+            self.center_y = world_size / 2
+        else:
+            self.center_y = max(self.height / 2, min(world_size - self.height / 2, self.center_y))
+
+
+class TileRenderer:
+    """
+    Renders base-map tiles locally: a graticule plus the gazetteer places.
+
+    Tiles are cached (least recently used tiles are dropped first), so panning
+    over already visited areas only re-blits images.
+    """
+
+    BACKGROUND_COLOR = (29, 39, 51)
+    GRID_COLOR = (46, 59, 74)
+    PLACE_COLOR = (93, 113, 133)
+    LABEL_COLOR = (143, 163, 184)
+
+    # Place names are drawn from this zoom level on
+    LABEL_MIN_ZOOM = 5
+
+    # Graticule spacings in degrees; the finest one at least this many pixels apart is used
+    GRID_STEPS = (30, 10, 5, 2, 1, 0.5, 0.2, 0.1, 0.05, 0.02, 0.01, 0.005, 0.002)
+    GRID_MIN_PIXELS = 96
+
+    def __init__(self, geocoder=None, cache_size: int = 256):
+        """
+        Initialize the renderer.
+
+        Args:
+            geocoder: ReverseGeocoder whose gazetteer places are drawn (optional)
+            cache_size: Maximum number of cached tiles
+        """
+        self.geocoder = geocoder
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # (zoom, tile_x, tile_y) -> Image
+        self._font = ImageFont.load_default()
+        self._places = None  # (world x, world y at zoom 0, name)
+
+    def render(self, zoom: int, tile_x: int, tile_y: int) -> Image.Image:
+        """
+        Get a base-map tile.
+
+        Args:
+            zoom: Zoom level
+            tile_x: Tile column (0 .. 2^zoom - 1)
+            tile_y: Tile row (0 .. 2^zoom - 1)
+
+        Returns:
+            RGB image of TILE_SIZE x TILE_SIZE pixels
+        """
+        key = (zoom, tile_x, tile_y)
+        tile = self._cache.get(key)
+        if tile is not None:
+            self._cache.move_to_end(key)
+            return tile
+
+        tile = Image.new('RGB', (TILE_SIZE, TILE_SIZE), self.BACKGROUND_COLOR)
+        draw = ImageDraw.Draw(tile)
+        self._draw_graticule(draw, zoom, tile_x, tile_y)
+        self._draw_places(draw, zoom, tile_x, tile_y)
+
+        self._cache[key] = tile
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return tile
+
+    def _draw_graticule(self, draw: ImageDraw.ImageDraw, zoom: int, tile_x: int, tile_y: int):
+        """Draw latitude/longitude lines crossing the tile."""
+        pixels_per_degree = TILE_SIZE * (1 << zoom) / 360.0
+        step = next((step for step in reversed(self.GRID_STEPS)
+                     if step * pixels_per_degree >= self.GRID_MIN_PIXELS), self.GRID_STEPS[0])
+        left, top = tile_x * TILE_SIZE, tile_y * TILE_SIZE
+        north, west = unproject(left, top, zoom)
+        south, east = unproject(left + TILE_SIZE, top + TILE_SIZE, zoom)
+
+        for index in range(int(math.ceil(west / step)), int(math.floor(east / step)) + 1):
+            x = project(0.0, index * step, zoom)[0] - left
+            draw.line([(x, 0), (x, TILE_SIZE)], fill=self.GRID_COLOR)
+        for index in range(int(math.ceil(south / step)), int(math.floor(north / step)) + 1):
+            y = project(index * step, 0.0, zoom)[1] - top
+            draw.line([(0, y), (TILE_SIZE, y)], fill=self.GRID_COLOR)
+
+    def _draw_places(self, draw: ImageDraw.ImageDraw, zoom: int, tile_x: int, tile_y: int):
+        """Draw the gazetteer places inside the tile."""
+        places = self._get_places()
+        if places is None:
+            return
+
+        scale = 1 << zoom
+        xs = places[0] * scale - tile_x * TILE_SIZE
+        ys = places[1] * scale - tile_y * TILE_SIZE
+        # Include places just left of / above the tile whose dot or label reaches into it
+        inside = np.flatnonzero((xs >= -80) & (xs < TILE_SIZE + 2) & (ys >= -8) & (ys < TILE_SIZE + 8))
+        radius = 1 if zoom < 4 else 2
+        for index in inside.tolist():
+            x, y = float(xs[index]), float(ys[index])
+            draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=self.PLACE_COLOR)
+            if zoom >= self.LABEL_MIN_ZOOM:
+                draw.text((x + 4, y - 6), places[2][index], fill=self.LABEL_COLOR, font=self._font)
+
+    def _get_places(self) -> Optional[Tuple[np.ndarray, np.ndarray, List[str]]]:
+        """Project the gazetteer places to zoom-0 world pixels (once)."""
+        if self._places is None and self.geocoder is not None and self.geocoder.load():
+            coordinates = np.asarray(self.geocoder.coordinates, dtype=np.float64)
+            latitudes = np.radians(np.clip(coordinates[:, 0], -MAX_LATITUDE, MAX_LATITUDE))
+            xs = (coordinates[:, 1] + 180.0) / 360.0 * TILE_SIZE
+            ys = (1.0 - np.log(np.tan(latitudes) + 1.0 / np.cos(latitudes)) / np.pi) / 2.0 * TILE_SIZE
+            self._places = (xs, ys, [place[0] for place in self.geocoder.places])
+        return self._places
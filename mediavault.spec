@@ -49,6 +49,9 @@ haar_cascade_path = os.path.join(cv2_data_path, 'data', 'haarcascade_frontalface
 if os.path.exists(haar_cascade_path):
     datas.append((haar_cascade_path, 'cv2/data'))
 
+# Bundled offline reverse-geocoding gazetteer
+datas.append(('gazetteer.csv', '.'))
+
 # Collect CustomTkinter assets
 try:
     ctk_datas = collect_data_files('customtkinter')
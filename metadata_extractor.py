@@ -3,13 +3,15 @@ MediaVault Scanner - Metadata Extraction Module (GGUF OCR Version)
 Extracts metadata from images and videos using various techniques.
 """
 
+import io
 import os
+import calendar
 from datetime import datetime
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, List
 from pathlib import Path
 
 # Image processing
-from PIL import Image
+from PIL import Image, ImageOps
 from PIL.ExifTags import TAGS, GPSTAGS
 import exifread
 
@@ -17,9 +19,176 @@ import exifread
 import cv2
 import numpy as np
 
+# Optional: PyAV for keyframe-only video decoding (falls back to OpenCV seeks)
+try:
+    import av
+    PYAV_AVAILABLE = True
+except ImportError:
+    PYAV_AVAILABLE = False
+
 # GGUF OCR (Deepseek GGUF with Tesseract fallback)
 from gguf_ocr import GGUF_OCR
 
+# Header-only metadata parsing (EXIF blocks, MP4/MOV atoms, AVI headers)
+from exif_reader import ExifReader
+from video_container import VideoContainerParser
+
+# Multi-resolution thumbnail pack store
+from thumbnail_store import ThumbnailStore
+
+# Batched object/scene heuristic engine
+from scene_detector import SceneDetector
+
+# Face counting (bounded-size Haar cascade or OpenCV DNN)
+from face_detector import FaceDetector
+
+# Perceptual hashing for near-duplicate detection
+from near_duplicates import dhash, to_signed
+
+# Colour/texture embeddings for visual similarity search
+from image_embedding import ImageEmbedder
+
+# Offline reverse geocoding of GPS positions
+from reverse_geocoder import ReverseGeocoder
+
+# Sentiment keyword matcher, shared stop words and day periods
+from keyword_rules import KeywordDictionary, day_period
+
+
+class VideoReader:
+    """
+    Single OpenCV capture session for a video file.
+
+    The container is opened once; decoded frames are cached by position so the
+    same frame can be shared by face detection, OCR, object detection and the
+    thumbnail without re-opening or re-seeking the file.
+    """
+
+    def __init__(self, filepath: str):
+        """
+        Open the video file.
+
+        Args:
+            filepath: Full path to the video file
+        """
+        self.filepath = filepath
+        self.capture = cv2.VideoCapture(filepath)
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 0.0
+        self.frame_count = int(self.capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        self.duration = self.frame_count / self.fps if self.fps > 0 else 0.0
+        self._frames = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def is_opened(self) -> bool:
+        """Check whether the container could be opened."""
+        return self.capture.isOpened()
+
+    def read_frame_at(self, at_second: float) -> Optional[np.ndarray]:
+        """
+        Decode the frame at (or just after) the given position.
+
+        Positions past the end of short clips are clamped to the middle of the clip.
+
+        Args:
+            at_second: Position in seconds
+
+        Returns:
+            Decoded BGR frame, or None if it could not be read
+        """
+        if self.duration > 0 and at_second >= self.duration:
+            at_second = self.duration / 2
+
+        position_ms = int(at_second * 1000)
+        if position_ms in self._frames:
+            return self._frames[position_ms]
+
+        frame = None
+        try:
+            # Seek once by timestamp (the demuxer jumps to the preceding keyframe)
+            if position_ms > 0:
+                self.capture.set(cv2.CAP_PROP_POS_MSEC, position_ms)
+            success, decoded = self.capture.read()
+            if success:
+                frame = decoded
+        except Exception:
+            frame = None
+
+        self._frames[position_ms] = frame
+        return frame
+
+    def read_frames_uniform(self, count: int) -> List[Tuple[float, np.ndarray]]:
+        """
+        Decode up to `count` frames at evenly spaced positions.
+
+        Args:
+            count: Frame budget
+
+        Returns:
+            List of (position_seconds, frame) tuples
+        """
+        if self.duration <= 0 or count <= 0:
+            frame = self.read_frame_at(0)
+            return [(0.0, frame)] if frame is not None else []
+
+        frames = []
+        for index in range(count):
+            # Centre each sample within its segment of the clip
+            position = self.duration * (index + 0.5) / count
+            frame = self.read_frame_at(position)
+            if frame is not None:
+                frames.append((position, frame))
+        return frames
+
+    def read_keyframes(self, count: int) -> List[Tuple[float, np.ndarray]]:
+        """
+        Decode up to `count` keyframes spread across the clip.
+
+        Each sample seeks to the keyframe at or before an evenly spaced target and
+        decodes only that keyframe (non-key frames are skipped by the decoder).
+        Falls back to read_frames_uniform when PyAV is not installed.
+
+        Args:
+            count: Frame budget
+
+        Returns:
+            List of (position_seconds, frame) tuples (duplicate keyframes removed)
+        """
+        if not PYAV_AVAILABLE or self.duration <= 0 or count <= 0:
+            return self.read_frames_uniform(count)
+
+        frames = []
+        seen_pts = set()
+        try:
+            with av.open(self.filepath) as container:
+                stream = container.streams.video[0]
+                stream.codec_context.skip_frame = "NONKEY"
+                time_base = float(stream.time_base)
+
+                for index in range(count):
+                    target = self.duration * (index + 0.5) / count
+                    container.seek(int(target / time_base), stream=stream, backward=True, any_frame=False)
+
+                    for decoded in container.decode(stream):
+                        if decoded.pts is not None and decoded.pts not in seen_pts:
+                            seen_pts.add(decoded.pts)
+                            frames.append((decoded.pts * time_base, decoded.to_ndarray(format='bgr24')))
+                        break
+        except Exception as e:
+            print(f"Keyframe decoding failed for {self.filepath}, using frame seeks: {e}")
+            return self.read_frames_uniform(count)
+
+        return frames
+
+    def release(self):
+        """Close the capture session and drop cached frames."""
+        self.capture.release()
+        self._frames.clear()
+
 
 class MetadataExtractor:
     """Extracts comprehensive metadata from media files."""
@@ -28,13 +197,6 @@ class MetadataExtractor:
     IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.heic'}
     VIDEO_EXTENSIONS = {'.mp4', '.mov', '.avi'}
 
-    # Sentiment keywords for heuristic analysis
-    POSITIVE_KEYWORDS = {'vacation', 'birthday', 'party', 'wedding', 'celebration', 'trip', 'holiday'}
-    NEGATIVE_KEYWORDS = {'funeral', 'work', 'meeting', 'office'}
-
-    # Common stopwords to filter from OCR
-    STOPWORDS = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'is', 'are', 'was', 'were'}
-
     # Object/scene detection thresholds (simplified local heuristic)
     # Note: This is a basic color/pattern-based heuristic, not ML-based detection
     COLOR_RANGES = {
@@ -45,26 +207,84 @@ class MetadataExtractor:
         'foliage': {'lower': (25, 30, 30), 'upper': (95, 255, 255)},   # Green/yellow hues
     }
 
+    # Video frame sampling
+    VIDEO_SAMPLE_SECOND = 5  # Position of the single sampled frame / thumbnail frame
+    VIDEO_SAMPLE_MODES = ('single', 'uniform', 'keyframes')
+
     # Thumbnail settings
     THUMBNAIL_SIZE = (64, 64)
+    THUMBNAIL_DECODE_SIZE = (128, 128)  # Intermediate size before the square crop
     THUMBNAIL_DIR = "thumbnails"
+    THUMBNAIL_ASPECT_TOLERANCE = 0.02  # Max aspect ratio difference for embedded previews
+
+    # EXIF orientation -> transpose operations that restore the upright image
+    EXIF_ORIENTATION_TRANSPOSE = {
+        2: [Image.Transpose.FLIP_LEFT_RIGHT],
+        3: [Image.Transpose.ROTATE_180],
+        4: [Image.Transpose.FLIP_TOP_BOTTOM],
+        5: [Image.Transpose.TRANSPOSE],
+        6: [Image.Transpose.ROTATE_270],
+        7: [Image.Transpose.TRANSVERSE],
+        8: [Image.Transpose.ROTATE_90],
+    }
 
-    def __init__(self, gguf_ocr_config: dict = None):
+    def __init__(self, gguf_ocr_config: dict = None, extractor_config: dict = None):
         """
         Initialize the metadata extractor with face detection cascade and GGUF OCR.
 
         Args:
             gguf_ocr_config: Configuration dictionary for GGUF OCR engine
+            extractor_config: Configuration dictionary for extraction options
         """
-        # Load Haar Cascade for face detection
-        cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        self.face_cascade = cv2.CascadeClassifier(cascade_path)
-
-        # Create thumbnails directory if it doesn't exist
-        os.makedirs(self.THUMBNAIL_DIR, exist_ok=True)
+        self.config = extractor_config or {}
+
+        # Video sampling: 'single' frame at VIDEO_SAMPLE_SECOND, or a bounded number of
+        # 'uniform' seek points / 'keyframes' whose results are aggregated
+        self.video_sample_mode = self.config.get('video_sample_mode', 'single')
+        if self.video_sample_mode not in self.VIDEO_SAMPLE_MODES:
+            self.video_sample_mode = 'single'
+        self.video_frame_budget = max(1, int(self.config.get('video_frame_budget', 8)))
+
+        # Lazy thumbnails are generated when first displayed instead of during the scan
+        self.lazy_thumbnails = self.config.get('thumbnail_mode', 'eager') == 'lazy'
+
+        # Object/scene heuristic engine; expensive stages can be disabled for throughput
+        self.scene_detector = SceneDetector(
+            self.COLOR_RANGES,
+            detect_colors=self.config.get('scene_detect_colors', True),
+            detect_edges=self.config.get('scene_detect_edges', True),
+            detect_circles=self.config.get('scene_detect_circles', True)
+        )
+
+        # Face detector (Haar cascade by default, optional DNN backend)
+        self.face_detector = FaceDetector(
+            backend=self.config.get('face_detector_backend', 'haar'),
+            max_dimension=self.config.get('face_max_dimension', 1280),
+            dnn_model_path=self.config.get('face_dnn_model_path'),
+            dnn_config_path=self.config.get('face_dnn_config_path')
+        )
+
+        # Thumbnail pyramid store (pack files + offset index in the thumbnails directory)
+        self.thumbnail_store = ThumbnailStore(self.config.get('thumbnail_dir', self.THUMBNAIL_DIR))
+
+        # Sentiment keywords and OCR stop words (built-in or from a dictionary file)
+        self.keyword_dictionary = KeywordDictionary(self.config.get('keyword_dictionary_path'))
 
         # Initialize GGUF OCR engine (Deepseek GGUF with Tesseract fallback)
-        self.gguf_ocr = GGUF_OCR(config=gguf_ocr_config)
+        self.gguf_ocr = GGUF_OCR(config=gguf_ocr_config, keyword_dictionary=self.keyword_dictionary)
+
+        # Header parsers: EXIF blocks of images, container headers of videos
+        self.exif_reader = ExifReader()
+        self.container_parser = VideoContainerParser()
+
+        # Visual similarity descriptor
+        self.embedder = ImageEmbedder()
+
+        # Offline reverse geocoder (gazetteer loaded on the first geotagged file)
+        self.geocoder = ReverseGeocoder(
+            self.config.get('gazetteer_path'),
+            max_distance_km=self.config.get('geocode_max_distance_km', 250)
+        )
     
     def extract_metadata(self, filepath: str) -> Dict[str, Any]:
         """
@@ -76,90 +296,218 @@ class MetadataExtractor:
         Returns:
             Dictionary containing all extracted metadata
         """
-        file_ext = Path(filepath).suffix.lower()
         filename = os.path.basename(filepath)
-        
-        # Determine file type
-        if file_ext in self.IMAGE_EXTENSIONS:
-            file_type = 'Image'
-        elif file_ext in self.VIDEO_EXTENSIONS:
-            file_type = 'Video'
-        else:
-            file_type = 'Unknown'
-        
+        file_type = self._get_file_type(filepath)
+
         # Initialize metadata dictionary
         metadata = {
             'filepath': filepath,
             'filename': filename,
             'file_type': file_type,
             'date_time_original': None,
+            'capture_timestamp': None,
             'gps_latitude': None,
             'gps_longitude': None,
             'person_count': 0,
             'ocr_text_summary': '',
             'object_keywords': '',
             'emotion_sentiment': 'Neutral',
-            'thumbnail_path': None
+            'sentiment': 'Neutral',
+            'sentiment_context': None,
+            'day_period': None,
+            'thumbnail_path': None,
+            'duration_seconds': None,
+            'width': None,
+            'height': None,
+            'codec': None,
+            'frame_rate': None,
+            'phash': None,
+            'embedding': None,
+            'place_name': None,
+            'place_region': None,
+            'place_country': None
         }
 
         try:
+            video_frame = None
             if file_type == 'Image':
                 self._extract_image_metadata(filepath, metadata)
             elif file_type == 'Video':
-                self._extract_video_metadata(filepath, metadata)
+                video_frame = self._extract_video_metadata(filepath, metadata)
+                if video_frame is not None:
+                    metadata['phash'] = self._compute_phash(video_frame)
+                    metadata['embedding'] = self._compute_embedding(video_frame)
+
+            # Normalize the EXIF capture time into epoch seconds
+            metadata['capture_timestamp'] = self._parse_capture_timestamp(metadata['date_time_original'])
+
+            # Resolve the GPS position to a place name
+            self.geocoder.annotate([metadata])
 
             # Apply emotion/sentiment heuristic
-            metadata['emotion_sentiment'] = self._analyze_emotion_sentiment(filepath, metadata)
+            metadata['emotion_sentiment'] = self.analyze_emotion_sentiment(filepath, metadata)
 
-            # Generate thumbnail
-            metadata['thumbnail_path'] = self._generate_thumbnail(filepath, file_type)
+            # Generate thumbnail (videos reuse the already decoded frame)
+            if not self.lazy_thumbnails:
+                self._generate_thumbnail(filepath, file_type, frame=video_frame)
 
         except Exception as e:
             print(f"Error extracting metadata from {filename}: {e}")
 
         return metadata
-    
+
+    def extract_header_metadata(self, filepath: str) -> Dict[str, Any]:
+        """
+        Extract only the metadata stored in file headers (EXIF-only scan mode).
+
+        Reads the EXIF block of images or the container headers of videos; no
+        pixels are decoded and no analysis (faces, OCR, objects) is performed.
+
+        Args:
+            filepath: Full path to the media file
+
+        Returns:
+            Dictionary with filepath, filename, file_type, capture time, GPS and
+            the available dimension / container fields
+        """
+        file_type = self._get_file_type(filepath)
+        metadata = {
+            'filepath': filepath,
+            'filename': os.path.basename(filepath),
+            'file_type': file_type,
+            'date_time_original': None,
+            'capture_timestamp': None,
+            'gps_latitude': None,
+            'gps_longitude': None,
+            'width': None,
+            'height': None
+        }
+
+        try:
+            if file_type == 'Image':
+                self._extract_exif_data(filepath, metadata)
+            elif file_type == 'Video':
+                metadata.update({'duration_seconds': None, 'codec': None, 'frame_rate': None})
+                self._extract_container_metadata(filepath, metadata)
+
+            metadata['capture_timestamp'] = self._parse_capture_timestamp(metadata['date_time_original'])
+        except Exception as e:
+            print(f"Error reading header metadata from {metadata['filename']}: {e}")
+
+        return metadata
+
+    def _get_file_type(self, filepath: str) -> str:
+        """Determine the file type ('Image', 'Video' or 'Unknown') from the extension."""
+        file_ext = Path(filepath).suffix.lower()
+        if file_ext in self.IMAGE_EXTENSIONS:
+            return 'Image'
+        if file_ext in self.VIDEO_EXTENSIONS:
+            return 'Video'
+        return 'Unknown'
+
     def _extract_image_metadata(self, filepath: str, metadata: Dict[str, Any]):
         """Extract metadata specific to image files."""
         # Extract EXIF data
         self._extract_exif_data(filepath, metadata)
 
+        # Decode the image once for hashing, face and object detection
+        img = cv2.imread(filepath)
+
+        # Perceptual hash (near-duplicates) and embedding (visual similarity)
+        if img is not None:
+            metadata['phash'] = self._compute_phash(img)
+            metadata['embedding'] = self._compute_embedding(img)
+
         # Detect faces
-        metadata['person_count'] = self._detect_faces_image(filepath)
+        metadata['person_count'] = self._detect_faces_frame(img) if img is not None else 0
 
         # Perform OCR
         ocr_text, ocr_keywords = self._extract_ocr_text(filepath)
         metadata['ocr_text_summary'] = ocr_text
 
         # Detect objects/scenes (local heuristic)
-        object_tags = self._detect_objects_image(filepath)
+        object_tags = self._detect_objects([img])[0] if img is not None else ''
 
         # Combine object tags and OCR keywords
         metadata['object_keywords'] = self._combine_keywords(object_tags, ocr_keywords)
     
-    def _extract_video_metadata(self, filepath: str, metadata: Dict[str, Any]):
-        """Extract metadata specific to video files."""
-        # Sample a frame from the video (at 5 seconds)
-        frame = self._sample_video_frame(filepath, at_second=5)
+    def _extract_video_metadata(self, filepath: str, metadata: Dict[str, Any]) -> Optional[np.ndarray]:
+        """
+        Extract metadata specific to video files.
 
-        if frame is not None:
-            # Detect faces in the sampled frame
-            metadata['person_count'] = self._detect_faces_frame(frame)
+        In multi-frame modes, faces and objects are detected on every sampled frame
+        and aggregated (max person count, union of scene tags); OCR runs once on the
+        representative frame.
 
-            # Perform OCR on the sampled frame
-            ocr_text, ocr_keywords = self._extract_ocr_from_frame(frame)
-            metadata['ocr_text_summary'] = ocr_text
+        Returns:
+            The representative frame (for reuse by the thumbnail stage), or None
+        """
+        # Container properties, creation time and GPS come from the file headers
+        self._extract_container_metadata(filepath, metadata)
+
+        # Sample frames from the video with a single capture session
+        with VideoReader(filepath) as reader:
+            if self.video_sample_mode == 'uniform':
+                samples = reader.read_frames_uniform(self.video_frame_budget)
+            elif self.video_sample_mode == 'keyframes':
+                samples = reader.read_keyframes(self.video_frame_budget)
+            else:
+                frame = reader.read_frame_at(self.VIDEO_SAMPLE_SECOND)
+                samples = [(self.VIDEO_SAMPLE_SECOND, frame)] if frame is not None else []
+
+        if not samples:
+            return None
 
-            # Detect objects/scenes in the sampled frame (local heuristic)
-            object_tags = self._detect_objects_frame(frame)
+        # Representative frame: the sample closest to the standard sampling position
+        frame = min(samples, key=lambda sample: abs(sample[0] - self.VIDEO_SAMPLE_SECOND))[1]
+
+        # Detect faces in the sampled frames (max over frames)
+        metadata['person_count'] = max(self._detect_faces([sample for _, sample in samples]))
+
+        # Perform OCR on the representative frame
+        ocr_text, ocr_keywords = self._extract_ocr_from_frame(frame)
+        metadata['ocr_text_summary'] = ocr_text
+
+        # Detect objects/scenes in the sampled frames as one batch (union of tags, local
+        # heuristic; circle detection is skipped for video frames)
+        object_tags = self._merge_tags(self._detect_objects([sample for _, sample in samples], detect_circles=False))
+
+        # Combine object tags and OCR keywords
+        metadata['object_keywords'] = self._combine_keywords(object_tags, ocr_keywords)
+
+        return frame
+
+    def _extract_container_metadata(self, filepath: str, metadata: Dict[str, Any]):
+        """Read video properties from the container headers without decoding frames."""
+        container_info = self.container_parser.parse(filepath)
+        for key, value in container_info.items():
+            if key in metadata:
+                metadata[key] = value
+
+    def _merge_tags(self, tag_strings) -> str:
+        """Merge comma-separated tag strings into one, keeping first-seen order."""
+        tags = []
+        for tag_string in tag_strings:
+            tags.extend(tag.strip() for tag in tag_string.split(',') if tag.strip())
+        tags = list(dict.fromkeys(tags))
+
+        # A specific tag from any frame supersedes the generic fallback
+        if len(tags) > 1 and 'general-scene' in tags:
+            tags.remove('general-scene')
+        return ', '.join(tags)
 
-            # Combine object tags and OCR keywords
-            metadata['object_keywords'] = self._combine_keywords(object_tags, ocr_keywords)
-    
     def _extract_exif_data(self, filepath: str, metadata: Dict[str, Any]):
         """Extract EXIF data including timestamp and GPS coordinates."""
+        # Fast path: read only the EXIF block (JPEG APP1, PNG eXIf, HEIC Exif item)
+        exif_fields = self.exif_reader.read(filepath)
+        if exif_fields is not None:
+            for key in ('date_time_original', 'gps_latitude', 'gps_longitude', 'width', 'height'):
+                if exif_fields.get(key) is not None:
+                    metadata[key] = exif_fields[key]
+            return
+
         try:
-            # Try with PIL first
+            # Fall back to PIL for other formats
             with Image.open(filepath) as img:
                 exif_data = img._getexif()
                 if exif_data:
@@ -200,6 +548,20 @@ class MetadataExtractor:
             except Exception as e2:
                 pass
 
+    def _parse_capture_timestamp(self, dt_str: Optional[str]) -> Optional[int]:
+        """
+        Convert an EXIF datetime string ("YYYY:MM:DD HH:MM:SS") into epoch seconds.
+
+        The wall-clock time is interpreted as UTC, matching the SQL backfill in MediaDatabase.
+        """
+        if not dt_str:
+            return None
+        try:
+            dt = datetime.strptime(dt_str.strip()[:19], '%Y:%m:%d %H:%M:%S')
+            return calendar.timegm(dt.timetuple())
+        except (ValueError, AttributeError):
+            return None
+
     def _parse_gps_info(self, gps_info: Dict) -> Tuple[Optional[float], Optional[float]]:
         """Parse GPS info from PIL EXIF data."""
         try:
@@ -239,44 +601,24 @@ class MetadataExtractor:
         except Exception:
             return None
 
-    def _detect_faces_image(self, filepath: str) -> int:
-        """Detect faces in an image file."""
-        try:
-            img = cv2.imread(filepath)
-            if img is None:
-                return 0
-            return self._detect_faces_frame(img)
-        except Exception:
-            return 0
+    def _compute_phash(self, frame: np.ndarray) -> int:
+        """Compute the perceptual hash of a decoded frame (signed 64-bit, as stored)."""
+        return to_signed(dhash(frame))
+
+    def _compute_embedding(self, frame: np.ndarray) -> bytes:
+        """Compute the visual similarity embedding of a decoded frame (float16 blob)."""
+        return self.embedder.to_blob(self.embedder.embed(frame))
 
     def _detect_faces_frame(self, frame: np.ndarray) -> int:
         """Detect faces in a video frame or image array."""
-        try:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            faces = self.face_cascade.detectMultiScale(
-                gray,
-                scaleFactor=1.1,
-                minNeighbors=5,
-                minSize=(30, 30)
-            )
-            return len(faces)
-        except Exception:
-            return 0
+        return self._detect_faces([frame])[0]
 
-    def _sample_video_frame(self, filepath: str, at_second: int = 5) -> Optional[np.ndarray]:
-        """Sample a single frame from a video file."""
+    def _detect_faces(self, frames: List[np.ndarray]) -> List[int]:
+        """Count faces in a batch of video frames or image arrays."""
         try:
-            cap = cv2.VideoCapture(filepath)
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_number = int(fps * at_second)
-
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-            ret, frame = cap.read()
-            cap.release()
-
-            return frame if ret else None
+            return self.face_detector.count_faces_batch(frames)
         except Exception:
-            return None
+            return [0] * len(frames)
 
     def _extract_ocr_text(self, filepath: str) -> Tuple[str, str]:
         """
@@ -317,122 +659,25 @@ class MetadataExtractor:
 
     # Note: _process_ocr_text method removed - now handled by GGUF_OCR class
 
-    def _detect_objects_image(self, filepath: str) -> str:
+    def _detect_objects(self, frames: List[np.ndarray], detect_circles: Optional[bool] = None) -> List[str]:
         """
-        Detect objects/scenes in an image using local heuristic methods.
+        Detect objects/scenes in decoded frames using the local heuristic engine.
 
         NOTE: This is a simplified color/pattern-based heuristic, NOT ML-based detection.
         It identifies common scenes (sky, grass, water, etc.) based on dominant colors.
-        """
-        try:
-            # Read image with OpenCV
-            img = cv2.imread(filepath)
-            if img is None:
-                return ''
-
-            # Resize for faster processing
-            height, width = img.shape[:2]
-            max_dim = 400
-            if max(height, width) > max_dim:
-                scale = max_dim / max(height, width)
-                img = cv2.resize(img, (int(width * scale), int(height * scale)))
-
-            # Convert to HSV for color-based detection
-            hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
-
-            detected_objects = []
-            total_pixels = img.shape[0] * img.shape[1]
-
-            # Check for each color range
-            for obj_name, color_range in self.COLOR_RANGES.items():
-                lower = np.array(color_range['lower'])
-                upper = np.array(color_range['upper'])
-
-                # Create mask for this color range
-                mask = cv2.inRange(hsv, lower, upper)
-
-                # Calculate percentage of image with this color
-                color_pixels = cv2.countNonZero(mask)
-                percentage = (color_pixels / total_pixels) * 100
-
-                # If significant presence (>15%), add to detected objects
-                if percentage > 15:
-                    detected_objects.append(obj_name)
-
-            # Detect edges to identify structured objects vs natural scenes
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            edges = cv2.Canny(gray, 50, 150)
-            edge_pixels = cv2.countNonZero(edges)
-            edge_percentage = (edge_pixels / total_pixels) * 100
-
-            # High edge density suggests buildings, vehicles, or structured objects
-            if edge_percentage > 10:
-                detected_objects.append('building/structure')
-
-            # Detect circles (could be faces, balls, wheels, etc.)
-            circles = cv2.HoughCircles(
-                gray, cv2.HOUGH_GRADIENT, dp=1, minDist=50,
-                param1=50, param2=30, minRadius=10, maxRadius=100
-            )
-            if circles is not None and len(circles[0]) > 2:
-                detected_objects.append('circular-objects')
-
-            return ', '.join(detected_objects) if detected_objects else 'general-scene'
 
-        except Exception as e:
-            print(f"Error detecting objects in image: {e}")
-            return ''
-
-    def _detect_objects_frame(self, frame: np.ndarray) -> str:
-        """
-        Detect objects/scenes in a video frame using local heuristic methods.
+        Args:
+            frames: Decoded BGR images or video frames
+            detect_circles: Override the circle detection stage (None uses the configuration)
 
-        NOTE: This is a simplified color/pattern-based heuristic, NOT ML-based detection.
+        Returns:
+            One comma-separated tag string per frame
         """
         try:
-            # Resize for faster processing
-            height, width = frame.shape[:2]
-            max_dim = 400
-            if max(height, width) > max_dim:
-                scale = max_dim / max(height, width)
-                frame = cv2.resize(frame, (int(width * scale), int(height * scale)))
-
-            # Convert to HSV for color-based detection
-            hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-
-            detected_objects = []
-            total_pixels = frame.shape[0] * frame.shape[1]
-
-            # Check for each color range
-            for obj_name, color_range in self.COLOR_RANGES.items():
-                lower = np.array(color_range['lower'])
-                upper = np.array(color_range['upper'])
-
-                # Create mask for this color range
-                mask = cv2.inRange(hsv, lower, upper)
-
-                # Calculate percentage of frame with this color
-                color_pixels = cv2.countNonZero(mask)
-                percentage = (color_pixels / total_pixels) * 100
-
-                # If significant presence (>15%), add to detected objects
-                if percentage > 15:
-                    detected_objects.append(obj_name)
-
-            # Detect edges
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            edges = cv2.Canny(gray, 50, 150)
-            edge_pixels = cv2.countNonZero(edges)
-            edge_percentage = (edge_pixels / total_pixels) * 100
-
-            if edge_percentage > 10:
-                detected_objects.append('building/structure')
-
-            return ', '.join(detected_objects) if detected_objects else 'general-scene'
-
+            return self.scene_detector.detect_batch(frames, detect_circles=detect_circles)
         except Exception as e:
-            print(f"Error detecting objects in frame: {e}")
-            return ''
+            print(f"Error detecting objects: {e}")
+            return [''] * len(frames)
 
     def _combine_keywords(self, object_tags: str, ocr_keywords: str) -> str:
         """
@@ -453,137 +698,215 @@ class MetadataExtractor:
 
         return ', '.join(combined) if combined else ''
 
-    def _analyze_emotion_sentiment(self, filepath: str, metadata: Dict[str, Any]) -> str:
+    def analyze_emotion_sentiment(self, filepath: str, metadata: Dict[str, Any]) -> str:
         """
         Apply rule-based heuristic for emotion/sentiment classification.
 
+        Stores the structured parts in metadata ('sentiment', 'sentiment_context',
+        'day_period') and returns the combined label (e.g. "Positive/Vacation/Daytime").
+        """
+        sentiment, context, day_period = self._classify_sentiment(
+            filepath, metadata.get('capture_timestamp')
+        )
+
+        metadata['sentiment'] = sentiment
+        metadata['sentiment_context'] = context
+        metadata['day_period'] = day_period
+
+        # Format final sentiment
+        return '/'.join(part for part in (sentiment, context, day_period) if part)
+
+    def _classify_sentiment(self, filepath: str,
+                            capture_timestamp: Optional[int]) -> Tuple[str, Optional[str], Optional[str]]:
+        """
+        Classify sentiment, context keyword and day period for a media file.
+
         Rules:
         1. Check filename and parent directory for sentiment keywords
-        2. Infer time of day from date_time_original
-        """
-        sentiment = 'Neutral'
-        context = ''
+        2. Infer time of day from the parsed capture timestamp
 
+        Returns:
+            Tuple of (sentiment, context_keyword or None, day_period or None)
+        """
         # Rule 1: Keyword-based sentiment
-        path_lower = filepath.lower()
+        sentiment, context = self.keyword_dictionary.classify_sentiment(filepath)
 
-        for keyword in self.POSITIVE_KEYWORDS:
-            if keyword in path_lower:
-                sentiment = 'Positive'
-                context = keyword.capitalize()
-                break
+        # Rule 2: Time-of-day inference
+        return sentiment, context, day_period(capture_timestamp)
 
-        if sentiment == 'Neutral':
-            for keyword in self.NEGATIVE_KEYWORDS:
-                if keyword in path_lower:
-                    sentiment = 'Negative'
-                    context = keyword.capitalize()
-                    break
+    def generate_thumbnail(self, filepath: str) -> bool:
+        """
+        Generate the thumbnails of a file on demand (lazy thumbnail mode).
 
-        # Rule 2: Time-of-day inference
-        if metadata.get('date_time_original'):
-            try:
-                # Parse datetime (format: "YYYY:MM:DD HH:MM:SS")
-                dt_str = metadata['date_time_original']
-                dt = datetime.strptime(dt_str, '%Y:%m:%d %H:%M:%S')
-                hour = dt.hour
-
-                if 6 <= hour < 18:
-                    time_context = 'Daytime'
-                else:
-                    time_context = 'Nighttime'
-
-                if context:
-                    context = f"{context}/{time_context}"
-                else:
-                    context = time_context
-            except Exception:
-                pass
+        Args:
+            filepath: Full path to the media file
 
-        # Format final sentiment
-        if context:
-            return f"{sentiment}/{context}"
-        else:
-            return sentiment
+        Returns:
+            True if the thumbnails exist afterwards, False otherwise
+        """
+        return self._generate_thumbnail(filepath, self._get_file_type(filepath))
 
-    def _generate_thumbnail(self, filepath: str, file_type: str) -> Optional[str]:
+    def _generate_thumbnail(self, filepath: str, file_type: str,
+                            frame: Optional[np.ndarray] = None) -> bool:
         """
-        Generate a thumbnail for the media file.
+        Generate the thumbnail renditions for the media file.
+
+        The renditions are kept in the thumbnail store under the file path, so
+        no per-record thumbnail path is stored.
 
         Args:
             filepath: Full path to the media file
             file_type: Type of file ('Image' or 'Video')
+            frame: Already decoded video frame (avoids re-opening the video)
 
         Returns:
-            Path to the generated thumbnail, or None if failed
+            True if the renditions are stored, False otherwise
         """
         try:
-            # Create a unique thumbnail filename based on the original file
-            file_hash = str(hash(filepath))[-10:]  # Use last 10 digits of hash
-            thumbnail_filename = f"thumb_{file_hash}.jpg"
-            thumbnail_path = os.path.join(self.THUMBNAIL_DIR, thumbnail_filename)
-
-            # Skip if thumbnail already exists
-            if os.path.exists(thumbnail_path):
-                return thumbnail_path
-
             if file_type == 'Image':
-                # Generate thumbnail from image
                 with Image.open(filepath) as img:
-                    # Convert to RGB if necessary (for PNG with transparency, etc.)
-                    if img.mode != 'RGB':
-                        img = img.convert('RGB')
+                    # Only fill in the renditions this image is large enough for and lacks
+                    missing = [size for size in self._thumbnail_sizes(img.size)
+                               if not self.thumbnail_store.has(filepath, size)]
+                    if not missing:
+                        return True
+
+                    # The embedded EXIF preview (about 160px) only has enough detail
+                    # for the square list thumbnail
+                    renditions = {}
+                    smallest = min(ThumbnailStore.SIZES)
+                    if smallest in missing:
+                        preview = self._load_embedded_thumbnail(filepath)
+                        if preview is not None:
+                            renditions = self._render_thumbnails(preview, [smallest])
+
+                    remaining = [size for size in missing if size not in renditions]
+                    if remaining:
+                        # Let the JPEG decoder downscale while decoding (DCT scaling)
+                        largest = max(max(remaining), max(self.THUMBNAIL_DECODE_SIZE))
+                        img.draft('RGB', (largest, largest))
+                        renditions.update(self._render_thumbnails(ImageOps.exif_transpose(img), remaining))
 
-                    # Create thumbnail with exact size (crop to square if needed)
-                    # First, resize maintaining aspect ratio
-                    img.thumbnail((128, 128), Image.Resampling.LANCZOS)
+            elif file_type == 'Video':
+                # Video renditions are always rendered together from a full frame
+                if self.thumbnail_store.has(filepath):
+                    return True
 
-                    # Create a square thumbnail by cropping/padding
-                    thumb = Image.new('RGB', self.THUMBNAIL_SIZE, (0, 0, 0))
+                # Decode the frame only if the caller didn't provide it
+                if frame is None:
+                    with VideoReader(filepath) as reader:
+                        frame = reader.read_frame_at(self.VIDEO_SAMPLE_SECOND)
 
-                    # Calculate position to paste (center the image)
-                    paste_x = (self.THUMBNAIL_SIZE[0] - img.width) // 2
-                    paste_y = (self.THUMBNAIL_SIZE[1] - img.height) // 2
+                if frame is None:
+                    return False
 
-                    thumb.paste(img, (paste_x, paste_y))
-                    thumb.save(thumbnail_path, 'JPEG', quality=85)
+                # Convert BGR to RGB and create PIL Image from frame
+                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                renditions = self._render_thumbnails(Image.fromarray(frame_rgb))
 
-            elif file_type == 'Video':
-                # Generate thumbnail from video frame at 5 seconds
-                cap = cv2.VideoCapture(filepath)
+            else:
+                return False
+
+            return self.thumbnail_store.put(filepath, renditions)
+
+        except Exception as e:
+            print(f"Error generating thumbnail for {filepath}: {e}")
+            return False
 
-                # Set position to 5 seconds (5000 milliseconds)
-                cap.set(cv2.CAP_PROP_POS_MSEC, 5000)
+    def _load_embedded_thumbnail(self, filepath: str) -> Optional[Image.Image]:
+        """
+        Load the EXIF IFD1 preview of an image, upright according to its orientation.
+
+        Returns:
+            The preview image, or None if there is none, it is smaller than
+            THUMBNAIL_DECODE_SIZE or its aspect ratio differs from the full image
+        """
+        fields = self.exif_reader.read(filepath, include_thumbnail=True)
+        if not fields or 'thumbnail' not in fields:
+            return None
 
-                # Read the frame
-                success, frame = cap.read()
-                cap.release()
+        try:
+            preview = Image.open(io.BytesIO(fields['thumbnail']))
+            preview.load()
+        except Exception:
+            return None
 
-                if success:
-                    # Convert BGR to RGB
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if max(preview.size) < max(self.THUMBNAIL_DECODE_SIZE):
+            return None
 
-                    # Create PIL Image from frame
-                    img = Image.fromarray(frame_rgb)
+        # Previews of non-4:3 images are often letterboxed to 160x120
+        width, height = fields.get('width'), fields.get('height')
+        if width and height:
+            if abs(preview.width / preview.height - width / height) > self.THUMBNAIL_ASPECT_TOLERANCE:
+                return None
 
-                    # Create thumbnail with exact size
-                    img.thumbnail((128, 128), Image.Resampling.LANCZOS)
+        for method in self.EXIF_ORIENTATION_TRANSPOSE.get(fields.get('orientation'), []):
+            preview = preview.transpose(method)
+        return preview
 
-                    # Create a square thumbnail by cropping/padding
-                    thumb = Image.new('RGB', self.THUMBNAIL_SIZE, (0, 0, 0))
+    @staticmethod
+    def _thumbnail_sizes(dimensions: Tuple[int, int]) -> List[int]:
+        """
+        Rendition sizes produced for a source of the given dimensions.
 
-                    # Calculate position to paste (center the image)
-                    paste_x = (self.THUMBNAIL_SIZE[0] - img.width) // 2
-                    paste_y = (self.THUMBNAIL_SIZE[1] - img.height) // 2
+        The smallest size is always produced; a larger size only when the source
+        has more detail than the next smaller rendition (small sources are
+        never upscaled).
+        """
+        sizes = sorted(ThumbnailStore.SIZES)
+        return [size for index, size in enumerate(sizes) if index == 0 or max(dimensions) > sizes[index - 1]]
 
-                    thumb.paste(img, (paste_x, paste_y))
-                    thumb.save(thumbnail_path, 'JPEG', quality=85)
-                else:
-                    return None
+    def _render_thumbnails(self, img: Image.Image, sizes: Optional[List[int]] = None) -> Dict[int, bytes]:
+        """
+        Encode the thumbnail renditions an image is large enough for.
 
-            return thumbnail_path
+        The smallest size is the square list thumbnail; larger sizes keep the
+        aspect ratio (see _thumbnail_sizes).
 
-        except Exception as e:
-            print(f"Error generating thumbnail for {filepath}: {e}")
-            return None
+        Args:
+            img: Source image
+            sizes: Renditions to encode (default: all the source is large enough for)
 
+        Returns:
+            Rendition size -> JPEG bytes
+        """
+        # Convert to RGB if necessary (for PNG with transparency, etc.)
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        wanted = set(self._thumbnail_sizes(img.size))
+        if sizes is not None:
+            wanted &= set(sizes)
+
+        renditions = {}
+        # Downscale from the largest rendition to the smallest
+        for size in sorted(wanted, reverse=True):
+            if size == self.THUMBNAIL_SIZE[0]:
+                renditions[size] = self._encode_square_thumbnail(img)
+            else:
+                img = img.copy()
+                img.thumbnail((size, size), Image.Resampling.LANCZOS)
+                renditions[size] = self._encode_jpeg(img)
+        return renditions
+
+    def _encode_square_thumbnail(self, img: Image.Image) -> bytes:
+        """Resize an image into a square THUMBNAIL_SIZE JPEG (centered, cropped/padded)."""
+        # First, resize maintaining aspect ratio
+        img = img.copy()
+        img.thumbnail(self.THUMBNAIL_DECODE_SIZE, Image.Resampling.LANCZOS)
+
+        # Create a square thumbnail by cropping/padding
+        thumb = Image.new('RGB', self.THUMBNAIL_SIZE, (0, 0, 0))
+
+        # Calculate position to paste (center the image)
+        paste_x = (self.THUMBNAIL_SIZE[0] - img.width) // 2
+        paste_y = (self.THUMBNAIL_SIZE[1] - img.height) // 2
+
+        thumb.paste(img, (paste_x, paste_y))
+        return self._encode_jpeg(thumb)
+
+    def _encode_jpeg(self, img: Image.Image) -> bytes:
+        """Encode an image as JPEG bytes."""
+        buffer = io.BytesIO()
+        img.save(buffer, 'JPEG', quality=85)
+        return buffer.getvalue()
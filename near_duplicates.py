@@ -0,0 +1,289 @@
+"""
+MediaVault Scanner - Near-Duplicate Detection Module
+Perceptual difference hashes (dHash), a multi-index hash table for Hamming
+distance queries and a bulk duplicate clustering job.
+
+Usage:
+    python near_duplicates.py [database] [--distance 6]
+"""
+
+import argparse
+from itertools import combinations
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+HASH_BITS = 64
+HASH_MASK = (1 << HASH_BITS) - 1
+
+# Query rows expanded into candidate pairs at once by the clustering job
+PAIR_BLOCK_SIZE = 65536
+
+
+def dhash(image: np.ndarray) -> int:
+    """
+    Compute the 64-bit difference hash of a decoded image.
+
+    The image is reduced to a 9x8 grayscale thumbnail; each bit tells whether a
+    pixel is brighter than its right-hand neighbour.
+
+    Args:
+        image: BGR (or grayscale) image
+
+    Returns:
+        Unsigned 64-bit hash
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(image, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def to_signed(value: int) -> int:
+    """Convert an unsigned 64-bit hash to the signed form stored in SQLite INTEGER columns."""
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+
+def to_unsigned(value: int) -> int:
+    """Convert a stored (signed) hash back to its unsigned 64-bit form."""
+    return value & HASH_MASK
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Number of differing bits between two unsigned hashes."""
+    return (first ^ second).bit_count()
+
+
+class MultiIndexHash:
+    """
+    Multi-index hash table answering "hashes within Hamming distance k" queries.
+
+    Every hash is split into CHUNK_COUNT 16-bit chunks, each indexed in its own
+    dictionary. By the pigeonhole principle, a hash within distance k of the query
+    matches the query in at least one chunk within k // CHUNK_COUNT bits, so only
+    the buckets of those chunk variants are probed and the candidates verified.
+    """
+
+    CHUNK_COUNT = 4
+    CHUNK_BITS = HASH_BITS // CHUNK_COUNT
+    CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+    def __init__(self, max_distance: int = 6):
+        """
+        Initialize an empty index.
+
+        Args:
+            max_distance: Largest Hamming distance that queries may ask for
+        """
+        self.max_distance = max_distance
+        self.hashes = {}  # item id -> unsigned hash
+        self.tables = [{} for _ in range(self.CHUNK_COUNT)]  # chunk value -> [item ids]
+
+        self.flip_masks = self.flip_masks_for(max_distance)
+
+    @classmethod
+    def flip_masks_for(cls, max_distance: int) -> List[int]:
+        """Get the bit flip masks of all chunk variants within the chunk search radius."""
+        radius = max_distance // cls.CHUNK_COUNT
+        flip_masks = [0]
+        for bit_count in range(1, radius + 1):
+            for bits in combinations(range(cls.CHUNK_BITS), bit_count):
+                flip_masks.append(sum(1 << bit for bit in bits))
+        return flip_masks
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def add(self, item_id: int, value: int):
+        """
+        Index a hash.
+
+        Args:
+            item_id: Identifier returned by queries (e.g. the media record id)
+            value: Unsigned 64-bit hash
+        """
+        self.hashes[item_id] = value
+        for table, chunk in zip(self.tables, self._chunks(value)):
+            table.setdefault(chunk, []).append(item_id)
+
+    def add_many(self, items: Iterable[Tuple[int, int]]):
+        """Index many (item_id, unsigned hash) pairs."""
+        for item_id, value in items:
+            self.add(item_id, value)
+
+    def query(self, value: int, max_distance: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Find indexed hashes within a Hamming distance.
+
+        Args:
+            value: Unsigned 64-bit query hash
+            max_distance: Distance limit (defaults to, and may not exceed, the index setting)
+
+        Returns:
+            List of (item_id, distance) sorted by distance
+        """
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+
+        seen = set()
+        matches = []
+        for table, chunk in zip(self.tables, self._chunks(value)):
+            for flip_mask in self.flip_masks:
+                for item_id in table.get(chunk ^ flip_mask, ()):
+                    if item_id in seen:
+                        continue
+                    seen.add(item_id)
+                    distance = hamming_distance(value, self.hashes[item_id])
+                    if distance <= max_distance:
+                        matches.append((item_id, distance))
+
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+    def _chunks(self, value: int) -> List[int]:
+        """Split a hash into its chunk values."""
+        return [(value >> (index * self.CHUNK_BITS)) & self.CHUNK_MASK for index in range(self.CHUNK_COUNT)]
+
+
+def find_duplicate_clusters(items: Iterable[Tuple[int, int]], max_distance: int = 6) -> List[List[int]]:
+    """
+    Group hashes into clusters of near-duplicates.
+
+    Items within max_distance of each other are linked and linked items are
+    merged transitively (union-find), so a cluster can contain pairs that are
+    further apart than max_distance through intermediate items. Candidate pairs
+    are generated with the same chunk scheme as MultiIndexHash, but vectorized
+    over all hashes (chunk buckets of sorted arrays), which keeps the
+    job practical for millions of images.
+
+    Args:
+        items: (item_id, unsigned hash) pairs
+        max_distance: Largest Hamming distance treated as a duplicate
+
+    Returns:
+        Clusters with at least two members, each sorted by item id
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    ids = np.array([item_id for item_id, _ in items], dtype=np.int64)
+    # Identical hashes always share a cluster; joining distinct hashes only also
+    # avoids quadratic candidate sets for common hashes (e.g. blank frames)
+    unique_hashes, inverse = np.unique(np.array([value for _, value in items], dtype=np.uint64),
+                                       return_inverse=True)
+
+    parent = list(range(len(unique_hashes)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for first, second in _near_pairs(unique_hashes, max_distance):
+        first_root, second_root = find(first), find(second)
+        if first_root != second_root:
+            parent[max(first_root, second_root)] = min(first_root, second_root)
+
+    roots = np.array([find(index) for index in range(len(unique_hashes))], dtype=np.int64)[inverse.ravel()]
+    clusters: Dict[int, List[int]] = {}
+    for root, item_id in zip(roots.tolist(), ids.tolist()):
+        clusters.setdefault(root, []).append(item_id)
+
+    return sorted(
+        (sorted(members) for members in clusters.values() if len(members) > 1),
+        key=lambda members: members[0]
+    )
+
+
+def _near_pairs(hashes: np.ndarray, max_distance: int) -> Iterator[Tuple[int, int]]:
+    """
+    Yield index pairs (i < j) of distinct hashes within max_distance.
+
+    For every chunk and chunk flip mask, the flipped query chunks are looked up
+    in the buckets of the sorted chunk array; candidate pairs are expanded and verified in
+    blocks of PAIR_BLOCK_SIZE query rows to bound memory use.
+    """
+    count = len(hashes)
+    flip_masks = MultiIndexHash.flip_masks_for(max_distance)
+    rows = np.arange(count)
+
+    for chunk_index in range(MultiIndexHash.CHUNK_COUNT):
+        chunks = ((hashes >> np.uint64(chunk_index * MultiIndexHash.CHUNK_BITS)) &
+                  np.uint64(MultiIndexHash.CHUNK_MASK)).astype(np.int64)
+        order = np.argsort(chunks, kind='stable')
+        # Start and length of each chunk value's run in the sorted order
+        bucket_sizes = np.bincount(chunks, minlength=MultiIndexHash.CHUNK_MASK + 1)
+        bucket_starts = np.cumsum(bucket_sizes) - bucket_sizes
+
+        for flip_mask in flip_masks:
+            for block_start in range(0, count, PAIR_BLOCK_SIZE):
+                block = rows[block_start:block_start + PAIR_BLOCK_SIZE]
+                targets = chunks[block] ^ flip_mask
+                lower = bucket_starts[targets]
+                matches = bucket_sizes[targets]
+                total = int(matches.sum())
+                if total == 0:
+                    continue
+
+                # Expand each query row into one candidate pair per matching chunk
+                starts = np.repeat(lower, matches)
+                offsets = np.arange(total) - np.repeat(np.cumsum(matches) - matches, matches)
+                left = np.repeat(block, matches)
+                right = order[starts + offsets]
+
+                keep = left < right
+                left, right = left[keep], right[keep]
+                keep = _popcount(hashes[left] ^ hashes[right]) <= max_distance
+                yield from zip(left[keep].tolist(), right[keep].tolist())
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    """Count the set bits of each uint64 value."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    return np.unpackbits(values.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+def update_duplicate_groups(db, max_distance: int = 6) -> int:
+    """
+    Recompute the duplicate groups of all hashed records in a database.
+
+    Each record of a cluster gets the smallest record id of its cluster as
+    duplicate_group; records without near-duplicates are reset to NULL.
+
+    Args:
+        db: MediaDatabase instance
+        max_distance: Largest Hamming distance treated as a duplicate
+
+    Returns:
+        Number of clusters found, or -1 if the groups could not be stored
+    """
+    items = ((record_id, to_unsigned(phash)) for record_id, phash in db.get_perceptual_hashes())
+    clusters = find_duplicate_clusters(items, max_distance)
+    if not db.set_duplicate_groups(clusters):
+        return -1
+    return len(clusters)
+
+
+def main():
+    from config import Config
+    from database import MediaDatabase
+
+    Config.load_config()
+    parser = argparse.ArgumentParser(description="Find near-duplicate images in a MediaVault database")
+    parser.add_argument('database', nargs='?', default=Config.DEFAULT_DB_PATH, help="Path to metadata.db")
+    parser.add_argument('--distance', type=int, default=Config.NEAR_DUPLICATE_DISTANCE,
+                        help="Largest Hamming distance between duplicate hashes")
+    args = parser.parse_args()
+
+    cluster_count = update_duplicate_groups(MediaDatabase(args.database), args.distance)
+    if cluster_count >= 0:
+        print(f"Found {cluster_count} duplicate clusters (distance <= {args.distance})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+MediaVault Scanner - Reverse Geocoder Module
+Offline nearest-place lookup for GPS coordinates using a KD-tree over a bundled
+city gazetteer (or a larger GeoNames cities file).
+
+Usage:
+    python reverse_geocoder.py [database] [--gazetteer PATH] [--overwrite]
+"""
+
+import argparse
+import csv
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+DEFAULT_GAZETTEER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gazetteer.csv')
+
+
+class ReverseGeocoder:
+    """
+    Resolves coordinates to (place, region, country) without network access.
+
+    Gazetteer entries are converted to 3D unit vectors and indexed in an exact
+    single KD-tree (OpenCV FLANN); the straight-line nearest neighbour on the
+    unit sphere is also the great-circle nearest place. Lookups are batched, so
+    a whole scan batch or backfill page is resolved in one call.
+
+    Supported gazetteers:
+        CSV with the header name,region,country,latitude,longitude (bundled)
+        GeoNames cities dump (tab-separated, e.g. cities15000.txt)
+    """
+
+    EARTH_RADIUS_KM = 6371.0
+
+    # FLANN single KD-tree with unlimited checks (exact search)
+    FLANN_INDEX_KDTREE_SINGLE = 4
+    LEAF_MAX_SIZE = 10
+
+    def __init__(self, gazetteer_path: Optional[str] = None, max_distance_km: Optional[float] = 250):
+        """
+        Initialize the geocoder (the gazetteer is loaded on first use).
+
+        Args:
+            gazetteer_path: Gazetteer file (defaults to the bundled gazetteer.csv)
+            max_distance_km: Coordinates further than this from every place stay
+                unresolved (None = always use the nearest place)
+        """
+        self.gazetteer_path = gazetteer_path or DEFAULT_GAZETTEER
+        self.max_distance_km = max_distance_km
+        self.places = []  # (name, region, country)
+        self.coordinates = None  # (latitude, longitude) per place
+        self.vectors = None
+        self.index = None
+
+    def load(self) -> bool:
+        """
+        Load the gazetteer and build the KD-tree.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if self.index is not None:
+            return True
+
+        try:
+            if self.gazetteer_path.lower().endswith('.txt'):
+                places, coordinates = self._read_geonames(self.gazetteer_path)
+            else:
+                places, coordinates = self._read_csv(self.gazetteer_path)
+        except (OSError, ValueError, csv.Error) as e:
+            print(f"Error loading gazetteer {self.gazetteer_path}: {e}")
+            return False
+
+        if not places:
+            print(f"Gazetteer {self.gazetteer_path} contains no places")
+            return False
+
+        coordinates = np.array(coordinates, dtype=np.float64)
+        self.places = places
+        self.coordinates = coordinates
+        self.vectors = self._to_unit_vectors(coordinates[:, 0], coordinates[:, 1])
+        self.index = cv2.flann_Index(self.vectors, {
+            'algorithm': self.FLANN_INDEX_KDTREE_SINGLE,
+            'leaf_max_size': self.LEAF_MAX_SIZE
+        })
+        return True
+
+    def resolve(self, latitudes: Sequence[float],
+                longitudes: Sequence[float]) -> List[Optional[Tuple[str, str, str]]]:
+        """
+        Resolve many coordinates in one batch.
+
+        Args:
+            latitudes: Latitudes in decimal degrees
+            longitudes: Longitudes in decimal degrees
+
+        Returns:
+            (place, region, country) per coordinate, or None where it is too far
+            from every gazetteer place (or the gazetteer is unavailable)
+        """
+        if len(latitudes) == 0:
+            return []
+        if not self.load():
+            return [None] * len(latitudes)
+
+        queries = self._to_unit_vectors(np.asarray(latitudes, dtype=np.float64),
+                                        np.asarray(longitudes, dtype=np.float64))
+        indices, _ = self.index.knnSearch(queries, 1, params={'checks': -1})
+        indices = indices[:, 0]
+
+        # Great-circle distance from the chord length between the unit vectors
+        chords = np.linalg.norm(self.vectors[indices].astype(np.float64) - queries, axis=1)
+        distances_km = 2 * self.EARTH_RADIUS_KM * np.arcsin(np.clip(chords / 2, 0, 1))
+
+        return [
+            self.places[index] if self.max_distance_km is None or distance <= self.max_distance_km else None
+            for index, distance in zip(indices.tolist(), distances_km.tolist())
+        ]
+
+    def resolve_one(self, latitude: float, longitude: float) -> Optional[Tuple[str, str, str]]:
+        """Resolve a single coordinate (see resolve)."""
+        return self.resolve([latitude], [longitude])[0]
+
+    def annotate(self, records: List[Dict[str, Any]]):
+        """
+        Set place_name, place_region and place_country on metadata records in one batch.
+
+        Records without GPS coordinates get None for all three fields.
+
+        Args:
+            records: Metadata dictionaries with gps_latitude / gps_longitude
+        """
+        geotagged = [
+            record for record in records
+            if record.get('gps_latitude') is not None and record.get('gps_longitude') is not None
+        ]
+        places = self.resolve([record['gps_latitude'] for record in geotagged],
+                              [record['gps_longitude'] for record in geotagged])
+
+        for record in records:
+            record['place_name'] = record['place_region'] = record['place_country'] = None
+        for record, place in zip(geotagged, places):
+            if place:
+                record['place_name'], record['place_region'], record['place_country'] = place
+
+    def _to_unit_vectors(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """Convert coordinates to float32 unit vectors (FLANN works on float32)."""
+        latitudes = np.radians(latitudes)
+        longitudes = np.radians(longitudes)
+        return np.ascontiguousarray(np.stack([
+            np.cos(latitudes) * np.cos(longitudes),
+            np.cos(latitudes) * np.sin(longitudes),
+            np.sin(latitudes)
+        ], axis=1), dtype=np.float32)
+
+    def _read_csv(self, path: str) -> Tuple[List[Tuple[str, str, str]], List[Tuple[float, float]]]:
+        """Read the bundled CSV gazetteer."""
+        places = []
+        coordinates = []
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                places.append((row['name'], row['region'], row['country']))
+                coordinates.append((float(row['latitude']), float(row['longitude'])))
+        return places, coordinates
+
+    def _read_geonames(self, path: str) -> Tuple[List[Tuple[str, str, str]], List[Tuple[float, float]]]:
+        """Read a GeoNames cities dump (region = admin1 code, country = ISO code)."""
+        places = []
+        coordinates = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                fields = line.rstrip('\n').split('\t')
+                if len(fields) < 11:
+                    continue
+                places.append((fields[1], fields[10], fields[8]))
+                coordinates.append((float(fields[4]), float(fields[5])))
+        return places, coordinates
+
+
+def backfill_places(db, geocoder: ReverseGeocoder, overwrite: bool = False, batch_size: int = 10000) -> int:
+    """
+    Resolve the place columns of stored geotagged records.
+
+    Args:
+        db: MediaDatabase instance
+        geocoder: Reverse geocoder to use
+        overwrite: Also re-resolve records that already have a place
+        batch_size: Records resolved and written per transaction
+
+    Returns:
+        Number of records processed, or -1 if the gazetteer could not be loaded
+    """
+    if not geocoder.load():
+        return -1
+
+    processed = 0
+    after_id = 0
+    while True:
+        rows = db.get_geotagged_batch(after_id, batch_size, missing_place_only=not overwrite)
+        if not rows:
+            return processed
+
+        places = geocoder.resolve([row[1] for row in rows], [row[2] for row in rows])
+        db.update_places([
+            (place[0], place[1], place[2], row[0]) if place else (None, None, None, row[0])
+            for row, place in zip(rows, places)
+        ])
+        processed += len(rows)
+        after_id = rows[-1][0]
+
+
+def main():
+    from config import Config
+    from database import MediaDatabase
+
+    Config.load_config()
+    parser = argparse.ArgumentParser(description="Resolve place names of geotagged media offline")
+    parser.add_argument('database', nargs='?', default=Config.DEFAULT_DB_PATH, help="Path to metadata.db")
+    parser.add_argument('--gazetteer', default=Config.GAZETTEER_PATH, help="Gazetteer CSV or GeoNames .txt")
+    parser.add_argument('--overwrite', action='store_true', help="Re-resolve records that already have a place")
+    args = parser.parse_args()
+
+    geocoder = ReverseGeocoder(args.gazetteer, Config.GEOCODE_MAX_DISTANCE_KM)
+    processed = backfill_places(MediaDatabase(args.database), geocoder, overwrite=args.overwrite)
+    if processed >= 0:
+        print(f"Resolved places for {processed} geotagged records")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,10 @@ Recursively scans directories for media files and coordinates metadata extractio
 import os
 from pathlib import Path
 from typing import List, Callable, Optional, Dict, Any
+from content_hash import ContentHasher
 from database import MediaDatabase
+from location_clusters import update_location_clusters
+from events import update_events
 from metadata_extractor import MetadataExtractor
 
 
@@ -19,23 +22,55 @@ class MediaScanner:
         '.mp4', '.mov', '.avi'              # Videos
     }
 
-    def __init__(self, db_path: str = "metadata.db", gguf_ocr_config: Dict[str, Any] = None):
+    # Columns written by the EXIF-only scan mode
+    HEADER_FIELDS = [
+        'filename', 'file_type', 'date_time_original', 'capture_timestamp',
+        'gps_latitude', 'gps_longitude', 'width', 'height',
+        'duration_seconds', 'codec', 'frame_rate',
+        'place_name', 'place_region', 'place_country'
+    ]
+
+    # Records written per transaction in EXIF-only scan mode
+    HEADER_BATCH_SIZE = 500
+
+    # Record columns not copied from the original record to an exact duplicate
+    # (the path-derived sentiment columns are recomputed for the duplicate's own path)
+    ALIAS_OWN_FIELDS = ('id', 'filepath', 'filename', 'duplicate_group', 'content_hash', 'duplicate_of',
+                        'location_cluster', 'event_id')
+
+    def __init__(self, db_path: str = "metadata.db", gguf_ocr_config: Dict[str, Any] = None,
+                 extractor_config: Dict[str, Any] = None):
         """
         Initialize the media scanner.
 
         Args:
             db_path: Path to the SQLite database file
             gguf_ocr_config: Configuration dictionary for GGUF OCR engine
+            extractor_config: Configuration dictionary for extraction options
         """
         self.database = MediaDatabase(db_path)
-        self.extractor = MetadataExtractor(gguf_ocr_config=gguf_ocr_config)
+        self.extractor = MetadataExtractor(
+            gguf_ocr_config=gguf_ocr_config,
+            extractor_config=extractor_config
+        )
+
+        # Exact duplicates (same content hash) reuse the metadata of the existing record
+        extractor_config = extractor_config or {}
+        self.skip_duplicate_content = extractor_config.get('skip_duplicate_content', True)
+        self.content_hasher = ContentHasher(workers=extractor_config.get('content_hash_workers', 4))
+
+        # New records join the location clusters and events after each scan
+        self.location_cluster_precision = extractor_config.get('location_cluster_precision', 7)
+        self.event_max_gap_minutes = extractor_config.get('event_max_gap_minutes', 120)
+        self.event_max_jump_km = extractor_config.get('event_max_jump_km', 30)
         self.should_stop = False
     
     def scan_directory(
         self,
         directory: str,
         progress_callback: Optional[Callable[[int, int, str], None]] = None,
-        update_existing: bool = False
+        update_existing: bool = False,
+        exif_only: bool = False
     ) -> dict:
         """
         Recursively scan a directory for media files and extract metadata.
@@ -44,6 +79,8 @@ class MediaScanner:
             directory: Path to the directory to scan
             progress_callback: Optional callback function(current, total, filename)
             update_existing: If True, update existing files; if False, skip them
+            exif_only: If True, only read header metadata (EXIF / video container)
+                without decoding or analysing any pixels
             
         Returns:
             Dictionary with scan statistics
@@ -60,10 +97,17 @@ class MediaScanner:
             'skipped': 0,
             'errors': 0,
             'new_records': 0,
-            'updated_records': 0
+            'updated_records': 0,
+            'duplicates': 0
         }
+
+        if exif_only:
+            self._scan_headers(media_files, stats, progress_callback, update_existing)
+            self._update_groupings()
+            return stats
         
         # Process each file
+        extracted_hashes = set()
         for index, filepath in enumerate(media_files, start=1):
             if self.should_stop:
                 break
@@ -76,15 +120,24 @@ class MediaScanner:
             
             try:
                 # Check if file already exists in database
-                file_exists = self.database.file_exists(filepath)
+                file_exists = self.database.file_exists(filepath, analyzed_only=True)
                 
                 if file_exists and not update_existing:
                     stats['skipped'] += 1
                     continue
                 
-                # Extract metadata
-                metadata = self.extractor.extract_metadata(filepath)
-                
+                # Reuse the metadata of an identical file, or extract it
+                content_hash = self.content_hasher.hash_file(filepath) if self.skip_duplicate_content else None
+                original = self.database.find_by_content_hash(content_hash, filepath) if content_hash else None
+                # When updating, only copy from records re-extracted during this scan
+                if original and (not update_existing or content_hash in extracted_hashes):
+                    metadata = self._copy_duplicate_metadata(filepath, original)
+                    stats['duplicates'] += 1
+                else:
+                    metadata = self.extractor.extract_metadata(filepath)
+                    metadata['content_hash'] = content_hash
+                    extracted_hashes.add(content_hash)
+
                 # Insert into database
                 success = self.database.insert_metadata(metadata)
                 
@@ -100,9 +153,95 @@ class MediaScanner:
             except Exception as e:
                 print(f"Error processing {filename}: {e}")
                 stats['errors'] += 1
-        
+
+        self._update_groupings()
         return stats
     
+    def _update_groupings(self):
+        """Assign the records added by a scan to location clusters and events."""
+        update_location_clusters(self.database, self.location_cluster_precision)
+        update_events(self.database, self.event_max_gap_minutes, self.event_max_jump_km)
+
+    def _copy_duplicate_metadata(self, filepath: str, original: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the record of an exact duplicate from the record of the original file.
+
+        Args:
+            filepath: Full path to the duplicate file
+            original: Database record with the same content hash
+
+        Returns:
+            Metadata dictionary for the duplicate (an alias of the original)
+        """
+        metadata = {key: value for key, value in original.items() if key not in self.ALIAS_OWN_FIELDS}
+        metadata.update({
+            'filepath': filepath,
+            'filename': os.path.basename(filepath),
+            'content_hash': original['content_hash'],
+            'duplicate_of': original['duplicate_of'] or original['filepath']
+        })
+
+        # Sentiment comes from the filename and folders, not from the content
+        metadata['emotion_sentiment'] = self.extractor.analyze_emotion_sentiment(filepath, metadata)
+
+        # Share the original's thumbnail renditions instead of generating new ones
+        self.extractor.thumbnail_store.link(original['filepath'], filepath)
+
+        return metadata
+
+    def _scan_headers(
+        self,
+        media_files: List[str],
+        stats: dict,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        update_existing: bool = False
+    ):
+        """
+        EXIF-only scan: read header metadata and write it in batched transactions.
+
+        Args:
+            media_files: Files to process
+            stats: Scan statistics dictionary to update
+            progress_callback: Optional callback function(current, total, filename),
+                called once per batch
+            update_existing: If True, update existing files; if False, skip them
+        """
+        existing = self.database.get_existing_filepaths()
+        total_files = len(media_files)
+        batch = []
+
+        def flush(current: int):
+            if not batch:
+                return
+            # Resolve the places of the whole batch in one lookup
+            self.extractor.geocoder.annotate(batch)
+            if self.database.update_metadata_fields(batch, self.HEADER_FIELDS):
+                for record in batch:
+                    stats['processed'] += 1
+                    if record['filepath'] in existing:
+                        stats['updated_records'] += 1
+                    else:
+                        stats['new_records'] += 1
+            else:
+                stats['errors'] += len(batch)
+            if progress_callback:
+                progress_callback(current, total_files, batch[-1]['filename'])
+            batch.clear()
+
+        for index, filepath in enumerate(media_files, start=1):
+            if self.should_stop:
+                break
+
+            if filepath in existing and not update_existing:
+                stats['skipped'] += 1
+                continue
+
+            batch.append(self.extractor.extract_header_metadata(filepath))
+            if len(batch) >= self.HEADER_BATCH_SIZE:
+                flush(index)
+
+        flush(total_files)
+
     def _find_media_files(self, directory: str) -> List[str]:
         """
         Recursively find all media files in a directory.
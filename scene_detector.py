@@ -0,0 +1,178 @@
+"""
+MediaVault Scanner - Scene Detector Module
+Batched local object/scene heuristic (colour ranges, edge density, circles).
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+
+class ColorRangeClassifier:
+    """
+    Measures the share of pixels inside each HSV colour range in a single pass.
+
+    Every range gets one bit. Per-channel lookup tables map each H, S and V value
+    to the bitmask of ranges that accept it; ANDing the three looked-up masks gives
+    the set of ranges a pixel falls in, and one histogram over those codes yields the
+    pixel counts of all ranges at once (identical to cv2.inRange + countNonZero).
+    """
+
+    def __init__(self, color_ranges: Dict[str, Dict[str, tuple]], threshold: float = 15):
+        """
+        Build the per-channel lookup tables.
+
+        Args:
+            color_ranges: Name -> {'lower': (h, s, v), 'upper': (h, s, v)}, inclusive bounds
+            threshold: Minimum percentage of pixels for a range to be reported
+        """
+        if len(color_ranges) > 8:
+            raise ValueError("At most 8 colour ranges are supported")
+
+        self.names = list(color_ranges)
+        self.threshold = threshold
+
+        values = np.arange(256)
+        self.channel_luts = []
+        for channel in range(3):
+            lut = np.zeros(256, dtype=np.uint8)
+            for bit, name in enumerate(self.names):
+                lower = color_ranges[name]['lower'][channel]
+                upper = color_ranges[name]['upper'][channel]
+                lut[(values >= lower) & (values <= upper)] |= np.uint8(1 << bit)
+            self.channel_luts.append(lut)
+
+        # code -> range membership matrix, used to sum the code histogram per range
+        self.code_count = 1 << len(self.names)
+        codes = np.arange(self.code_count)
+        self.code_membership = np.stack(
+            [(codes >> bit) & 1 for bit in range(len(self.names))], axis=1
+        ).astype(np.float64)
+
+    def percentages_batch(self, hsv_frames: Sequence[np.ndarray]) -> np.ndarray:
+        """
+        Compute the percentage of pixels in each colour range for many HSV frames.
+
+        Args:
+            hsv_frames: HSV images (uint8, 3 channels); sizes may differ
+
+        Returns:
+            Array of shape (len(hsv_frames), len(names)) with percentages
+        """
+        histograms = np.zeros((len(hsv_frames), self.code_count))
+        totals = np.ones(len(hsv_frames))
+
+        for index, hsv in enumerate(hsv_frames):
+            hue, saturation, value = cv2.split(hsv)
+            codes = cv2.LUT(hue, self.channel_luts[0])
+            cv2.bitwise_and(codes, cv2.LUT(saturation, self.channel_luts[1]), dst=codes)
+            cv2.bitwise_and(codes, cv2.LUT(value, self.channel_luts[2]), dst=codes)
+
+            histograms[index] = cv2.calcHist([codes], [0], None, [self.code_count], [0, self.code_count]).ravel()
+            totals[index] = codes.size
+
+        # All frames' range counts in one matrix product
+        counts = histograms @ self.code_membership
+        return counts / totals[:, None] * 100
+
+    def classify_batch(self, hsv_frames: Sequence[np.ndarray]) -> List[List[str]]:
+        """
+        Get the colour ranges covering more than the threshold for many HSV frames.
+
+        Returns:
+            One list of range names per frame (in colour range order)
+        """
+        return [
+            [name for name, percentage in zip(self.names, row) if percentage > self.threshold]
+            for row in self.percentages_batch(hsv_frames)
+        ]
+
+
+class SceneDetector:
+    """
+    Object/scene heuristic engine for batches of decoded BGR frames.
+
+    NOTE: This is a simplified color/pattern-based heuristic, NOT ML-based detection.
+    Stages: dominant colour ranges (sky, grass, ...), edge density (buildings and
+    structures) and HoughCircles (circular objects). Each stage can be disabled;
+    HoughCircles is by far the most expensive one.
+    """
+
+    # Longest side frames are downscaled to before analysis
+    MAX_DIMENSION = 400
+
+    # Edge pixel percentage above which a frame is tagged as a structure
+    EDGE_THRESHOLD = 10
+
+    # More circles than this tag a frame with circular objects
+    CIRCLE_MIN_COUNT = 2
+
+    def __init__(self, color_ranges: Dict[str, Dict[str, tuple]], detect_colors: bool = True,
+                 detect_edges: bool = True, detect_circles: bool = True):
+        """
+        Initialize the engine.
+
+        Args:
+            color_ranges: HSV colour ranges for the colour stage (see ColorRangeClassifier)
+            detect_colors: Enable the colour range stage
+            detect_edges: Enable the edge density stage
+            detect_circles: Enable the HoughCircles stage
+        """
+        self.color_classifier = ColorRangeClassifier(color_ranges)
+        self.detect_colors = detect_colors
+        self.detect_edges = detect_edges
+        self.detect_circles = detect_circles
+
+    def downscale(self, frame: np.ndarray) -> np.ndarray:
+        """Resize a frame so that its longest side is at most MAX_DIMENSION."""
+        height, width = frame.shape[:2]
+        if max(height, width) <= self.MAX_DIMENSION:
+            return frame
+        scale = self.MAX_DIMENSION / max(height, width)
+        return cv2.resize(frame, (int(width * scale), int(height * scale)))
+
+    def detect_batch(self, frames: Sequence[np.ndarray], detect_circles: Optional[bool] = None) -> List[str]:
+        """
+        Detect scene tags for a batch of frames.
+
+        Args:
+            frames: Decoded BGR frames (downscaled here if larger than MAX_DIMENSION)
+            detect_circles: Override the HoughCircles stage for this call
+                (None uses the engine setting)
+
+        Returns:
+            One comma-separated tag string per frame ('general-scene' if nothing matched)
+        """
+        if detect_circles is None:
+            detect_circles = self.detect_circles
+
+        frames = [self.downscale(frame) for frame in frames]
+        tags = [[] for _ in frames]
+
+        if self.detect_colors and frames:
+            hsv_frames = [cv2.cvtColor(frame, cv2.COLOR_BGR2HSV) for frame in frames]
+            for frame_tags, color_tags in zip(tags, self.color_classifier.classify_batch(hsv_frames)):
+                frame_tags.extend(color_tags)
+
+        if self.detect_edges or detect_circles:
+            for frame, frame_tags in zip(frames, tags):
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+                # High edge density suggests buildings, vehicles, or structured objects
+                if self.detect_edges:
+                    edges = cv2.Canny(gray, 50, 150)
+                    edge_percentage = cv2.countNonZero(edges) / edges.size * 100
+                    if edge_percentage > self.EDGE_THRESHOLD:
+                        frame_tags.append('building/structure')
+
+                # Detect circles (could be faces, balls, wheels, etc.)
+                if detect_circles:
+                    circles = cv2.HoughCircles(
+                        gray, cv2.HOUGH_GRADIENT, dp=1, minDist=50,
+                        param1=50, param2=30, minRadius=10, maxRadius=100
+                    )
+                    if circles is not None and len(circles[0]) > self.CIRCLE_MIN_COUNT:
+                        frame_tags.append('circular-objects')
+
+        return [', '.join(frame_tags) if frame_tags else 'general-scene' for frame_tags in tags]
@@ -0,0 +1,127 @@
+"""
+Test script for content hashing and exact-duplicate skipping during scans.
+"""
+
+import os
+import shutil
+import tempfile
+
+import cv2
+import numpy as np
+
+from content_hash import ContentHasher
+
+
+def test_content_hash():
+    """Test that chunked, multi-threaded hashing is deterministic."""
+    print("=" * 60)
+    print("Testing Content Hash")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        data = np.random.default_rng(5).integers(0, 256, size=3 * 1024 * 1024 + 123, dtype=np.uint8).tobytes()
+        paths = {}
+        for name, content in (('a.bin', data), ('b.bin', data), ('c.bin', data[:-1] + b'\x00'),
+                              ('d.bin', data[:-1]), ('empty.bin', b'')):
+            paths[name] = os.path.join(temp_dir, name)
+            with open(paths[name], 'wb') as f:
+                f.write(content)
+
+        print("\n1. Testing determinism across worker counts...")
+        small_chunks = ContentHasher(workers=4, chunk_size=256 * 1024)
+        single = ContentHasher(workers=1, chunk_size=256 * 1024)
+        digest = small_chunks.hash_file(paths['a.bin'])
+        assert len(digest) == 32
+        assert digest == single.hash_file(paths['a.bin']) == small_chunks.hash_file(paths['b.bin'])
+        small_chunks.close()
+        print("   ✓ Same hash for identical content with 1 and 4 threads")
+
+        print("\n2. Testing different content...")
+        hasher = ContentHasher()
+        hashes = {name: hasher.hash_file(path) for name, path in paths.items()}
+        assert hashes['a.bin'] == hashes['b.bin']
+        assert len({hashes['a.bin'], hashes['c.bin'], hashes['d.bin'], hashes['empty.bin']}) == 4
+        assert hasher.hash_file(os.path.join(temp_dir, 'missing.bin')) is None
+        print("   ✓ Changed bytes and lengths change the hash")
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+def test_duplicate_scan():
+    """Test that exact duplicates copy metadata instead of being re-extracted."""
+    from scanner import MediaScanner
+
+    print("=" * 60)
+    print("Testing Duplicate-Aware Scan")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, 'scan.db')
+    try:
+        media_dir = os.path.join(temp_dir, 'media')
+        for folder in ('originals', 'backup_1', 'backup_2', 'z_vacation'):
+            os.makedirs(os.path.join(media_dir, folder))
+        image = np.zeros((240, 320, 3), dtype=np.uint8)
+        image[:120] = (235, 206, 135)
+        original = os.path.join(media_dir, 'originals', 'photo.jpg')
+        cv2.imwrite(original, image)
+        for folder in ('backup_1', 'backup_2', 'z_vacation'):
+            shutil.copy(original, os.path.join(media_dir, folder, 'photo.jpg'))
+        cv2.imwrite(os.path.join(media_dir, 'originals', 'other.png'), image)
+
+        scanner = MediaScanner(db_path, extractor_config={'thumbnail_dir': os.path.join(temp_dir, 'thumbnails')})
+        extract_calls = []
+        extract_metadata = scanner.extractor.extract_metadata
+        scanner.extractor.extract_metadata = lambda path: extract_calls.append(path) or extract_metadata(path)
+
+        stats = scanner.scan_directory(media_dir)
+        print(f"   Scan stats: {stats}")
+        assert stats['new_records'] == 5
+        assert stats['duplicates'] == 3
+        assert len(extract_calls) == 2
+
+        db = scanner.get_database()
+        records = {record['filepath']: record for record in db.get_all_metadata()}
+        source = next(record for record in records.values()
+                      if record['filename'] == 'photo.jpg' and record['duplicate_of'] is None)
+        store = scanner.extractor.thumbnail_store
+        aliases = db.get_aliases(source['filepath'])
+        assert len(aliases) == 3
+        for alias in aliases:
+            record = records[alias]
+            assert record['content_hash'] == source['content_hash']
+            assert record['object_keywords'] == source['object_keywords']
+            assert record['phash'] == source['phash']
+            assert store.get(alias) == store.get(source['filepath'])
+        print("   ✓ Duplicates copied metadata and share thumbnails")
+
+        # Path-derived sentiment belongs to each copy's own path
+        vacation = records[os.path.join(media_dir, 'z_vacation', 'photo.jpg')]
+        assert (vacation['sentiment'], vacation['sentiment_context']) == ('Positive', 'Vacation')
+        assert vacation['emotion_sentiment'].startswith('Positive/Vacation')
+        assert records[os.path.join(media_dir, 'backup_1', 'photo.jpg')]['sentiment'] == 'Neutral'
+        print("   ✓ Duplicates classify sentiment from their own path")
+
+        # Updating re-extracts each content once and copies it to the aliases
+        extract_calls.clear()
+        stats = scanner.scan_directory(media_dir, update_existing=True)
+        assert stats['updated_records'] == 5 and stats['duplicates'] == 3
+        assert len(extract_calls) == 2
+        print("   ✓ Updates re-extract each distinct content once")
+        scanner.extractor.thumbnail_store.close()
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_content_hash()
+    test_duplicate_scan()
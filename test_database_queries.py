@@ -0,0 +1,305 @@
+"""
+Test script for indexed database queries (capture timestamps, date ranges, histograms).
+"""
+
+import os
+import tempfile
+
+from database import MediaDatabase
+
+
+def _make_record(name, date_time_original=None, **extra):
+    """Build a minimal metadata record for insertion."""
+    record = {
+        'filepath': os.path.join('C:\\test', name),
+        'filename': name,
+        'file_type': 'Image',
+        'date_time_original': date_time_original,
+        'person_count': 0,
+        'ocr_text_summary': '',
+        'object_keywords': '',
+        'emotion_sentiment': 'Neutral'
+    }
+    record.update(extra)
+    return record
+
+
+def _create_test_database():
+    """Create a temporary database populated with a few records."""
+    db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    db_file.close()
+    db = MediaDatabase(db_file.name)
+
+    db.insert_metadata(_make_record('a.jpg', '2023:06:01 08:00:00',
+                                    emotion_sentiment='Positive/Vacation/Daytime',
+                                    person_count=1, object_keywords='sky, beach'))
+    db.insert_metadata(_make_record('b.jpg', '2023:06:15 21:30:00',
+                                    emotion_sentiment='Positive/Party/Nighttime',
+                                    person_count=4, object_keywords='sky, cake'))
+    db.insert_metadata(_make_record('c.jpg', '2024:01:02 12:00:00',
+                                    emotion_sentiment='Negative/Work/Daytime',
+                                    person_count=7, object_keywords='building/structure'))
+    db.insert_metadata(_make_record('d.jpg', None, file_type='Video', object_keywords='sky'))
+    db.insert_metadata(_make_record('e.jpg', 'not a date'))
+    return db
+
+
+def test_capture_timestamps():
+    """Test capture timestamp parsing, range filters and histograms."""
+    print("=" * 60)
+    print("Testing Capture Timestamp Queries")
+    print("=" * 60)
+
+    db = _create_test_database()
+    try:
+        print("\n1. Testing timestamp normalization...")
+        record = db.get_metadata_by_filepath(os.path.join('C:\\test', 'a.jpg'))
+        assert record['capture_timestamp'] == 1685606400
+        assert db.get_metadata_by_filepath(os.path.join('C:\\test', 'd.jpg'))['capture_timestamp'] is None
+        assert db.get_metadata_by_filepath(os.path.join('C:\\test', 'e.jpg'))['capture_timestamp'] is None
+        print("   ✓ Timestamps parsed at insert time")
+
+        print("\n2. Testing date range filters...")
+        june_2023 = db.get_filtered_metadata(date_from=1685577600, date_to=1688169600)
+        assert sorted(r['filename'] for r in june_2023) == ['a.jpg', 'b.jpg']
+        assert db.get_capture_date_range() == (1685606400, 1704196800)
+        print(f"   June 2023 records: {len(june_2023)}")
+        print("   ✓ Date range filtering working!")
+
+        print("\n3. Testing histograms...")
+        assert db.get_capture_histogram('year') == [('2023', 2), ('2024', 1)]
+        assert db.get_capture_histogram('month') == [('2023-06', 2), ('2024-01', 1)]
+        assert db.get_capture_histogram('day', date_from=1704067200) == [('2024-01-02', 1)]
+        print("   ✓ Histograms working!")
+    finally:
+        os.remove(db.db_path)
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+def test_capture_buckets():
+    """Test the trigger-maintained day buckets behind the timeline."""
+    print("=" * 60)
+    print("Testing Capture Date Buckets")
+    print("=" * 60)
+
+    db = _create_test_database()
+    try:
+        def day_counts():
+            with db.get_connection() as conn:
+                return dict(conn.execute("SELECT day, media_count FROM capture_day_counts").fetchall())
+
+        print("\n1. Testing trigger maintenance...")
+        assert day_counts() == {'2023-06-01': 1, '2023-06-15': 1, '2024-01-02': 1}
+
+        # Re-inserting a file (upsert) moves its count to the new day
+        db.insert_metadata(_make_record('a.jpg', '2023:07:04 10:00:00'))
+        db.update_metadata_fields([{'filepath': os.path.join('C:\\test', 'd.jpg'), 'capture_timestamp': 1704196800},
+                                   {'filepath': os.path.join('C:\\test', 'new.jpg'), 'capture_timestamp': None}],
+                                  ['capture_timestamp'])
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM media_metadata WHERE filename = 'b.jpg'")
+        assert day_counts() == {'2023-07-04': 1, '2024-01-02': 2}
+        print("   ✓ Inserts, re-inserts, updates and deletes tracked")
+
+        print("\n2. Testing histogram ranges...")
+        assert db.get_capture_histogram('month') == [('2023-07', 1), ('2024-01', 2)]
+        assert db.get_capture_histogram('year', date_to=1704067200) == [('2023', 1)]
+        # Ranges not aligned to days fall back to the timestamp index
+        assert db.get_capture_histogram('day', date_from=1704196800 + 1) == []
+        assert db.get_capture_histogram('day', date_from=1704196800) == [('2024-01-02', 2)]
+
+        assert MediaDatabase.bucket_range('2023') == (1672531200, 1704067200)
+        assert MediaDatabase.bucket_range('2023-12') == (1701388800, 1704067200)
+        assert MediaDatabase.bucket_range('2024-02-28') == (1709078400, 1709164800)
+        assert MediaDatabase.bucket_label(1704067199, 'month') == '2023-12'
+        assert MediaDatabase.bucket_label(-1, 'day') == '1969-12-31'
+        print("   ✓ Buckets aggregated per year, month and day")
+
+        print("\n3. Testing the backfill of existing databases...")
+        with db.get_connection() as conn:
+            conn.execute("DROP TABLE capture_day_counts")
+        MediaDatabase(db.db_path)
+        assert day_counts() == {'2023-07-04': 1, '2024-01-02': 2}
+        print("   ✓ Buckets rebuilt from existing records")
+    finally:
+        os.remove(db.db_path)
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+def test_structured_sentiment():
+    """Test the structured sentiment, context and day period columns."""
+    print("=" * 60)
+    print("Testing Structured Sentiment Columns")
+    print("=" * 60)
+
+    db = _create_test_database()
+    try:
+        print("\n1. Testing label splitting...")
+        record = db.get_metadata_by_filepath(os.path.join('C:\\test', 'b.jpg'))
+        assert (record['sentiment'], record['sentiment_context'], record['day_period']) == \
+            ('Positive', 'Party', 'Nighttime')
+        print("   ✓ Sentiment parts stored")
+
+        print("\n2. Testing equality filters...")
+        assert len(db.get_filtered_metadata(emotion_filter='Positive')) == 2
+        assert len(db.get_filtered_metadata(emotion_filter='Neutral')) == 2
+        assert len(db.get_filtered_metadata(context_filter='Work')) == 1
+        assert len(db.get_filtered_metadata(emotion_filter='Positive', day_period_filter='Daytime')) == 1
+        print("   ✓ Filtering working!")
+
+        print("\n3. Testing sentiment distribution...")
+        analytics = db.get_analytics_summary()
+        assert analytics['emotion_distribution'] == {'Positive': 2, 'Neutral': 2, 'Negative': 1}
+        print(f"   Emotion distribution: {analytics['emotion_distribution']}")
+    finally:
+        os.remove(db.db_path)
+
+
+def test_facet_counts():
+    """Test facet counts for all filter dimensions."""
+    print("=" * 60)
+    print("Testing Facet Counts")
+    print("=" * 60)
+
+    db = _create_test_database()
+    try:
+        print("\n1. Testing unfiltered facets...")
+        facets = db.get_facet_counts()
+        assert facets['total'] == 5
+        assert facets['sentiment'] == {'Positive': 2, 'Neutral': 2, 'Negative': 1}
+        assert facets['person_count'] == {'0': 2, '1': 1, '2-5': 1, '6+': 1}
+        assert facets['file_type'] == {'Image': 4, 'Video': 1}
+        assert list(facets['keywords'].items())[0] == ('sky', 3)
+        print(f"   Facets: {facets}")
+
+        print("\n2. Testing facets under filters...")
+        facets = db.get_facet_counts(emotion_filter='Positive', person_count_min=2)
+        assert facets['total'] == 1
+        # Each facet ignores its own filter
+        assert facets['sentiment'] == {'Positive': 1, 'Negative': 1}
+        assert facets['person_count'] == {'0': 0, '1': 1, '2-5': 1, '6+': 0}
+        assert facets['keywords'] == {'cake': 1, 'sky': 1}
+
+        # The keyword filter matches whole indexed keywords, like the keyword facet
+        facets = db.get_facet_counts(keyword_search='sky')
+        assert facets['total'] == facets['keywords']['sky'] == len(db.get_filtered_metadata(keyword_search='sky')) == 3
+        assert db.get_filtered_metadata(keyword_search='sk') == []
+
+        print("\n3. Testing keyword index maintenance on update...")
+        db.insert_metadata(_make_record('d.jpg', None, file_type='Video', object_keywords='water'))
+        facets = db.get_facet_counts()
+        assert facets['keywords']['sky'] == 2 and facets['keywords']['water'] == 1
+        assert db.get_analytics_summary()['top_keywords'][0] == 'sky'
+        print("   ✓ Facet counts working!")
+    finally:
+        os.remove(db.db_path)
+
+
+def test_streaming_csv_export():
+    """Test batched CSV export with progress reporting."""
+    import csv
+
+    print("=" * 60)
+    print("Testing Streaming CSV Export")
+    print("=" * 60)
+
+    db = _create_test_database()
+    export_path = db.db_path + '.csv'
+    try:
+        progress = []
+        success = db.export_to_csv(export_path, batch_size=2,
+                                   progress_callback=lambda done, total: progress.append((done, total)))
+        assert success
+        assert progress == [(2, 5), (4, 5), (5, 5)]
+
+        with open(export_path, newline='', encoding='utf-8') as csvfile:
+            rows = list(csv.DictReader(csvfile))
+        assert len(rows) == 5
+        assert list(rows[0].keys()) == db.EXPORT_COLUMNS
+        print(f"   Exported {len(rows)} rows in {len(progress)} batches")
+
+        print("\n2. Testing filtered export...")
+        assert db.export_to_csv(export_path, emotion_filter='Positive')
+        with open(export_path, newline='', encoding='utf-8') as csvfile:
+            assert len(list(csv.DictReader(csvfile))) == 2
+        assert not db.export_to_csv(export_path, emotion_filter='Unknown')
+
+        # Views without filters (similar images, map areas, events) export their record ids
+        record_ids = [record['id'] for record in db.get_all_metadata()][:3]
+        assert db.export_to_csv(export_path, record_ids=record_ids)
+        with open(export_path, newline='', encoding='utf-8') as csvfile:
+            assert sorted(int(row['id']) for row in csv.DictReader(csvfile)) == sorted(record_ids)
+
+        print("\n3. Testing export of in-memory records...")
+        assert db.export_to_csv(export_path, records=db.get_all_metadata())
+        print("   ✓ CSV export working!")
+    finally:
+        os.remove(db.db_path)
+        if os.path.exists(export_path):
+            os.remove(export_path)
+
+
+def test_columnar_export():
+    """Test typed Parquet / Arrow IPC export (skipped if pyarrow is missing)."""
+    import shutil
+
+    print("=" * 60)
+    print("Testing Columnar Export")
+    print("=" * 60)
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("   ⚠ pyarrow not installed, skipping")
+        return
+
+    db = _create_test_database()
+    export_dir = tempfile.mkdtemp()
+    try:
+        print("\n1. Testing Parquet export...")
+        parquet_path = os.path.join(export_dir, 'media.parquet')
+        assert db.export_to_columnar(parquet_path, row_group_size=2)
+        table = pq.read_table(parquet_path)
+        assert table.num_rows == 5
+        assert pa.types.is_timestamp(table.schema.field('capture_timestamp').type)
+        assert table.schema.field('person_count').type == pa.int32()
+        assert pq.ParquetFile(parquet_path).num_row_groups == 3
+        print("   ✓ Parquet export working!")
+
+        print("\n2. Testing Arrow IPC export...")
+        arrow_path = os.path.join(export_dir, 'media.arrow')
+        assert db.export_to_columnar(arrow_path, file_format='arrow', emotion_filter='Positive')
+        with pa.ipc.open_file(arrow_path) as reader:
+            assert reader.read_all().num_rows == 2
+        print("   ✓ Arrow export working!")
+
+        print("\n3. Testing partitioned export...")
+        db.insert_metadata({'filepath': '/test/old.jpg', 'filename': 'old.jpg', 'file_type': 'Image',
+                            'capture_timestamp': -157766400})  # 1965
+        partitioned_dir = os.path.join(export_dir, 'by_year')
+        assert db.export_to_columnar(partitioned_dir, partition_by='capture_year')
+        assert sorted(os.listdir(partitioned_dir)) == [
+            'capture_year=1965', 'capture_year=2023', 'capture_year=2024', 'capture_year=unknown'
+        ]
+        year_table = pq.read_table(os.path.join(partitioned_dir, 'capture_year=2023', 'part-0.parquet'))
+        assert year_table.num_rows == 2
+        print("   ✓ Partitioned export working!")
+    finally:
+        os.remove(db.db_path)
+        shutil.rmtree(export_dir)
+
+
+if __name__ == "__main__":
+    test_capture_timestamps()
+    test_capture_buckets()
+    test_structured_sentiment()
+    test_facet_counts()
+    test_streaming_csv_export()
+    test_columnar_export()
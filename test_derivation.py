@@ -0,0 +1,161 @@
+"""
+Test script for re-deriving stored columns without re-extraction.
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from database import MediaDatabase
+from derivation import DerivationEngine
+from events import update_events
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _record(name, **fields):
+    record = {'filepath': f'/photos/{name}', 'filename': name, 'file_type': 'Image'}
+    record.update(fields)
+    return record
+
+
+def test_derivation():
+    """Test the derivation steps, checkpoints and resume."""
+    print("=" * 60)
+    print("Testing Derivation Engine")
+    print("=" * 60)
+
+    directory = tempfile.mkdtemp()
+    db_path = os.path.join(directory, 'metadata.db')
+    dictionary_path = os.path.join(directory, 'keywords.json')
+    try:
+        with open(dictionary_path, 'w', encoding='utf-8') as f:
+            json.dump({'sentiment': {'Positive': ['beach'], 'Negative': ['work']},
+                       'stopwords': ['with', 'menu']}, f)
+
+        db = MediaDatabase(db_path)
+        db.insert_metadata(_record('beach/IMG_1.jpg', date_time_original='2023:07:01 10:00:00',
+                                   emotion_sentiment='Neutral/Daytime', object_keywords='sky, with, coffee',
+                                   gps_latitude=48.8566, gps_longitude=2.3522, place_name='Nowhere'))
+        db.insert_metadata(_record('work/IMG_2.jpg', date_time_original='2023:07:01 22:00:00',
+                                   emotion_sentiment='Neutral', object_keywords='Menu, receipt'))
+        db.insert_metadata(_record('IMG_3.jpg', date_time_original='2023:07:01 11:00:00',
+                                   emotion_sentiment='Neutral/Daytime', object_keywords='general-scene'))
+        # EXIF-only record: no analysis yet
+        db.update_metadata_fields([_record('beach/IMG_4.jpg', date_time_original='2023:07:02 10:00:00')],
+                                  ['filename', 'file_type', 'date_time_original'])
+        with db.get_connection() as conn:
+            conn.execute("UPDATE media_metadata SET capture_timestamp = 0 WHERE filename = 'IMG_3.jpg'")
+
+        print("\n1. Testing all steps...")
+        assert update_events(db) == 3
+        event_id = {record['filename']: record['event_id'] for record in db.get_all_metadata()}['beach/IMG_1.jpg']
+        engine = DerivationEngine(db, {'keyword_dictionary_path': dictionary_path}, batch_size=2)
+        progress = []
+        changed = engine.run(progress_callback=lambda done, total, step: progress.append((step, done, total)))
+        assert changed == {'dates': 2, 'places': 1, 'sentiment': 2, 'keywords': 2}
+        # Progress counts the records each step reads (not the EXIF-only record)
+        assert ('sentiment', 3, 3) in progress and ('dates', 4, 4) in progress
+
+        records = {record['filename']: record for record in db.get_all_metadata()}
+        assert records['IMG_3.jpg']['capture_timestamp'] == 1688209200
+        assert records['beach/IMG_1.jpg']['emotion_sentiment'] == 'Positive/Beach/Daytime'
+        assert records['work/IMG_2.jpg']['sentiment_context'] == 'Work'
+        assert records['work/IMG_2.jpg']['day_period'] == 'Nighttime'
+        assert records['IMG_3.jpg']['emotion_sentiment'] == 'Neutral/Daytime'
+        assert records['beach/IMG_4.jpg']['emotion_sentiment'] is None
+        assert records['beach/IMG_1.jpg']['place_name'] == 'Paris'
+        assert records['beach/IMG_1.jpg']['object_keywords'] == 'sky, coffee'
+        assert records['work/IMG_2.jpg']['object_keywords'] == 'receipt'
+
+        with db.get_connection() as conn:
+            indexed = sorted(row[0] for row in conn.execute("SELECT keyword FROM media_keywords"))
+        assert indexed == ['coffee', 'general-scene', 'receipt', 'sky']
+        # Unchanged events are kept, and their places follow their media
+        assert records['beach/IMG_1.jpg']['event_id'] == event_id
+        assert db.get_events()[-1]['place_name'] == 'Paris'
+        assert db.get_event_count() == 3
+        assert db.get_derivation_checkpoints() == {}
+        assert engine.run() == {'dates': 0, 'places': 0, 'sentiment': 0, 'keywords': 0}
+        print("   ✓ Derived columns, keyword index and events updated; a second run changes nothing")
+
+        print("\n2. Testing checkpoints and resume...")
+        db.update_metadata_fields([
+            _record(f'trip/IMG_{index}.jpg', emotion_sentiment='Neutral', capture_timestamp=1690891200)
+            for index in range(10, 20)
+        ], ['filename', 'file_type', 'emotion_sentiment', 'capture_timestamp'])
+
+        def interrupt(done, total, step):
+            if step == 'sentiment' and done >= 4:
+                raise Interrupted()
+
+        engine = DerivationEngine(db, {'keyword_dictionary_path': dictionary_path}, batch_size=2)
+        try:
+            engine.run(['sentiment'], progress_callback=interrupt)
+            assert False, "run should have been interrupted"
+        except Interrupted:
+            pass
+        checkpoint = db.get_derivation_checkpoints()['sentiment']
+        assert checkpoint['last_id'] > 0 and not checkpoint['completed']
+
+        resumed = []
+        changed = engine.run(['sentiment'], progress_callback=lambda done, total, step: resumed.append(done))
+        assert changed == {'sentiment': 10}
+        # Records before the checkpoint are not read again, but count as processed
+        assert resumed == [6, 8, 10, 12, 13]
+        assert all(record['emotion_sentiment'] == 'Neutral/Daytime' for record in db.get_all_metadata()
+                   if record['filename'].startswith('trip/'))
+
+        assert engine.run(['unknown']) == {}
+        print("   ✓ Interrupted runs continue after the last stored batch")
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+def test_derivation_throughput():
+    """Test the sentiment and date steps on a large table."""
+    print("=" * 60)
+    print("Testing Derivation Throughput")
+    print("=" * 60)
+
+    db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    db_file.close()
+    try:
+        db = MediaDatabase(db_file.name)
+        count = 100000
+        with db.get_connection() as conn:
+            conn.executemany("""
+                INSERT INTO media_metadata (filepath, filename, date_time_original, emotion_sentiment)
+                VALUES (?, ?, ?, 'Neutral')
+            """, ((f'/photos/{"party" if index % 7 == 0 else "misc"}/IMG_{index}.jpg', f'IMG_{index}.jpg',
+                   f'2022:{index % 12 + 1:02d}:{index % 28 + 1:02d} {index % 24:02d}:00:00')
+                  for index in range(count)))
+
+        engine = DerivationEngine(db)
+        start = time.perf_counter()
+        changed = engine.run(['dates', 'sentiment'])
+        elapsed = time.perf_counter() - start
+        print(f"   {count} records re-derived in {elapsed:.2f} s ({count / elapsed:,.0f} records/s)")
+        assert changed == {'dates': count, 'sentiment': count}
+        assert db.get_capture_histogram('year') == [('2022', count)]
+        assert db.get_facet_counts()['sentiment']['Positive'] == len(range(0, count, 7))
+    finally:
+        os.remove(db_file.name)
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_derivation()
+    test_derivation_throughput()
@@ -0,0 +1,190 @@
+"""
+Test script for event segmentation by capture time gaps and GPS jumps.
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from database import MediaDatabase
+from events import haversine_km, segment_events, update_events
+
+HOUR = 3600
+
+
+def _add_records(db, records):
+    """Insert (filename, timestamp, latitude, longitude, place) records."""
+    db.update_metadata_fields([
+        {'filepath': filename, 'filename': filename, 'file_type': 'Image', 'capture_timestamp': timestamp,
+         'gps_latitude': latitude, 'gps_longitude': longitude, 'place_name': place}
+        for filename, timestamp, latitude, longitude, place in records
+    ], ['filename', 'file_type', 'capture_timestamp', 'gps_latitude', 'gps_longitude', 'place_name'])
+
+
+def _partition(db):
+    """Events as sets of filenames (independent of event ids)."""
+    with db.get_connection() as conn:
+        rows = conn.execute(
+            "SELECT event_id, filename FROM media_metadata WHERE event_id IS NOT NULL"
+        ).fetchall()
+    groups = {}
+    for event_id, filename in rows:
+        groups.setdefault(event_id, set()).add(filename)
+    return sorted(sorted(group) for group in groups.values())
+
+
+def test_segmentation():
+    """Test the linear segmentation pass."""
+    print("=" * 60)
+    print("Testing Event Segmentation")
+    print("=" * 60)
+
+    print("\n1. Testing time gaps...")
+    rows = [(1, 0, None, None), (2, HOUR, None, None), (3, 2 * HOUR, None, None),
+            (4, 5 * HOUR, None, None), (5, 5 * HOUR, None, None)]
+    assert segment_events(rows, 2 * HOUR, 30) == [[1, 2, 3], [4, 5]]
+    assert segment_events(rows, HOUR - 1, 30) == [[1], [2], [3], [4, 5]]
+    assert segment_events([], HOUR, 30) == []
+    print("   ✓ Split on gaps longer than the threshold")
+
+    print("\n2. Testing GPS jumps...")
+    assert abs(haversine_km(48.8566, 2.3522, 51.5074, -0.1278) - 343.5) < 1
+    rows = [(1, 0, 48.85, 2.35), (2, 600, None, None), (3, 1200, 48.86, 2.36),
+            (4, 1800, 51.50, -0.12), (5, 2400, 51.51, -0.13)]
+    assert segment_events(rows, 2 * HOUR, 30) == [[1, 2, 3], [4, 5]]
+    assert segment_events(rows, 2 * HOUR, 500) == [[1, 2, 3, 4, 5]]
+    print("   ✓ Files without GPS never split; jumps between geotagged files do")
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+def test_incremental_events():
+    """Test that incremental assignment matches a full rebuild."""
+    print("=" * 60)
+    print("Testing Incremental Events")
+    print("=" * 60)
+
+    db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    db_file.close()
+    try:
+        db = MediaDatabase(db_file.name)
+
+        print("\n1. Testing summaries...")
+        _add_records(db, [
+            ('a1.jpg', 1000, 48.85, 2.35, 'Paris'), ('a2.jpg', 2000, 48.86, 2.34, 'Paris'),
+            ('a3.jpg', 3000, None, None, None),
+            ('b1.jpg', 20 * HOUR, 51.50, -0.12, 'London'), ('b2.jpg', 20 * HOUR + 60, 51.51, -0.12, 'London'),
+            ('undated.jpg', None, None, None, None),
+        ])
+        assert update_events(db, max_gap_minutes=120, max_jump_km=30) == 5
+        assert db.get_event_count() == 2
+        assert _partition(db) == [['a1.jpg', 'a2.jpg', 'a3.jpg'], ['b1.jpg', 'b2.jpg']]
+
+        london, paris = db.get_events()
+        assert paris['media_count'] == 3 and paris['place_name'] == 'Paris'
+        assert (paris['start_timestamp'], paris['end_timestamp']) == (1000, 3000)
+        assert abs(paris['centroid_latitude'] - 48.855) < 1e-9
+        assert paris['filename'] == 'a1.jpg'
+        assert [record['filename'] for record in db.get_event_records(london['id'])] == ['b1.jpg', 'b2.jpg']
+        assert update_events(db) == 0
+        print("   ✓ Events stored with date range, place and representative")
+
+        print("\n2. Testing merges and extensions...")
+        # Files in the gap bridge both events into one
+        _add_records(db, [('bridge1.jpg', 9 * HOUR, None, None, None),
+                          ('bridge2.jpg', 15 * HOUR, None, None, None),
+                          ('bridge3.jpg', 4 * HOUR, None, None, None)])
+        assert update_events(db, max_gap_minutes=6 * 60, max_jump_km=30000) == 3
+        assert db.get_event_count() == 1
+        assert db.get_events()[0]['media_count'] == 8
+
+        print("\n3. Testing splits...")
+        # A tighter threshold only applies to re-segmented events, so rebuild
+        assert update_events(db, max_gap_minutes=120, max_jump_km=30, rebuild=True) == 8
+        assert _partition(db) == [['a1.jpg', 'a2.jpg', 'a3.jpg'], ['b1.jpg', 'b2.jpg'],
+                                  ['bridge1.jpg'], ['bridge2.jpg'], ['bridge3.jpg']]
+        # A file jumping away mid-event splits it
+        _add_records(db, [('jump.jpg', 2500, 40.71, -74.0, 'New York')])
+        update_events(db, max_gap_minutes=120, max_jump_km=30)
+        assert _partition(db)[:3] == [['a1.jpg', 'a2.jpg'], ['a3.jpg', 'jump.jpg'], ['b1.jpg', 'b2.jpg']]
+        assert sum(event['media_count'] for event in db.get_events()) == 9
+        print("   ✓ Existing events merged and split only where new files land")
+
+        print("\n4. Testing files leaving events...")
+        # Re-dated to 2020: the file's old event may not keep spanning 1970
+        _add_records(db, [('jump.jpg', 1577880000, 40.71, -74.0, 'New York')])
+        assert update_events(db, max_gap_minutes=120, max_jump_km=30) == 2
+        assert _partition(db)[:4] == [['a1.jpg', 'a2.jpg', 'a3.jpg'], ['b1.jpg', 'b2.jpg'],
+                                      ['bridge1.jpg'], ['bridge2.jpg']]
+        moved = db.get_events()[0]
+        assert moved['media_count'] == 1 and moved['start_timestamp'] == moved['end_timestamp'] == 1577880000
+
+        # Rescanning unchanged files keeps their events
+        events_before = db.get_events()
+        for filename in ('a1.jpg', 'a2.jpg', 'bridge1.jpg'):
+            record = db.get_metadata_by_filepath(filename)
+            db.insert_metadata({'filepath': filename, 'filename': filename,
+                                'capture_timestamp': record['capture_timestamp'],
+                                'gps_latitude': record['gps_latitude'], 'gps_longitude': record['gps_longitude'],
+                                'place_name': record['place_name']})
+        assert update_events(db, max_gap_minutes=120, max_jump_km=30) == 0
+        assert db.get_events() == events_before
+
+        # A rescanned file with a new capture time leaves its event
+        db.insert_metadata({'filepath': 'bridge1.jpg', 'filename': 'bridge1.jpg', 'capture_timestamp': 15 * HOUR + 60})
+        assert update_events(db, max_gap_minutes=120, max_jump_km=30) == 1
+        assert ['bridge1.jpg', 'bridge2.jpg'] in _partition(db)
+        with db.get_connection() as conn:
+            stale = conn.execute("""
+                SELECT COUNT(*) FROM events e WHERE (media_count, start_timestamp, end_timestamp) IS NOT
+                    (SELECT COUNT(*), MIN(capture_timestamp), MAX(capture_timestamp)
+                     FROM media_metadata WHERE event_id = e.id)
+                    OR representative_id NOT IN (SELECT id FROM media_metadata WHERE event_id = e.id)
+            """).fetchone()[0]
+        assert stale == 0 and db.get_event_count() == 5
+        print("   ✓ Rescans keep events; re-dated files leave no stale events")
+
+        print("\n5. Testing incremental batches against a full rebuild...")
+        rng = random.Random(3)
+        records, timestamp = [], 0
+        for index in range(3000):
+            timestamp += rng.choice([30, 300, 1800, 4 * HOUR, 30 * HOUR])
+            if rng.random() < 0.7:
+                latitude, longitude = rng.choice([(48.85, 2.35), (51.50, -0.12), (40.71, -74.0)])
+                records.append((f'r{index}.jpg', timestamp, latitude + rng.uniform(-0.05, 0.05),
+                                longitude, None))
+            else:
+                records.append((f'r{index}.jpg', timestamp, None, None, None))
+        rng.shuffle(records)
+
+        for start in range(0, len(records), 700):
+            _add_records(db, records[start:start + 700])
+            update_events(db, batch_size=250)
+        incremental = _partition(db)
+
+        start = time.perf_counter()
+        assert update_events(db, rebuild=True) == len(records) + 9
+        elapsed = time.perf_counter() - start
+        assert _partition(db) == incremental
+        print(f"   ✓ {len(incremental)} events identical to a rebuild ({elapsed * 1000:.0f} ms)")
+
+        with db.get_connection() as conn:
+            stale = conn.execute("""
+                SELECT COUNT(*) FROM events e WHERE media_count !=
+                    (SELECT COUNT(*) FROM media_metadata WHERE event_id = e.id)
+            """).fetchone()[0]
+        assert stale == 0
+    finally:
+        os.remove(db_file.name)
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_segmentation()
+    test_incremental_events()
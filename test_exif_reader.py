@@ -0,0 +1,287 @@
+"""
+Test script for the header-only EXIF reader and the EXIF-only scan mode.
+"""
+
+import io
+import os
+import shutil
+import struct
+import tempfile
+import zlib
+
+from PIL import Image
+
+from exif_reader import ExifReader
+
+
+def _build_tiff(thumbnail=None, orientation=6, dimensions=(4000, 3000)):
+    """
+    Build a little-endian EXIF TIFF block with DateTimeOriginal, GPS, orientation,
+    pixel dimensions and (optionally) an IFD1 JPEG thumbnail.
+    """
+    def ifd(entries, data_offset, next_ifd=0):
+        # entries: list of (tag, type, count, payload bytes)
+        table = struct.pack('<H', len(entries))
+        extra = b''
+        for tag, field_type, count, payload in entries:
+            if len(payload) <= 4:
+                table += struct.pack('<HHI', tag, field_type, count) + payload.ljust(4, b'\x00')
+            else:
+                table += struct.pack('<HHII', tag, field_type, count, data_offset + len(extra))
+                extra += payload
+        return table + struct.pack('<I', next_ifd), extra
+
+    def rationals(*values):
+        return b''.join(struct.pack('<II', numerator, denominator) for numerator, denominator in values)
+
+    def ifd_size(count):
+        return 2 + count * 12 + 4
+
+    # Layout: header, IFD0, Exif IFD, GPS IFD, IFD1, thumbnail
+    ifd0_offset = 8
+    exif_offset = ifd0_offset + ifd_size(3)
+    date = b'2023:06:01 08:00:00\x00'
+    gps_offset = exif_offset + ifd_size(3) + len(date)
+    gps_extra = 48
+    ifd1_offset = gps_offset + ifd_size(4) + gps_extra
+    thumbnail_offset = ifd1_offset + ifd_size(2)
+
+    ifd0, _ = ifd([
+        (0x0112, 3, 1, struct.pack('<H', orientation)),
+        (0x8769, 4, 1, struct.pack('<I', exif_offset)),
+        (0x8825, 4, 1, struct.pack('<I', gps_offset)),
+    ], 0, next_ifd=ifd1_offset if thumbnail else 0)
+    exif_ifd, exif_extra = ifd([
+        (0x9003, 2, len(date), date),
+        (0xA002, 4, 1, struct.pack('<I', dimensions[0])),
+        (0xA003, 4, 1, struct.pack('<I', dimensions[1])),
+    ], exif_offset + ifd_size(3))
+    gps_ifd, gps_data = ifd([
+        (1, 2, 2, b'N\x00'),
+        (2, 5, 3, rationals((37, 1), (46, 1), (2964, 100))),
+        (3, 2, 2, b'W\x00'),
+        (4, 5, 3, rationals((122, 1), (25, 1), (984, 100))),
+    ], gps_offset + ifd_size(4))
+    assert len(gps_data) == gps_extra
+
+    tiff = b'II*\x00' + struct.pack('<I', ifd0_offset) + ifd0 + exif_ifd + exif_extra + gps_ifd + gps_data
+    if thumbnail:
+        ifd1, _ = ifd([
+            (0x0201, 4, 1, struct.pack('<I', thumbnail_offset)),
+            (0x0202, 4, 1, struct.pack('<I', len(thumbnail))),
+        ], 0)
+        tiff += ifd1 + thumbnail
+    return tiff
+
+
+def _jpeg_bytes(size=(32, 24), color='blue'):
+    """Encode a small solid-colour JPEG."""
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+def _build_jpeg(tiff, size=(32, 24), color='blue'):
+    """Insert an APP1 EXIF segment after the JPEG SOI marker."""
+    jpeg = _jpeg_bytes(size, color)
+    segment = b'Exif\x00\x00' + tiff
+    return jpeg[:2] + b'\xff\xe1' + struct.pack('>H', len(segment) + 2) + segment + jpeg[2:]
+
+
+def _build_png(tiff):
+    """Insert an eXIf chunk after the PNG IHDR chunk."""
+    buffer = io.BytesIO()
+    Image.new('RGB', (8, 8), 'red').save(buffer, 'PNG')
+    png = buffer.getvalue()
+    ihdr_end = 8 + 8 + 13 + 4
+    chunk = struct.pack('>I', len(tiff)) + b'eXIf' + tiff + struct.pack('>I', zlib.crc32(b'eXIf' + tiff))
+    return png[:ihdr_end] + chunk + png[ihdr_end:]
+
+
+def _build_heic(tiff):
+    """Build a minimal HEIF structure whose Exif item lives in mdat."""
+    def box(box_type, payload):
+        return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+    infe = box(b'infe', struct.pack('>BxxxHH4s', 2, 1, 0, b'hvc1') + b'\x00') + \
+        box(b'infe', struct.pack('>BxxxHH4s', 2, 2, 0, b'Exif') + b'\x00')
+    iinf = box(b'iinf', struct.pack('>IH', 0, 2) + infe)
+
+    ftyp = box(b'ftyp', b'heic\x00\x00\x00\x00mif1heic')
+    exif_item = struct.pack('>I', 0) + tiff
+
+    def build(mdat_offset):
+        # iloc version 0: offset_size=4, length_size=4, base_offset_size=0
+        iloc = box(b'iloc', struct.pack('>IBBH', 0, 0x44, 0x00, 1) +
+                   struct.pack('>HHHII', 2, 0, 1, mdat_offset, len(exif_item)))
+        meta = box(b'meta', struct.pack('>I', 0) + box(b'hdlr', b'\x00' * 25) + iinf + iloc)
+        return ftyp + meta
+
+    header = build(0)
+    data_offset = len(header) + 8
+    return build(data_offset) + box(b'mdat', exif_item)
+
+
+def test_exif_reader():
+    """Test EXIF block extraction from JPEG, PNG and HEIC files."""
+    print("=" * 60)
+    print("Testing Header-Only EXIF Reader")
+    print("=" * 60)
+
+    reader = ExifReader()
+    temp_dir = tempfile.mkdtemp()
+    thumbnail = _jpeg_bytes((160, 120))
+    tiff = _build_tiff(thumbnail)
+    try:
+        for index, (name, data) in enumerate([
+            ('photo.jpg', _build_jpeg(tiff)),
+            ('image.png', _build_png(tiff)),
+            ('photo.heic', _build_heic(tiff)),
+        ], start=1):
+            print(f"\n{index}. Testing {name}...")
+            path = os.path.join(temp_dir, name)
+            with open(path, 'wb') as f:
+                f.write(data)
+
+            fields = reader.read(path)
+            assert fields['date_time_original'] == '2023:06:01 08:00:00'
+            assert abs(fields['gps_latitude'] - 37.7749) < 1e-4
+            assert abs(fields['gps_longitude'] + 122.4194) < 1e-4
+            assert fields['orientation'] == 6
+            assert (fields['width'], fields['height']) == (4000, 3000)
+            assert 'thumbnail' not in fields
+            assert reader.read(path, include_thumbnail=True)['thumbnail'] == thumbnail
+            print(f"   ✓ {name}: {fields}")
+
+        print("\n4. Testing agreement with PIL...")
+        with Image.open(os.path.join(temp_dir, 'photo.jpg')) as img:
+            pil_exif = img._getexif()
+        assert pil_exif[0x9003] == '2023:06:01 08:00:00'
+        print("   ✓ PIL reads the same EXIF block")
+
+        print("\n5. Testing files without EXIF...")
+        plain_path = os.path.join(temp_dir, 'plain.jpg')
+        with open(plain_path, 'wb') as f:
+            f.write(_jpeg_bytes())
+        assert reader.read(plain_path) == {}
+        text_path = os.path.join(temp_dir, 'notes.txt')
+        with open(text_path, 'w') as f:
+            f.write('not an image')
+        assert reader.read(text_path) is None
+        print("   ✓ Missing EXIF handled")
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+def test_exif_only_scan():
+    """Test the EXIF-only scan mode and that a full scan still analyses those files."""
+    from scanner import MediaScanner
+
+    print("=" * 60)
+    print("Testing EXIF-Only Scan Mode")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, 'scan.db')
+    try:
+        for index in range(3):
+            with open(os.path.join(temp_dir, f'photo_{index}.jpg'), 'wb') as f:
+                f.write(_build_jpeg(_build_tiff()))
+
+        scanner = MediaScanner(db_path, extractor_config={'thumbnail_dir': os.path.join(temp_dir, 'thumbnails')})
+        stats = scanner.scan_directory(temp_dir, exif_only=True)
+        assert stats['new_records'] == 3
+        record = scanner.get_database().get_metadata_by_filepath(os.path.join(temp_dir, 'photo_0.jpg'))
+        assert record['capture_timestamp'] == 1685606400
+        assert record['width'] == 4000
+        assert record['emotion_sentiment'] is None
+        print(f"   EXIF-only stats: {stats}")
+
+        stats = scanner.scan_directory(temp_dir, exif_only=True)
+        assert stats['skipped'] == 3
+
+        # Header-only rows are not treated as analysed by a full scan
+        assert not scanner.get_database().file_exists(record['filepath'], analyzed_only=True)
+        assert scanner.get_database().file_exists(record['filepath'])
+        print("   ✓ EXIF-only scan working!")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_embedded_thumbnails():
+    """Test that thumbnails come from the EXIF preview when it is usable."""
+    from metadata_extractor import MetadataExtractor
+
+    print("=" * 60)
+    print("Testing Embedded Thumbnail Reuse")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+    extractor = MetadataExtractor(extractor_config={'thumbnail_dir': os.path.join(temp_dir, 'thumbnails')})
+
+    def make_thumbnail(name, tiff, size=(400, 300)):
+        path = os.path.join(temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(_build_jpeg(tiff, size=size, color='blue'))
+        assert extractor._generate_thumbnail(path, 'Image')
+        return extractor.thumbnail_store.get_image(path, 64).convert('RGB')
+
+    def is_red(pixel):
+        return pixel[0] > 200 and pixel[2] < 60
+
+    try:
+        red_preview = _jpeg_bytes((160, 120), 'red')
+
+        print("\n1. Testing preview reuse...")
+        thumb = make_thumbnail('preview.jpg', _build_tiff(red_preview, orientation=1))
+        assert is_red(thumb.getpixel((32, 32)))
+        # 160x120 -> 128x96: the 64x64 crop is fully covered
+        assert is_red(thumb.getpixel((0, 0)))
+        print("   ✓ Embedded preview used")
+
+        print("\n2. Testing larger renditions...")
+        # The preview only has 160px of detail: 256 and 1024 come from the image itself
+        path = os.path.join(temp_dir, 'large.jpg')
+        thumb = make_thumbnail('large.jpg', _build_tiff(red_preview, orientation=1), size=(2000, 1500))
+        assert is_red(thumb.getpixel((32, 32)))
+        for size, dimensions in ((256, (256, 192)), (1024, (1024, 768))):
+            rendition = extractor.thumbnail_store.get_image(path, size)
+            assert rendition.size == dimensions
+            assert not is_red(rendition.convert('RGB').getpixel((10, 10)))
+
+        # Stores holding only the list thumbnail get the missing renditions filled in
+        extractor.thumbnail_store.put(path + '.old', {64: extractor.thumbnail_store.get(path, 64)})
+        shutil.copy(path, path + '.old')
+        assert extractor._generate_thumbnail(path + '.old', 'Image')
+        assert extractor.thumbnail_store.has(path + '.old', 1024)
+        assert extractor.thumbnail_store.get_image(path + '.old', 256).size == (256, 192)
+        print("   ✓ 256 and 1024 renditions decoded from the image")
+
+        print("\n3. Testing orientation...")
+        thumb = make_thumbnail('rotated.jpg', _build_tiff(red_preview, orientation=6))
+        assert is_red(thumb.getpixel((32, 32)))
+        assert extractor._load_embedded_thumbnail(os.path.join(temp_dir, 'rotated.jpg')).size == (120, 160)
+        print("   ✓ Orientation applied")
+
+        print("\n4. Testing fallback to full decode...")
+        # Preview aspect (4:3) does not match a 16:9 image
+        thumb = make_thumbnail('wide.jpg', _build_tiff(red_preview, orientation=1, dimensions=(1920, 1080)),
+                               size=(320, 180))
+        assert not is_red(thumb.getpixel((32, 32)))
+        # Preview smaller than the decode size
+        thumb = make_thumbnail('small.jpg', _build_tiff(_jpeg_bytes((80, 60), 'red'), orientation=1))
+        assert not is_red(thumb.getpixel((32, 32)))
+        print("   ✓ Fallback working!")
+    finally:
+        extractor.thumbnail_store.close()
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_exif_reader()
+    test_exif_only_scan()
+    test_embedded_thumbnails()
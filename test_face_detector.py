@@ -0,0 +1,59 @@
+"""
+Test script for the face detector backends.
+"""
+
+import time
+
+import numpy as np
+
+from benchmark_faces import synthetic_photo
+from face_detector import FaceDetector
+
+
+def test_face_detector():
+    """Test bounded-size Haar detection, batching and the DNN fallback."""
+    print("=" * 60)
+    print("Testing Face Detector")
+    print("=" * 60)
+
+    rng = np.random.default_rng(7)
+    large = rng.integers(0, 256, size=(3000, 4000, 3), dtype=np.uint8)
+    small = np.full((200, 300, 3), 128, dtype=np.uint8)
+
+    print("\n1. Testing Haar backend...")
+    detector = FaceDetector('haar', max_dimension=640)
+    assert detector.backend == 'haar'
+    assert detector.count_faces_batch([large, small]) == [0, 0]
+    assert detector.count_faces(small) == 0
+    assert detector.count_faces_batch([]) == []
+    print("   ✓ Haar backend working!")
+
+    print("\n2. Testing recall against full-resolution Haar...")
+    # Downscaling trades the smallest detectable face for speed; sizes are kept
+    # clear of each limit (faces right at it are found or missed by resampling)
+    face_sizes = [36, 60, 120, 150, 220]
+    photo = synthetic_photo(face_sizes, shape=(1800, 2400))
+    for max_dimension, expected_min_face in ((None, 30), (1280, 45), (640, 90)):
+        detector = FaceDetector('haar', max_dimension=max_dimension)
+        min_face = detector.min_face_size(*photo.shape[:2])
+        assert min_face == expected_min_face
+        start = time.perf_counter()
+        count = detector.count_faces(photo)
+        print(f"   max_dimension={max_dimension}: {count} faces of {len(face_sizes)} (min face {min_face}px) "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+        assert count == sum(size >= min_face for size in face_sizes)
+    print("   ✓ Faces down to the reported minimum size found at every bound")
+
+    print("\n3. Testing DNN fallback...")
+    detector = FaceDetector('dnn', dnn_model_path='missing.caffemodel', dnn_config_path='missing.prototxt')
+    assert detector.backend == 'haar'
+    assert detector.count_faces(small) == 0
+    print("   ✓ Falls back to Haar without model files")
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_face_detector()
@@ -0,0 +1,129 @@
+"""
+Test script for the keyword dictionary and the compiled keyword matcher.
+"""
+
+import json
+import os
+import random
+import string
+import tempfile
+import time
+
+from keyword_rules import KeywordDictionary, KeywordMatcher
+
+
+def _naive_match(labelled_keywords, text):
+    """Reference matcher: earliest keyword of the first label found in the text."""
+    text = text.lower()
+    for label, keywords in labelled_keywords:
+        found = [(text.find(keyword), -len(keyword), keyword) for keyword in keywords if keyword in text]
+        if found:
+            return label, min(found)[2]
+    return None
+
+
+def test_keyword_matcher():
+    """Test single-pass and batch keyword matching."""
+    print("=" * 60)
+    print("Testing Keyword Matcher")
+    print("=" * 60)
+
+    print("\n1. Testing labels and priority...")
+    dictionary = KeywordDictionary()
+    assert dictionary.classify_sentiment('/photos/Summer Vacation/IMG_001.jpg') == ('Positive', 'Vacation')
+    assert dictionary.classify_sentiment('/work/office_party.jpg') == ('Positive', 'Party')
+    assert dictionary.classify_sentiment('/Work/meeting.jpg') == ('Negative', 'Work')
+    assert dictionary.classify_sentiment('/photos/IMG_002.jpg') == ('Neutral', None)
+    print("   ✓ Positive keywords win over negative ones, as before")
+
+    print("\n2. Testing overlapping and prefix keywords...")
+    matcher = KeywordMatcher([('Short', ['par']), ('Long', ['party', 'partyline', 'tyl'])])
+    assert matcher.match('partyline') == ('Short', 'par')
+    assert matcher.match('xpartylinex') == ('Short', 'par')
+    assert matcher.match('tylenol partyl') == ('Short', 'par')
+    assert matcher.match('stylish') == ('Long', 'tyl')
+    assert KeywordMatcher([('A', ['a.b', 'c+'])]).match('xc+') == ('A', 'c+')
+    assert KeywordMatcher([]).match_batch(['anything']) == [None]
+    print("   ✓ Keywords hidden inside longer keywords are still found")
+
+    print("\n3. Testing batches against a naive matcher...")
+    rng = random.Random(4)
+    vocabulary = {''.join(rng.choice('abcdef') for _ in range(rng.randint(2, 6))) for _ in range(300)}
+    labelled = [('First', sorted(vocabulary)[::3]), ('Second', sorted(vocabulary)[1::3]),
+                ('Third', sorted(vocabulary)[2::3])]
+    matcher = KeywordMatcher(labelled)
+    paths = [''.join(rng.choice('abcdefgh/') for _ in range(rng.randint(0, 30))) for _ in range(2000)]
+    assert matcher.match_batch(paths) == [_naive_match(labelled, path) for path in paths]
+
+    # Lowercasing 'İ' yields two characters; hits must stay with their path
+    paths = ['/' + 'İ' * 40 + '/trip', '/y/b.jpg', '/z/c.jpg', '/Ärger/ÉTÉ/Work']
+    assert dictionary.classify_sentiment_batch(paths) == [
+        ('Positive', 'Trip'), ('Neutral', None), ('Neutral', None), ('Negative', 'Work')
+    ]
+    print("   ✓ 2,000 random paths and non-ASCII paths match the reference")
+
+    print("\n4. Testing a large vocabulary...")
+    words = sorted({''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))
+                    for _ in range(20000)})
+    matcher = KeywordMatcher([('Positive', words[:10000]), ('Negative', words[10000:])])
+    paths = [f"/media/{rng.choice(words)}/IMG_{index:05d}.jpg" if index % 4 == 0
+             else f"/media/album{index % 50}/IMG_{index:05d}.jpg" for index in range(20000)]
+    start = time.perf_counter()
+    results = matcher.match_batch(paths)
+    elapsed = time.perf_counter() - start
+    assert sum(result is not None for result in results) >= 5000
+    print(f"   ✓ 20,000 paths over 20,000 keywords in {elapsed * 1000:.0f} ms")
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+def test_keyword_dictionary_file():
+    """Test loading the dictionary from a file and the shared stop words."""
+    print("=" * 60)
+    print("Testing Keyword Dictionary File")
+    print("=" * 60)
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'keywords.json')
+    try:
+        print("\n1. Testing export and load...")
+        assert KeywordDictionary().save(path)
+        assert KeywordDictionary(path).sentiment_keywords == KeywordDictionary().sentiment_keywords
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'sentiment': {'Negative': ['Hospital'], 'Positive': ['beach']},
+                       'stopwords': ['Receipt']}, f)
+        dictionary = KeywordDictionary(path)
+        assert dictionary.classify_sentiment('/hospital/beach.jpg') == ('Negative', 'Hospital')
+        assert dictionary.classify_sentiment('/vacation.jpg') == ('Neutral', None)
+        assert dictionary.extract_keywords('Receipt receipt total TOTAL total') == 'total'
+        print("   ✓ Labels, priority and stop words read from the file")
+
+        print("\n2. Testing invalid files...")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"sentiment": ["not", "a", "mapping"]}')
+        dictionary = KeywordDictionary(path)
+        assert dictionary.classify_sentiment('/birthday.jpg') == ('Positive', 'Birthday')
+        assert not dictionary.load(os.path.join(directory, 'missing.json'))
+        print("   ✓ Built-in lists kept when the file cannot be used")
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+        os.rmdir(directory)
+
+    print("\n3. Testing OCR keywords with the merged stop words...")
+    keywords = KeywordDictionary().extract_keywords("The menu: coffee with milk, coffee with sugar, and the bill were paid")
+    assert keywords.split(', ')[0] == 'coffee'
+    assert 'with' not in keywords and 'the' not in keywords and 'were' not in keywords
+    print("   ✓ Stop words of both former lists filtered")
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_keyword_matcher()
+    test_keyword_dictionary_file()
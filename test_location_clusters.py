@@ -0,0 +1,156 @@
+"""
+Test script for geohash location clustering.
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from database import MediaDatabase
+from location_clusters import encode_geohashes, update_location_clusters
+
+
+def _insert_points(db, points, prefix):
+    """Insert geotagged records named prefix_<index>."""
+    db.update_metadata_fields([
+        {'filepath': f'{prefix}_{index}.jpg', 'filename': f'{prefix}_{index}.jpg',
+         'file_type': 'Image', 'gps_latitude': latitude, 'gps_longitude': longitude}
+        for index, (latitude, longitude) in enumerate(points)
+    ], ['filename', 'file_type', 'gps_latitude', 'gps_longitude'])
+
+
+def _cluster_of(db, filepath):
+    return db.get_metadata_by_filepath(filepath)['location_cluster']
+
+
+def test_geohash():
+    """Test geohash encoding against reference values."""
+    print("=" * 60)
+    print("Testing Geohash Encoding")
+    print("=" * 60)
+
+    assert encode_geohashes([57.64911], [10.40744], precision=11) == ['u4pruydqqvj']
+    assert encode_geohashes([42.6], [-5.6], precision=5) == ['ezs42']
+    assert encode_geohashes([-90.0, 89.99], [-180.0, 179.99], precision=3) == ['000', 'zzz']
+    assert encode_geohashes([], []) == []
+    print("   ✓ Reference geohashes match")
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+def test_location_clusters():
+    """Test incremental clustering, merges and the dashboard count."""
+    print("=" * 60)
+    print("Testing Location Clusters")
+    print("=" * 60)
+
+    db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    db_file.close()
+    try:
+        db = MediaDatabase(db_file.name)
+
+        print("\n1. Testing initial clustering...")
+        # Two photos a metre apart on either side of a cell border, and a distant photo
+        cell_height, cell_width = 180.0 / 2 ** 17, 360.0 / 2 ** 18
+        border = np.floor((48.8584 + 90) / cell_height) * cell_height - 90
+        longitude = (np.floor((2.2945 + 180) / cell_width) + 0.5) * cell_width - 180
+        _insert_points(db, [(border - 0.000005, longitude), (border + 0.000005, longitude),
+                            (40.6892, -74.0445)], 'a')
+        db.insert_metadata({'filepath': 'no_gps.jpg', 'filename': 'no_gps.jpg'})
+        assert encode_geohashes([border - 0.000005], [longitude]) != encode_geohashes([border + 0.000005], [longitude])
+
+        assert update_location_clusters(db, precision=7) == 3
+        assert _cluster_of(db, 'a_0.jpg') == _cluster_of(db, 'a_1.jpg') != _cluster_of(db, 'a_2.jpg')
+        assert _cluster_of(db, 'no_gps.jpg') is None
+        assert db.get_analytics_summary()['unique_locations'] == 2
+        assert db.get_analytics_summary()['geotagged_count'] == 3
+        print("   ✓ Nearby photos share a cluster across cell borders")
+
+        print("\n2. Testing incremental updates and merges...")
+        assert update_location_clusters(db, precision=7) == 0
+        # Two cells east: separate cluster, then a photo in between bridges both
+        _insert_points(db, [(border, longitude + 2 * cell_width)], 'b')
+        assert update_location_clusters(db, precision=7) == 1
+        assert db.get_location_cluster_count() == 3
+        _insert_points(db, [(border, longitude + cell_width)], 'c')
+        assert update_location_clusters(db, precision=7) == 1
+        assert db.get_location_cluster_count() == 2
+        paris = {_cluster_of(db, name) for name in ('a_0.jpg', 'a_1.jpg', 'b_0.jpg', 'c_0.jpg')}
+        assert len(paris) == 1
+
+        with db.get_connection() as conn:
+            cluster = dict(conn.execute("SELECT * FROM location_clusters WHERE id = ?", (paris.pop(),)).fetchone())
+        assert cluster['media_count'] == 4
+        assert abs(cluster['centroid_latitude'] - border) < 1e-4
+        assert abs(cluster['centroid_longitude'] - (longitude + 0.75 * cell_width)) < 1e-9
+        assert cluster['representative_id'] == db.get_metadata_by_filepath('a_0.jpg')['id']
+        print("   ✓ New photos grow and merge existing clusters")
+
+        print("\n3. Testing records leaving clusters...")
+        # The bridging photo moves to New York: Paris splits again, no cluster keeps it
+        _insert_points(db, [(40.6893, -74.0446)], 'c')
+        assert _cluster_of(db, 'c_0.jpg') is None and _cluster_of(db, 'a_0.jpg') is None
+        assert update_location_clusters(db, precision=7) == 4
+        assert _cluster_of(db, 'c_0.jpg') == _cluster_of(db, 'a_2.jpg')
+        assert _cluster_of(db, 'a_0.jpg') == _cluster_of(db, 'a_1.jpg') != _cluster_of(db, 'b_0.jpg')
+        assert db.get_location_cluster_count() == 3
+
+        # Rescanning an unchanged record keeps its id and cluster
+        record = db.get_metadata_by_filepath('a_0.jpg')
+        db.insert_metadata({'filepath': 'a_0.jpg', 'filename': 'a_0.jpg', 'gps_latitude': record['gps_latitude'],
+                            'gps_longitude': record['gps_longitude']})
+        rescanned = db.get_metadata_by_filepath('a_0.jpg')
+        assert (rescanned['id'], rescanned['location_cluster']) == (record['id'], record['location_cluster'])
+        assert update_location_clusters(db, precision=7) == 0
+
+        # A rescanned record with a new position leaves its cluster
+        db.insert_metadata({'filepath': 'b_0.jpg', 'filename': 'b_0.jpg', 'gps_latitude': 51.5007,
+                            'gps_longitude': -0.1246})
+        assert update_location_clusters(db, precision=7) == 1
+        with db.get_connection() as conn:
+            stale = conn.execute("""
+                SELECT COUNT(*) FROM location_clusters c WHERE media_count !=
+                    (SELECT COUNT(*) FROM media_metadata WHERE location_cluster = c.id)
+                    OR representative_id NOT IN (SELECT id FROM media_metadata WHERE location_cluster = c.id)
+            """).fetchone()[0]
+            orphaned = conn.execute(
+                "SELECT COUNT(*) FROM location_cells WHERE cluster_id NOT IN (SELECT id FROM location_clusters)"
+            ).fetchone()[0]
+        assert stale == 0 and orphaned == 0
+        assert db.get_location_cluster_count() == 3
+        assert db.get_analytics_summary()['unique_locations'] == 3
+        print("   ✓ Rescans keep clusters; moved records leave no stale clusters")
+
+        print("\n4. Testing precision changes and the antimeridian...")
+        _insert_points(db, [(-17.0, 179.99999), (-17.0, -179.99999)], 'd')
+        assert update_location_clusters(db, precision=6) == 7
+        assert db.get_location_cell_precision() == 6
+        assert _cluster_of(db, 'd_0.jpg') == _cluster_of(db, 'd_1.jpg')
+        assert db.get_location_cluster_count() == 4
+        assert update_location_clusters(db, precision=6, rebuild=True) == 7
+        print("   ✓ Clusters rebuilt when the precision changes")
+
+        print("\n5. Testing throughput...")
+        rng = np.random.default_rng(5)
+        centers = rng.uniform([-50, -180], [60, 180], (2000, 2))
+        points = centers[rng.integers(0, 2000, 50000)] + rng.normal(0, 0.002, (50000, 2))
+        _insert_points(db, points.tolist(), 'e')
+        start = time.perf_counter()
+        assert update_location_clusters(db, precision=6) == 50000
+        print(f"   50,000 records clustered in {time.perf_counter() - start:.2f}s")
+        assert db.get_analytics_summary()['geotagged_count'] == 50007
+    finally:
+        os.remove(db_file.name)
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_geohash()
+    test_location_clusters()
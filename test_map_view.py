@@ -0,0 +1,149 @@
+"""
+Test script for the map viewport, offline tiles and map aggregation queries.
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from database import MediaDatabase
+from location_clusters import update_location_clusters
+from map_tiles import TILE_SIZE, MapViewport, TileRenderer, project, unproject
+from reverse_geocoder import ReverseGeocoder
+
+
+def test_map_viewport():
+    """Test projection, panning, zooming and tile layout."""
+    print("=" * 60)
+    print("Testing Map Viewport")
+    print("=" * 60)
+
+    print("\n1. Testing Web Mercator projection...")
+    assert project(0, 0, 0) == (128.0, 128.0)
+    for latitude, longitude in ((48.8584, 2.2945), (-33.8568, 151.2153), (64.13, -21.9)):
+        x, y = project(latitude, longitude, 10)
+        back = unproject(x, y, 10)
+        assert abs(back[0] - latitude) < 1e-9 and abs(back[1] - longitude) < 1e-9
+    print("   ✓ project/unproject round trip")
+
+    print("\n2. Testing pan and zoom...")
+    viewport = MapViewport(800, 600, latitude=48.8584, longitude=2.2945, zoom=12)
+    x, y = viewport.to_screen(48.8584, 2.2945)
+    assert abs(x - 400) < 1e-6 and abs(y - 300) < 1e-6
+
+    anchor = viewport.to_latlon(100, 450)
+    viewport.zoom_at(100, 450, 2)
+    assert viewport.zoom == 14
+    x, y = viewport.to_screen(*anchor)
+    assert abs(x - 100) < 1e-6 and abs(y - 450) < 1e-6
+
+    viewport.pan(50, -20)
+    x, y = viewport.to_screen(*anchor)
+    assert abs(x - 150) < 1e-6 and abs(y - 430) < 1e-6
+
+    viewport.zoom_at(0, 0, 100)
+    assert viewport.zoom == MapViewport.MAX_ZOOM
+    print("   ✓ Zoom keeps the point under the cursor fixed")
+
+    print("\n3. Testing bounds and tiles...")
+    world = MapViewport(1200, 800, zoom=1)
+    assert world.bounds()[2:] == (-180.0, 180.0)
+    assert world.center_y == world.world_size / 2
+
+    pacific = MapViewport(512, 256, latitude=0, longitude=180, zoom=3)
+    min_latitude, max_latitude, min_longitude, max_longitude = pacific.bounds()
+    assert min_longitude > max_longitude
+    assert abs(min_longitude - 135) < 1e-6 and abs(max_longitude + 135) < 1e-6
+    assert min_latitude < 0 < max_latitude
+
+    tiles = pacific.visible_tiles()
+    assert sorted((tile_x, tile_y) for tile_x, tile_y, _, _ in tiles) == [(0, 3), (0, 4), (7, 3), (7, 4)]
+    print("   ✓ Views across the antimeridian wrap")
+
+    print("\n4. Testing the tile renderer...")
+    renderer = TileRenderer(ReverseGeocoder(), cache_size=4)
+    x, y = project(48.8566, 2.3522, 6)
+    tile = renderer.render(6, int(x // TILE_SIZE), int(y // TILE_SIZE))
+    assert tile.size == (TILE_SIZE, TILE_SIZE)
+    pixel = tile.getpixel((int(x % TILE_SIZE), int(y % TILE_SIZE)))
+    assert pixel == TileRenderer.PLACE_COLOR
+    assert renderer.render(6, int(x // TILE_SIZE), int(y // TILE_SIZE)) is tile
+
+    for tile_x in range(5):
+        renderer.render(3, tile_x, 0)
+    assert len(renderer._cache) == 4
+    assert TileRenderer().render(0, 0, 0).getpixel((1, 1)) == TileRenderer.BACKGROUND_COLOR
+    print("   ✓ Tiles rendered offline and cached")
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+def test_map_aggregation():
+    """Test viewport aggregation of location clusters."""
+    print("=" * 60)
+    print("Testing Map Aggregation")
+    print("=" * 60)
+
+    db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    db_file.close()
+    try:
+        db = MediaDatabase(db_file.name)
+        points = {'paris_a': (48.8584, 2.2945), 'paris_b': (48.8606, 2.3376), 'paris_c': (48.8606, 2.3377),
+                  'nyc': (40.6892, -74.0445), 'fiji': (-17.0, 179.9), 'samoa': (-13.8, -171.8)}
+        db.update_metadata_fields([
+            {'filepath': f'{name}.jpg', 'filename': f'{name}.jpg', 'file_type': 'Image',
+             'gps_latitude': latitude, 'gps_longitude': longitude, 'capture_timestamp': index}
+            for index, (name, (latitude, longitude)) in enumerate(points.items())
+        ], ['filename', 'file_type', 'gps_latitude', 'gps_longitude', 'capture_timestamp'])
+        update_location_clusters(db, precision=7)
+
+        print("\n1. Testing grid aggregation...")
+        cells = db.get_map_clusters(-85, 85, -180, 180, cell_degrees=10)
+        assert [cell['media_count'] for cell in cells] == [3, 1, 1, 1]
+        paris = cells[0]
+        assert paris['cluster_count'] == 2
+        assert paris['filepath'] == 'paris_b.jpg'  # representative of the largest cluster
+        assert paris['bounds'] == (40, 50, 0, 10)
+        assert abs(paris['latitude'] - (48.8584 + 2 * 48.8606) / 3) < 1e-6
+
+        fine = db.get_map_clusters(48, 49, 2, 3, cell_degrees=0.01)
+        assert sorted(cell['media_count'] for cell in fine) == [1, 2]
+        print("   ✓ Clusters merged per grid cell with a representative")
+
+        print("\n2. Testing antimeridian viewports and area records...")
+        pacific = db.get_map_clusters(-30, 0, 170, -170, cell_degrees=5)
+        assert sorted(cell['filepath'] for cell in pacific) == ['fiji.jpg', 'samoa.jpg']
+        records = db.get_area_records(*paris['bounds'])
+        assert [record['filename'] for record in records] == ['paris_c.jpg', 'paris_b.jpg', 'paris_a.jpg']
+        assert len(db.get_area_records(*paris['bounds'], limit=1)) == 1
+        print("   ✓ Areas across the antimeridian and marker drill-down")
+
+        print("\n3. Testing query time on many places...")
+        rng = np.random.default_rng(6)
+        with db.get_connection() as conn:
+            conn.executemany(
+                "INSERT INTO location_clusters (centroid_latitude, centroid_longitude, media_count) VALUES (?, ?, ?)",
+                zip(rng.uniform(-60, 70, 200000).tolist(), rng.uniform(-180, 180, 200000).tolist(),
+                    rng.integers(1, 50, 200000).tolist())
+            )
+        viewport = MapViewport(1000, 700, latitude=48.86, longitude=2.35, zoom=6)
+        start = time.perf_counter()
+        cells = db.get_map_clusters(*viewport.bounds(), viewport.degrees_per_pixel() * 64)
+        elapsed = time.perf_counter() - start
+        print(f"   {len(cells)} markers for a zoom 6 view over 200,000 places in {elapsed * 1000:.0f} ms")
+        assert len(cells) <= (1000 // 64 + 2) * (700 // 32 + 2)
+    finally:
+        os.remove(db_file.name)
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_map_viewport()
+    test_map_aggregation()
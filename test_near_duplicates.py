@@ -0,0 +1,119 @@
+"""
+Test script for perceptual hashing and near-duplicate clustering.
+"""
+
+import os
+import random
+import tempfile
+
+import cv2
+import numpy as np
+
+from database import MediaDatabase
+from near_duplicates import (MultiIndexHash, dhash, find_duplicate_clusters, hamming_distance,
+                             to_signed, to_unsigned, update_duplicate_groups)
+
+
+def _flip_bits(value, count, rng):
+    """Flip `count` distinct random bits of a 64-bit hash."""
+    for bit in rng.sample(range(64), count):
+        value ^= 1 << bit
+    return value
+
+
+def _brute_force_clusters(items, max_distance):
+    """Reference single-link clustering by comparing all pairs."""
+    clusters = [{item_id} for item_id, _ in items]
+    for (first_id, first), (second_id, second) in ((a, b) for i, a in enumerate(items) for b in items[i + 1:]):
+        if hamming_distance(first, second) <= max_distance:
+            merged = [cluster for cluster in clusters if first_id in cluster or second_id in cluster]
+            clusters = [cluster for cluster in clusters if cluster not in merged] + [set().union(*merged)]
+    return sorted((sorted(cluster) for cluster in clusters if len(cluster) > 1), key=lambda members: members[0])
+
+
+def test_near_duplicates():
+    """Test dHash, multi-index queries and duplicate clustering."""
+    print("=" * 60)
+    print("Testing Near-Duplicate Detection")
+    print("=" * 60)
+
+    print("\n1. Testing dHash...")
+    rng_np = np.random.default_rng(3)
+    image = cv2.resize(rng_np.integers(0, 256, size=(6, 8, 3), dtype=np.uint8), (640, 480),
+                       interpolation=cv2.INTER_CUBIC)
+    resized = cv2.resize(image, (320, 240), interpolation=cv2.INTER_AREA)
+    other = cv2.resize(rng_np.integers(0, 256, size=(6, 8, 3), dtype=np.uint8), (640, 480),
+                       interpolation=cv2.INTER_CUBIC)
+    assert 0 <= dhash(image) < 1 << 64
+    assert hamming_distance(dhash(image), dhash(resized)) <= 4
+    assert hamming_distance(dhash(image), dhash(other)) > 12
+    for value in (0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1):
+        assert -(1 << 63) <= to_signed(value) < 1 << 63
+        assert to_unsigned(to_signed(value)) == value
+    print("   ✓ Resized copies hash alike, different images do not")
+
+    print("\n2. Testing multi-index queries against brute force...")
+    rng = random.Random(11)
+    hashes = {item_id: rng.getrandbits(64) for item_id in range(2000)}
+    base = hashes[0]
+    for item_id, flips in zip(range(2000, 2010), range(10)):
+        hashes[item_id] = _flip_bits(base, flips, rng)
+
+    for max_distance in (3, 6, 9):
+        index = MultiIndexHash(max_distance)
+        index.add_many(hashes.items())
+        assert len(index) == len(hashes)
+        for query in (base, hashes[2005], hashes[17]):
+            expected = sorted(
+                (item_id, hamming_distance(query, value)) for item_id, value in hashes.items()
+                if hamming_distance(query, value) <= max_distance
+            )
+            assert sorted(index.query(query)) == expected, max_distance
+    print("   ✓ Results identical to a linear scan for k = 3, 6, 9")
+
+    print("\n3. Testing duplicate clustering...")
+    items = [(1, 0x00FF00FF00FF00FF), (2, 0x00FF00FF00FF00FE), (3, 0x00FF00FF00FF00FC),
+             (4, 0xFFFFFFFF00000000), (5, 0x123456789ABCDEF0), (6, 0x123456789ABCDEF1),
+             (7, 0xFFFFFFFF00000000)]
+    assert find_duplicate_clusters(items, max_distance=1) == [[1, 2, 3], [4, 7], [5, 6]]
+    assert find_duplicate_clusters(items, max_distance=0) == [[4, 7]]
+    assert find_duplicate_clusters([], max_distance=6) == []
+
+    # Randomized check against brute-force single-link clustering
+    random_items = [(item_id, value) for item_id, value in hashes.items() if item_id < 300 or item_id >= 2000]
+    expected = _brute_force_clusters(random_items, 6)
+    assert find_duplicate_clusters(random_items, max_distance=6) == expected
+    print("   ✓ Clusters merge transitively and singletons are dropped")
+
+    print("\n4. Testing duplicate groups in the database...")
+    db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    db_file.close()
+    try:
+        db = MediaDatabase(db_file.name)
+        for name, value in (('a.jpg', 0xF0F0F0F0F0F0F0F0), ('b.jpg', 0xF0F0F0F0F0F0F0F1),
+                            ('c.jpg', 0x0F0F0F0F0F0F0F0F), ('d.jpg', None)):
+            db.insert_metadata({'filepath': name, 'filename': name, 'file_type': 'Image',
+                                'emotion_sentiment': 'Neutral',
+                                'phash': to_signed(value) if value is not None else None})
+
+        assert len(db.get_perceptual_hashes()) == 3
+        assert update_duplicate_groups(db, max_distance=2) == 1
+        records = {record['filename']: record for record in db.get_all_metadata()}
+        group_id = records['a.jpg']['id']
+        assert records['b.jpg']['duplicate_group'] == group_id
+        assert records['c.jpg']['duplicate_group'] is None
+        assert [record['filename'] for record in db.get_duplicate_group(group_id)] == ['a.jpg', 'b.jpg']
+
+        assert update_duplicate_groups(db, max_distance=0) == 0
+        assert db.get_duplicate_group(group_id) == []
+        print("   ✓ Groups stored and recomputed")
+    finally:
+        os.remove(db_file.name)
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_near_duplicates()
@@ -124,6 +124,72 @@ def test_object_detection():
     print("  - Combined with OCR keywords")
     print("\nThis is NOT ML-based detection, but a basic pattern recognition system.")
 
+def test_color_classifier():
+    """Test that the single-pass colour classifier matches per-range cv2.inRange counts."""
+    import cv2
+    from scene_detector import ColorRangeClassifier
+
+    print("=" * 60)
+    print("Testing Single-Pass Colour Classifier")
+    print("=" * 60)
+
+    classifier = ColorRangeClassifier(MetadataExtractor.COLOR_RANGES)
+    rng = np.random.default_rng(42)
+
+    frames = []
+    for index in range(12):
+        height, width = rng.integers(20, 200, size=2)
+        bgr = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+        if index % 3 == 0:
+            bgr[:height // 2] = rng.integers(0, 256, size=3)  # Large uniform region
+        frames.append(cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV))
+
+    percentages = classifier.percentages_batch(frames)
+    assert percentages.shape == (len(frames), len(MetadataExtractor.COLOR_RANGES))
+
+    for hsv, row in zip(frames, percentages):
+        for (name, color_range), percentage in zip(MetadataExtractor.COLOR_RANGES.items(), row):
+            mask = cv2.inRange(hsv, np.array(color_range['lower']), np.array(color_range['upper']))
+            expected = cv2.countNonZero(mask) / (hsv.shape[0] * hsv.shape[1]) * 100
+            assert abs(percentage - expected) < 1e-9, (name, percentage, expected)
+
+    sky = cv2.cvtColor(np.full((10, 10, 3), (235, 206, 135), dtype=np.uint8), cv2.COLOR_BGR2HSV)
+    assert classifier.classify_batch([sky])[0] == ['sky', 'water']
+    print("   ✓ Colour classifier matches cv2.inRange")
+
+
+def test_scene_detector_stages():
+    """Test batched scene detection and the per-stage enable flags."""
+    import cv2
+    from scene_detector import SceneDetector
+
+    print("=" * 60)
+    print("Testing Scene Detector Stages")
+    print("=" * 60)
+
+    # Blue sky with four dark circles
+    circles = np.full((400, 400, 3), (235, 206, 135), dtype=np.uint8)
+    for center in [(100, 100), (300, 100), (100, 300), (300, 300)]:
+        cv2.circle(circles, center, 40, (20, 20, 20), 3)
+    grass = np.full((1200, 1600, 3), (34, 139, 34), dtype=np.uint8)
+    gray = np.full((100, 100, 3), 128, dtype=np.uint8)
+
+    detector = SceneDetector(MetadataExtractor.COLOR_RANGES)
+    batch = detector.detect_batch([circles, grass, gray])
+    assert batch == [detector.detect_batch([frame])[0] for frame in (circles, grass, gray)]
+    assert 'circular-objects' in batch[0] and batch[0].startswith('sky, water')
+    assert batch[1] == 'grass, foliage'
+    assert batch[2] == 'general-scene'
+    print(f"   Batch tags: {batch}")
+
+    assert 'circular-objects' not in detector.detect_batch([circles], detect_circles=False)[0]
+    no_colors = SceneDetector(MetadataExtractor.COLOR_RANGES, detect_colors=False, detect_circles=False)
+    assert no_colors.detect_batch([grass]) == ['general-scene']
+    print("   ✓ Stage flags working!")
+
+
 if __name__ == "__main__":
     test_object_detection()
+    test_color_classifier()
+    test_scene_detector_stages()
 
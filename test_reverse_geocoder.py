@@ -0,0 +1,117 @@
+"""
+Test script for offline reverse geocoding.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from database import MediaDatabase
+from reverse_geocoder import ReverseGeocoder, backfill_places
+
+
+def test_reverse_geocoder():
+    """Test place lookups, batch throughput and the GeoNames format."""
+    print("=" * 60)
+    print("Testing Reverse Geocoder")
+    print("=" * 60)
+
+    geocoder = ReverseGeocoder()
+
+    print("\n1. Testing known locations...")
+    assert geocoder.resolve_one(48.8584, 2.2945) == ('Paris', 'Ile-de-France', 'France')
+    assert geocoder.resolve_one(37.8199, -122.4783)[0] == 'San Francisco'
+    assert geocoder.resolve_one(-33.8568, 151.2153)[0] == 'Sydney'
+    assert geocoder.resolve_one(64.13, -21.90)[2] == 'Iceland'
+    # Across the antimeridian
+    assert geocoder.resolve_one(-18.0, -179.9)[2] == 'Fiji'
+    # Middle of the Pacific Ocean
+    assert geocoder.resolve_one(-30.0, -140.0) is None
+    assert geocoder.resolve([], []) == []
+    print("   ✓ Known coordinates resolve to the expected places")
+
+    print("\n2. Testing batch lookups against brute force...")
+    rng = np.random.default_rng(4)
+    latitudes = rng.uniform(-60, 75, 200000)
+    longitudes = rng.uniform(-180, 180, 200000)
+
+    start = time.perf_counter()
+    places = ReverseGeocoder(max_distance_km=None).resolve(latitudes, longitudes)
+    elapsed = time.perf_counter() - start
+    print(f"   {len(places) / elapsed:,.0f} lookups/s")
+
+    queries = geocoder._to_unit_vectors(latitudes[:2000], longitudes[:2000]).astype(np.float64)
+    nearest = np.argmax(queries @ geocoder.vectors.astype(np.float64).T, axis=1)
+    agreement = np.mean([places[i] == geocoder.places[index] for i, index in enumerate(nearest)])
+    assert agreement > 0.999, agreement
+    print("   ✓ KD-tree results match a linear scan")
+
+    print("\n3. Testing a GeoNames cities file...")
+    temp_dir = tempfile.mkdtemp()
+    try:
+        geonames_path = os.path.join(temp_dir, 'cities.txt')
+        with open(geonames_path, 'w', encoding='utf-8') as f:
+            for geoname_id, name, lat, lon, country, admin1 in (
+                    (1, 'Springfield', 39.80, -89.64, 'US', 'IL'),
+                    (2, 'Shelbyville', 39.41, -88.79, 'US', 'IL')):
+                fields = [str(geoname_id), name, name, '', str(lat), str(lon), 'P', 'PPL', country, '', admin1]
+                f.write('\t'.join(fields) + '\n')
+        local = ReverseGeocoder(geonames_path)
+        assert local.resolve_one(39.42, -88.80) == ('Shelbyville', 'IL', 'US')
+        assert not ReverseGeocoder(os.path.join(temp_dir, 'missing.csv')).load()
+        print("   ✓ GeoNames format supported")
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+def test_place_backfill():
+    """Test annotating records and the database backfill job."""
+    print("=" * 60)
+    print("Testing Place Backfill")
+    print("=" * 60)
+
+    db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    db_file.close()
+    try:
+        db = MediaDatabase(db_file.name)
+        for name, latitude, longitude in (('rome.jpg', 41.89, 12.49), ('tokyo.jpg', 35.68, 139.76),
+                                          ('tokyo2.jpg', 35.66, 139.70), ('none.jpg', None, None)):
+            db.insert_metadata({'filepath': name, 'filename': name, 'file_type': 'Image',
+                                'emotion_sentiment': 'Neutral',
+                                'gps_latitude': latitude, 'gps_longitude': longitude})
+
+        geocoder = ReverseGeocoder()
+        assert backfill_places(db, geocoder, batch_size=2) == 3
+        assert db.get_metadata_by_filepath('rome.jpg')['place_name'] == 'Rome'
+        assert db.get_metadata_by_filepath('tokyo.jpg')['place_country'] == 'Japan'
+        assert db.get_metadata_by_filepath('none.jpg')['place_name'] is None
+        assert backfill_places(db, geocoder) == 0
+        assert backfill_places(db, geocoder, overwrite=True) == 3
+
+        analytics = db.get_analytics_summary()
+        assert analytics['top_places'][0] == ('Tokyo, Japan', 2)
+        assert analytics['country_count'] == 2
+
+        records = [{'gps_latitude': 51.50, 'gps_longitude': -0.12}, {'gps_latitude': None}]
+        geocoder.annotate(records)
+        assert records[0]['place_name'] == 'London' and records[0]['place_region'] == 'England'
+        assert records[1]['place_name'] is None
+        print("   ✓ Places stored, counted and re-resolved")
+    finally:
+        os.remove(db_file.name)
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_reverse_geocoder()
+    test_place_backfill()
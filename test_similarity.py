@@ -0,0 +1,121 @@
+"""
+Test script for image embeddings and the IVF similarity index.
+"""
+
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+from database import MediaDatabase
+from image_embedding import ImageEmbedder
+from vector_index import IVFIndex
+
+
+def _scene(rng, base_color):
+    """Draw a synthetic scene with a dominant colour and some random rectangles."""
+    image = np.full((240, 320, 3), base_color, dtype=np.uint8)
+    for _ in range(6):
+        x, y = rng.integers(0, 280), rng.integers(0, 200)
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
+        cv2.rectangle(image, (int(x), int(y)), (int(x) + 40, int(y) + 30), color, -1)
+    return image
+
+
+def test_image_embedding():
+    """Test embedding properties and blob encoding."""
+    print("=" * 60)
+    print("Testing Image Embeddings")
+    print("=" * 60)
+
+    embedder = ImageEmbedder()
+    rng = np.random.default_rng(1)
+    sky = _scene(rng, (235, 206, 135))
+    grass = _scene(rng, (34, 139, 34))
+
+    vector = embedder.embed(sky)
+    assert vector.shape == (ImageEmbedder.EMBEDDING_DIM,)
+    assert abs(np.linalg.norm(vector) - 1) < 1e-5
+
+    resized = embedder.embed(cv2.resize(sky, (1280, 960)))
+    assert float(vector @ resized) > 0.95
+    assert float(vector @ embedder.embed(grass)) < float(vector @ resized)
+    assert np.linalg.norm(embedder.embed(np.zeros((10, 10, 3), dtype=np.uint8))) > 0
+
+    blob = embedder.to_blob(vector)
+    assert len(blob) == ImageEmbedder.EMBEDDING_DIM * 2
+    assert np.allclose(ImageEmbedder.from_blob(blob), vector, atol=1e-3)
+    assert ImageEmbedder.from_blob(b'') is None and ImageEmbedder.from_blob(blob[:-2]) is None
+    print("   ✓ Unit-norm float16 embeddings, similar for resized copies")
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+def test_vector_index():
+    """Test IVF queries against brute force and building from the database."""
+    print("=" * 60)
+    print("Testing IVF Vector Index")
+    print("=" * 60)
+
+    print("\n1. Testing recall against brute force...")
+    rng = np.random.default_rng(2)
+    centers = rng.random((50, ImageEmbedder.EMBEDDING_DIM)).astype(np.float32)
+    vectors = centers[rng.integers(0, 50, 5000)] + rng.random((5000, ImageEmbedder.EMBEDDING_DIM)) * 0.2
+    vectors = (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float16)
+    ids = np.arange(100, 5100)
+
+    index = IVFIndex(probe_count=8)
+    index.build(ids, vectors)
+    assert len(index) == 5000
+
+    recall = []
+    for query_index in range(0, 5000, 250):
+        query = vectors[query_index].astype(np.float32)
+        results = index.query(query, k=10, exclude_id=ids[query_index])
+        assert ids[query_index] not in [record_id for record_id, _ in results]
+        assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+        scores = vectors.astype(np.float32) @ query
+        scores[query_index] = -np.inf
+        expected = set(ids[np.argsort(-scores)[:10]])
+        recall.append(len(expected & {record_id for record_id, _ in results}) / 10)
+    print(f"   Recall@10: {np.mean(recall):.2f}")
+    assert np.mean(recall) >= 0.9
+    assert IVFIndex().query(vectors[0]) == []
+
+    print("\n2. Testing index built from the database...")
+    db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    db_file.close()
+    try:
+        db = MediaDatabase(db_file.name)
+        embedder = ImageEmbedder()
+        scene_rng = np.random.default_rng(3)
+        for index_number, color in enumerate([(235, 206, 135)] * 3 + [(34, 139, 34)] * 3 + [(40, 40, 200)]):
+            name = f'img_{index_number}.jpg'
+            db.insert_metadata({'filepath': name, 'filename': name, 'file_type': 'Image',
+                                'emotion_sentiment': 'Neutral',
+                                'embedding': embedder.to_blob(embedder.embed(_scene(scene_rng, color)))})
+        db.insert_metadata({'filepath': 'no_embedding.mp4', 'filename': 'no_embedding.mp4'})
+
+        index = IVFIndex.from_database(db, probe_count=4)
+        assert len(index) == 7
+        query = db.get_metadata_by_filepath('img_0.jpg')
+        results = index.query(ImageEmbedder.from_blob(query['embedding']), k=2, exclude_id=query['id'])
+        similar = [record['filename'] for record in db.get_metadata_by_ids([record_id for record_id, _ in results])]
+        assert sorted(similar) == ['img_1.jpg', 'img_2.jpg']
+        assert 'embedding' not in db.EXPORT_COLUMNS
+        print("   ✓ Most similar images share the dominant colour")
+    finally:
+        os.remove(db_file.name)
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_image_embedding()
+    test_vector_index()
@@ -3,8 +3,12 @@ Test script for thumbnail generation and display features.
 """
 
 import os
+import shutil
+import tempfile
 from metadata_extractor import MetadataExtractor
 from database import MediaDatabase
+from thumbnail_store import ThumbnailStore
+from thumbnail_queue import ThumbnailQueue
 
 def test_thumbnail_generation():
     """Test thumbnail generation for existing test data."""
@@ -41,14 +45,12 @@ def test_thumbnail_generation():
         filepath = record.get('filepath')
         thumbnail_path = record.get('thumbnail_path')
         
-        if thumbnail_path:
-            if os.path.exists(thumbnail_path):
-                thumbnails_found += 1
-                print(f"✓ Thumbnail exists: {os.path.basename(thumbnail_path)}")
-            else:
-                print(f"✗ Thumbnail missing: {thumbnail_path}")
+        # Thumbnail store first, then legacy per-file thumbnails
+        if extractor.thumbnail_store.has(filepath) or (thumbnail_path and os.path.isfile(thumbnail_path)):
+            thumbnails_found += 1
+            print(f"✓ Thumbnail exists: {os.path.basename(filepath)}")
         else:
-            print(f"⚠ No thumbnail path for: {os.path.basename(filepath)}")
+            print(f"✗ Thumbnail missing: {os.path.basename(filepath)}")
     
     print(f"\n{thumbnails_found}/{len(records)} thumbnails found")
     
@@ -69,24 +71,29 @@ def test_thumbnail_generation():
     # Extract metadata (which should generate thumbnail)
     metadata = extractor.extract_metadata(test_image_path)
     
-    if metadata.get('thumbnail_path'):
-        print(f"✓ Thumbnail generated: {metadata['thumbnail_path']}")
+    if extractor.thumbnail_store.has(test_image_path):
+        print(f"✓ Thumbnail generated")
         
-        if os.path.exists(metadata['thumbnail_path']):
-            print(f"✓ Thumbnail file exists")
+        thumb_img = extractor.thumbnail_store.get_image(test_image_path, 64)
+        if thumb_img is not None:
+            print(f"✓ Thumbnail stored")
             
             # Check thumbnail size
-            thumb_img = Image.open(metadata['thumbnail_path'])
             print(f"✓ Thumbnail size: {thumb_img.size}")
             
             if thumb_img.size == (64, 64):
                 print(f"✓ Thumbnail size is correct (64x64)")
             else:
                 print(f"⚠ Thumbnail size is {thumb_img.size}, expected (64, 64)")
+
+            # Check the larger renditions
+            for size in (256, 1024):
+                rendition = extractor.thumbnail_store.get_image(test_image_path, size)
+                print(f"✓ {size}px rendition size: {rendition.size}")
         else:
-            print(f"✗ Thumbnail file not found")
+            print(f"✗ Thumbnail not found in store")
     else:
-        print(f"✗ No thumbnail path in metadata")
+        print(f"✗ No thumbnail generated")
     
     # Clean up test image
     if os.path.exists(test_image_path):
@@ -97,6 +104,111 @@ def test_thumbnail_generation():
     print("Thumbnail Test Complete!")
     print("=" * 60)
 
+def test_thumbnail_store():
+    """Test the pack-file thumbnail store."""
+    print("=" * 60)
+    print("Testing Thumbnail Pack Store")
+    print("=" * 60)
+
+    store_dir = tempfile.mkdtemp()
+    try:
+        store = ThumbnailStore(store_dir)
+        store.PACK_MAX_BYTES = 10
+
+        print("\n1. Testing put/get...")
+        assert store.put('a.jpg', {64: b'a64', 256: b'a256'})
+        assert store.put('b.jpg', {64: b'b64', 1024: b'b1024'})
+        assert store.get('a.jpg', 64) == b'a64'
+        assert store.get('a.jpg', 256) == b'a256'
+        # Missing sizes resolve to the next larger, else the largest smaller rendition
+        assert store.get('b.jpg', 256) == b'b1024'
+        assert store.get('a.jpg', 1024) == b'a256'
+        assert store.get('missing.jpg') is None
+        assert store.has('a.jpg') and store.has('a.jpg', 256) and not store.has('a.jpg', 1024)
+        print("   ✓ Renditions read back")
+
+        print("\n2. Testing pack rollover and replacement...")
+        assert store.put('a.jpg', {64: b'new-a64'})
+        assert store.get('a.jpg', 64) == b'new-a64'
+        packs = sorted(name for name in os.listdir(store_dir) if name.endswith('.bin'))
+        assert packs == ['pack_00000.bin', 'pack_00001.bin']
+        store.close()
+
+        print("\n3. Testing persistence...")
+        store = ThumbnailStore(store_dir)
+        assert store.get('a.jpg', 64) == b'new-a64'
+        assert store.get('b.jpg', 64) == b'b64'
+        assert store.put('c.jpg', {64: b'c64'})
+        assert store.get('c.jpg') == b'c64'
+        store.close()
+        print("   ✓ Thumbnail store working!")
+    finally:
+        shutil.rmtree(store_dir)
+
+
+def test_lazy_thumbnails():
+    """Test lazy thumbnail mode and the background fill queue."""
+    import threading
+    from PIL import Image
+
+    print("=" * 60)
+    print("Testing Lazy Thumbnails")
+    print("=" * 60)
+
+    print("\n1. Testing queue priorities...")
+    generated = []
+    done = threading.Event()
+
+    def generate(filepath):
+        generated.append(filepath)
+        if filepath == 'visible-2':
+            done.set()
+        return True
+
+    ready = []
+    queue = ThumbnailQueue(generate, has_thumbnail=lambda filepath: filepath == 'cached',
+                           on_ready=ready.append)
+    queue.PREFILL_DELAY = 0
+    queue.pause()
+    queue.prefill(['old-1', 'old-2'])
+    queue.prefill(['prefill-1', 'visible-1'])
+    queue.request(['visible-1', 'cached'])
+    queue.request(['visible-2'])
+    assert queue.pending_count() == 4
+    queue.resume()
+
+    assert done.wait(5)
+    queue.stop()
+    # Visible files first (in request order), stale prefill requests dropped
+    assert generated[:2] == ['visible-1', 'visible-2']
+    assert 'old-1' not in generated and 'old-2' not in generated
+    assert 'cached' in ready and 'cached' not in generated
+    print(f"   Generation order: {generated}")
+
+    print("\n2. Testing lazy extraction...")
+    temp_dir = tempfile.mkdtemp()
+    try:
+        image_path = os.path.join(temp_dir, 'lazy.jpg')
+        Image.new('RGB', (320, 240), color='green').save(image_path)
+
+        extractor = MetadataExtractor(extractor_config={'thumbnail_mode': 'lazy',
+                                                        'thumbnail_dir': os.path.join(temp_dir, 'thumbnails')})
+        metadata = extractor.extract_metadata(image_path)
+        assert metadata['thumbnail_path'] is None
+        assert not extractor.thumbnail_store.has(image_path)
+
+        assert extractor.generate_thumbnail(image_path)
+        assert extractor.thumbnail_store.get_image(image_path, 64).size == (64, 64)
+        # Renditions are looked up by file path: no per-record path is stored or exported
+        assert 'thumbnail_path' not in MediaDatabase.EXPORT_COLUMNS
+        extractor.thumbnail_store.close()
+        print("   ✓ Lazy thumbnails working!")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
 if __name__ == "__main__":
     test_thumbnail_generation()
+    test_thumbnail_store()
+    test_lazy_thumbnails()
 
@@ -0,0 +1,146 @@
+"""
+Test script for header-only video container parsing (MP4/MOV atoms, AVI headers).
+"""
+
+import os
+import struct
+import tempfile
+import time
+from datetime import datetime
+
+from video_container import VideoContainerParser
+
+
+def _atom(atom_type, payload):
+    """Build an MP4 atom."""
+    return struct.pack('>I4s', 8 + len(payload), atom_type) + payload
+
+
+def _riff_chunk(chunk_id, payload):
+    """Build a RIFF chunk (word aligned)."""
+    padding = b'\x00' if len(payload) % 2 else b''
+    return struct.pack('<4sI', chunk_id, len(payload)) + payload + padding
+
+
+def _build_mp4(with_apple_metadata=False):
+    """Build a minimal MOV file: 10 s, 1920x1080 avc1 at 30 fps, with GPS."""
+    # 2023-06-01 08:00:00 UTC in QuickTime epoch seconds
+    creation_time = 1685606400 + VideoContainerParser.QUICKTIME_EPOCH_OFFSET
+    mvhd = _atom(b'mvhd', struct.pack('>I4I', 0, creation_time, creation_time, 1000, 10000) + b'\x00' * 80)
+
+    tkhd = _atom(b'tkhd', struct.pack('>I5I', 0, 0, 0, 1, 0, 10000) + b'\x00' * 52 +
+                 struct.pack('>II', 1920 << 16, 1080 << 16))
+    mdhd = _atom(b'mdhd', struct.pack('>I4I', 0, 0, 0, 30000, 300000) + b'\x00' * 4)
+    hdlr = _atom(b'hdlr', struct.pack('>II4s', 0, 0, b'vide') + b'\x00' * 13)
+    stsd = _atom(b'stsd', struct.pack('>II', 0, 1) + _atom(b'avc1', b'\x00' * 78))
+    stts = _atom(b'stts', struct.pack('>III', 0, 1, 300) + struct.pack('>I', 1000))
+    minf = _atom(b'minf', _atom(b'stbl', stsd + stts))
+    trak = _atom(b'trak', tkhd + _atom(b'mdia', mdhd + hdlr + minf))
+
+    location = b'+37.7749-122.4194+010.000/'
+    udta = _atom(b'udta', _atom(b'\xa9xyz', struct.pack('>HH', len(location), 0x15c7) + location))
+
+    moov_children = mvhd + trak + udta
+    if with_apple_metadata:
+        key = b'com.apple.quicktime.creationdate'
+        keys = _atom(b'keys', struct.pack('>II', 0, 1) + struct.pack('>I4s', 8 + len(key), b'mdta') + key)
+        value = b'2023-06-01T01:00:00-0700'
+        ilst = _atom(b'ilst', _atom(struct.pack('>I', 1), _atom(b'data', struct.pack('>II', 1, 0) + value)))
+        moov_children += _atom(b'meta', _atom(b'hdlr', b'\x00' * 25) + keys + ilst)
+
+    # mdat before moov: the parser must skip it without reading
+    return _atom(b'ftyp', b'qt  \x00\x00\x00\x00') + _atom(b'mdat', b'\x00' * 4096) + _atom(b'moov', moov_children)
+
+
+def _build_avi():
+    """Build a minimal AVI header: 640x480 MJPG at 25 fps, 250 frames."""
+    avih = _riff_chunk(b'avih', struct.pack('<10I', 40000, 0, 0, 0, 250, 0, 1, 0, 640, 480) + b'\x00' * 16)
+    strh = _riff_chunk(b'strh', struct.pack('<4s4sIHHIIIII', b'vids', b'MJPG', 0, 0, 0, 0, 1, 25, 0, 250) +
+                       b'\x00' * 20)
+    strf = _riff_chunk(b'strf', struct.pack('<IiiHH4s', 40, 640, 480, 1, 24, b'MJPG') + b'\x00' * 20)
+    strl = _riff_chunk(b'LIST', b'strl' + strh + strf)
+    hdrl = _riff_chunk(b'LIST', b'hdrl' + avih + strl)
+    movi = _riff_chunk(b'LIST', b'movi')
+    body = b'AVI ' + hdrl + movi
+    return struct.pack('<4sI', b'RIFF', len(body)) + body
+
+
+def _write_temp(data, suffix):
+    """Write bytes to a temporary file and return its path."""
+    temp_file = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+    temp_file.write(data)
+    temp_file.close()
+    return temp_file.name
+
+
+def test_video_container():
+    """Test MP4/MOV and AVI header parsing."""
+    print("=" * 60)
+    print("Testing Video Container Parsing")
+    print("=" * 60)
+
+    parser = VideoContainerParser()
+    paths = []
+    try:
+        print("\n1. Testing MOV atoms...")
+        paths.append(_write_temp(_build_mp4(), '.mov'))
+        info = parser.parse(paths[-1])
+        print(f"   Parsed: {info}")
+        assert info['duration_seconds'] == 10.0
+        assert (info['width'], info['height']) == (1920, 1080)
+        assert info['codec'] == 'avc1'
+        assert info['frame_rate'] == 30.0
+        # The UTC movie header time is stored as local time, like EXIF dates
+        assert info['date_time_original'] == datetime.fromtimestamp(1685606400).strftime('%Y:%m:%d %H:%M:%S')
+        if hasattr(time, 'tzset'):
+            previous_tz = os.environ.get('TZ')
+            os.environ['TZ'] = 'PST8PDT,M3.2.0,M11.1.0'
+            time.tzset()
+            try:
+                assert parser.parse(paths[-1])['date_time_original'] == '2023:06:01 01:00:00'
+            finally:
+                if previous_tz is None:
+                    del os.environ['TZ']
+                else:
+                    os.environ['TZ'] = previous_tz
+                time.tzset()
+        assert (info['gps_latitude'], info['gps_longitude']) == (37.7749, -122.4194)
+        print("   ✓ MOV parsing working!")
+
+        print("\n2. Testing QuickTime creation date key...")
+        paths.append(_write_temp(_build_mp4(with_apple_metadata=True), '.mov'))
+        info = parser.parse(paths[-1])
+        # The recorded wall-clock time is preferred over the movie header time
+        assert info['date_time_original'] == '2023:06:01 01:00:00'
+        print("   ✓ Creation date key working!")
+
+        print("\n3. Testing AVI headers...")
+        paths.append(_write_temp(_build_avi(), '.avi'))
+        info = parser.parse(paths[-1])
+        print(f"   Parsed: {info}")
+        assert info == {
+            'width': 640, 'height': 480, 'codec': 'MJPG',
+            'frame_rate': 25.0, 'duration_seconds': 10.0
+        }
+        print("   ✓ AVI parsing working!")
+
+        print("\n4. Testing unsupported data...")
+        paths.append(_write_temp(b'not a video', '.mkv'))
+        assert parser.parse(paths[-1]) == {}
+        assert parser.parse(paths[-1] + '.missing') == {}
+
+        # Movie header atom without payload
+        paths.append(_write_temp(_atom(b'moov', _atom(b'mvhd', b'')), '.mov'))
+        assert parser.parse(paths[-1]) == {}
+        print("   ✓ Unsupported and truncated files handled")
+    finally:
+        for path in paths:
+            os.remove(path)
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_video_container()
@@ -0,0 +1,142 @@
+"""
+MediaVault Scanner - Thumbnail Queue Module
+Background priority queue that generates thumbnails on demand (lazy thumbnail mode).
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+
+class ThumbnailQueue:
+    """
+    Single worker thread generating thumbnails in priority order.
+
+    Files requested for display (VISIBLE) are processed before the low-priority
+    prefill of browsed/filtered results (PREFILL). Each prefill request replaces
+    the previous one, so the worker only fills what the user is currently looking at.
+    """
+
+    # Priorities (lower value runs first)
+    VISIBLE = 0
+    PREFILL = 1
+
+    # Pause between prefill items so the worker yields to scans and the GUI
+    PREFILL_DELAY = 0.01
+
+    def __init__(self, generate: Callable[[str], bool], has_thumbnail: Callable[[str], bool],
+                 on_ready: Optional[Callable[[str], None]] = None):
+        """
+        Initialize the queue and start its worker thread.
+
+        Args:
+            generate: Function(filepath) creating the thumbnails; returns success
+            has_thumbnail: Function(filepath) telling whether thumbnails already exist
+            on_ready: Optional callback(filepath), called from the worker thread
+                after a thumbnail was generated
+        """
+        self.generate = generate
+        self.has_thumbnail = has_thumbnail
+        self.on_ready = on_ready
+
+        self._heap = []
+        self._counter = itertools.count()
+        self._queued = {}  # filepath -> (priority, prefill generation)
+        self._prefill_generation = 0
+        self._paused = False
+        self._stopped = False
+        self._condition = threading.Condition()
+
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def request(self, filepaths: Iterable[str]):
+        """Queue files that are being displayed (high priority)."""
+        with self._condition:
+            for filepath in filepaths:
+                self._push(filepath, self.VISIBLE)
+            self._condition.notify()
+
+    def prefill(self, filepaths: Iterable[str]):
+        """Replace the low-priority prefill set with the given files."""
+        with self._condition:
+            self._prefill_generation += 1
+            # Drop the previous prefill set (its heap entries are skipped when popped)
+            self._queued = {
+                filepath: queued for filepath, queued in self._queued.items()
+                if queued[0] != self.PREFILL
+            }
+            for filepath in filepaths:
+                self._push(filepath, self.PREFILL)
+            self._condition.notify()
+
+    def pause(self):
+        """Pause processing (e.g. while a scan is running)."""
+        with self._condition:
+            self._paused = True
+
+    def resume(self):
+        """Resume processing."""
+        with self._condition:
+            self._paused = False
+            self._condition.notify()
+
+    def stop(self):
+        """Stop the worker thread."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def pending_count(self) -> int:
+        """Get the number of queued files."""
+        with self._condition:
+            return len(self._queued)
+
+    def _push(self, filepath: str, priority: int):
+        """Add a file unless it is already queued with the same or a higher priority."""
+        generation = self._prefill_generation if priority == self.PREFILL else 0
+        queued = self._queued.get(filepath)
+        if queued is not None:
+            # Already at the top priority, or already in the current prefill set
+            if queued[0] == self.VISIBLE or (priority == self.PREFILL and queued[1] == generation):
+                return
+
+        self._queued[filepath] = (priority, generation)
+        heapq.heappush(self._heap, (priority, next(self._counter), filepath, generation))
+
+    def _pop(self) -> Optional[tuple]:
+        """Wait for and remove the next live entry; returns None when stopped."""
+        with self._condition:
+            while True:
+                if self._stopped:
+                    return None
+
+                if self._heap and not self._paused:
+                    priority, _, filepath, generation = heapq.heappop(self._heap)
+                    # Skip entries superseded by a re-queue or a newer prefill request
+                    if self._queued.get(filepath) != (priority, generation):
+                        continue
+                    del self._queued[filepath]
+                    return priority, filepath
+
+                self._condition.wait()
+
+    def _run(self):
+        """Worker loop."""
+        while True:
+            entry = self._pop()
+            if entry is None:
+                return
+            priority, filepath = entry
+
+            try:
+                if self.has_thumbnail(filepath) or self.generate(filepath):
+                    if self.on_ready:
+                        self.on_ready(filepath)
+            except Exception as e:
+                print(f"Error generating thumbnail for {filepath}: {e}")
+
+            if priority == self.PREFILL:
+                time.sleep(self.PREFILL_DELAY)
@@ -0,0 +1,217 @@
+"""
+MediaVault Scanner - Thumbnail Store Module
+Stores multi-resolution thumbnail renditions in append-only pack files with a
+SQLite offset index; reads are served from memory-mapped packs.
+"""
+
+import io
+import mmap
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+from PIL import Image
+
+
+class ThumbnailStore:
+    """Pack-file thumbnail pyramid keyed by media file path."""
+
+    # Rendition sizes in pixels (64 is the square list thumbnail, the others keep the aspect ratio)
+    SIZES = (64, 256, 1024)
+
+    # A new pack file is started once the current one exceeds this size
+    PACK_MAX_BYTES = 256 * 1024 * 1024
+
+    INDEX_FILENAME = "thumbnails.idx"
+    PACK_FILENAME = "pack_{0:05d}.bin"
+
+    def __init__(self, store_dir: str = "thumbnails"):
+        """
+        Open (or create) the thumbnail store.
+
+        Args:
+            store_dir: Directory holding the pack files and the index
+        """
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._maps = {}  # pack number -> (file, mmap)
+
+        self._conn = sqlite3.connect(os.path.join(store_dir, self.INDEX_FILENAME), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS thumbnails (
+                filepath TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                pack INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                PRIMARY KEY (filepath, size)
+            )
+        """)
+        self._conn.commit()
+
+        row = self._conn.execute("SELECT MAX(pack) FROM thumbnails").fetchone()
+        self._current_pack = row[0] or 0
+
+    def put(self, filepath: str, renditions: Dict[int, bytes]) -> bool:
+        """
+        Append encoded renditions of a media file and index them.
+
+        Previously stored renditions of the same size are superseded (their
+        bytes stay in the pack until it is rewritten).
+
+        Args:
+            filepath: Full path to the media file
+            renditions: Rendition size -> encoded JPEG bytes
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not renditions:
+            return False
+
+        try:
+            with self._lock:
+                pack_path = self._pack_path(self._current_pack)
+                if os.path.exists(pack_path) and os.path.getsize(pack_path) >= self.PACK_MAX_BYTES:
+                    self._current_pack += 1
+                    pack_path = self._pack_path(self._current_pack)
+
+                entries = []
+                with open(pack_path, 'ab') as pack_file:
+                    offset = pack_file.tell()
+                    for size, data in sorted(renditions.items()):
+                        pack_file.write(data)
+                        entries.append((filepath, size, self._current_pack, offset, len(data)))
+                        offset += len(data)
+
+                self._conn.executemany("""
+                    INSERT OR REPLACE INTO thumbnails (filepath, size, pack, offset, length)
+                    VALUES (?, ?, ?, ?, ?)
+                """, entries)
+                self._conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error storing thumbnails for {filepath}: {e}")
+            return False
+
+    def link(self, source_filepath: str, filepath: str) -> bool:
+        """
+        Index the renditions of one file under another path without copying bytes
+        (used for exact duplicates).
+
+        Args:
+            source_filepath: File whose renditions are shared
+            filepath: File that should use them
+
+        Returns:
+            True if renditions were linked, False if the source has none
+        """
+        try:
+            with self._lock:
+                cursor = self._conn.execute("""
+                    INSERT OR REPLACE INTO thumbnails (filepath, size, pack, offset, length)
+                    SELECT ?, size, pack, offset, length FROM thumbnails WHERE filepath = ?
+                """, (filepath, source_filepath))
+                self._conn.commit()
+                return cursor.rowcount > 0
+        except Exception as e:
+            print(f"Error linking thumbnails for {filepath}: {e}")
+            return False
+
+    def get(self, filepath: str, size: int = 64) -> Optional[bytes]:
+        """
+        Read an encoded rendition.
+
+        Args:
+            filepath: Full path to the media file
+            size: Requested rendition size; if missing, the next larger stored
+                rendition is returned, else the largest smaller one
+
+        Returns:
+            JPEG bytes, or None if the file has no thumbnails
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT size, pack, offset, length FROM thumbnails WHERE filepath = ?",
+                (filepath,)
+            ).fetchall()
+            if not rows:
+                return None
+
+            larger = sorted(row for row in rows if row[0] >= size)
+            _, pack, offset, length = larger[0] if larger else max(rows)
+
+            try:
+                data = self._get_map(pack, offset + length)
+                return bytes(data[offset:offset + length])
+            except (OSError, ValueError) as e:
+                print(f"Error reading thumbnail pack {pack}: {e}")
+                return None
+
+    def get_image(self, filepath: str, size: int = 64) -> Optional[Image.Image]:
+        """
+        Read a rendition as a PIL image.
+
+        Args:
+            filepath: Full path to the media file
+            size: Requested rendition size (see get)
+
+        Returns:
+            Decoded image, or None if the file has no thumbnails
+        """
+        data = self.get(filepath, size)
+        if data is None:
+            return None
+        try:
+            img = Image.open(io.BytesIO(data))
+            img.load()
+            return img
+        except Exception as e:
+            print(f"Error decoding thumbnail for {filepath}: {e}")
+            return None
+
+    def has(self, filepath: str, size: Optional[int] = None) -> bool:
+        """Check whether a file has any (or a specific size of) stored rendition."""
+        with self._lock:
+            if size is None:
+                row = self._conn.execute(
+                    "SELECT 1 FROM thumbnails WHERE filepath = ? LIMIT 1", (filepath,)
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT 1 FROM thumbnails WHERE filepath = ? AND size = ?", (filepath, size)
+                ).fetchone()
+            return row is not None
+
+    def close(self):
+        """Close the memory maps and the index connection."""
+        with self._lock:
+            for pack_file, pack_map in self._maps.values():
+                pack_map.close()
+                pack_file.close()
+            self._maps.clear()
+            self._conn.close()
+
+    def _pack_path(self, pack: int) -> str:
+        """Get the path of a pack file."""
+        return os.path.join(self.store_dir, self.PACK_FILENAME.format(pack))
+
+    def _get_map(self, pack: int, required_length: int) -> mmap.mmap:
+        """Get a memory map of a pack, remapping it if it has grown since it was mapped."""
+        cached = self._maps.get(pack)
+        if cached and len(cached[1]) >= required_length:
+            return cached[1]
+
+        if cached:
+            cached[1].close()
+            cached[0].close()
+
+        pack_file = open(self._pack_path(pack), 'rb')
+        pack_map = mmap.mmap(pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps[pack] = (pack_file, pack_map)
+        return pack_map
@@ -0,0 +1,176 @@
+"""
+MediaVault Scanner - Timeline Panel
+Capture-date histogram for the analysis screen: years, drilling down into the
+months of a year and the days of a month. Bars are read from the per-day
+bucket table, so drawing a level costs one small query.
+"""
+
+import tkinter as tk
+from typing import Callable, List, Optional, Tuple
+
+import customtkinter as ctk
+
+from database import MediaDatabase
+
+
+class TimelinePanel(ctk.CTkFrame):
+    """Bar-chart timeline with drill-down (click) and range brushing (drag)."""
+
+    LEVELS = ('year', 'month', 'day')
+
+    BAR_COLOR = "#1F538D"
+    BRUSH_COLOR = "#2B7A0B"
+    TEXT_COLOR = "#AAAAAA"
+
+    # Space below the bars for bucket labels (pixels)
+    LABEL_HEIGHT = 16
+
+    # Minimum horizontal distance between two bucket labels (pixels)
+    LABEL_SPACING = 44
+
+    def __init__(self, parent, get_database: Callable,
+                 on_brush: Optional[Callable[[Optional[int], Optional[int]], None]] = None,
+                 height: int = 120, **kwargs):
+        """
+        Initialize the timeline.
+
+        Args:
+            parent: Parent widget
+            get_database: Callable returning the MediaDatabase to query
+            on_brush: Called with the selected (date_from, date_to) epoch seconds
+                (date_to exclusive), or (None, None) when the selection is cleared
+            height: Height of the bar chart in pixels
+        """
+        super().__init__(parent, **kwargs)
+        self.get_database = get_database
+        self.on_brush = on_brush
+
+        self.path: List[str] = []  # labels drilled into, e.g. ['2023', '2023-06']
+        self.buckets: List[Tuple[str, int]] = []  # bars of the current level
+        self.selection: Optional[Tuple[int, int]] = None  # selected bar indices
+        self._press_index = None
+
+        self.grid_columnconfigure(1, weight=1)
+
+        self.up_btn = ctk.CTkButton(self, text="◀", width=32, command=self._go_up, state="disabled")
+        self.up_btn.grid(row=0, column=0, padx=(5, 2), pady=(5, 0))
+        self.title_label = ctk.CTkLabel(self, text="📅 Timeline", font=ctk.CTkFont(size=12, weight="bold"))
+        self.title_label.grid(row=0, column=1, padx=5, pady=(5, 0), sticky="w")
+        ctk.CTkButton(self, text="Clear", width=60, command=self._clear).grid(row=0, column=2, padx=5, pady=(5, 0))
+
+        self.canvas = tk.Canvas(self, height=height, bg="#2B2B2B", highlightthickness=0)
+        self.canvas.grid(row=1, column=0, columnspan=3, padx=5, pady=5, sticky="ew")
+
+        self.canvas.bind("<Configure>", lambda e: self._draw())
+        self.canvas.bind("<ButtonPress-1>", self._on_press)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<ButtonRelease-1>", self._on_release)
+
+    @property
+    def level(self) -> str:
+        return self.LEVELS[len(self.path)]
+
+    def refresh(self):
+        """Reload the bars of the current level."""
+        db = self.get_database()
+        if self.path:
+            start, end = MediaDatabase.bucket_range(self.path[-1])
+            histogram = db.get_capture_histogram(self.level, start, end)
+            first = MediaDatabase.bucket_label(start, self.level)
+            last = MediaDatabase.bucket_label(end - 1, self.level)
+        else:
+            histogram = db.get_capture_histogram(self.level)
+            first, last = (histogram[0][0], histogram[-1][0]) if histogram else (None, None)
+
+        # Show empty buckets too, so the bars form a continuous axis
+        counts = dict(histogram)
+        self.buckets = []
+        label = first
+        while label is not None and label <= last:
+            self.buckets.append((label, counts.get(label, 0)))
+            label = MediaDatabase.bucket_label(MediaDatabase.bucket_range(label)[1], self.level)
+
+        self.selection = None
+        self.up_btn.configure(state="normal" if self.path else "disabled")
+        total = sum(count for _, count in self.buckets)
+        self.title_label.configure(text=f"📅 Timeline  {' › '.join(['All'] + self.path)}  ({total} dated files)")
+        self._draw()
+
+    def _draw(self):
+        """Draw the bars, labels and brush selection."""
+        self.canvas.delete("all")
+        if not self.buckets:
+            self.canvas.create_text(10, 10, text="No dated files", fill=self.TEXT_COLOR, anchor="nw")
+            return
+
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1) - self.LABEL_HEIGHT
+        bar_width = width / len(self.buckets)
+        peak = max(count for _, count in self.buckets) or 1
+        label_every = max(1, int(self.LABEL_SPACING // bar_width) + 1)
+
+        for index, (label, count) in enumerate(self.buckets):
+            x0, x1 = index * bar_width, (index + 1) * bar_width
+            selected = self.selection and min(self.selection) <= index <= max(self.selection)
+            if selected:
+                self.canvas.create_rectangle(x0, 0, x1, height, fill="#333D2B", outline="")
+            if count:
+                bar_height = max(2, (height - 4) * count / peak)
+                self.canvas.create_rectangle(x0 + 1, height - bar_height, max(x0 + 2, x1 - 1), height,
+                                             fill=self.BRUSH_COLOR if selected else self.BAR_COLOR, outline="")
+            if index % label_every == 0:
+                self.canvas.create_text(x0 + 2, height + 2, text=label.split('-')[-1], anchor="nw",
+                                        fill=self.TEXT_COLOR, font=("Segoe UI", 8))
+
+    def _index_at(self, x: float) -> Optional[int]:
+        """Get the bar index under a canvas x position."""
+        if not self.buckets:
+            return None
+        width = max(self.canvas.winfo_width(), 1)
+        return max(0, min(len(self.buckets) - 1, int(x / (width / len(self.buckets)))))
+
+    def _on_press(self, event):
+        self._press_index = self._index_at(event.x)
+        if self._press_index is not None:
+            self.selection = (self._press_index, self._press_index)
+            self._draw()
+
+    def _on_drag(self, event):
+        index = self._index_at(event.x)
+        if self._press_index is not None and index is not None:
+            self.selection = (self._press_index, index)
+            self._draw()
+
+    def _on_release(self, event):
+        if self._press_index is None or self.selection is None:
+            return
+        first, last = min(self.selection), max(self.selection)
+        self._press_index = None
+
+        # A click drills into the bucket; a drag only brushes the range
+        if first == last and self.level != self.LEVELS[-1]:
+            self.path.append(self.buckets[first][0])
+            self.refresh()
+            self._brush(*MediaDatabase.bucket_range(self.path[-1]))
+            return
+        self._brush(MediaDatabase.bucket_range(self.buckets[first][0])[0],
+                    MediaDatabase.bucket_range(self.buckets[last][0])[1])
+
+    def _go_up(self):
+        if not self.path:
+            return
+        self.path.pop()
+        self.refresh()
+        if self.path:
+            self._brush(*MediaDatabase.bucket_range(self.path[-1]))
+        else:
+            self._brush(None, None)
+
+    def _clear(self):
+        self.path = []
+        self.refresh()
+        self._brush(None, None)
+
+    def _brush(self, date_from: Optional[int], date_to: Optional[int]):
+        if self.on_brush:
+            self.on_brush(date_from, date_to)
@@ -0,0 +1,151 @@
+"""
+MediaVault Scanner - Vector Index Module
+Inverted-file (IVF) index over image embeddings for "more like this" queries.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from image_embedding import ImageEmbedder
+
+
+class IVFIndex:
+    """
+    Approximate nearest-neighbour index using cosine similarity.
+
+    Vectors are partitioned with spherical k-means into list_count inverted
+    lists, stored contiguously (float16) in list order. A query ranks the
+    centroids and scores only the vectors of the probe_count closest lists.
+    """
+
+    # Vectors sampled to train the k-means centroids
+    TRAIN_SAMPLE = 50000
+    KMEANS_ITERATIONS = 10
+
+    # Vectors scored per matrix product while assigning lists
+    ASSIGN_BLOCK_SIZE = 65536
+
+    def __init__(self, list_count: Optional[int] = None, probe_count: int = 8, seed: int = 0):
+        """
+        Initialize an empty index.
+
+        Args:
+            list_count: Number of inverted lists (None = about sqrt of the vector count)
+            probe_count: Lists scanned per query (more = better recall, slower)
+            seed: Random seed for centroid training
+        """
+        self.list_count = list_count
+        self.probe_count = probe_count
+        self.seed = seed
+
+        self.centroids = np.zeros((0, ImageEmbedder.EMBEDDING_DIM), dtype=np.float32)
+        self.vectors = np.zeros((0, ImageEmbedder.EMBEDDING_DIM), dtype=np.float16)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.offsets = np.zeros(1, dtype=np.int64)  # list i spans offsets[i]:offsets[i + 1]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def build(self, ids: np.ndarray, vectors: np.ndarray):
+        """
+        Train the centroids and fill the inverted lists.
+
+        Args:
+            ids: Record ids, shape (N,)
+            vectors: Unit-norm embeddings, shape (N, EMBEDDING_DIM)
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = np.asarray(vectors, dtype=np.float16)
+        if len(ids) == 0:
+            return
+
+        list_count = self.list_count or int(np.sqrt(len(ids)))
+        list_count = max(1, min(list_count, len(ids)))
+        self.centroids = self._train(vectors, list_count)
+
+        assignments = np.concatenate([
+            np.argmax(vectors[start:start + self.ASSIGN_BLOCK_SIZE].astype(np.float32) @ self.centroids.T, axis=1)
+            for start in range(0, len(vectors), self.ASSIGN_BLOCK_SIZE)
+        ])
+        order = np.argsort(assignments, kind='stable')
+        self.vectors = vectors[order]
+        self.ids = ids[order]
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=len(self.centroids)))])
+
+    def query(self, vector: np.ndarray, k: int = 20, exclude_id: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Find the most similar indexed vectors.
+
+        Args:
+            vector: Query embedding
+            k: Number of results
+            exclude_id: Record id to leave out (usually the query record itself)
+
+        Returns:
+            List of (record id, cosine similarity), most similar first
+        """
+        if len(self.ids) == 0:
+            return []
+
+        vector = np.asarray(vector, dtype=np.float32)
+        probe_count = min(self.probe_count, len(self.centroids))
+        lists = np.argpartition(-(self.centroids @ vector), probe_count - 1)[:probe_count]
+
+        candidates = np.concatenate([np.arange(self.offsets[i], self.offsets[i + 1]) for i in lists])
+        scores = self.vectors[candidates].astype(np.float32) @ vector
+        if exclude_id is not None:
+            scores[self.ids[candidates] == exclude_id] = -np.inf
+
+        count = min(k, int(np.isfinite(scores).sum()))
+        if count == 0:
+            return []
+        best = np.argpartition(-scores, count - 1)[:count]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [(int(self.ids[candidates[i]]), float(scores[i])) for i in best]
+
+    def _train(self, vectors: np.ndarray, list_count: int) -> np.ndarray:
+        """Spherical k-means on a sample of the vectors."""
+        rng = np.random.default_rng(self.seed)
+        sample_size = min(len(vectors), max(self.TRAIN_SAMPLE, list_count))
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)].astype(np.float32)
+
+        centroids = sample[rng.choice(sample_size, list_count, replace=False)]
+        for _ in range(self.KMEANS_ITERATIONS):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+
+            # Re-seed empty lists with random sample vectors
+            empty = np.bincount(assignments, minlength=list_count) == 0
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.maximum(norms, 1e-12)
+        return centroids
+
+    @classmethod
+    def from_database(cls, db, **kwargs) -> 'IVFIndex':
+        """
+        Build an index over all stored embeddings.
+
+        Args:
+            db: MediaDatabase instance
+            **kwargs: IVFIndex constructor arguments
+
+        Returns:
+            Built index
+        """
+        ids = []
+        blobs = []
+        blob_size = ImageEmbedder.EMBEDDING_DIM * 2
+        for batch in db.iter_embeddings():
+            for record_id, blob in batch:
+                if blob is not None and len(blob) == blob_size:
+                    ids.append(record_id)
+                    blobs.append(blob)
+
+        vectors = np.frombuffer(b''.join(blobs), dtype=np.float16).reshape(-1, ImageEmbedder.EMBEDDING_DIM)
+        index = cls(**kwargs)
+        index.build(np.array(ids, dtype=np.int64), vectors)
+        return index
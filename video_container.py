@@ -0,0 +1,346 @@
+"""
+MediaVault Scanner - Video Container Module
+Reads video metadata (duration, resolution, codec, frame rate, creation time, GPS)
+directly from MP4/MOV atoms and AVI headers without decoding any pixels.
+
+Creation times are returned as naive local wall-clock time, like photo EXIF
+dates, so photos and videos of the same moment sort together. The QuickTime
+creationdate key (recorded with the camera's UTC offset) is used as written;
+the UTC movie header time is converted to this machine's time zone.
+"""
+
+import os
+import re
+import struct
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Any, Optional, Iterator, Tuple
+
+
+class VideoContainerParser:
+    """Lightweight header parser for MP4/MOV (ISO BMFF / QuickTime) and AVI files."""
+
+    # Atoms that only contain other atoms
+    CONTAINER_ATOMS = {b'moov', b'trak', b'mdia', b'minf', b'stbl', b'udta', b'edts'}
+
+    # Largest moov atom we are willing to read (the atom is usually a few KB)
+    MAX_MOOV_SIZE = 32 * 1024 * 1024
+
+    # Bytes read from the start of an AVI file (the hdrl list lives at the front)
+    AVI_HEADER_READ_SIZE = 64 * 1024
+
+    # Seconds between the QuickTime epoch (1904-01-01) and the Unix epoch
+    QUICKTIME_EPOCH_OFFSET = 2082844800
+
+    # QuickTime metadata keys of interest
+    APPLE_LOCATION_KEY = 'com.apple.quicktime.location.ISO6709'
+    APPLE_CREATION_DATE_KEY = 'com.apple.quicktime.creationdate'
+
+    # ISO 6709 coordinate string, e.g. "+37.7749-122.4194+010.000/"
+    ISO6709_PATTERN = re.compile(r'([+-]\d+(?:\.\d+)?)([+-]\d+(?:\.\d+)?)')
+
+    def parse(self, filepath: str) -> Dict[str, Any]:
+        """
+        Read container-level metadata from a video file.
+
+        Args:
+            filepath: Full path to the video file
+
+        Returns:
+            Dictionary with any of: duration_seconds, width, height, codec,
+            frame_rate, date_time_original ("YYYY:MM:DD HH:MM:SS"),
+            gps_latitude, gps_longitude. Missing fields are omitted.
+        """
+        try:
+            with open(filepath, 'rb') as f:
+                header = f.read(12)
+                if header[:4] == b'RIFF' and header[8:12] == b'AVI ':
+                    return self._parse_avi(f)
+                return self._parse_mp4(f)
+        except (OSError, struct.error, ValueError, IndexError) as e:
+            print(f"Error reading video container of {os.path.basename(filepath)}: {e}")
+            return {}
+
+    # ------------------------------------------------------------------
+    # MP4 / MOV
+    # ------------------------------------------------------------------
+
+    def _parse_mp4(self, f) -> Dict[str, Any]:
+        """Locate the moov atom by walking top-level atom headers and parse it."""
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+        offset = 0
+
+        while offset + 8 <= file_size:
+            f.seek(offset)
+            size, atom_type, header_size = self._read_atom_header(f, file_size - offset)
+            if size < header_size:
+                break
+
+            if atom_type == b'moov':
+                if size > self.MAX_MOOV_SIZE:
+                    return {}
+                payload = f.read(size - header_size)
+                return self._parse_moov(payload)
+
+            # Skip other atoms (mdat, free, ...) without reading them
+            offset += size
+
+        return {}
+
+    def _read_atom_header(self, f, remaining: int) -> Tuple[int, bytes, int]:
+        """Read an atom header from a file, returning (size, type, header_size)."""
+        header = f.read(8)
+        if len(header) < 8:
+            return 0, b'', 8
+
+        size, atom_type = struct.unpack('>I4s', header)
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            return size, atom_type, 16
+        if size == 0:
+            size = remaining
+        return size, atom_type, 8
+
+    def _iter_atoms(self, data: bytes, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[bytes, int, int]]:
+        """Yield (type, payload_start, payload_end) for atoms in a byte range."""
+        end = len(data) if end is None else end
+        offset = start
+
+        while offset + 8 <= end:
+            size, atom_type = struct.unpack_from('>I4s', data, offset)
+            header_size = 8
+            if size == 1:
+                size = struct.unpack_from('>Q', data, offset + 8)[0]
+                header_size = 16
+            elif size == 0:
+                size = end - offset
+
+            if size < header_size or offset + size > end:
+                break
+
+            yield atom_type, offset + header_size, offset + size
+            offset += size
+
+    def _parse_moov(self, moov: bytes) -> Dict[str, Any]:
+        """Extract metadata fields from the moov atom payload."""
+        result = {}
+        apple_metadata = {}
+
+        for atom_type, start, end in self._iter_atoms(moov):
+            if atom_type == b'mvhd':
+                self._parse_mvhd(moov[start:end], result)
+            elif atom_type == b'trak':
+                track = self._parse_trak(moov, start, end)
+                if track.get('handler') == b'vide' and 'width' not in result:
+                    result.update({k: v for k, v in track.items() if k != 'handler'})
+            elif atom_type == b'udta':
+                self._parse_udta(moov, start, end, result)
+            elif atom_type == b'meta':
+                apple_metadata.update(self._parse_apple_metadata(moov, start, end))
+
+        # QuickTime metadata keys (iPhone etc.) take precedence over udta/mvhd values
+        location = apple_metadata.get(self.APPLE_LOCATION_KEY)
+        if location:
+            self._apply_iso6709(location, result)
+
+        creation_date = apple_metadata.get(self.APPLE_CREATION_DATE_KEY)
+        if creation_date:
+            local_time = self._parse_iso8601_local(creation_date)
+            if local_time:
+                result['date_time_original'] = local_time
+
+        return result
+
+    def _parse_mvhd(self, data: bytes, result: Dict[str, Any]):
+        """Parse the movie header (creation time and duration)."""
+        version = data[0]
+        if version == 1:
+            creation_time, _, timescale, duration = struct.unpack_from('>QQIQ', data, 4)
+        else:
+            creation_time, _, timescale, duration = struct.unpack_from('>IIII', data, 4)
+
+        if timescale > 0 and duration > 0:
+            result['duration_seconds'] = round(duration / timescale, 3)
+
+        if creation_time > self.QUICKTIME_EPOCH_OFFSET:
+            # mvhd creation time is UTC; store it as local time like EXIF dates
+            created = datetime.fromtimestamp(creation_time - self.QUICKTIME_EPOCH_OFFSET, tz=timezone.utc)
+            created = created.astimezone()
+            result.setdefault('date_time_original', created.strftime('%Y:%m:%d %H:%M:%S'))
+
+    def _parse_trak(self, data: bytes, start: int, end: int) -> Dict[str, Any]:
+        """Parse a track: dimensions (tkhd), handler, codec and frame rate."""
+        track = {}
+        timescale = 0
+
+        for atom_type, atom_start, atom_end in self._iter_atoms(data, start, end):
+            if atom_type == b'tkhd':
+                tkhd = data[atom_start:atom_end]
+                # Width/height are the last two 16.16 fixed-point fields
+                width, height = struct.unpack_from('>II', tkhd, len(tkhd) - 8)
+                if width and height:
+                    track['width'] = width >> 16
+                    track['height'] = height >> 16
+            elif atom_type == b'mdia':
+                for mdia_type, mdia_start, mdia_end in self._iter_atoms(data, atom_start, atom_end):
+                    if mdia_type == b'mdhd':
+                        version = data[mdia_start]
+                        fmt = '>QQI' if version == 1 else '>III'
+                        timescale = struct.unpack_from(fmt, data, mdia_start + 4)[2]
+                    elif mdia_type == b'hdlr':
+                        track['handler'] = data[mdia_start + 8:mdia_start + 12]
+                    elif mdia_type == b'minf':
+                        self._parse_minf(data, mdia_start, mdia_end, timescale, track)
+
+        return track
+
+    def _parse_minf(self, data: bytes, start: int, end: int, timescale: int, track: Dict[str, Any]):
+        """Parse the sample table for codec (stsd) and frame rate (stts)."""
+        for atom_type, atom_start, atom_end in self._iter_atoms(data, start, end):
+            if atom_type != b'stbl':
+                continue
+
+            for stbl_type, stbl_start, stbl_end in self._iter_atoms(data, atom_start, atom_end):
+                if stbl_type == b'stsd':
+                    entry_count = struct.unpack_from('>I', data, stbl_start + 4)[0]
+                    if entry_count:
+                        codec = data[stbl_start + 12:stbl_start + 16]
+                        track['codec'] = codec.decode('latin-1').strip()
+                elif stbl_type == b'stts' and timescale > 0:
+                    entry_count = struct.unpack_from('>I', data, stbl_start + 4)[0]
+                    total_samples = 0
+                    total_duration = 0
+                    for index in range(entry_count):
+                        count, delta = struct.unpack_from('>II', data, stbl_start + 8 + index * 8)
+                        total_samples += count
+                        total_duration += count * delta
+                    if total_duration > 0:
+                        track['frame_rate'] = round(total_samples * timescale / total_duration, 3)
+
+    def _parse_udta(self, data: bytes, start: int, end: int, result: Dict[str, Any]):
+        """Parse QuickTime user data (©xyz GPS location)."""
+        for atom_type, atom_start, atom_end in self._iter_atoms(data, start, end):
+            if atom_type == b'\xa9xyz':
+                # 2-byte string length, 2-byte language code, then the ISO 6709 string
+                length = struct.unpack_from('>H', data, atom_start)[0]
+                text = data[atom_start + 4:atom_start + 4 + length].decode('utf-8', errors='ignore')
+                self._apply_iso6709(text, result)
+
+    def _parse_apple_metadata(self, data: bytes, start: int, end: int) -> Dict[str, str]:
+        """Parse QuickTime 'meta' keys/ilst into a key -> string value mapping."""
+        # The QuickTime meta atom has no version/flags; the MP4 one does
+        if start + 8 <= end and data[start + 4:start + 8] not in (b'hdlr', b'keys', b'ilst'):
+            start += 4
+
+        keys = []
+        values = {}
+        for atom_type, atom_start, atom_end in self._iter_atoms(data, start, end):
+            if atom_type == b'keys':
+                entry_count = struct.unpack_from('>I', data, atom_start + 4)[0]
+                offset = atom_start + 8
+                for _ in range(entry_count):
+                    key_size = struct.unpack_from('>I', data, offset)[0]
+                    keys.append(data[offset + 8:offset + key_size].decode('utf-8', errors='ignore'))
+                    offset += key_size
+            elif atom_type == b'ilst':
+                for item_type, item_start, item_end in self._iter_atoms(data, atom_start, atom_end):
+                    key_index = struct.unpack('>I', item_type)[0]
+                    for value_type, value_start, value_end in self._iter_atoms(data, item_start, item_end):
+                        if value_type == b'data':
+                            # 4-byte type indicator, 4-byte locale, then the value
+                            values[key_index] = data[value_start + 8:value_end].decode('utf-8', errors='ignore')
+
+        return {
+            keys[index - 1]: value
+            for index, value in values.items()
+            if 0 < index <= len(keys)
+        }
+
+    def _apply_iso6709(self, text: str, result: Dict[str, Any]):
+        """Store latitude/longitude from an ISO 6709 string."""
+        match = self.ISO6709_PATTERN.match(text.strip())
+        if match:
+            result['gps_latitude'] = float(match.group(1))
+            result['gps_longitude'] = float(match.group(2))
+
+    def _parse_iso8601_local(self, text: str) -> Optional[str]:
+        """Convert an ISO 8601 date (e.g. 2023-06-01T08:00:00-0700) to local EXIF format."""
+        try:
+            created = datetime.strptime(text.strip()[:19], '%Y-%m-%dT%H:%M:%S')
+            return created.strftime('%Y:%m:%d %H:%M:%S')
+        except ValueError:
+            return None
+
+    # ------------------------------------------------------------------
+    # AVI
+    # ------------------------------------------------------------------
+
+    def _parse_avi(self, f) -> Dict[str, Any]:
+        """Parse the AVI hdrl list (avih main header and the video strh/strf)."""
+        f.seek(12)
+        data = f.read(self.AVI_HEADER_READ_SIZE)
+        result = {}
+
+        for chunk_id, start, end in self._iter_riff_chunks(data, 0, len(data)):
+            if chunk_id == b'LIST' and data[start:start + 4] == b'hdrl':
+                self._parse_avi_hdrl(data, start + 4, end, result)
+                break
+
+        return result
+
+    def _iter_riff_chunks(self, data: bytes, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+        """Yield (chunk_id, payload_start, payload_end) for RIFF chunks (little endian, word aligned)."""
+        offset = start
+        while offset + 8 <= end:
+            chunk_id, size = struct.unpack_from('<4sI', data, offset)
+            payload_start = offset + 8
+            payload_end = min(payload_start + size, end)
+            yield chunk_id, payload_start, payload_end
+            offset = payload_start + size + (size & 1)
+
+    def _parse_avi_hdrl(self, data: bytes, start: int, end: int, result: Dict[str, Any]):
+        """Parse avih and the first video stream header."""
+        total_frames = 0
+        micro_sec_per_frame = 0
+
+        for chunk_id, chunk_start, chunk_end in self._iter_riff_chunks(data, start, end):
+            if chunk_id == b'avih':
+                (micro_sec_per_frame, _, _, _, total_frames, _, _, _,
+                 width, height) = struct.unpack_from('<10I', data, chunk_start)
+                if width and height:
+                    result['width'] = width
+                    result['height'] = height
+            elif chunk_id == b'LIST' and data[chunk_start:chunk_start + 4] == b'strl':
+                if self._parse_avi_strl(data, chunk_start + 4, chunk_end, result):
+                    break
+
+        if 'frame_rate' not in result and micro_sec_per_frame:
+            result['frame_rate'] = round(1_000_000 / micro_sec_per_frame, 3)
+        if 'duration_seconds' not in result and total_frames and micro_sec_per_frame:
+            result['duration_seconds'] = round(total_frames * micro_sec_per_frame / 1_000_000, 3)
+
+    def _parse_avi_strl(self, data: bytes, start: int, end: int, result: Dict[str, Any]) -> bool:
+        """Parse a stream list; returns True if it was the video stream."""
+        is_video = False
+
+        for chunk_id, chunk_start, chunk_end in self._iter_riff_chunks(data, start, end):
+            if chunk_id == b'strh':
+                fcc_type, fcc_handler = struct.unpack_from('<4s4s', data, chunk_start)
+                if fcc_type != b'vids':
+                    return False
+                is_video = True
+                scale, rate, _, length = struct.unpack_from('<4I', data, chunk_start + 20)
+                if scale and rate:
+                    result['frame_rate'] = round(rate / scale, 3)
+                    if length:
+                        result['duration_seconds'] = round(length * scale / rate, 3)
+                codec = fcc_handler.decode('latin-1').strip('\x00 ')
+                if codec:
+                    result['codec'] = codec
+            elif chunk_id == b'strf' and is_video:
+                # BITMAPINFOHEADER: biCompression holds the codec FourCC
+                compression = data[chunk_start + 16:chunk_start + 20].decode('latin-1').strip('\x00 ')
+                if compression:
+                    result['codec'] = compression
+
+        return is_video